@@ -0,0 +1,431 @@
+"""Local HTTP API serving the precomputed debater statistics.
+
+Serves the DebaterStats JSON written by `debater_stats generate` to the
+dashboard one debater at a time instead of as a single static file:
+
+    GET /api/version                       published stats version
+    GET /api/debaters?q=&page=&per_page=   debater search, paginated
+    GET /api/debaters/<id>                 stats of one debater
+    GET /api/debaters/<id>/debates?page=   debate history, paginated
+
+The server is a small asyncio HTTP/1.1 implementation on the standard
+library. Responses are kept in an LRU cache, carry an ETag (answered with
+304 on If-None-Match) and are gzipped when the client accepts it. The
+stats file is watched in the background; a new version is loaded off the
+event loop and swapped in with a single reference assignment, so requests
+see either the old or the new stats and never a mix.
+
+Example usage:
+    python -m api.stats_server serve --port 8000
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from data.preprocessing.categorize_motions import normalize_text
+from data.preprocessing.debater_stats import PATH_TO_STATS_OUTPUT
+from logger.logger import logger, setup_logging
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_CACHE_SIZE = 512
+DEFAULT_RELOAD_INTERVAL = 2.0
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+# Smaller bodies are not worth compressing
+GZIP_MIN_BYTES = 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+MAX_HEADER_LINES = 100
+
+
+class ApiError(Exception):
+    """Error answered with a JSON body and the given status."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Response:
+    status: HTTPStatus
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class StatsSnapshot:
+    """One published version of the stats with its lookup structures."""
+
+    version: str
+    debaters: list[dict]
+    by_id: dict[int, dict]
+    search_names: list[str]
+
+    @classmethod
+    def load(cls, path: Path) -> "StatsSnapshot":
+        """Load the stats file; the version is derived from its metadata."""
+        stat = path.stat()
+        with open(path, "r", encoding="utf-8") as f:
+            debaters = json.load(f)
+        debaters.sort(key=lambda d: (d["name"], d["id"]))
+        return cls(
+            version=file_version(stat),
+            debaters=debaters,
+            by_id={d["id"]: d for d in debaters},
+            search_names=[normalize_text(d["name"]) for d in debaters],
+        )
+
+
+def file_version(stat: os.stat_result) -> str:
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+class ResponseCache:
+    """Least recently used cache of encoded responses."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def error_response(status: HTTPStatus, message: str) -> Response:
+    body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+    return Response(status, body, {"Content-Type": "application/json; charset=utf-8"})
+
+
+def _page_params(query: dict[str, list[str]]) -> tuple[int, int]:
+    try:
+        page = int(query.get("page", ["1"])[0])
+        per_page = int(query.get("per_page", [str(PAGE_SIZE)])[0])
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "page and per_page must be integers")
+    if page < 1 or not 1 <= per_page <= MAX_PAGE_SIZE:
+        raise ApiError(
+            HTTPStatus.BAD_REQUEST,
+            f"page must be >= 1 and per_page between 1 and {MAX_PAGE_SIZE}",
+        )
+    return page, per_page
+
+
+def _paginate(items: list, page: int, per_page: int) -> dict:
+    start = (page - 1) * per_page
+    return {
+        "total": len(items),
+        "page": page,
+        "per_page": per_page,
+        "items": items[start : start + per_page],
+    }
+
+
+class StatsApp:
+    """Request handling on top of the current stats snapshot."""
+
+    def __init__(self, stats_path: Path, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.stats_path = stats_path
+        self.cache = ResponseCache(cache_size)
+        self.snapshot = StatsSnapshot.load(stats_path)
+
+    def reload_if_changed(self) -> bool:
+        """Load the stats file if a new version was published.
+
+        Returns:
+            True if a new snapshot was swapped in
+        """
+        try:
+            version = file_version(self.stats_path.stat())
+        except FileNotFoundError:
+            return False
+        if version == self.snapshot.version:
+            return False
+
+        try:
+            snapshot = StatsSnapshot.load(self.stats_path)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Keeping stats {self.snapshot.version}: {e}")
+            return False
+        # Cached responses are keyed by version, so old entries just age out
+        self.snapshot = snapshot
+        logger.info(f"Loaded stats version {snapshot.version}")
+        return True
+
+    def route(self, snapshot: StatsSnapshot, path: str, query: dict) -> dict:
+        """JSON payload of an API path."""
+        parts = [part for part in path.split("/") if part]
+        if parts == ["api", "version"]:
+            return {"version": snapshot.version, "debaters": len(snapshot.debaters)}
+        if parts[:2] != ["api", "debaters"]:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path: {path}")
+
+        if parts == ["api", "debaters"]:
+            page, per_page = _page_params(query)
+            term = normalize_text(query.get("q", [""])[0].strip())
+            matches = [
+                {"id": d["id"], "name": d["name"], "rating": d.get("rating")}
+                for d, name in zip(snapshot.debaters, snapshot.search_names)
+                if term in name
+            ]
+            return _paginate(matches, page, per_page)
+
+        try:
+            debater = snapshot.by_id.get(int(parts[2]))
+        except ValueError:
+            debater = None
+        if debater is None or len(parts) > 4:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path: {path}")
+
+        if len(parts) == 3:
+            stats = {k: v for k, v in debater.items() if k != "debates"}
+            return {**stats, "debates_count": len(debater["debates"])}
+        if parts[3] == "debates":
+            page, per_page = _page_params(query)
+            return _paginate(debater["debates"], page, per_page)
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown path: {path}")
+
+    def handle(self, method: str, target: str, headers: dict[str, str]) -> Response:
+        """Answer one request.
+
+        Args:
+            method: HTTP method
+            target: Request target (path and query string)
+            headers: Request headers with lowercase names
+
+        Returns:
+            Response to send
+        """
+        if method not in ("GET", "HEAD"):
+            return error_response(
+                HTTPStatus.METHOD_NOT_ALLOWED, "Only GET is supported"
+            )
+
+        snapshot = self.snapshot
+        accepts_gzip = "gzip" in headers.get("accept-encoding", "")
+        key = (snapshot.version, target, accepts_gzip)
+
+        cached = self.cache.get(key)
+        if cached is None:
+            url = urlsplit(target)
+            try:
+                payload = self.route(snapshot, url.path, parse_qs(url.query))
+            except ApiError as e:
+                return error_response(e.status, str(e))
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            digest = hashlib.sha1(body).hexdigest()[:20]
+            encoding = None
+            if accepts_gzip and len(body) >= GZIP_MIN_BYTES:
+                body = gzip.compress(body, compresslevel=6)
+                encoding = "gzip"
+            # Each encoding is a different representation with its own tag
+            etag = f'"{digest}-gz"' if encoding else f'"{digest}"'
+            cached = (etag, body, encoding)
+            self.cache.put(key, cached)
+
+        etag, body, encoding = cached
+        response_headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+            "X-Stats-Version": snapshot.version,
+        }
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+        if headers.get("if-none-match") == etag:
+            return Response(HTTPStatus.NOT_MODIFIED, b"", response_headers)
+        return Response(HTTPStatus.OK, body, response_headers)
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """Read a request line and headers; None when the client went away."""
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, version = request_line.decode("latin-1").split()
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise ApiError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+    return method, target, version, headers
+
+
+def encode_response(response: Response, keep_alive: bool, head: bool) -> bytes:
+    status = response.status
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+    headers = {
+        **response.headers,
+        "Content-Length": str(len(response.body)),
+        "Access-Control-Allow-Origin": "*",
+        "Connection": "keep-alive" if keep_alive else "close",
+    }
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    head_bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head_bytes if head else head_bytes + response.body
+
+
+async def handle_connection(
+    app: StatsApp, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Serve the requests of one keep-alive connection."""
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(
+                    read_request(reader), KEEP_ALIVE_TIMEOUT
+                )
+            except ApiError as e:
+                writer.write(
+                    encode_response(error_response(e.status, str(e)), False, False)
+                )
+                break
+            if request is None:
+                break
+
+            method, target, version, headers = request
+            keep_alive = (
+                headers.get("connection", "").lower() != "close"
+                and version == "HTTP/1.1"
+            )
+            response = app.handle(method, target, headers)
+            writer.write(encode_response(response, keep_alive, method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def watch_stats(app: StatsApp, interval: float) -> None:
+    """Reload the stats whenever the pipeline publishes a new version."""
+    while True:
+        await asyncio.sleep(interval)
+        # Parsing a large stats file would block the event loop
+        await asyncio.to_thread(app.reload_if_changed)
+
+
+async def serve(
+    app: StatsApp,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    reload_interval: float = DEFAULT_RELOAD_INTERVAL,
+) -> None:
+    """Run the server until cancelled."""
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(app, reader, writer), host, port
+    )
+    watcher = asyncio.create_task(watch_stats(app, reload_interval))
+    address = server.sockets[0].getsockname()
+    logger.info(
+        f"Serving stats {app.snapshot.version} on http://{address[0]}:{address[1]}"
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        watcher.cancel()
+
+
+def cmd_serve(args):
+    """Command to serve the debater statistics over HTTP."""
+    stats_path = Path(args.stats)
+    app = StatsApp(stats_path, cache_size=args.cache_size)
+    print(f"Loaded stats of {len(app.snapshot.debaters)} debaters from: {stats_path}")
+    print(f"Listening on http://{args.host}:{args.port}/api/debaters")
+    try:
+        asyncio.run(serve(app, args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Local HTTP API for the debater statistics",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # serve command
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve the debater statistics over HTTP"
+    )
+    serve_parser.add_argument(
+        "-s",
+        "--stats",
+        type=str,
+        default=str(PATH_TO_STATS_OUTPUT),
+        help=f"Debater stats JSON path (default: {PATH_TO_STATS_OUTPUT})",
+    )
+    serve_parser.add_argument(
+        "--host",
+        type=str,
+        default=DEFAULT_HOST,
+        help=f"Interface to listen on (default: {DEFAULT_HOST})",
+    )
+    serve_parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})",
+    )
+    serve_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Number of cached responses (default: {DEFAULT_CACHE_SIZE})",
+    )
+    serve_parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=DEFAULT_RELOAD_INTERVAL,
+        help="Seconds between checks for new stats "
+        f"(default: {DEFAULT_RELOAD_INTERVAL})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        cmd_serve(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,513 @@
+"""Benchmarks for the preprocessing pipeline on synthetic debate data.
+
+Times the hot functions of data.preprocessing at several dataset sizes and
+writes one JSON record per benchmark to bench_output.txt, so runs can be
+compared against each other with --compare. The startup time of the
+preprocessing CLIs (`--help`, measured with `python -X importtime`) is
+recorded alongside as `startup:<module>` with n_debates 0.
+
+Example usage:
+    python -m benchmarks.bench_preprocessing --sizes 10000 100000
+    python -m benchmarks.bench_preprocessing --compare old_bench_output.txt
+"""
+
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+
+from benchmarks.synthetic_data import synthetic_debate_csv
+from data.preprocessing.categorize_motions import (
+    PATH_TO_CATEGORIES_FILE,
+    categorize_motion,
+    categorize_motions,
+    compile_category_index,
+    load_categories,
+    normalize_text,
+)
+from data.preprocessing.debate_store import (
+    DebateStore,
+    load_debate_store,
+    parse_teams_string,
+)
+from data.preprocessing.estimate_gender import (
+    PATH_TO_FEMALE_NAMES,
+    PATH_TO_MALE_NAMES,
+    extract_debater_names,
+    extract_debaters,
+    guess_gender,
+    load_name_lists,
+)
+from data.preprocessing.motion_similarity import build_motion_index
+from data.preprocessing.ratings import update_ratings
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PATH_TO_BENCH_OUTPUT = PROJECT_ROOT / "bench_output.txt"
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+
+# Every preprocessing module with a CLI
+STARTUP_MODULES = [
+    "data.preprocessing.categorize_motions",
+    "data.preprocessing.debate_index",
+    "data.preprocessing.debater_stats",
+    "data.preprocessing.estimate_gender",
+    "data.preprocessing.judge_stats",
+    "data.preprocessing.motion_similarity",
+    "data.preprocessing.name_lists",
+    "data.preprocessing.ratings",
+    "data.preprocessing.search_index",
+    "data.preprocessing.speaker_points_model",
+    "data.preprocessing.stats_rollups",
+    "data.preprocessing.validation",
+    "data.preprocessing.warehouse",
+]
+# Import time a CLI may spend before argparse runs
+STARTUP_TARGET_SECONDS = 0.1
+
+
+@dataclass
+class BenchmarkCase:
+    """A prepared benchmark: `run` performs `n_ops` operations."""
+
+    n_ops: int
+    run: Callable[[], object]
+
+
+class BenchmarkInputs:
+    """Lazily loaded inputs shared by the benchmarks of one dataset size."""
+
+    def __init__(self, csv_path: Path):
+        self.csv_path = csv_path
+
+    @cached_property
+    def rows(self) -> list[dict]:
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+
+    @cached_property
+    def teams_strings(self) -> list[str]:
+        return [row["teams"] for row in self.rows if row["teams"]]
+
+    @cached_property
+    def motion_texts(self) -> list[str]:
+        return [row["motion"].strip() for row in self.rows if row["motion"].strip()]
+
+    @cached_property
+    def distinct_motions(self) -> list[str]:
+        return sorted(set(self.motion_texts))
+
+    @cached_property
+    def debater_names(self) -> list[str]:
+        return sorted(extract_debater_names(self.csv_path))
+
+    @cached_property
+    def store(self) -> DebateStore:
+        return load_debate_store(self.csv_path)
+
+    @cached_property
+    def categories(self):
+        return load_categories(PATH_TO_CATEGORIES_FILE)
+
+    @cached_property
+    def name_lists(self) -> tuple[set[str], set[str]]:
+        return load_name_lists(PATH_TO_MALE_NAMES, PATH_TO_FEMALE_NAMES)
+
+
+def bench_parse_teams_string(inputs: BenchmarkInputs) -> BenchmarkCase:
+    teams_strings = inputs.teams_strings
+    return BenchmarkCase(
+        len(teams_strings), lambda: [parse_teams_string(s) for s in teams_strings]
+    )
+
+
+def bench_extract_debater_names(inputs: BenchmarkInputs) -> BenchmarkCase:
+    return BenchmarkCase(
+        len(inputs.rows), lambda: extract_debater_names(inputs.csv_path)
+    )
+
+
+def bench_extract_debaters(inputs: BenchmarkInputs) -> BenchmarkCase:
+    return BenchmarkCase(len(inputs.rows), lambda: extract_debaters(inputs.csv_path))
+
+
+def bench_guess_gender(inputs: BenchmarkInputs) -> BenchmarkCase:
+    names = inputs.debater_names
+    male_names, female_names = inputs.name_lists
+    return BenchmarkCase(
+        len(names),
+        lambda: [guess_gender(name, male_names, female_names) for name in names],
+    )
+
+
+def bench_normalize_text(inputs: BenchmarkInputs) -> BenchmarkCase:
+    motions = inputs.motion_texts
+    return BenchmarkCase(len(motions), lambda: [normalize_text(m) for m in motions])
+
+
+def bench_categorize_motion(inputs: BenchmarkInputs) -> BenchmarkCase:
+    motions = inputs.distinct_motions
+    categories = inputs.categories
+    return BenchmarkCase(
+        len(motions), lambda: [categorize_motion(m, categories) for m in motions]
+    )
+
+
+def bench_categorize_motions(inputs: BenchmarkInputs) -> BenchmarkCase:
+    motions = inputs.distinct_motions
+    categories = inputs.categories
+    return BenchmarkCase(len(motions), lambda: categorize_motions(motions, categories))
+
+
+def bench_categorize_motion_weighted(inputs: BenchmarkInputs) -> BenchmarkCase:
+    motions = inputs.distinct_motions
+    index = compile_category_index(inputs.categories, set(motions))
+    return BenchmarkCase(
+        len(motions), lambda: [categorize_motion(m, index) for m in motions]
+    )
+
+
+def bench_build_motion_index(inputs: BenchmarkInputs) -> BenchmarkCase:
+    motions = inputs.distinct_motions
+    return BenchmarkCase(len(motions), lambda: build_motion_index(motions))
+
+
+def bench_update_ratings(inputs: BenchmarkInputs) -> BenchmarkCase:
+    store = inputs.store
+    return BenchmarkCase(len(store.debates), lambda: update_ratings(store))
+
+
+BENCHMARKS: dict[str, Callable[[BenchmarkInputs], BenchmarkCase]] = {
+    "parse_teams_string": bench_parse_teams_string,
+    "extract_debater_names": bench_extract_debater_names,
+    "extract_debaters": bench_extract_debaters,
+    "guess_gender": bench_guess_gender,
+    "normalize_text": bench_normalize_text,
+    "categorize_motion": bench_categorize_motion,
+    "categorize_motions": bench_categorize_motions,
+    "categorize_motion_weighted": bench_categorize_motion_weighted,
+    "build_motion_index": bench_build_motion_index,
+    "update_ratings": bench_update_ratings,
+}
+
+
+def measure(case: BenchmarkCase, repeat: int = 1, memory: bool = True) -> dict:
+    """Time a benchmark case and optionally measure its peak memory.
+
+    An untimed warm-up run comes first, so one-off costs such as the lazy
+    pandas and NumPy imports or functools caches are not charged to
+    whichever case happens to run first. The timing runs without tracemalloc
+    (best of `repeat`); peak memory is measured in a separate run, since
+    tracing slows allocation down.
+
+    Args:
+        case: Prepared benchmark case
+        repeat: Number of timed runs
+        memory: Whether to measure peak traced memory
+
+    Returns:
+        Dict with seconds, ops_per_second and peak_memory_mb
+    """
+    case.run()
+
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        case.run()
+        timings.append(time.perf_counter() - start)
+    seconds = min(timings)
+
+    peak_memory_mb = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        case.run()
+        peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    return {
+        "n_ops": case.n_ops,
+        "seconds": round(seconds, 6),
+        "ops_per_second": round(case.n_ops / seconds, 1) if seconds else None,
+        "peak_memory_mb": (
+            round(peak_memory_mb, 3) if peak_memory_mb is not None else None
+        ),
+    }
+
+
+def parse_importtime(output: str) -> dict[str, int]:
+    """Cumulative import time (microseconds) of each top-level import.
+
+    Only imports made after interpreter startup (the `site` import) are
+    included, i.e. those caused by the command itself.
+
+    Args:
+        output: stderr of `python -X importtime ...`
+
+    Returns:
+        Module name -> cumulative microseconds, in import order
+    """
+    imports = {}
+    after_site = False
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented below the module importing them
+        if name.startswith("  "):
+            continue
+        if after_site and cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative)
+        after_site = after_site or name.strip() == "site"
+    return imports
+
+
+def measure_startup(module: str, repeat: int = 1) -> dict:
+    """Import time of `python -m <module> --help` (best of `repeat`).
+
+    Args:
+        module: CLI module name
+        repeat: Number of runs
+
+    Returns:
+        Dict with seconds (import time), wall_seconds and slowest_import
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", module, "--help"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        wall_seconds = time.perf_counter() - start
+        imports = parse_importtime(completed.stderr)
+        seconds = sum(imports.values()) / 1e6
+        if best is None or seconds < best["seconds"]:
+            best = {
+                "n_ops": 1,
+                "seconds": round(seconds, 6),
+                "wall_seconds": round(wall_seconds, 6),
+                "slowest_import": max(imports, key=imports.get, default=None),
+            }
+    return best
+
+
+def run_startup_benchmarks(modules: list[str], repeat: int = 1) -> list[dict]:
+    """Measure the startup time of each CLI module.
+
+    Args:
+        modules: CLI module names
+        repeat: Number of runs per module
+
+    Returns:
+        One result record per module, named `startup:<module>`
+    """
+    results = []
+    for module in modules:
+        name = f"startup:{module.rsplit('.', 1)[-1]}"
+        result = {"type": "result", "benchmark": name, "n_debates": 0}
+        result.update(measure_startup(module, repeat=repeat))
+        results.append(result)
+        over_target = result["seconds"] > STARTUP_TARGET_SECONDS
+        print(
+            f"  {name:<28} {result['seconds'] * 1000:>9.1f} ms imports"
+            f"  {result['wall_seconds'] * 1000:>9.1f} ms total"
+            + (f"  over {STARTUP_TARGET_SECONDS * 1000:.0f} ms" if over_target else "")
+        )
+    return results
+
+
+def run_metadata() -> dict:
+    """Describe the environment a benchmark run was made in."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "type": "run",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def run_benchmarks(
+    sizes: list[int],
+    names: list[str] | None = None,
+    repeat: int = 1,
+    memory: bool = True,
+    seed: int = 0,
+) -> list[dict]:
+    """Run the selected benchmarks at every dataset size.
+
+    Args:
+        sizes: Numbers of synthetic debates
+        names: Benchmark names (default: all)
+        repeat: Number of timed runs per benchmark
+        memory: Whether to measure peak memory
+        seed: Seed of the synthetic data
+
+    Returns:
+        One result record per (benchmark, size)
+    """
+    results = []
+    for n_debates in sizes:
+        inputs = BenchmarkInputs(synthetic_debate_csv(n_debates, seed))
+        for name in names or BENCHMARKS:
+            case = BENCHMARKS[name](inputs)
+            result = {"type": "result", "benchmark": name, "n_debates": n_debates}
+            result.update(measure(case, repeat=repeat, memory=memory))
+            results.append(result)
+            print(
+                f"  {name:<28} {n_debates:>9} debates  {result['seconds']:>10.4f} s"
+                f"  {result['ops_per_second'] or 0:>12.0f} ops/s"
+                + (
+                    f"  {result['peak_memory_mb']:>9.1f} MB"
+                    if result["peak_memory_mb"] is not None
+                    else ""
+                )
+            )
+    return results
+
+
+def save_results(results: list[dict], output_path: Path) -> None:
+    """Write run metadata and results as JSON lines."""
+    with open(output_path, "w", encoding="utf-8") as f:
+        for record in [run_metadata(), *results]:
+            f.write(json.dumps(record) + "\n")
+
+
+def load_results(input_path: Path) -> list[dict]:
+    """Load the result records of a previous run."""
+    with open(input_path, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records if r.get("type") == "result"]
+
+
+def compare_results(
+    baseline: list[dict],
+    current: list[dict],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> list[dict]:
+    """Compare two runs and return the regressions.
+
+    Args:
+        baseline: Results of the reference run
+        current: Results of the new run
+        threshold: Slowdown ratio above which a result counts as a regression
+
+    Returns:
+        Comparison records (benchmark, n_debates, ratio) of the regressions
+    """
+    baseline_by_key = {(r["benchmark"], r["n_debates"]): r for r in baseline}
+
+    regressions = []
+    for result in current:
+        key = (result["benchmark"], result["n_debates"])
+        if key not in baseline_by_key or not baseline_by_key[key]["seconds"]:
+            continue
+        ratio = result["seconds"] / baseline_by_key[key]["seconds"]
+        print(f"  {key[0]:<28} {key[1]:>9} debates  {ratio:>6.2f}x baseline time")
+        if ratio > threshold:
+            regressions.append(
+                {"benchmark": key[0], "n_debates": key[1], "ratio": round(ratio, 3)}
+            )
+    return regressions
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the preprocessing pipeline on synthetic data"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help=f"Numbers of synthetic debates (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "-b",
+        "--benchmarks",
+        nargs="+",
+        choices=list(BENCHMARKS),
+        default=None,
+        help="Benchmarks to run (default: all)",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=1, help="Timed runs per benchmark"
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the peak memory run"
+    )
+    parser.add_argument(
+        "--no-startup", action="store_true", help="Skip the CLI startup benchmarks"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=str(PATH_TO_BENCH_OUTPUT),
+        help=f"Output file path (default: {PATH_TO_BENCH_OUTPUT})",
+    )
+    parser.add_argument(
+        "--compare",
+        default=None,
+        help="Previous output file to compare against; exits non-zero on regressions",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Slowdown ratio counted as a regression "
+        f"(default: {DEFAULT_REGRESSION_THRESHOLD})",
+    )
+    args = parser.parse_args()
+
+    print("Running benchmarks...")
+    results = run_benchmarks(
+        args.sizes, args.benchmarks, repeat=args.repeat, memory=not args.no_memory
+    )
+    if not args.no_startup:
+        results += run_startup_benchmarks(STARTUP_MODULES, repeat=max(args.repeat, 3))
+
+    output_path = Path(args.output)
+    save_results(results, output_path)
+    print(f"Results saved to: {output_path}")
+
+    if args.compare:
+        print(f"\nComparison with: {args.compare}")
+        regressions = compare_results(
+            load_results(Path(args.compare)), results, args.threshold
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold}x")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""Synthetic debate_data.csv generator for benchmarks.
+
+Produces files in the format written by the `greybox` spider feed, built from
+the real first-name lists and category keywords, so that the preprocessing
+pipeline sees realistic name, motion and nesting distributions at any size.
+"""
+
+import argparse
+import csv
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+PATH_TO_MALE_NAMES = PROJECT_ROOT / "data" / "resources" / "male_names.txt"
+PATH_TO_FEMALE_NAMES = PROJECT_ROOT / "data" / "resources" / "female_names.txt"
+PATH_TO_CATEGORIES_FILE = PROJECT_ROOT / "data" / "resources" / "category_keywords.json"
+PATH_TO_SYNTHETIC_DATA = PROJECT_ROOT / "benchmarks" / "data"
+
+CSV_COLUMNS = [
+    "type",
+    "id",
+    "date",
+    "comp",
+    "comp_id",
+    "league_name",
+    "league_id",
+    "motion",
+    "tournament_name",
+    "tournament_id",
+    "judges_scoring",
+    "score",
+    "teams",
+]
+
+SURNAME_STEMS = [
+    "Novák", "Dvořák", "Svoboda", "Černý", "Procház", "Kučer", "Veselý", "Horák",
+    "Němec", "Pokorn", "Marek", "Pospíšil", "Hájek", "Jelínek", "Růžičk", "Beneš",
+    "Fiala", "Sedláček", "Doležal", "Zeman", "Kolář", "Navrátil", "Čermák", "Urban",
+    "Vaněk", "Blažek", "Kříž", "Kovář", "Bartoš", "Vlček", "Polák", "Musil",
+]  # fmt: skip
+SURNAME_SUFFIXES = ["", "ek", "ík", "a", "ský", "ec", "ka", "an"]
+NICKNAMES = ["Speedy", "Doktor", "Šéf", "Kapitán"]
+COMPETITIONS = [
+    ("Debatní pohár XXIX.", 12),
+    ("Debate Cup XXIX.", 13),
+    ("Debaty pro radost", 14),
+]
+MOTION_TEMPLATES = [
+    "Vláda by měla {0} a {1}",
+    "Tento dům by zakázal {0}",
+    "We should prioritise {0} over {1}",
+    "Stát by měl podporovat {0}, {1} a {2}",
+    "This house regrets {0}",
+    "Školy by měly učit {0}",
+]
+FILLER_WORDS = ["všechny", "občany", "společnost", "people", "the", "new", "veřejné"]
+
+SPEAKERS_PER_TEAM = 3
+DEBATES_PER_DEBATER = 20
+DEBATES_PER_MOTION = 7
+HISTORY_DAYS = 10 * 365
+
+
+def feminine_surname(surname: str) -> str:
+    """Turn a male Czech surname into its female form (Novák -> Nováková)."""
+    if surname.endswith("ý"):
+        return surname[:-1] + "á"
+    if surname.endswith("a"):
+        return surname[:-1] + "ová"
+    if surname.endswith("ek"):
+        return surname[:-2] + "ková"
+    return surname + "ová"
+
+
+def _load_lines(path: Path) -> list[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def make_debaters(n_debaters: int, rng: random.Random) -> list[tuple[int, str]]:
+    """Create (speaker_id, "Surname Firstname") pairs from the real name lists."""
+    male_names = _load_lines(PATH_TO_MALE_NAMES)
+    female_names = _load_lines(PATH_TO_FEMALE_NAMES)
+
+    debaters = []
+    for speaker_id in range(1, n_debaters + 1):
+        surname = rng.choice(SURNAME_STEMS) + rng.choice(SURNAME_SUFFIXES)
+        if rng.random() < 0.5:
+            first_name = rng.choice(female_names)
+            surname = feminine_surname(surname)
+        else:
+            first_name = rng.choice(male_names)
+        name = f"{surname} {first_name}"
+        if rng.random() < 0.01:
+            name = f'{surname} "{rng.choice(NICKNAMES)}" {first_name}'
+        debaters.append((speaker_id, name))
+    return debaters
+
+
+def make_motions(n_motions: int, rng: random.Random) -> list[str]:
+    """Create motions mixing category keywords with filler words."""
+    with open(PATH_TO_CATEGORIES_FILE, "r", encoding="utf-8") as f:
+        keywords = [kw for kws in json.load(f).values() for kw in kws]
+
+    motions = []
+    for _ in range(n_motions):
+        template = rng.choice(MOTION_TEMPLATES)
+        words = [f"{rng.choice(FILLER_WORDS)} {rng.choice(keywords)}" for _ in range(3)]
+        motions.append(template.format(*words))
+    return motions
+
+
+def generate_debate_rows(n_debates: int, seed: int = 0):
+    """Yield synthetic debate rows as dicts with CSV-ready string fields.
+
+    Args:
+        n_debates: Number of debates to generate
+        seed: Random seed, so the same size always yields the same file
+
+    Yields:
+        Row dicts keyed by CSV_COLUMNS
+    """
+    rng = random.Random(seed)
+    n_debaters = max(12, n_debates * 2 * SPEAKERS_PER_TEAM // DEBATES_PER_DEBATER)
+    debaters = make_debaters(n_debaters, rng)
+    motions = make_motions(max(10, n_debates // DEBATES_PER_MOTION), rng)
+    n_teams = max(2, n_debaters // SPEAKERS_PER_TEAM)
+
+    for i in range(n_debates):
+        debate_id = 10000 + i
+        comp, comp_id = COMPETITIONS[i % len(COMPETITIONS)]
+        tournament_id = 300 + i // 40
+        debate_date = date(2015, 1, 1) + timedelta(days=i * HISTORY_DAYS // n_debates)
+
+        teams = []
+        for side in ("aff", "neg"):
+            team_id = rng.randrange(n_teams) + 1
+            speakers = []
+            for position in range(SPEAKERS_PER_TEAM):
+                speaker_id, name = debaters[
+                    (team_id * SPEAKERS_PER_TEAM + position) % n_debaters
+                ]
+                points = rng.randint(55, 90) if rng.random() > 0.02 else None
+                speakers.append(
+                    {"name": name, "speaker_id": speaker_id, "points": points}
+                )
+            teams.append(
+                {
+                    "team_name": f"Tým {team_id}",
+                    "team_id": team_id,
+                    "side": side,
+                    "speakers": speakers,
+                }
+            )
+
+        winner = rng.choice(("aff", "neg"))
+        split = rng.choice(("3:0", "3:0", "2:1"))
+        judges = [
+            {"name": name, "judge_id": judge_id, "side": winner, "score": split}
+            for judge_id, name in rng.sample(debaters, rng.choice((1, 1, 1, 3)))
+        ]
+
+        yield {
+            "type": "debate",
+            "id": debate_id,
+            "date": f"{debate_date.isoformat()} 09:30:00 ",
+            "comp": comp,
+            "comp_id": comp_id,
+            "league_name": "Debatní liga",
+            "league_id": 44,
+            "motion": rng.choice(motions) if rng.random() > 0.005 else "",
+            "tournament_name": f"Turnaj {tournament_id}",
+            "tournament_id": tournament_id,
+            # The spider feed writes nested values with str(), i.e. Python repr
+            "judges_scoring": str(judges),
+            "score": f"vyhráli {split}",
+            "teams": str(teams),
+        }
+
+
+def write_debate_csv(output_path: Path, n_debates: int, seed: int = 0) -> Path:
+    """Write a synthetic debate CSV.
+
+    Args:
+        output_path: Path to output CSV file
+        n_debates: Number of debates to generate
+        seed: Random seed
+
+    Returns:
+        The output path
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        writer.writerows(generate_debate_rows(n_debates, seed))
+    return output_path
+
+
+def synthetic_debate_csv(n_debates: int, seed: int = 0) -> Path:
+    """Return a cached synthetic debate CSV, generating it on first use."""
+    path = PATH_TO_SYNTHETIC_DATA / f"debate_data_{n_debates}_{seed}.csv"
+    if not path.exists():
+        tmp_path = path.with_suffix(".tmp")
+        write_debate_csv(tmp_path, n_debates, seed)
+        tmp_path.replace(path)
+    return path
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Generate synthetic debate data")
+    parser.add_argument("n_debates", type=int, help="Number of debates")
+    parser.add_argument("-o", "--output", required=True, help="Output CSV path")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    write_debate_csv(Path(args.output), args.n_debates, args.seed)
+    print(f"Wrote {args.n_debates} debates to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,29 @@
+from __future__ import annotations
+
 import argparse
 import json
+import math
 import string
 import unicodedata
-from dataclasses import dataclass
+from collections.abc import Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 
-import pandas as pd
-
+from data.preprocessing.lazy_imports import lazy_import
+from data.preprocessing.parallel_csv import map_chunks, read_csv_range
+from data.preprocessing.results_cache import (
+    PATH_TO_RESULTS_CACHE,
+    ResultsCache,
+    cache_key,
+    cached_map,
+    hash_file,
+)
+from data.preprocessing.table_output import DEFAULT_CHUNK_ROWS, write_table
 from logger.logger import log_function_call, logger, setup_logging
 
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
 PATH_TO_CATEGORIES_FILE = PROJECT_ROOT / "data" / "resources" / "category_keywords.json"
@@ -16,9 +31,21 @@ PATH_TO_MOTIONS_LIST = PROJECT_ROOT / "data" / "processed" / "motions.txt"
 PATH_TO_CATEGORIZATION_OUTPUT = (
     PROJECT_ROOT / "data" / "processed" / "motion_categories.csv"
 )
+PATH_TO_MOTION_CLUSTERS = PROJECT_ROOT / "data" / "processed" / "motion_clusters.csv"
+PATH_TO_CATEGORY_INDEX = PROJECT_ROOT / "data" / "processed" / "category_index.json"
 
+# Bump whenever a change to the scoring changes categorization results
+ALGORITHM_VERSION = 2
+TOP_CATEGORIES = 3
 
-@dataclass
+CATEGORIZATION_COLUMNS = ["motion"] + [
+    column
+    for rank in range(1, TOP_CATEGORIES + 1)
+    for column in (f"category_{rank}", f"category_{rank}_score")
+]
+
+
+@dataclass(slots=True, frozen=True)
 class Motion:
     """Represents a debate motion."""
 
@@ -26,7 +53,7 @@ class Motion:
     normalized_words: list[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Category:
     """Represents a debate topic category with keywords."""
 
@@ -34,15 +61,15 @@ class Category:
     keywords: set[str]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CategoryScore:
     """Score for a category-motion match."""
 
     category: Category
-    score: int
+    score: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MotionCategorization:
     """Final categorization result for a motion."""
 
@@ -111,23 +138,32 @@ def load_categories(categories_path: Path) -> list[Category]:
     return categories
 
 
-def extract_motions(csv_path: Path) -> set[str]:
+def motion_set(motions: pd.Series) -> set[str]:
+    """Unique stripped, non-empty motion texts."""
+    return {motion.strip() for motion in motions if pd.notna(motion) and motion.strip()}
+
+
+def _chunk_motions(csv_path: Path, start: int, end: int) -> set[str]:
+    return motion_set(read_csv_range(csv_path, start, end)["motion"])
+
+
+def extract_motions(csv_path: Path, workers: int = 1) -> set[str]:
     """Extract unique motions from debate CSV file.
 
     Args:
         csv_path: Path to the input CSV file
+        workers: Number of processes reading chunks of the CSV; the result
+            is the same for any number
 
     Returns:
         Set of unique motion texts
     """
     logger.info(f"Extracting motions from: {csv_path}")
 
-    df = pd.read_csv(csv_path, encoding="utf-8")
-
-    motions = set()
-    for motion in df["motion"]:
-        if pd.notna(motion) and motion.strip():
-            motions.add(motion.strip())
+    if workers <= 1:
+        motions = motion_set(pd.read_csv(csv_path, encoding="utf-8")["motion"])
+    else:
+        motions = set().union(*map_chunks(_chunk_motions, csv_path, workers))
 
     logger.info(f"Extracted {len(motions)} unique motions")
     return motions
@@ -177,89 +213,577 @@ def calculate_category_score(motion: Motion, category: Category) -> CategoryScor
     Returns:
         CategoryScore object with match count
     """
-    score = 0
-    motion_words_set = set(motion.normalized_words)
-    matching_keywords = []
+    score = len(category.keywords.intersection(motion.normalized_words))
+    return CategoryScore(category=category, score=score)
 
-    for keyword in category.keywords:
-        if keyword in motion_words_set:
-            matching_keywords.append(keyword)
-            score += 1
 
-    return CategoryScore(category=category, score=score)
+@dataclass
+class CategoryIndex:
+    """Categories compiled for weighted scoring.
+
+    Every keyword gets an integer id; `keyword_categories[i]` are the ids of
+    the categories containing keyword `i` and `weights[i]` its IDF weight.
+    A category is only assigned when its score reaches
+    `thresholds[category_id]`. `sources` are the hashes of the categories
+    file and motion corpus the index was compiled from (see index_sources).
+    """
+
+    categories: list[Category]
+    keyword_ids: dict[str, int]
+    keyword_categories: list[list[int]]
+    weights: list[float]
+    thresholds: list[float]
+    sources: dict[str, str] = field(default_factory=dict)
+
+    def score(self, motion: Motion) -> list[CategoryScore]:
+        """Weighted scores of the categories a motion reaches the threshold of.
+
+        Args:
+            motion: Motion object with normalized words
+
+        Returns:
+            CategoryScore objects, best first
+        """
+        return [
+            CategoryScore(category=self.categories[category_id], score=score)
+            for category_id, score in self.rank(motion)
+        ]
+
+    def rank(self, motion: Motion) -> list[tuple[int, float]]:
+        """Like score, as (category_id, score) pairs.
+
+        Ties go to the category with more matching keywords, then by name.
+        """
+        totals = [0.0] * len(self.categories)
+        matches = [0] * len(self.categories)
+        for word in set(motion.normalized_words):
+            keyword_id = self.keyword_ids.get(word)
+            if keyword_id is None:
+                continue
+            weight = self.weights[keyword_id]
+            for category_id in self.keyword_categories[keyword_id]:
+                totals[category_id] += weight
+                matches[category_id] += 1
+
+        ranked = sorted(
+            (
+                category_id
+                for category_id, total in enumerate(totals)
+                if total > 0 and total >= self.thresholds[category_id]
+            ),
+            key=lambda i: (-totals[i], -matches[i], self.categories[i].name),
+        )
+        return [(i, round(totals[i], 4)) for i in ranked]
+
+
+def compile_category_index(
+    categories: list[Category],
+    motions: set[str] | None = None,
+    thresholds: dict[str, float] | None = None,
+) -> CategoryIndex:
+    """Compile categories into a CategoryIndex.
+
+    Keyword weights are the smoothed IDF log((1 + N) / (1 + df)) + 1 over the
+    motion corpus, so keywords that appear in many motions count for less.
+
+    Args:
+        categories: Categories to compile
+        motions: Motion corpus to compute IDF weights on (default: all
+            weights are 1)
+        thresholds: Minimum score per category name (default: 0)
+
+    Returns:
+        Compiled CategoryIndex
+    """
+    thresholds = thresholds or {}
+
+    keyword_ids: dict[str, int] = {}
+    keyword_categories: list[list[int]] = []
+    for category_id, category in enumerate(categories):
+        for keyword in sorted(category.keywords):
+            keyword_id = keyword_ids.setdefault(keyword, len(keyword_ids))
+            if keyword_id == len(keyword_categories):
+                keyword_categories.append([])
+            keyword_categories[keyword_id].append(category_id)
+
+    weights = [1.0] * len(keyword_ids)
+    if motions:
+        document_frequency = [0] * len(keyword_ids)
+        for motion_text in motions:
+            for word in set(normalize_motion(motion_text).normalized_words):
+                keyword_id = keyword_ids.get(word)
+                if keyword_id is not None:
+                    document_frequency[keyword_id] += 1
+        weights = [
+            math.log((1 + len(motions)) / (1 + df)) + 1.0 for df in document_frequency
+        ]
+
+    return CategoryIndex(
+        categories=categories,
+        keyword_ids=keyword_ids,
+        keyword_categories=keyword_categories,
+        weights=weights,
+        thresholds=[float(thresholds.get(c.name, 0.0)) for c in categories],
+    )
+
+
+def index_sources(categories_path: Path, motions_path: Path) -> dict[str, str]:
+    """Hashes of the files a category index is compiled from.
+
+    Args:
+        categories_path: Path to the category keywords JSON file
+        motions_path: Path to the motions text file
+
+    Returns:
+        Dict with the "categories" and "motions" file hashes
+    """
+    return {
+        "categories": hash_file(categories_path),
+        "motions": hash_file(motions_path),
+    }
+
+
+def save_category_index(index: CategoryIndex, output_path: Path) -> None:
+    """Save a compiled category index to JSON.
+
+    Args:
+        index: Compiled category index
+        output_path: Path to output JSON file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    keywords = sorted(index.keyword_ids, key=index.keyword_ids.get)
+    data = {
+        "categories": [
+            {"name": category.name, "threshold": threshold}
+            for category, threshold in zip(index.categories, index.thresholds)
+        ],
+        "keywords": [
+            {
+                "keyword": keyword,
+                "weight": round(index.weights[keyword_id], 6),
+                "categories": index.keyword_categories[keyword_id],
+            }
+            for keyword_id, keyword in enumerate(keywords)
+        ],
+        "sources": index.sources,
+    }
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"Saved category index to: {output_path}")
+
+
+def load_category_index(input_path: Path) -> CategoryIndex:
+    """Load a category index saved by save_category_index.
+
+    Args:
+        input_path: Path to the category index JSON file
+
+    Returns:
+        Compiled CategoryIndex
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    categories = [Category(name=c["name"], keywords=set()) for c in data["categories"]]
+    for entry in data["keywords"]:
+        for category_id in entry["categories"]:
+            categories[category_id].keywords.add(entry["keyword"])
+
+    return CategoryIndex(
+        categories=categories,
+        keyword_ids={e["keyword"]: i for i, e in enumerate(data["keywords"])},
+        keyword_categories=[e["categories"] for e in data["keywords"]],
+        weights=[e["weight"] for e in data["keywords"]],
+        thresholds=[c["threshold"] for c in data["categories"]],
+        sources=data.get("sources", {}),
+    )
+
+
+def load_or_compile_category_index(
+    index_path: Path, categories_path: Path, motions_path: Path
+) -> CategoryIndex:
+    """Load the category index, recompiling it when its sources changed.
+
+    The index is compiled and saved when it does not exist, or when the
+    categories file or motion corpus no longer match the hashes it was
+    compiled from. Thresholds of the stale index are kept for the categories
+    that still exist.
+
+    Args:
+        index_path: Path to the category index JSON file
+        categories_path: Path to the category keywords JSON file
+        motions_path: Path to the motions text file
+
+    Returns:
+        Compiled CategoryIndex matching the current files
+    """
+    sources = index_sources(categories_path, motions_path)
+    thresholds = None
+    if index_path.exists():
+        index = load_category_index(index_path)
+        if index.sources == sources:
+            return index
+        logger.warning(
+            f"Category index {index_path} is out of date with "
+            f"{categories_path} or {motions_path}, recompiling"
+        )
+        thresholds = {
+            category.name: threshold
+            for category, threshold in zip(index.categories, index.thresholds)
+        }
+
+    categories = load_categories(categories_path)
+    names = {category.name for category in categories}
+    if thresholds:
+        thresholds = {name: t for name, t in thresholds.items() if name in names}
+    index = compile_category_index(categories, load_motions(motions_path), thresholds)
+    index.sources = sources
+    save_category_index(index, index_path)
+    return index
+
+
+def rank_categories(
+    motion: Motion, categories: list[Category] | CategoryIndex
+) -> list[tuple[int, float]]:
+    """Rank the categories matching a motion.
+
+    Args:
+        motion: Motion object with normalized words
+        categories: Available categories, or a compiled CategoryIndex for
+            weighted scoring
+
+    Returns:
+        (category index, score) pairs of the matching categories, best first
+    """
+    if isinstance(categories, CategoryIndex):
+        return categories.rank(motion)
+
+    words = set(motion.normalized_words)
+    ranked = []
+    for category_id, category in enumerate(categories):
+        score = len(category.keywords.intersection(words))
+        if score > 0:
+            ranked.append((category_id, score))
+
+    ranked.sort(key=lambda x: x[1], reverse=True)
+    return ranked
+
+
+def _category_list(categories: list[Category] | CategoryIndex) -> list[Category]:
+    if isinstance(categories, CategoryIndex):
+        return categories.categories
+    return categories
+
+
+def _score_dtype(categories: list[Category] | CategoryIndex):
+    return np.float64 if isinstance(categories, CategoryIndex) else np.int64
 
 
 def categorize_motion(
-    motion_text: str, categories: list[Category]
+    motion_text: str, categories: list[Category] | CategoryIndex
 ) -> MotionCategorization:
     """Categorize a single motion using all available categories.
 
     Args:
         motion_text: Original motion text
-        categories: Dictionary of available categories
+        categories: Available categories, or a compiled CategoryIndex for
+            weighted scoring
 
     Returns:
         MotionCategorization with top 3 categories (or fewer if tied/no matches)
     """
     motion = normalize_motion(motion_text)
+    category_list = _category_list(categories)
 
-    scores = []
-    for category in categories:
-        category_score = calculate_category_score(motion, category)
-        if category_score.score > 0:
-            scores.append(category_score)
-
-    scores.sort(key=lambda x: x.score, reverse=True)
-
-    top_1 = scores[0] if len(scores) >= 1 else None
-    top_2 = scores[1] if len(scores) >= 2 else None
-    top_3 = scores[2] if len(scores) >= 3 else None
+    tops = [
+        CategoryScore(category=category_list[category_id], score=score)
+        for category_id, score in rank_categories(motion, categories)[:TOP_CATEGORIES]
+    ]
+    tops += [None] * (TOP_CATEGORIES - len(tops))
 
     return MotionCategorization(
         motion_text=motion_text,
-        top_category_1=top_1,
-        top_category_2=top_2,
-        top_category_3=top_3,
+        top_category_1=tops[0],
+        top_category_2=tops[1],
+        top_category_3=tops[2],
+    )
+
+
+@dataclass(eq=False)
+class CategorizationResults:
+    """Categorization results of many motions, stored as arrays.
+
+    Row `i` belongs to `motion_texts[i]`: `category_ids[i, j]` is the index in
+    `categories` of its (j + 1)-th best category, or -1 if it has fewer
+    matches, and `scores[i, j]` the score of that category (0 if none).
+    """
+
+    motion_texts: list[str]
+    categories: list[Category]
+    category_ids: np.ndarray
+    scores: np.ndarray
+
+    @classmethod
+    def empty(
+        cls, motion_texts: list[str], categories: list[Category], score_dtype="int64"
+    ) -> "CategorizationResults":
+        """Results with no categories assigned yet, to be filled with set_row."""
+        shape = (len(motion_texts), TOP_CATEGORIES)
+        return cls(
+            motion_texts=list(motion_texts),
+            categories=categories,
+            category_ids=np.full(shape, -1, dtype=np.int32),
+            scores=np.zeros(shape, dtype=score_dtype),
+        )
+
+    @classmethod
+    def from_ranked(
+        cls,
+        motion_texts: list[str],
+        categories: list[Category],
+        ranked: list[list[tuple[int, float]]],
+        score_dtype=None,
+    ) -> "CategorizationResults":
+        """Build the arrays from the ranked categories of each motion.
+
+        Scores stay integers unless `score_dtype` says otherwise or some
+        score is a float.
+        """
+        if score_dtype is None:
+            is_weighted = any(isinstance(s, float) for top in ranked for _, s in top)
+            score_dtype = np.float64 if is_weighted else np.int64
+        results = cls.empty(motion_texts, categories, score_dtype)
+        for row, top in enumerate(ranked):
+            results.set_row(row, top)
+        return results
+
+    def set_row(self, row: int, top: list[tuple[int, float]]) -> None:
+        """Assign the best (category index, score) pairs to a motion."""
+        for j, (category_id, score) in enumerate(top[:TOP_CATEGORIES]):
+            self.category_ids[row, j] = category_id
+            self.scores[row, j] = score
+
+    @classmethod
+    def from_categorizations(
+        cls, results: list[MotionCategorization]
+    ) -> "CategorizationResults":
+        """Convert MotionCategorization objects into the array layout."""
+        categories: dict[str, tuple[int, Category]] = {}
+        ranked = []
+        for result in results:
+            top = []
+            for category_score in (
+                result.top_category_1,
+                result.top_category_2,
+                result.top_category_3,
+            ):
+                if category_score is None:
+                    continue
+                category = category_score.category
+                category_id, _ = categories.setdefault(
+                    category.name, (len(categories), category)
+                )
+                top.append((category_id, category_score.score))
+            ranked.append(top)
+
+        return cls.from_ranked(
+            [r.motion_text for r in results],
+            [category for _, category in categories.values()],
+            ranked,
+        )
+
+    def __len__(self) -> int:
+        return len(self.motion_texts)
+
+    def __getitem__(self, row: int) -> MotionCategorization:
+        tops = [
+            (
+                CategoryScore(category=self.categories[category_id], score=score.item())
+                if category_id >= 0
+                else None
+            )
+            for category_id, score in zip(self.category_ids[row], self.scores[row])
+        ]
+        return MotionCategorization(self.motion_texts[row], *tops)
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+    def category_counts(self) -> np.ndarray:
+        """Number of categories assigned to each motion."""
+        return (self.category_ids >= 0).sum(axis=1)
+
+    def ranked(self, row: int) -> list[tuple[int, float]]:
+        """(category index, score) pairs of a motion, best first."""
+        return [
+            (int(category_id), score.item())
+            for category_id, score in zip(self.category_ids[row], self.scores[row])
+            if category_id >= 0
+        ]
+
+
+def categorize_motions(
+    motion_texts: list[str],
+    categories: list[Category] | CategoryIndex,
+    canonical: dict[str, str] | None = None,
+) -> CategorizationResults:
+    """Categorize motions, scoring each canonical motion only once.
+
+    Args:
+        motion_texts: Motion texts to categorize
+        categories: Available categories or a compiled CategoryIndex
+        canonical: Optional motion -> canonical motion mapping; variants
+            get the categories of their canonical motion
+
+    Returns:
+        CategorizationResults with one row per motion text, in input order
+    """
+    canonical = canonical or {}
+    results = CategorizationResults.empty(
+        motion_texts, _category_list(categories), _score_dtype(categories)
+    )
+
+    # Row of the first motion scored for each canonical motion
+    first_rows: dict[str, int] = {}
+    for row, motion_text in enumerate(motion_texts):
+        key = canonical.get(motion_text, motion_text)
+        first_row = first_rows.get(key)
+        if first_row is None:
+            first_rows[key] = row
+            results.set_row(row, rank_categories(normalize_motion(key), categories))
+        else:
+            results.category_ids[row] = results.category_ids[first_row]
+            results.scores[row] = results.scores[first_row]
+
+    return results
+
+
+def categorize_motions_cached(
+    motion_texts: list[str],
+    categories: list[Category] | CategoryIndex,
+    cache: ResultsCache,
+    key: str,
+    canonical: dict[str, str] | None = None,
+) -> tuple[CategorizationResults, int]:
+    """Categorize motions, reusing results cached under the key.
+
+    Args:
+        motion_texts: Motion texts to categorize
+        categories: Available categories or a compiled CategoryIndex
+        cache: Results cache
+        key: Cache key covering every input the results depend on besides
+            the motions
+        canonical: Optional motion -> canonical motion mapping
+
+    Returns:
+        Tuple of (CategorizationResults with one row per motion text, number
+        of motions that were not cached)
+    """
+    category_list = _category_list(categories)
+
+    def compute(missing: list[str]) -> list:
+        results = categorize_motions(missing, categories, canonical)
+        return [
+            [[category_list[i].name, score] for i, score in results.ranked(row)]
+            for row in range(len(results))
+        ]
+
+    encoded, computed = cached_map(cache, key, motion_texts, compute)
+    ids = {category.name: i for i, category in enumerate(category_list)}
+    ranked = [
+        [(ids[name], score) for name, score in encoded[motion_text]]
+        for motion_text in motion_texts
+    ]
+    results = CategorizationResults.from_ranked(
+        motion_texts, category_list, ranked, _score_dtype(categories)
     )
+    return results, computed
+
+
+def load_canonical_motions(input_path: Path) -> dict[str, str]:
+    """Load the motion -> canonical motion mapping saved by motion_similarity.
+
+    Args:
+        input_path: Path to the motion clusters CSV
+
+    Returns:
+        Dictionary mapping motion text -> canonical motion text
+    """
+    df = pd.read_csv(input_path, encoding="utf-8")
+    return dict(zip(df["motion"], df["canonical_motion"]))
+
+
+def categorization_rows(
+    results: CategorizationResults, chunk_rows: int = DEFAULT_CHUNK_ROWS
+) -> Iterator[tuple]:
+    """CSV rows of categorization results, converted one chunk at a time.
+
+    Args:
+        results: Categorization results
+        chunk_rows: Number of rows converted from the arrays at once
+
+    Yields:
+        (motion, category_1, category_1_score, ..., category_3_score)
+    """
+    # The extra trailing name is picked by the -1 of a missing category
+    names = np.array([c.name for c in results.categories] + [""], dtype=object)
+    for start in range(0, len(results), chunk_rows):
+        stop = start + chunk_rows
+        columns = [results.motion_texts[start:stop]]
+        for j in range(TOP_CATEGORIES):
+            columns.append(names[results.category_ids[start:stop, j]].tolist())
+            columns.append(results.scores[start:stop, j].tolist())
+        yield from zip(*columns)
 
 
 def save_categorization_results(
-    results: list[MotionCategorization], output_path: Path
+    results: CategorizationResults | list[MotionCategorization],
+    output_path: Path,
+    parquet: bool = False,
 ) -> None:
     """Save categorization results to CSV.
 
     Args:
-        results: List of MotionCategorization objects
+        results: CategorizationResults, or a list of MotionCategorization
+            objects
         output_path: Path to output CSV file
+        parquet: Also write the results as Parquet next to the CSV
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if not isinstance(results, CategorizationResults):
+        results = CategorizationResults.from_categorizations(results)
+
+    write_table(
+        output_path,
+        CATEGORIZATION_COLUMNS,
+        categorization_rows(results),
+        parquet=parquet,
+        # Lower-ranked categories are missing for most motions
+        column_types={
+            f"category_{rank}": "string" for rank in range(1, TOP_CATEGORIES + 1)
+        },
+    )
 
-    data = {
-        "motion": [r.motion_text for r in results],
-        "category_1": [
-            r.top_category_1.category.name if r.top_category_1 else "" for r in results
-        ],
-        "category_1_score": [
-            r.top_category_1.score if r.top_category_1 else 0 for r in results
-        ],
-        "category_2": [
-            r.top_category_2.category.name if r.top_category_2 else "" for r in results
-        ],
-        "category_2_score": [
-            r.top_category_2.score if r.top_category_2 else 0 for r in results
-        ],
-        "category_3": [
-            r.top_category_3.category.name if r.top_category_3 else "" for r in results
-        ],
-        "category_3_score": [
-            r.top_category_3.score if r.top_category_3 else 0 for r in results
-        ],
-    }
+    logger.info(f"Saved categorization results to: {output_path}")
 
-    df = pd.DataFrame(data)
-    df.to_csv(output_path, index=False, encoding="utf-8")
 
-    logger.info(f"Saved categorization results to: {output_path}")
+def load_motion_categories(input_path: Path) -> pd.DataFrame:
+    """Load categorization results as (motion, category) pairs.
+
+    Args:
+        input_path: Path to the CSV written by save_categorization_results
+
+    Returns:
+        DataFrame with one row per motion and assigned category
+    """
+    df = pd.read_csv(input_path, encoding="utf-8")
+    pairs = df.melt(
+        id_vars="motion", value_vars=["category_1", "category_2", "category_3"]
+    )
+    pairs = pairs.dropna(subset=["value"])
+    pairs = pairs[pairs["value"].astype(str).str.strip() != ""]
+    return pairs.rename(columns={"value": "category"})[["motion", "category"]]
 
 
 def cmd_extract_motions(args):
@@ -270,7 +794,7 @@ def cmd_extract_motions(args):
     output_path = Path(args.output)
 
     print(f"Extracting motions from: {input_path}")
-    motions = extract_motions(input_path)
+    motions = extract_motions(input_path, args.workers)
     print(f"Found {len(motions)} unique motions")
 
     save_motions(motions, output_path)
@@ -293,24 +817,44 @@ def cmd_categorize(args):
     categories = load_categories(categories_path)
     print(f"Loaded {len(categories)} categories")
 
-    print("Categorizing motions...")
-    results = []
-    for motion_text in sorted(motions):
-        result = categorize_motion(motion_text, categories)
-        results.append(result)
+    if args.weighted:
+        index_path = Path(args.index)
+        categories = load_or_compile_category_index(
+            index_path, categories_path, motions_path
+        )
+        print(f"Using weighted category index: {index_path}")
+
+    canonical = None
+    if args.clusters:
+        canonical = load_canonical_motions(Path(args.clusters))
+        print(f"Loaded {len(set(canonical.values()))} canonical motions")
 
-    save_categorization_results(results, output_path)
+    print("Categorizing motions...")
+    if args.no_cache:
+        results = categorize_motions(sorted(motions), categories, canonical)
+    else:
+        resources = [categories_path]
+        if args.weighted:
+            resources.append(Path(args.index))
+        if args.clusters:
+            resources.append(Path(args.clusters))
+        key = cache_key(
+            "categorize", ALGORITHM_VERSION, resources, options=[args.weighted]
+        )
+        results, computed = categorize_motions_cached(
+            sorted(motions),
+            categories,
+            ResultsCache(Path(args.cache_dir)),
+            key,
+            canonical,
+        )
+        print(f"Cached: {len(results) - computed}, computed: {computed}")
+
+    save_categorization_results(results, output_path, parquet=args.parquet)
     print(f"Categorization results saved to: {output_path}")
 
-    no_category_count = sum(1 for r in results if r.top_category_1 is None)
-    one_category_count = sum(
-        1 for r in results if r.top_category_1 and r.top_category_2 is None
-    )
-    two_category_count = sum(
-        1 for r in results if r.top_category_2 and r.top_category_3 is None
-    )
-    three_category_count = (
-        len(results) - no_category_count - one_category_count - two_category_count
+    no_category_count, one_category_count, two_category_count, three_category_count = (
+        np.bincount(results.category_counts(), minlength=TOP_CATEGORIES + 1)
     )
 
     print("\nSummary:")
@@ -321,6 +865,34 @@ def cmd_categorize(args):
     print(f"  Three categories: {three_category_count}")
 
 
+def cmd_compile(args):
+    """Command to compile categories into a weighted category index."""
+    setup_logging()
+
+    motions_path = Path(args.motions_file)
+    categories_path = Path(args.categories_file)
+    output_path = Path(args.output)
+
+    motions = load_motions(motions_path)
+    categories = load_categories(categories_path)
+
+    thresholds = None
+    if args.thresholds:
+        with open(args.thresholds, "r", encoding="utf-8") as f:
+            thresholds = json.load(f)
+        unknown = set(thresholds) - {c.name for c in categories}
+        if unknown:
+            raise ValueError(f"Thresholds for unknown categories: {sorted(unknown)}")
+
+    index = compile_category_index(categories, motions, thresholds)
+    index.sources = index_sources(categories_path, motions_path)
+    save_category_index(index, output_path)
+    print(
+        f"Compiled {len(index.keyword_ids)} keywords of {len(categories)} "
+        f"categories over {len(motions)} motions to: {output_path}"
+    )
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -343,6 +915,12 @@ def main():
         default=str(PATH_TO_MOTIONS_LIST),
         help="Path to output motions text file",
     )
+    extract_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes reading chunks of the CSV (default: 1)",
+    )
     extract_parser.set_defaults(func=cmd_extract_motions)
 
     # Categorize command
@@ -367,8 +945,69 @@ def main():
         default=str(PATH_TO_CATEGORIZATION_OUTPUT),
         help="Path to output CSV file",
     )
+    categorize_parser.add_argument(
+        "--clusters",
+        default=None,
+        help="Motion clusters CSV; categorize each canonical motion only once "
+        f"(e.g. {PATH_TO_MOTION_CLUSTERS})",
+    )
+    categorize_parser.add_argument(
+        "--weighted",
+        action="store_true",
+        help="Score keywords by IDF weight using the compiled category index",
+    )
+    categorize_parser.add_argument(
+        "--index",
+        default=str(PATH_TO_CATEGORY_INDEX),
+        help="Compiled category index for --weighted (recompiled if missing or out of date)",
+    )
+    categorize_parser.add_argument(
+        "--cache-dir",
+        default=str(PATH_TO_RESULTS_CACHE),
+        help="Directory of the results cache",
+    )
+    categorize_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Categorize every motion without reading or writing the cache",
+    )
+    categorize_parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Also write the results as Parquet (requires pyarrow)",
+    )
     categorize_parser.set_defaults(func=cmd_categorize)
 
+    # Compile command
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile categories into a weighted category index"
+    )
+    compile_parser.add_argument(
+        "-m",
+        "--motions-file",
+        default=str(PATH_TO_MOTIONS_LIST),
+        help="Path to motions text file the IDF weights are computed on",
+    )
+    compile_parser.add_argument(
+        "-c",
+        "--categories-file",
+        default=str(PATH_TO_CATEGORIES_FILE),
+        help="Path to category keywords JSON file",
+    )
+    compile_parser.add_argument(
+        "-t",
+        "--thresholds",
+        default=None,
+        help="JSON file mapping category name -> minimum weighted score",
+    )
+    compile_parser.add_argument(
+        "-o",
+        "--output",
+        default=str(PATH_TO_CATEGORY_INDEX),
+        help="Path to output category index JSON file",
+    )
+    compile_parser.set_defaults(func=cmd_compile)
+
     args = parser.parse_args()
 
     if args.command is None:
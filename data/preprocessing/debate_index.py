@@ -0,0 +1,421 @@
+"""Persistent postings index over the debate store.
+
+Maps speakers, teams, judges and motion categories to the sorted ids of the
+debates they appear in. Each postings list is a slice of one flat array
+(CSR layout: sorted keys, offsets, postings), saved as .npy files and
+memory-mapped on load, so queries touch only the postings they need and
+never the raw CSV.
+
+Example usage:
+    python -m data.preprocessing.debate_index build
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from data.preprocessing.categorize_motions import (
+    PATH_TO_CATEGORIZATION_OUTPUT,
+    load_motion_categories,
+)
+from data.preprocessing.debate_store import DebateStore, load_debate_store, team_keys
+from data.preprocessing.lazy_imports import lazy_import
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_INDEX_DIR = PROJECT_ROOT / "data" / "processed" / "index"
+
+METADATA_FILENAME = "index.json"
+
+# Side codes stored alongside speaker, team and judge postings
+SIDE_CODES = {"aff": 0, "neg": 1}
+NO_SIDE = -1
+
+
+@dataclass
+class Postings:
+    """Postings lists of integer keys in CSR layout.
+
+    The postings of `keys[i]` are `values[offsets[i]:offsets[i + 1]]`, sorted
+    ascending; `sides`, when present, holds the side code of every posting.
+    """
+
+    keys: np.ndarray
+    offsets: np.ndarray
+    values: np.ndarray
+    sides: np.ndarray | None = None
+
+    @classmethod
+    def build(
+        cls, keys: np.ndarray, values: np.ndarray, sides: np.ndarray | None = None
+    ) -> "Postings":
+        """Group (key, value) pairs into postings lists.
+
+        Args:
+            keys: Key of every pair
+            values: Value of every pair; duplicates within a key are dropped
+            sides: Optional side code of every pair
+
+        Returns:
+            Postings with values sorted within each key
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=np.int64)
+        if len(keys) == 0:
+            return cls(
+                keys=keys,
+                offsets=np.zeros(1, dtype=np.int64),
+                values=values,
+                sides=np.empty(0, dtype=np.int8) if sides is not None else None,
+            )
+        order = np.lexsort((values, keys))
+        keys, values = keys[order], values[order]
+
+        distinct = np.r_[True, (keys[1:] != keys[:-1]) | (values[1:] != values[:-1])]
+        keys, values = keys[distinct], values[distinct]
+
+        unique_keys, starts = np.unique(keys, return_index=True)
+        return cls(
+            keys=unique_keys,
+            offsets=np.r_[starts, len(values)].astype(np.int64),
+            values=values,
+            sides=(
+                np.asarray(sides, dtype=np.int8)[order][distinct]
+                if sides is not None
+                else None
+            ),
+        )
+
+    def _bounds(self, key: int) -> tuple[int, int]:
+        i = int(np.searchsorted(self.keys, key))
+        if i == len(self.keys) or self.keys[i] != key:
+            return 0, 0
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def get(self, key: int) -> np.ndarray:
+        """Sorted postings of a key (empty for unknown keys)."""
+        start, end = self._bounds(key)
+        return self.values[start:end]
+
+    def get_sides(self, key: int) -> np.ndarray:
+        """Side codes aligned with the postings of a key."""
+        start, end = self._bounds(key)
+        return self.sides[start:end]
+
+    def save(self, output_dir: Path, name: str) -> None:
+        np.save(output_dir / f"{name}.keys.npy", self.keys)
+        np.save(output_dir / f"{name}.offsets.npy", self.offsets)
+        np.save(output_dir / f"{name}.values.npy", self.values)
+        if self.sides is not None:
+            np.save(output_dir / f"{name}.sides.npy", self.sides)
+
+    @classmethod
+    def load(cls, input_dir: Path, name: str, mmap: bool = True) -> "Postings":
+        mmap_mode = "r" if mmap else None
+        sides_path = input_dir / f"{name}.sides.npy"
+        return cls(
+            keys=np.load(input_dir / f"{name}.keys.npy", mmap_mode=mmap_mode),
+            offsets=np.load(input_dir / f"{name}.offsets.npy", mmap_mode=mmap_mode),
+            values=np.load(input_dir / f"{name}.values.npy", mmap_mode=mmap_mode),
+            sides=(
+                np.load(sides_path, mmap_mode=mmap_mode)
+                if sides_path.exists()
+                else None
+            ),
+        )
+
+
+def _side_codes(sides: pd.Series) -> np.ndarray:
+    return sides.map(SIDE_CODES).fillna(NO_SIDE).to_numpy(dtype=np.int8)
+
+
+@dataclass
+class DebateIndex:
+    """Query API over the postings of speakers, teams, judges and categories.
+
+    Speaker, team and judge postings hold debate ids with the side played
+    (or voted for); category postings hold debate ids, and category_motions
+    the ids of the motions (positions in `motions`) assigned to a category.
+    """
+
+    speakers: Postings
+    teams: Postings
+    judges: Postings
+    categories: Postings
+    category_motions: Postings
+    category_names: list[str]
+    motions: list[str]
+
+    def category_code(self, category: str) -> int:
+        try:
+            return self.category_names.index(category)
+        except ValueError:
+            raise KeyError(f"Unknown category: {category}") from None
+
+    def speaker_debates(self, debater_id: int, category: str | None = None):
+        """Debates of a speaker, optionally only those on a motion category.
+
+        Args:
+            debater_id: Speaker id
+            category: Motion category name
+
+        Returns:
+            Sorted array of debate ids
+        """
+        debates = self.speakers.get(debater_id)
+        if category is None:
+            return np.asarray(debates)
+        return np.intersect1d(
+            debates,
+            self.categories.get(self.category_code(category)),
+            assume_unique=True,
+        )
+
+    def team_debates(self, team_id: int) -> np.ndarray:
+        return np.asarray(self.teams.get(team_id))
+
+    def judge_debates(self, judge_id: int) -> np.ndarray:
+        return np.asarray(self.judges.get(judge_id))
+
+    def category_debates(self, category: str) -> np.ndarray:
+        return np.asarray(self.categories.get(self.category_code(category)))
+
+    def motions_in_category(self, category: str) -> list[str]:
+        motion_ids = self.category_motions.get(self.category_code(category))
+        return [self.motions[i] for i in motion_ids]
+
+    def speaker_vs_team(self, debater_id: int, team_id: int) -> np.ndarray:
+        """Debates in which a speaker faced a team.
+
+        Returns:
+            Sorted array of debate ids
+        """
+        return _opposed(
+            self.speakers.get(debater_id),
+            self.speakers.get_sides(debater_id),
+            self.teams.get(team_id),
+            self.teams.get_sides(team_id),
+        )
+
+    def team_vs_team(self, team_id: int, opponent_id: int) -> np.ndarray:
+        """Debates between two teams, as a sorted array of debate ids."""
+        return _opposed(
+            self.teams.get(team_id),
+            self.teams.get_sides(team_id),
+            self.teams.get(opponent_id),
+            self.teams.get_sides(opponent_id),
+        )
+
+    def judge_side_votes(self, judge_id: int) -> dict:
+        """Aff/neg split of a judge's ballots.
+
+        Returns:
+            Dict with aff and neg vote counts and the aff share (None when
+            the judge has no aff/neg votes)
+        """
+        sides = np.asarray(self.judges.get_sides(judge_id))
+        aff = int(np.count_nonzero(sides == SIDE_CODES["aff"]))
+        neg = int(np.count_nonzero(sides == SIDE_CODES["neg"]))
+        return {
+            "aff": aff,
+            "neg": neg,
+            "aff_share": aff / (aff + neg) if aff + neg else None,
+        }
+
+
+def _opposed(debates, sides, other_debates, other_sides) -> np.ndarray:
+    """Debates shared by two postings lists with the two on opposite sides."""
+    common, i, j = np.intersect1d(
+        debates, other_debates, assume_unique=True, return_indices=True
+    )
+    sides, other_sides = np.asarray(sides)[i], np.asarray(other_sides)[j]
+    return common[(sides != other_sides) & (sides != NO_SIDE)]
+
+
+def build_debate_index(
+    store: DebateStore, motion_categories: pd.DataFrame | None = None
+) -> DebateIndex:
+    """Build the postings index of a debate store.
+
+    Args:
+        store: Debate history
+        motion_categories: (motion, category) pairs, see
+            categorize_motions.load_motion_categories
+
+    Returns:
+        In-memory DebateIndex
+    """
+    performances = store.performances
+    speakers = Postings.build(
+        performances["debater_id"].to_numpy(),
+        performances["debate_id"].to_numpy(),
+        _side_codes(performances["side"]),
+    )
+
+    team_rows = performances.drop_duplicates(["debate_id", "side"])
+    teams = Postings.build(
+        team_keys(team_rows),
+        team_rows["debate_id"].to_numpy(),
+        _side_codes(team_rows["side"]),
+    )
+
+    ballots = store.ballots
+    judges = Postings.build(
+        ballots["judge_id"].to_numpy(),
+        ballots["debate_id"].to_numpy(),
+        _side_codes(ballots["side"]),
+    )
+
+    debate_motions = store.debates["motion"].astype("string").str.strip()
+    if motion_categories is None:
+        motion_categories = pd.DataFrame(columns=["motion", "category"])
+    motions = sorted(set(debate_motions.dropna()) | set(motion_categories["motion"]))
+    category_names = sorted(motion_categories["category"].unique())
+
+    motion_ids = pd.Index(motions)
+    pairs = motion_categories.assign(
+        motion_id=motion_ids.get_indexer(motion_categories["motion"]),
+        category_code=pd.Index(category_names).get_indexer(
+            motion_categories["category"]
+        ),
+    )
+    category_motions = Postings.build(pairs["category_code"], pairs["motion_id"])
+
+    debates = pd.DataFrame(
+        {
+            "debate_id": store.debates["debate_id"].to_numpy(),
+            "motion": debate_motions.to_numpy(),
+        }
+    ).merge(pairs, on="motion")
+    categories = Postings.build(debates["category_code"], debates["debate_id"])
+
+    return DebateIndex(
+        speakers=speakers,
+        teams=teams,
+        judges=judges,
+        categories=categories,
+        category_motions=category_motions,
+        category_names=category_names,
+        motions=motions,
+    )
+
+
+POSTINGS_NAMES = ["speakers", "teams", "judges", "categories", "category_motions"]
+
+
+def save_debate_index(index: DebateIndex, output_dir: Path) -> None:
+    """Save the index as .npy postings files plus a JSON vocabulary.
+
+    Args:
+        index: Index to save
+        output_dir: Directory to write the index files to
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for name in POSTINGS_NAMES:
+        getattr(index, name).save(output_dir, name)
+
+    metadata = {"category_names": index.category_names, "motions": index.motions}
+    with open(output_dir / METADATA_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, ensure_ascii=False)
+
+    logger.info(f"Saved debate index to: {output_dir}")
+
+
+def load_debate_index(input_dir: Path, mmap: bool = True) -> DebateIndex:
+    """Load an index saved by save_debate_index.
+
+    Args:
+        input_dir: Index directory
+        mmap: Memory-map the postings instead of reading them into memory
+
+    Returns:
+        DebateIndex backed by the files in `input_dir`
+    """
+    with open(input_dir / METADATA_FILENAME, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+
+    postings = {name: Postings.load(input_dir, name, mmap) for name in POSTINGS_NAMES}
+    return DebateIndex(
+        **postings,
+        category_names=metadata["category_names"],
+        motions=metadata["motions"],
+    )
+
+
+def cmd_build(args):
+    """Command to build the debate index."""
+    input_path = Path(args.input)
+    categories_path = Path(args.categories)
+    output_dir = Path(args.output)
+
+    print(f"Loading debates from: {input_path}")
+    store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    motion_categories = None
+    if categories_path.exists():
+        motion_categories = load_motion_categories(categories_path)
+    else:
+        print(f"Motion categories not found, skipping: {categories_path}")
+
+    index = build_debate_index(store, motion_categories)
+    save_debate_index(index, output_dir)
+
+    print(f"  Speakers: {len(index.speakers.keys)}")
+    print(f"  Teams: {len(index.teams.keys)}")
+    print(f"  Judges: {len(index.judges.keys)}")
+    print(f"  Categories: {len(index.category_names)}")
+    print(f"Index saved to: {output_dir}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Postings index over the debate history",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # build command
+    build_parser = subparsers.add_parser("build", help="Build the debate index")
+    build_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    build_parser.add_argument(
+        "-c",
+        "--categories",
+        type=str,
+        default=str(PATH_TO_CATEGORIZATION_OUTPUT),
+        help=f"Motion categories CSV path (default: {PATH_TO_CATEGORIZATION_OUTPUT})",
+    )
+    build_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=str(PATH_TO_INDEX_DIR),
+        help=f"Output index directory (default: {PATH_TO_INDEX_DIR})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        cmd_build(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
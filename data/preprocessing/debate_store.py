@@ -0,0 +1,676 @@
+from __future__ import annotations
+
+import json
+import zlib
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from data.preprocessing.lazy_imports import lazy_import
+from data.preprocessing.parallel_csv import read_csv_range
+from logger.logger import logger
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+
+TEMPORARY_REPLACEMENT_STRING = "___TEMP___"
+
+# Winner and loser ballots in a debate score such as "vyhráli 2:1"
+SCORE_PATTERN = r"(\d+)\s*:\s*(\d+)"
+
+# Scraped dates are local wall-clock times such as "2025-01-26 09:31:00 "
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMEZONE = "Europe/Prague"
+# Seasons run from September to August
+SEASON_START_MONTH = 9
+
+DEBATE_COLUMNS = [
+    "debate_id",
+    "date",
+    "comp",
+    "comp_id",
+    "league_name",
+    "league_id",
+    "tournament_name",
+    "tournament_id",
+    "motion",
+    "score",
+]
+# Derived from `date` when the store is built
+DATE_KEY_COLUMNS = ["start_time", "month", "season"]
+PERFORMANCE_COLUMNS = [
+    "debate_id",
+    "team_id",
+    "team_name",
+    "side",
+    "position",
+    "debater_id",
+    "points",
+]
+BALLOT_COLUMNS = ["debate_id", "judge_id", "side", "score"]
+DEBATER_COLUMNS = ["debater_id", "debater_name"]
+JUDGE_COLUMNS = ["judge_id", "judge_name"]
+
+ID_COLUMNS = ["comp_id", "league_id", "tournament_id", "team_id"]
+
+
+@dataclass
+class DebateStore:
+    """Normalized debate tables keyed by integer ids.
+
+    Speakers and judges share one person id space (the site's `clovek_id`),
+    with display names kept only in the `debaters` and `judges` dimension
+    tables. Besides the raw `date`, debates carry the DATE_KEY_COLUMNS: the
+    parsed start time in Europe/Prague and yyyymm month and season start
+    year keys (NA for unparseable dates).
+    """
+
+    debates: pd.DataFrame
+    performances: pd.DataFrame
+    ballots: pd.DataFrame
+    debaters: pd.DataFrame
+    judges: pd.DataFrame
+
+    def debater_ids(self) -> np.ndarray:
+        """Sorted array of the ids of everyone who spoke in a debate."""
+        return np.unique(self.performances["debater_id"].to_numpy(dtype=np.int64))
+
+    def outcomes(self) -> pd.DataFrame:
+        """Winner and ballot split of every decided debate.
+
+        The winner is the side most judges voted for; the ballot split comes
+        from the debate score ("vyhráli 2:1") and falls back to the vote
+        count when the score is missing. Debates without a judge majority
+        are left out.
+
+        Returns:
+            DataFrame with debate_id, winner_side, aff_ballots and neg_ballots
+        """
+        votes = self.ballots[self.ballots["side"].isin(["aff", "neg"])]
+        counts = (
+            votes.groupby(["debate_id", "side"])
+            .size()
+            .unstack(fill_value=0)
+            .reindex(columns=["aff", "neg"], fill_value=0)
+        )
+        counts = counts[counts["aff"] != counts["neg"]]
+
+        outcomes = pd.DataFrame(
+            {
+                "debate_id": counts.index.to_numpy(dtype=np.int64),
+                "winner_side": np.where(counts["aff"] > counts["neg"], "aff", "neg"),
+            }
+        )
+        scores = self.debates.set_index("debate_id")["score"]
+        # Scores repeat a lot, so parse each distinct one once
+        codes, distinct = pd.factorize(scores.reindex(outcomes["debate_id"]))
+        distinct_split = (
+            pd.Series(distinct, dtype="string").str.extract(SCORE_PATTERN).astype(float)
+        )
+        split = pd.DataFrame(
+            np.vstack([distinct_split.to_numpy(), np.full((1, 2), np.nan)])[codes],
+            index=counts.index,
+        )
+        winner_ballots = split[0].fillna(counts[["aff", "neg"]].max(axis=1)).to_numpy()
+        loser_ballots = split[1].fillna(counts[["aff", "neg"]].min(axis=1)).to_numpy()
+        aff_won = outcomes["winner_side"].to_numpy() == "aff"
+
+        outcomes["aff_ballots"] = np.where(aff_won, winner_ballots, loser_ballots)
+        outcomes["neg_ballots"] = np.where(aff_won, loser_ballots, winner_ballots)
+        outcomes[["aff_ballots", "neg_ballots"]] = outcomes[
+            ["aff_ballots", "neg_ballots"]
+        ].astype(np.int64)
+        return outcomes
+
+    def upsert(self, records: Iterable[dict]) -> "DebateStore":
+        """Add debates to the store, replacing debates with the same id.
+
+        Args:
+            records: Debate items in the format accepted by build_debate_store
+
+        Returns:
+            New DebateStore; names from the new records take precedence
+        """
+        update = build_debate_store(records)
+        replaced = update.debates["debate_id"]
+
+        def merge_facts(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+            kept = old[~old["debate_id"].isin(replaced)]
+            if kept.empty:
+                return new.copy()
+            if new.empty:
+                return kept.reset_index(drop=True)
+            return pd.concat([kept, new], ignore_index=True)
+
+        def merge_names(
+            old: pd.DataFrame, new: pd.DataFrame, facts: pd.DataFrame, key: str
+        ) -> pd.DataFrame:
+            names = pd.concat([new, old], ignore_index=True)
+            names = names[names[key].isin(facts[key])].drop_duplicates(key)
+            return names.sort_values(key, ignore_index=True)
+
+        performances = merge_facts(self.performances, update.performances)
+        ballots = merge_facts(self.ballots, update.ballots)
+
+        return DebateStore(
+            debates=merge_facts(self.debates, update.debates),
+            performances=performances,
+            ballots=ballots,
+            debaters=merge_names(
+                self.debaters, update.debaters, performances, "debater_id"
+            ),
+            judges=merge_names(self.judges, update.judges, ballots, "judge_id"),
+        )
+
+    def without_debates(self, debate_ids: Iterable[int]) -> "DebateStore":
+        """Store with the given debates (and their rows) removed.
+
+        Args:
+            debate_ids: Ids of the debates to drop
+
+        Returns:
+            New DebateStore; people left without debates are dropped too
+        """
+        return self._select_debates(debate_ids, keep=False)
+
+    def only_debates(self, debate_ids: Iterable[int]) -> "DebateStore":
+        """Store with only the given debates (and their rows).
+
+        Args:
+            debate_ids: Ids of the debates to keep
+
+        Returns:
+            New DebateStore with the people of those debates
+        """
+        return self._select_debates(debate_ids, keep=True)
+
+    def _select_debates(self, debate_ids: Iterable[int], keep: bool) -> "DebateStore":
+        selected = pd.Index(np.fromiter(debate_ids, dtype=np.int64))
+
+        def kept(df: pd.DataFrame) -> pd.DataFrame:
+            return df[df["debate_id"].isin(selected) == keep].reset_index(drop=True)
+
+        performances = kept(self.performances)
+        ballots = kept(self.ballots)
+        return DebateStore(
+            debates=kept(self.debates),
+            performances=performances,
+            ballots=ballots,
+            debaters=self.debaters[
+                self.debaters["debater_id"].isin(performances["debater_id"])
+            ].reset_index(drop=True),
+            judges=self.judges[
+                self.judges["judge_id"].isin(ballots["judge_id"])
+            ].reset_index(drop=True),
+        )
+
+
+def legacy_person_id(name: str) -> int:
+    """Surrogate id for a person scraped before site ids were captured.
+
+    Derived from the name so it is stable between runs, and negative so it
+    never collides with a site id.
+
+    Args:
+        name: Display name of the speaker or judge
+
+    Returns:
+        Negative integer id
+    """
+    return -(zlib.crc32(name.encode("utf-8")) + 1)
+
+
+def _parse_distinct_dates(dates: pd.Series) -> tuple[np.ndarray, pd.DatetimeIndex]:
+    """Codes of `dates` and the Europe/Prague start times of its distinct values.
+
+    Dates repeat a lot (one per round), so each distinct string is parsed
+    once with DATE_FORMAT; date-only strings are read as midnight. Times in
+    the autumn DST overlap are taken as standard time and times in the
+    spring gap are shifted forward. Missing dates get code -1.
+    """
+    codes, distinct = pd.factorize(dates)
+    text = pd.Series(distinct, dtype="string").str.strip()
+    parsed = pd.to_datetime(text, format=DATE_FORMAT, errors="coerce")
+    parsed = parsed.fillna(
+        pd.to_datetime(text.str[:10], format="%Y-%m-%d", errors="coerce")
+    )
+    local = pd.DatetimeIndex(parsed).tz_localize(
+        TIMEZONE,
+        ambiguous=np.zeros(len(parsed), dtype=bool),
+        nonexistent="shift_forward",
+    )
+    return codes, local
+
+
+def parse_debate_dates(dates: pd.Series) -> pd.Series:
+    """Parse scraped debate dates into Europe/Prague start times.
+
+    Args:
+        dates: Raw date strings (None for missing dates)
+
+    Returns:
+        Series of datetime64[ns, Europe/Prague], NaT where unparseable
+    """
+    codes, local = _parse_distinct_dates(dates)
+    return pd.Series(
+        local.take(codes, allow_fill=True, fill_value=pd.NaT),
+        index=dates.index,
+        name="start_time",
+    )
+
+
+def add_date_keys(debates: pd.DataFrame) -> pd.DataFrame:
+    """Debates with the DATE_KEY_COLUMNS (re)computed from `date`."""
+    codes, local = _parse_distinct_dates(debates["date"])
+    months = local.year * 100 + local.month
+    seasons = local.year - (local.month < SEASON_START_MONTH)
+
+    def key(values: pd.Index) -> pd.arrays.IntegerArray:
+        # Distinct keys plus a trailing NA for missing and unparseable dates
+        keys = pd.array(np.r_[values.to_numpy(dtype=float), np.nan], dtype="Int64")
+        return keys[codes]
+
+    return debates.assign(
+        start_time=local.take(codes, allow_fill=True, fill_value=pd.NaT),
+        month=key(months),
+        season=key(seasons),
+    )
+
+
+def team_keys(performances: pd.DataFrame) -> np.ndarray:
+    """Team ids of performance rows, with surrogates for legacy rows.
+
+    Teams scraped before site ids were captured get a legacy id derived
+    from the team name, as people do.
+
+    Args:
+        performances: Rows with team_id and team_name columns
+
+    Returns:
+        int64 array of team keys
+    """
+    missing = performances["team_id"].isna().to_numpy()
+    keys = performances["team_id"].to_numpy(dtype=np.float64, na_value=0)
+    keys = keys.astype(np.int64)
+    if missing.any():
+        names = performances["team_name"].fillna("").astype(str).to_numpy()[missing]
+        unique_names, inverse = np.unique(names, return_inverse=True)
+        surrogates = np.array(
+            [legacy_person_id(name) for name in unique_names], dtype=np.int64
+        )
+        keys[missing] = surrogates[inverse]
+    return keys
+
+
+def tournament_keys(debates: pd.DataFrame) -> pd.Series:
+    """Tournament of each debate as a string key.
+
+    The tournament id where it was scraped, the tournament name otherwise.
+
+    Args:
+        debates: Rows with tournament_id and tournament_name columns
+
+    Returns:
+        String Series aligned with `debates`; NA when both are missing
+    """
+    return (
+        debates["tournament_id"]
+        .astype("string")
+        .fillna(debates["tournament_name"].astype("string"))
+    )
+
+
+def _parse_quoted_list(value_str: str) -> list:
+    """Parse a Python-repr list of dicts as exported by the scrapy CSV feed.
+
+    Names may contain nicknames in double quotes, which are masked while the
+    single quotes are turned into JSON quotes and restored afterwards.
+    """
+    has_quotes = '"' in value_str
+    if has_quotes:
+        value_str = value_str.replace('"', TEMPORARY_REPLACEMENT_STRING)
+    value_str = value_str.replace("'", '"')
+    value_str = value_str.replace("None", "null")
+    values = json.loads(value_str)
+    if not has_quotes:
+        return values
+
+    def restore(entry: dict) -> None:
+        for key, value in entry.items():
+            if isinstance(value, str):
+                entry[key] = value.replace(TEMPORARY_REPLACEMENT_STRING, '"')
+            elif isinstance(value, list):
+                for nested in value:
+                    restore(nested)
+
+    for value in values:
+        restore(value)
+    return values
+
+
+def parse_teams_string(teams_str: str) -> list | None:
+    """Parse teams string from CSV into Python list.
+
+    Required to handle name string with nicknames containing quotes.
+    E.g. {'name': 'Novák "Speedy" Jakub'}
+
+    Args:
+        teams_str: String representation of teams data
+
+    Returns:
+        Parsed list or None if parsing fails
+    """
+    try:
+        return _parse_quoted_list(teams_str)
+    except json.JSONDecodeError:
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error while parsing teams string: {e}")
+        logger.debug(f"Teams string: {teams_str}")
+        raise e
+
+
+def parse_judges_string(judges_str: str) -> list | None:
+    """Parse judges_scoring string from CSV into Python list.
+
+    Args:
+        judges_str: String representation of judges data
+
+    Returns:
+        Parsed list or None if parsing fails
+    """
+    try:
+        return _parse_quoted_list(judges_str)
+    except json.JSONDecodeError:
+        return None
+    except Exception as e:
+        logger.error(f"Unexpected error while parsing judges string: {e}")
+        logger.debug(f"Judges string: {judges_str}")
+        raise e
+
+
+def _keep_latest_name(
+    names: dict[int, tuple[int, str]], person: int, debate_id: int, name: str
+) -> None:
+    # Keep the name from the most recent debate as the display name
+    latest = names.get(person)
+    if latest is None or latest[0] <= debate_id:
+        names[person] = (debate_id, name)
+
+
+def _add_person(
+    names: dict[int, tuple[int, str]], entry: dict, id_key: str, debate_id: int
+) -> int | None:
+    """Id of a speaker or judge entry, recording its name in `names`.
+
+    Returns None for entries without a name, which are skipped.
+    """
+    name = (entry.get("name") or "").strip()
+    if not name:
+        return None
+    person = entry.get(id_key)
+    if person is None:
+        person = legacy_person_id(name)
+    _keep_latest_name(names, person, debate_id, name)
+    return person
+
+
+def name_dimension(
+    names: dict[int, tuple[int, str]], ids: pd.Series | list[int], columns: list[str]
+) -> pd.DataFrame:
+    """Id and display name table of the given people, sorted by id.
+
+    Args:
+        names: (debate_id, name) of every person, as from latest_person_names
+        ids: Array-like of the ids to include (duplicates allowed)
+        columns: Names of the id and name columns
+
+    Returns:
+        DataFrame with the two columns
+    """
+    df = pd.DataFrame(
+        [(person, names[person][1]) for person in pd.unique(np.asarray(ids))],
+        columns=columns,
+    )
+    df[columns[0]] = df[columns[0]].astype(np.int64)
+    return df.sort_values(columns[0], ignore_index=True)
+
+
+def latest_person_names(
+    records: Iterable[dict],
+) -> tuple[dict[int, tuple[int, str]], set[int]]:
+    """Display names of the people in debate records, without building a store.
+
+    Uses the same ids and naming rules as build_debate_store.
+
+    Args:
+        records: Debate records as accepted by build_debate_store
+
+    Returns:
+        Tuple of ({person id: (debate_id, name)} with the name from the most
+        recent debate, ids of the people who spoke)
+    """
+    names: dict[int, tuple[int, str]] = {}
+    speakers = set()
+    for record in records:
+        debate_id = int(record["id"])
+        for team in record.get("teams") or []:
+            for speaker in team["speakers"]:
+                person = _add_person(names, speaker, "speaker_id", debate_id)
+                if person is not None:
+                    speakers.add(person)
+        for judge in record.get("judges_scoring") or []:
+            _add_person(names, judge, "judge_id", debate_id)
+    return names, speakers
+
+
+def merge_person_names(
+    parts: Iterable[dict[int, tuple[int, str]]],
+) -> dict[int, tuple[int, str]]:
+    """Combine latest_person_names results of consecutive chunks of records.
+
+    Args:
+        parts: Name dicts in record order
+
+    Returns:
+        Name dict equal to that of all records read at once
+    """
+    merged: dict[int, tuple[int, str]] = {}
+    for names in parts:
+        for person, (debate_id, name) in names.items():
+            _keep_latest_name(merged, person, debate_id, name)
+    return merged
+
+
+def latest_debate_records(records: Iterable[dict]) -> list[dict]:
+    """The last record of every debate id, in the order of those records.
+
+    Args:
+        records: Debate records, possibly repeating debate ids
+
+    Returns:
+        List of records with distinct debate ids
+    """
+    latest: dict[int, dict] = {}
+    count = 0
+    for record in records:
+        debate_id = int(record["id"])
+        # Re-insert so the order is that of the last occurrences
+        latest.pop(debate_id, None)
+        latest[debate_id] = record
+        count += 1
+    if count > len(latest):
+        logger.warning(
+            f"Dropped {count - len(latest)} earlier rows of repeated debate ids"
+        )
+    return list(latest.values())
+
+
+def build_debate_store(records: Iterable[dict]) -> DebateStore:
+    """Normalize debate records into integer-keyed tables.
+
+    A debate id that occurs more than once (a re-scraped or concatenated
+    CSV) keeps only its last record, as if the later ones were upserted.
+
+    Args:
+        records: Debate items as yielded by the greybox spider, with `teams`
+            and `judges_scoring` already parsed into lists
+
+    Returns:
+        DebateStore with one row per debate, speaker performance and ballot
+    """
+    records = latest_debate_records(records)
+    debates = {column: [] for column in DEBATE_COLUMNS}
+    performances = {column: [] for column in PERFORMANCE_COLUMNS}
+    ballots = {column: [] for column in BALLOT_COLUMNS}
+    names: dict[int, tuple[int, str]] = {}
+    for record in records:
+        debate_id = int(record["id"])
+        debates["debate_id"].append(debate_id)
+        for column in DEBATE_COLUMNS[1:]:
+            debates[column].append(record.get(column))
+
+        for team in record.get("teams") or []:
+            for position, speaker in enumerate(team["speakers"], start=1):
+                debater_id = _add_person(names, speaker, "speaker_id", debate_id)
+                if debater_id is None:
+                    continue
+                performances["debate_id"].append(debate_id)
+                performances["team_id"].append(team.get("team_id"))
+                performances["team_name"].append(team.get("team_name"))
+                performances["side"].append(team.get("side"))
+                performances["position"].append(position)
+                performances["debater_id"].append(debater_id)
+                performances["points"].append(speaker.get("points"))
+
+        for judge in record.get("judges_scoring") or []:
+            judge_id = _add_person(names, judge, "judge_id", debate_id)
+            if judge_id is None:
+                continue
+            ballots["debate_id"].append(debate_id)
+            ballots["judge_id"].append(judge_id)
+            ballots["side"].append(judge.get("side"))
+            ballots["score"].append(judge.get("score"))
+
+    debates_df = pd.DataFrame(debates, columns=DEBATE_COLUMNS)
+    performances_df = pd.DataFrame(performances, columns=PERFORMANCE_COLUMNS)
+    ballots_df = pd.DataFrame(ballots, columns=BALLOT_COLUMNS)
+
+    debates_df["debate_id"] = debates_df["debate_id"].astype(np.int64)
+    debates_df = add_date_keys(debates_df)
+    for column in ID_COLUMNS:
+        for df in (debates_df, performances_df):
+            if column in df:
+                df[column] = pd.to_numeric(df[column]).astype("Int64")
+    performances_df["debate_id"] = performances_df["debate_id"].astype(np.int64)
+    performances_df["debater_id"] = performances_df["debater_id"].astype(np.int64)
+    performances_df["position"] = performances_df["position"].astype(np.int8)
+    performances_df["points"] = pd.to_numeric(performances_df["points"]).astype("Int64")
+    ballots_df["debate_id"] = ballots_df["debate_id"].astype(np.int64)
+    ballots_df["judge_id"] = ballots_df["judge_id"].astype(np.int64)
+
+    return DebateStore(
+        debates=debates_df,
+        performances=performances_df,
+        ballots=ballots_df,
+        debaters=name_dimension(names, performances_df["debater_id"], DEBATER_COLUMNS),
+        judges=name_dimension(names, ballots_df["judge_id"], JUDGE_COLUMNS),
+    )
+
+
+def read_debate_records(
+    csv_path: Path,
+    rejected: list[dict] | None = None,
+    byte_range: tuple[int, int] | None = None,
+) -> list[dict]:
+    """Read debate rows from the scraped CSV with nested columns parsed.
+
+    Rows whose teams cannot be parsed are skipped, and so are all but the
+    last of the parsed rows of a repeated debate id (as in
+    build_debate_store).
+
+    Args:
+        csv_path: Path to the input CSV file
+        rejected: If given, receives one dict (row, debate_id, reason,
+            value) per skipped row or unparseable judges column
+        byte_range: Only read the records in this (start, end) byte range,
+            as returned by parallel_csv.chunk_ranges; rejected rows are then
+            numbered from the start of the range
+
+    Returns:
+        List of debate records
+    """
+    if byte_range is None:
+        df = pd.read_csv(csv_path, encoding="utf-8")
+    else:
+        df = read_csv_range(csv_path, *byte_range)
+    df = df.astype(object).where(df.notna(), None)
+
+    records = []
+    record_rows = []
+    error_count = 0
+
+    def reject(row: int, record: dict, reason: str, value) -> None:
+        if rejected is not None:
+            rejected.append(
+                {
+                    "row": row,
+                    "debate_id": record.get("id"),
+                    "reason": reason,
+                    "value": value,
+                }
+            )
+
+    for row, record in enumerate(df.to_dict("records")):
+        if record["teams"] is None:
+            reject(row, record, "missing_teams", None)
+            continue
+
+        teams = parse_teams_string(record["teams"])
+        if teams is None:
+            error_count += 1
+            reject(row, record, "unparseable_teams", record["teams"])
+            continue
+        record["teams"] = teams
+
+        judges_str = record.get("judges_scoring")
+        judges = parse_judges_string(judges_str) if judges_str else []
+        if judges is None:
+            reject(row, record, "unparseable_judges", judges_str)
+        record["judges_scoring"] = judges or []
+        records.append(record)
+        record_rows.append(row)
+
+    if error_count > 0:
+        logger.warning(f"Failed to parse {error_count} rows in {csv_path}")
+
+    last_index = {int(record["id"]): index for index, record in enumerate(records)}
+    if len(last_index) < len(records):
+        logger.warning(
+            f"Skipped {len(records) - len(last_index)} earlier rows of repeated "
+            f"debate ids in {csv_path}"
+        )
+        kept = []
+        for index, (row, record) in enumerate(zip(record_rows, records)):
+            if last_index[int(record["id"])] == index:
+                kept.append(record)
+            else:
+                reject(row, record, "duplicate_debate_id", record["id"])
+        records = kept
+
+    return records
+
+
+def load_debate_store(csv_path: Path) -> DebateStore:
+    """Load the scraped debate CSV into a DebateStore.
+
+    Args:
+        csv_path: Path to the input CSV file
+
+    Returns:
+        DebateStore built from all parseable rows
+    """
+    return build_debate_store(read_debate_records(csv_path))
@@ -0,0 +1,316 @@
+"""Per-debater statistics for the dashboard.
+
+Builds one `DebaterStats` record (see web/src/types.ts) per speaker from the
+debate store: win rates by side, average speaker points by position, best
+and worst motion categories, the debate history and the speaker's rating.
+
+The search index of the debater selector is written beside the stats, so
+`-o docs/example_stats.json` publishes both to the dashboard.
+
+Example usage:
+    python -m data.preprocessing.debater_stats generate
+    python -m data.preprocessing.debater_stats generate -o docs/example_stats.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+from data.preprocessing.categorize_motions import (
+    PATH_TO_CATEGORIZATION_OUTPUT,
+    load_motion_categories,
+)
+from data.preprocessing.debate_store import DebateStore, load_debate_store
+from data.preprocessing.lazy_imports import lazy_import
+from data.preprocessing.ratings import (
+    PATH_TO_RATING_STATE,
+    speaker_ratings,
+    update_rating_state_file,
+)
+from data.preprocessing.search_index import (
+    SEARCH_INDEX_FILENAME,
+    build_search_index,
+    save_search_index,
+    search_index_path,
+)
+from data.preprocessing.validation import (
+    load_validated_store,
+    quarantine_store,
+    save_quarantine,
+)
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_STATS_OUTPUT = PROJECT_ROOT / "data" / "processed" / "debater_stats.json"
+
+DEBATE_LINK = "https://statistiky.debatovani.cz/?page=debata&debata_id={debate_id}"
+TOP_CATEGORIES = 3
+
+
+def debate_results(store: DebateStore) -> pd.DataFrame:
+    """Speaker performances joined with the debate, opponent and outcome.
+
+    Returns:
+        Performances with date, motion, opponent, won and ballots_gained
+        columns; won is NA for debates without a decision
+    """
+    # Sides are strings; an empty store would otherwise give a float64 key
+    performances = store.performances.astype({"side": object})
+    teams = performances[["debate_id", "side", "team_name"]].drop_duplicates(
+        ["debate_id", "side"]
+    )
+    opponents = teams.assign(
+        side=teams["side"].map({"aff": "neg", "neg": "aff"}).astype(object)
+    ).rename(columns={"team_name": "opponent"})
+
+    performances = performances.merge(
+        store.debates[["debate_id", "date", "motion"]], on="debate_id", how="left"
+    )
+    performances = performances.merge(opponents, on=["debate_id", "side"], how="left")
+
+    performances = performances.merge(store.outcomes(), on="debate_id", how="left")
+    decided = performances["winner_side"].notna()
+    is_aff = (performances["side"] == "aff").to_numpy()
+    performances["won"] = (
+        (performances["side"] == performances["winner_side"])
+        .where(decided)
+        .astype(float)
+    )
+    performances["ballots_gained"] = np.where(
+        is_aff, performances["aff_ballots"], performances["neg_ballots"]
+    )
+    performances["date"] = (
+        performances["date"].astype("string").str.strip().str[:10].fillna("")
+    )
+    performances["motion"] = performances["motion"].astype("string").str.strip()
+    return performances
+
+
+def _rate(won: pd.Series) -> float | None:
+    return round(float(won.mean()), 4) if len(won) else None
+
+
+def _optional(value) -> float | None:
+    return None if pd.isna(value) else round(float(value), 2)
+
+
+def compute_debater_stats(
+    store: DebateStore,
+    motion_categories: pd.DataFrame | None = None,
+    ratings: pd.DataFrame | None = None,
+) -> list[dict]:
+    """Compute dashboard statistics for every speaker.
+
+    Args:
+        store: Debate history
+        motion_categories: (motion, category) pairs from load_motion_categories
+        ratings: Speaker ratings with debater_id and rating columns
+
+    Returns:
+        List of DebaterStats dicts, ordered by name
+    """
+    results = debate_results(store)
+    decided = results[results["won"].notna()]
+
+    category_rates = {}
+    if motion_categories is not None:
+        per_category = decided.merge(motion_categories, on="motion")
+        rates = per_category.groupby(["debater_id", "category"])["won"].agg(
+            ["mean", "size"]
+        )
+        rates = rates.reset_index().sort_values(
+            ["debater_id", "mean", "size", "category"],
+            ascending=[True, False, False, True],
+        )
+        for debater_id, group in rates.groupby("debater_id", sort=False):
+            category_rates[debater_id] = [
+                {"category": category, "win_rate": round(float(rate), 4)}
+                for category, rate in zip(group["category"], group["mean"])
+            ]
+
+    rating_by_id = {}
+    if ratings is not None:
+        rating_by_id = dict(zip(ratings["debater_id"], ratings["rating"]))
+
+    names = dict(zip(store.debaters["debater_id"], store.debaters["debater_name"]))
+    decided_by_id = dict(list(decided.groupby("debater_id")))
+    results = results.sort_values(["date", "debate_id"])
+
+    stats = []
+    for debater_id, history in results.groupby("debater_id"):
+        won = decided_by_id.get(debater_id, decided.iloc[:0])
+        points = history.groupby("position")["points"].mean()
+        rates = category_rates.get(debater_id, [])
+        top = rates[:TOP_CATEGORIES]
+        bottom = rates[TOP_CATEGORIES:][::-1][:TOP_CATEGORIES]
+        rating = rating_by_id.get(debater_id)
+
+        stats.append(
+            {
+                "id": int(debater_id),
+                "name": names[debater_id],
+                "rating": round(float(rating), 1) if rating is not None else None,
+                "side_win_rates": {
+                    "total": _rate(won["won"]),
+                    "aff": _rate(won.loc[won["side"] == "aff", "won"]),
+                    "neg": _rate(won.loc[won["side"] == "neg", "won"]),
+                },
+                "positions_speaker_points": {
+                    str(position): _optional(points.get(position))
+                    for position in (1, 2, 3)
+                },
+                "motion_category_stats": {"top_3": top, "bottom_3": bottom},
+                "debates": [
+                    {
+                        "ballots_gained": 0 if pd.isna(ballots) else int(ballots),
+                        "opponent": opponent if isinstance(opponent, str) else "",
+                        "was_aff": side == "aff",
+                        "link": DEBATE_LINK.format(debate_id=debate_id),
+                        "speaker_points": _optional(speaker_points),
+                        "date": date,
+                    }
+                    for debate_id, ballots, opponent, side, speaker_points, date in zip(
+                        history["debate_id"],
+                        history["ballots_gained"],
+                        history["opponent"],
+                        history["side"],
+                        history["points"],
+                        history["date"],
+                    )
+                ],
+            }
+        )
+
+    stats.sort(key=lambda s: (s["name"], s["id"]))
+    return stats
+
+
+def save_debater_stats(stats: list[dict], output_path: Path) -> None:
+    """Save debater statistics as a JSON array.
+
+    The file is replaced atomically, so readers such as the stats server
+    never see a partially written version.
+
+    Args:
+        stats: List of DebaterStats dicts
+        output_path: Path to output JSON file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(stats, f, ensure_ascii=False)
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Saved debater stats to: {output_path}")
+
+
+def cmd_generate(args):
+    """Command to generate the per-debater statistics."""
+    input_path = Path(args.input)
+    categories_path = Path(args.categories)
+    output_path = Path(args.output)
+
+    print(f"Loading debates from: {input_path}")
+    if args.quarantine:
+        store, issues = load_validated_store(input_path)
+        save_quarantine(issues, Path(args.quarantine))
+        store = quarantine_store(store, issues)
+        print(f"Quarantined {len(issues)} rows, see: {args.quarantine}")
+    else:
+        store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    motion_categories = None
+    if categories_path.exists():
+        motion_categories = load_motion_categories(categories_path)
+    else:
+        print(f"Motion categories not found, skipping: {categories_path}")
+
+    print("Updating ratings...")
+    state = update_rating_state_file(store, Path(args.rating_state))
+
+    stats = compute_debater_stats(store, motion_categories, speaker_ratings(state))
+    save_debater_stats(stats, output_path)
+    print(f"Saved stats of {len(stats)} debaters to: {output_path}")
+
+    index_path = (
+        Path(args.search_index) if args.search_index else search_index_path(output_path)
+    )
+    save_search_index(build_search_index(stats), index_path)
+    print(f"Saved debater search index to: {index_path}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Per-debater statistics for the dashboard",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # generate command
+    generate_parser = subparsers.add_parser(
+        "generate", help="Generate the debater statistics JSON"
+    )
+    generate_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    generate_parser.add_argument(
+        "-c",
+        "--categories",
+        type=str,
+        default=str(PATH_TO_CATEGORIZATION_OUTPUT),
+        help=f"Motion categories CSV path (default: {PATH_TO_CATEGORIZATION_OUTPUT})",
+    )
+    generate_parser.add_argument(
+        "-s",
+        "--rating-state",
+        type=str,
+        default=str(PATH_TO_RATING_STATE),
+        help=f"Rating state file path (default: {PATH_TO_RATING_STATE})",
+    )
+    generate_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=str(PATH_TO_STATS_OUTPUT),
+        help=f"Output JSON file path (default: {PATH_TO_STATS_OUTPUT})",
+    )
+    generate_parser.add_argument(
+        "--quarantine",
+        type=str,
+        default=None,
+        help="Validate the debates first, leave out those with issues and "
+        "write the failing rows to this CSV",
+    )
+    generate_parser.add_argument(
+        "--search-index",
+        type=str,
+        default=None,
+        help=f"Debater search index path (default: {SEARCH_INDEX_FILENAME} "
+        "beside the output, where the dashboard fetches it)",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        cmd_generate(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -1,21 +1,65 @@
+from __future__ import annotations
+
 import argparse
-import json
+from collections.abc import Collection
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 
-import pandas as pd
-
-from logger.logger import logger, setup_logging
+from data.preprocessing.debate_store import (
+    DEBATER_COLUMNS,
+    latest_person_names,
+    legacy_person_id,
+    merge_person_names,
+    name_dimension,
+    parse_teams_string,
+)
+from data.preprocessing.lazy_imports import lazy_import
+from data.preprocessing.name_lists import (
+    COMPILED_SUFFIX,
+    NameList,
+    normalize_name,
+    normalized_names,
+)
+from data.preprocessing.parallel_csv import map_chunks, read_csv_range
+from data.preprocessing.results_cache import (
+    PATH_TO_RESULTS_CACHE,
+    ResultsCache,
+    cache_key,
+    cached_map,
+)
+from data.preprocessing.table_output import write_table
+from logger.logger import setup_logging
+
+pd = lazy_import("pandas")
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
 PATH_TO_MALE_NAMES = PROJECT_ROOT / "data" / "resources" / "male_names.txt"
 PATH_TO_FEMALE_NAMES = PROJECT_ROOT / "data" / "resources" / "female_names.txt"
-PATH_TO_DEBATER_NAMES = PROJECT_ROOT / "data" / "processed" / "debater_names.txt"
+PATH_TO_DEBATERS = PROJECT_ROOT / "data" / "processed" / "debaters.csv"
 PATH_TO_GENDER_OUTPUT = PROJECT_ROOT / "data" / "processed" / "debater_genders.csv"
-
-TEMPORARY_REPLACEMENT_STRING = "___TEMP___"
+PATH_TO_FIRST_NAME_TABLE = (
+    PROJECT_ROOT / "data" / "processed" / "first_name_genders.csv"
+)
+
+# Bump whenever a change to guess_gender changes its results
+ALGORITHM_VERSION = 2
+
+GENDER_COLUMNS = [
+    "debater_id",
+    "debater_name",
+    "is_male",
+    "inconclusive",
+    "method_used",
+]
+FIRST_NAME_TABLE_COLUMNS = [
+    "female_suffix",
+    "first_name",
+    "debaters",
+    "gender",
+    "method_used",
+]
 
 
 class Gender(Enum):
@@ -30,14 +74,15 @@ class GenderGuessMethod(Enum):
     INCONCLUSIVE = "inconclusive"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DebaterName:
     full_name: str
     first_name: str
     last_name: str
+    debater_id: int | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GenderGuess:
     debater_name: DebaterName
     gender: Gender
@@ -45,74 +90,107 @@ class GenderGuess:
 
 
 CZECH_FEMALE_SUFFIXES = ["ová", "á"]
+# Debater names come from the teams column alone
+NAME_SOURCE_COLUMNS = ["id", "teams"]
+
+
+def _read_person_names(
+    csv_path: Path, byte_range: tuple[int, int] | None = None
+) -> tuple[dict[int, tuple[int, str]], set[int]]:
+    if byte_range is None:
+        df = pd.read_csv(csv_path, encoding="utf-8", usecols=NAME_SOURCE_COLUMNS)
+    else:
+        df = read_csv_range(csv_path, *byte_range, columns=NAME_SOURCE_COLUMNS)
+    # Unparseable teams become None and are skipped, as in read_debate_records
+    records = (
+        {"id": debate_id, "teams": parse_teams_string(teams_str)}
+        for debate_id, teams_str in zip(df["id"], df["teams"])
+        if isinstance(teams_str, str)
+    )
+    return latest_person_names(records)
+
+
+def _chunk_person_names(
+    csv_path: Path, start: int, end: int
+) -> tuple[dict[int, tuple[int, str]], set[int]]:
+    return _read_person_names(csv_path, (start, end))
 
 
-def parse_teams_string(teams_str: str) -> list | None:
-    """Parse teams string from CSV into Python list.
+def extract_debaters(csv_path: Path, workers: int = 1) -> pd.DataFrame:
+    """Extract the debater name dimension from the debate CSV file.
 
-    Required to handle name string with nicknames containing quotes.
-    E.g. {'name': 'Novák "Speedy" Jakub'}
+    Debaters are keyed by their site id, so two people sharing a name stay
+    distinct and a renamed debater keeps a single row (with the latest name).
+    Only the id and teams columns are read and no DebateStore is built, so
+    the name is the latest one the debater spoke under (the store's debater
+    table may instead take a later name under which they judged).
 
     Args:
-        teams_str: String representation of teams data
+        csv_path: Path to the input CSV file
+        workers: Number of processes parsing chunks of the CSV; the result
+            is the same for any number
 
     Returns:
-        Parsed list or None if parsing fails
+        DataFrame with debater_id and debater_name columns
     """
-    try:
-        teams_str = teams_str.replace('"', TEMPORARY_REPLACEMENT_STRING)
-        teams_str = teams_str.replace("'", '"')
-        teams_str = teams_str.replace("None", "null")
-        teams = json.loads(teams_str)
-
-        for team in teams:
-            for speaker in team["speakers"]:
-                if speaker["name"]:
-                    speaker["name"] = speaker["name"].replace(
-                        TEMPORARY_REPLACEMENT_STRING, '"'
-                    )
-        return teams
-    except json.JSONDecodeError:
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error while parsing teams string: {e}")
-        logger.debug(f"Teams string: {teams_str}")
-        raise e
-
-
-def extract_debater_names(csv_path: Path) -> set[str]:
+    if workers <= 1:
+        names, speakers = _read_person_names(csv_path)
+    else:
+        parts = map_chunks(_chunk_person_names, csv_path, workers)
+        names = merge_person_names(names for names, _ in parts)
+        speakers = set().union(*(speakers for _, speakers in parts))
+    return name_dimension(names, sorted(speakers), DEBATER_COLUMNS)
+
+
+def extract_debater_names(csv_path: Path, workers: int = 1) -> set[str]:
     """Extract unique debater names from the debate CSV file.
 
     Args:
         csv_path: Path to the input CSV file
+        workers: Number of processes parsing chunks of the CSV
 
     Returns:
         Set of unique debater names
     """
-    df = pd.read_csv(csv_path, encoding="utf-8")
+    return set(extract_debaters(csv_path, workers)["debater_name"])
 
-    debater_names = set()
-    error_count = 0
 
-    for teams_str in df["teams"]:
-        if pd.isna(teams_str):
-            continue
+def save_debaters(debaters: pd.DataFrame, output_path: Path) -> None:
+    """Save the debater name dimension to CSV, sorted by name.
 
-        teams = parse_teams_string(teams_str)
-        if teams is None:
-            error_count += 1
-            continue
+    Args:
+        debaters: DataFrame with debater_id and debater_name columns
+        output_path: Path to output CSV file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        for team in teams:
-            for speaker in team["speakers"]:
-                speaker_name = speaker["name"].strip()
-                if speaker_name:
-                    debater_names.add(speaker_name)
+    debaters.sort_values(["debater_name", "debater_id"])[DEBATER_COLUMNS].to_csv(
+        output_path, index=False, encoding="utf-8"
+    )
+
+
+def load_debaters(input_path: Path) -> pd.DataFrame:
+    """Load the debater name dimension.
+
+    Plain name lists (.txt, one name per line) are accepted as well; their
+    debaters get the same surrogate ids as speakers scraped without ids.
+
+    Args:
+        input_path: Path to debaters CSV or names text file
 
-    if error_count > 0:
-        logger.debug(f"Failed to parse {error_count} rows in {csv_path}")
+    Returns:
+        DataFrame with debater_id and debater_name columns
+    """
+    if input_path.suffix == ".txt":
+        names = sorted(load_debater_names(input_path))
+        return pd.DataFrame(
+            {
+                "debater_id": [legacy_person_id(name) for name in names],
+                "debater_name": names,
+            }
+        )
 
-    return debater_names
+    return pd.read_csv(input_path, encoding="utf-8", dtype={"debater_id": "int64"})
 
 
 def save_debater_names(names: set[str], output_path: Path) -> None:
@@ -142,11 +220,12 @@ def load_debater_names(input_path: Path) -> set[str]:
         return {line.strip() for line in f if line.strip()}
 
 
-def parse_name(full_name: str) -> DebaterName:
+def parse_name(full_name: str, debater_id: int | None = None) -> DebaterName:
     """Split full name into first and last name.
 
     Args:
         full_name: Full name string (e.g., "Novák Jakub")
+        debater_id: Site id of the debater, if known
 
     Returns:
         DebaterName object with parsed components
@@ -160,7 +239,12 @@ def parse_name(full_name: str) -> DebaterName:
         last_name = parts[0] if parts else ""
         first_name = ""
 
-    return DebaterName(full_name=full_name, first_name=first_name, last_name=last_name)
+    return DebaterName(
+        full_name=full_name,
+        first_name=first_name,
+        last_name=last_name,
+        debater_id=debater_id,
+    )
 
 
 def guess_gender_from_lastname(last_name: str) -> Gender | None:
@@ -182,22 +266,23 @@ def guess_gender_from_lastname(last_name: str) -> Gender | None:
 
 
 def guess_gender_from_firstname(
-    first_name: str, male_names: set[str], female_names: set[str]
+    first_name: str, male_names: Collection[str], female_names: Collection[str]
 ) -> Gender:
     """Match first name against name lists.
 
     Args:
         first_name: First name to check
-        male_names: Set of male first names
-        female_names: Set of female first names
+        male_names: Male first names (set or NameList)
+        female_names: Female first names (set or NameList)
 
     Returns:
         Gender enum value
     """
-    first_name_lower = first_name.lower().strip()
+    # Normalized like the lists, so sets and NameLists answer alike
+    first_name_key = normalize_name(first_name)
 
-    is_female = first_name_lower in female_names
-    is_male = first_name_lower in male_names
+    is_female = first_name_key in female_names
+    is_male = first_name_key in male_names
 
     if is_female and not is_male:
         return Gender.FEMALE
@@ -208,19 +293,23 @@ def guess_gender_from_firstname(
 
 
 def guess_gender(
-    full_name: str, male_names: set[str], female_names: set[str]
+    full_name: str,
+    male_names: Collection[str],
+    female_names: Collection[str],
+    debater_id: int | None = None,
 ) -> GenderGuess:
     """Main gender guessing function using 2-step approach.
 
     Args:
         full_name: Full debater name
-        male_names: Set of male first names
-        female_names: Set of female first names
+        male_names: Male first names (set or NameList)
+        female_names: Female first names (set or NameList)
+        debater_id: Site id of the debater, if known
 
     Returns:
         GenderGuess object with results
     """
-    debater_name = parse_name(full_name)
+    debater_name = parse_name(full_name, debater_id)
 
     gender_from_lastname = guess_gender_from_lastname(debater_name.last_name)
     if gender_from_lastname == Gender.FEMALE:
@@ -248,50 +337,213 @@ def guess_gender(
     )
 
 
+def name_classes(debaters: pd.DataFrame) -> pd.DataFrame:
+    """The parts of each debater's name that guess_gender depends on.
+
+    A guess depends only on whether the last name has a female suffix and,
+    if it does not, on the lowercased first name, so debaters sharing both
+    get the same guess. Names are split as in parse_name.
+
+    Args:
+        debaters: DataFrame with a debater_name column
+
+    Returns:
+        DataFrame aligned with debaters, with female_suffix and first_name
+        columns (first_name is empty when female_suffix is set)
+    """
+    suffixes = tuple(CZECH_FEMALE_SUFFIXES)
+    female_suffix = []
+    first_names = []
+    # Plain string methods beat the pandas .str accessors here severalfold
+    for name in debaters["debater_name"].tolist():
+        parts = name.split(None, 2)
+        is_female = bool(parts) and parts[0].lower().endswith(suffixes)
+        female_suffix.append(is_female)
+        first_names.append("" if is_female or len(parts) < 2 else parts[1].lower())
+    return pd.DataFrame(
+        {"female_suffix": female_suffix, "first_name": first_names},
+        index=debaters.index,
+    )
+
+
+def resolve_name_class(
+    female_suffix: bool,
+    first_name: str,
+    male_names: Collection[str],
+    female_names: Collection[str],
+) -> tuple[Gender, GenderGuessMethod]:
+    """Gender guess of one name class, see name_classes and guess_gender."""
+    if female_suffix:
+        return Gender.FEMALE, GenderGuessMethod.LASTNAME_SUFFIX
+    gender = guess_gender_from_firstname(first_name, male_names, female_names)
+    if gender != Gender.INCONCLUSIVE:
+        return gender, GenderGuessMethod.FIRSTNAME_MATCH
+    return Gender.INCONCLUSIVE, GenderGuessMethod.INCONCLUSIVE
+
+
+def first_name_table(
+    classes: pd.DataFrame,
+    male_names: Collection[str],
+    female_names: Collection[str],
+    cache: ResultsCache | None = None,
+    key: str | None = None,
+) -> tuple[pd.DataFrame, int]:
+    """Resolve each distinct name class once.
+
+    Args:
+        classes: Name classes of the debaters, see name_classes
+        male_names: Male first names (set or NameList)
+        female_names: Female first names (set or NameList)
+        cache: Results cache to reuse guesses from, if any
+        key: Cache key covering the name lists (required with a cache)
+
+    Returns:
+        Tuple of (DataFrame with female_suffix, first_name, debaters,
+        gender and method_used columns, most frequent classes first;
+        number of classes that were not cached)
+    """
+    table = (
+        classes.value_counts(sort=False)
+        .rename("debaters")
+        .reset_index()
+        .sort_values(
+            ["debaters", "female_suffix", "first_name"],
+            ascending=[False, True, True],
+            ignore_index=True,
+        )
+    )
+    classes = list(zip(table["female_suffix"].tolist(), table["first_name"].tolist()))
+
+    def resolve(missing: list[tuple[bool, str]]) -> list[list[str]]:
+        return [
+            [gender.value, method.value]
+            for gender, method in (
+                resolve_name_class(female_suffix, first_name, male_names, female_names)
+                for female_suffix, first_name in missing
+            )
+        ]
+
+    if cache is None:
+        resolved = resolve(classes)
+        computed = len(classes)
+    else:
+        # Cache entries are JSON objects, so classes are keyed as strings
+        items = [f"{int(female_suffix)}:{name}" for female_suffix, name in classes]
+        encoded, computed = cached_map(
+            cache,
+            key,
+            items,
+            lambda missing: resolve([(item[0] == "1", item[2:]) for item in missing]),
+        )
+        resolved = [encoded[item] for item in items]
+
+    table["gender"] = [gender for gender, _ in resolved]
+    table["method_used"] = [method for _, method in resolved]
+    return table, computed
+
+
+def guess_genders(
+    debaters: pd.DataFrame, classes: pd.DataFrame, table: pd.DataFrame
+) -> pd.DataFrame:
+    """Broadcast the guesses of the name classes back to the debaters.
+
+    Args:
+        debaters: DataFrame with debater_id and debater_name columns
+        classes: Name classes of the debaters, see name_classes
+        table: Resolved name classes, see first_name_table
+
+    Returns:
+        DataFrame with GENDER_COLUMNS and a gender column, in debater order
+    """
+    guesses = pd.concat([debaters[DEBATER_COLUMNS], classes], axis=1).merge(
+        table[["female_suffix", "first_name", "gender", "method_used"]],
+        on=["female_suffix", "first_name"],
+        how="left",
+        validate="many_to_one",
+    )
+    guesses["is_male"] = guesses["gender"] == Gender.MALE.value
+    guesses["inconclusive"] = guesses["gender"] == Gender.INCONCLUSIVE.value
+    return guesses[GENDER_COLUMNS + ["gender"]]
+
+
+def load_name_list(path: Path) -> Collection[str]:
+    """Load a first name list.
+
+    Args:
+        path: Text list (one name per line) or a list compiled by
+            name_lists.compile_name_file, which is memory-mapped instead
+
+    Returns:
+        Set of normalized names or a NameList; empty if the file is missing
+    """
+    if not path.exists():
+        return set()
+    if path.suffix == COMPILED_SUFFIX:
+        return NameList(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return normalized_names(f)
+
+
 def load_name_lists(
     male_names_path: Path, female_names_path: Path
-) -> tuple[set[str], set[str]]:
+) -> tuple[Collection[str], Collection[str]]:
     """Load Czech/English male and female name lists.
 
     Args:
-        male_names_path: Path to male names file
-        female_names_path: Path to female names file
+        male_names_path: Path to male names file (text or compiled)
+        female_names_path: Path to female names file (text or compiled)
 
     Returns:
         Tuple of (male_names, female_names)
     """
-    male_names = set()
-    female_names = set()
-
-    if male_names_path.exists():
-        with open(male_names_path, "r", encoding="utf-8") as f:
-            male_names = {line.strip().lower() for line in f if line.strip()}
+    return load_name_list(male_names_path), load_name_list(female_names_path)
 
-    if female_names_path.exists():
-        with open(female_names_path, "r", encoding="utf-8") as f:
-            female_names = {line.strip().lower() for line in f if line.strip()}
 
-    return male_names, female_names
-
-
-def save_gender_results(results: list[GenderGuess], output_path: Path) -> None:
+def save_gender_results(
+    results: list[GenderGuess] | pd.DataFrame, output_path: Path, parquet: bool = False
+) -> None:
     """Save gender guessing results to CSV.
 
     Args:
-        results: List of GenderGuess objects
+        results: List of GenderGuess objects, or a DataFrame with
+            GENDER_COLUMNS (see guess_genders)
         output_path: Path to output CSV file
+        parquet: Also write the results as Parquet next to the CSV
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(results, pd.DataFrame):
+        rows = results[GENDER_COLUMNS].itertuples(index=False, name=None)
+    else:
+        rows = (
+            (
+                r.debater_name.debater_id,
+                r.debater_name.full_name,
+                r.gender == Gender.MALE,
+                r.gender == Gender.INCONCLUSIVE,
+                r.method_used.value,
+            )
+            for r in results
+        )
+    write_table(
+        output_path,
+        GENDER_COLUMNS,
+        rows,
+        parquet=parquet,
+        column_types={"debater_id": "int64"},
+    )
+
 
-    data = {
-        "debater_name": [r.debater_name.full_name for r in results],
-        "is_male": [r.gender == Gender.MALE for r in results],
-        "inconclusive": [r.gender == Gender.INCONCLUSIVE for r in results],
-        "method_used": [r.method_used.value for r in results],
-    }
+def save_first_name_table(table: pd.DataFrame, output_path: Path) -> None:
+    """Save the resolved name classes to CSV, see first_name_table.
 
-    df = pd.DataFrame(data)
-    df.to_csv(output_path, index=False, encoding="utf-8")
+    Args:
+        table: Resolved name classes
+        output_path: Path to output CSV file
+    """
+    write_table(
+        output_path,
+        FIRST_NAME_TABLE_COLUMNS,
+        table[FIRST_NAME_TABLE_COLUMNS].itertuples(index=False, name=None),
+    )
 
 
 def cmd_extract_names(args):
@@ -300,11 +552,11 @@ def cmd_extract_names(args):
     output_path = Path(args.output)
 
     print(f"Extracting names from: {input_path}")
-    debater_names = extract_debater_names(input_path)
-    print(f"Found {len(debater_names)} unique debater names")
+    debaters = extract_debaters(input_path, args.workers)
+    print(f"Found {len(debaters)} unique debaters")
 
-    save_debater_names(debater_names, output_path)
-    print(f"Saved debater names to: {output_path}")
+    save_debaters(debaters, output_path)
+    print(f"Saved debaters to: {output_path}")
 
 
 def cmd_analyze(args):
@@ -314,9 +566,9 @@ def cmd_analyze(args):
     female_names_path = Path(args.female_names_file)
     output_path = Path(args.output)
 
-    print(f"Loading debater names from: {debater_names_path}")
-    debater_names = load_debater_names(debater_names_path)
-    print(f"Loaded {len(debater_names)} debater names")
+    print(f"Loading debaters from: {debater_names_path}")
+    debaters = load_debaters(debater_names_path)
+    print(f"Loaded {len(debaters)} debaters")
 
     print("Loading name lists...")
     male_names, female_names = load_name_lists(male_names_path, female_names_path)
@@ -324,22 +576,38 @@ def cmd_analyze(args):
     print(f"  Female names: {len(female_names)}")
 
     print("Analyzing genders...")
-    results = []
-    for name in sorted(debater_names):
-        result = guess_gender(name, male_names, female_names)
-        results.append(result)
+    debaters = debaters.sort_values(["debater_name", "debater_id"])
+    classes = name_classes(debaters)
+    if args.no_cache:
+        table, computed = first_name_table(classes, male_names, female_names)
+    else:
+        key = cache_key(
+            "gender_name_class",
+            ALGORITHM_VERSION,
+            [male_names_path, female_names_path],
+        )
+        table, computed = first_name_table(
+            classes, male_names, female_names, ResultsCache(Path(args.cache_dir)), key
+        )
+    print(
+        f"Name classes: {len(table)}, cached: {len(table) - computed}, "
+        f"computed: {computed}"
+    )
+    results = guess_genders(debaters, classes, table)
 
-    save_gender_results(results, output_path)
+    save_gender_results(results, output_path, parquet=args.parquet)
     print(f"Gender results saved to: {output_path}")
 
-    male_count = sum(1 for r in results if r.gender == Gender.MALE)
-    female_count = sum(1 for r in results if r.gender == Gender.FEMALE)
-    inconclusive_count = sum(1 for r in results if r.gender == Gender.INCONCLUSIVE)
+    first_names_path = Path(args.first_names)
+    save_first_name_table(table, first_names_path)
+    print(f"First name table saved to: {first_names_path}")
+
+    counts = results["gender"].value_counts()
 
     print("\nSummary:")
-    print(f"  Male: {male_count}")
-    print(f"  Female: {female_count}")
-    print(f"  Inconclusive: {inconclusive_count}")
+    print(f"  Male: {counts.get(Gender.MALE.value, 0)}")
+    print(f"  Female: {counts.get(Gender.FEMALE.value, 0)}")
+    print(f"  Inconclusive: {counts.get(Gender.INCONCLUSIVE.value, 0)}")
 
 
 def main():
@@ -366,8 +634,14 @@ def main():
         "-o",
         "--output",
         type=str,
-        default=str(PATH_TO_DEBATER_NAMES),
-        help=f"Output text file path (default: {PATH_TO_DEBATER_NAMES})",
+        default=str(PATH_TO_DEBATERS),
+        help=f"Output CSV file path (default: {PATH_TO_DEBATERS})",
+    )
+    extract_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes parsing chunks of the CSV (default: 1)",
     )
 
     # analyze command
@@ -378,22 +652,24 @@ def main():
         "-d",
         "--debater-names-file",
         type=str,
-        default=str(PATH_TO_DEBATER_NAMES),
-        help=f"Debater names file path (default: {PATH_TO_DEBATER_NAMES})",
+        default=str(PATH_TO_DEBATERS),
+        help=f"Debaters CSV or names text file path (default: {PATH_TO_DEBATERS})",
     )
     analyze_parser.add_argument(
         "-m",
         "--male-names-file",
         type=str,
         default=str(PATH_TO_MALE_NAMES),
-        help=f"Male names file path (default: {PATH_TO_MALE_NAMES})",
+        help="Male names file path, text or compiled with "
+        f"`name_lists compile` (default: {PATH_TO_MALE_NAMES})",
     )
     analyze_parser.add_argument(
         "-f",
         "--female-names-file",
         type=str,
         default=str(PATH_TO_FEMALE_NAMES),
-        help=f"Female names file path (default: {PATH_TO_FEMALE_NAMES})",
+        help="Female names file path, text or compiled with "
+        f"`name_lists compile` (default: {PATH_TO_FEMALE_NAMES})",
     )
     analyze_parser.add_argument(
         "-o",
@@ -402,6 +678,29 @@ def main():
         default=str(PATH_TO_GENDER_OUTPUT),
         help=f"Output CSV file path (default: {PATH_TO_GENDER_OUTPUT})",
     )
+    analyze_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(PATH_TO_RESULTS_CACHE),
+        help=f"Results cache directory (default: {PATH_TO_RESULTS_CACHE})",
+    )
+    analyze_parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Analyze every name without reading or writing the cache",
+    )
+    analyze_parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Also write the results as Parquet (requires pyarrow)",
+    )
+    analyze_parser.add_argument(
+        "--first-names",
+        type=str,
+        default=str(PATH_TO_FIRST_NAME_TABLE),
+        help="Output CSV path of the resolved first name table "
+        f"(default: {PATH_TO_FIRST_NAME_TABLE})",
+    )
 
     args = parser.parse_args()
 
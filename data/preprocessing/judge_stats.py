@@ -0,0 +1,338 @@
+"""Per-judge ballot statistics.
+
+Aggregates every ballot per judge in one grouped pass: aff/neg vote share,
+how often the judge dissents from the panel majority, how often their own
+decision is a clear 3:0, and how generous the speaker points of their
+debates are compared to the rest of the tournament.
+
+The state keeps additive counts per judge plus the ids of the debates
+already counted, so new debates are folded in without recounting history.
+Point offsets are measured against the tournament means known at the time a
+debate is counted.
+
+Example usage:
+    python -m data.preprocessing.judge_stats update
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from data.preprocessing.debate_store import (
+    SCORE_PATTERN,
+    DebateStore,
+    load_debate_store,
+    tournament_keys,
+)
+from data.preprocessing.lazy_imports import lazy_import
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_JUDGE_STATE = PROJECT_ROOT / "data" / "processed" / "judge_state.npz"
+PATH_TO_JUDGE_STATS = PROJECT_ROOT / "data" / "processed" / "judge_stats.csv"
+
+COUNT_COLUMNS = [
+    "ballots",
+    "aff_votes",
+    "neg_votes",
+    "panel_votes",
+    "dissents",
+    "scored_ballots",
+    "clear_ballots",
+    "points_offset_sum",
+    "points_offset_count",
+]
+JUDGE_STATS_COLUMNS = [
+    "judge_id",
+    "judge_name",
+    "ballots",
+    "aff_share",
+    "dissent_rate",
+    "clear_share",
+    "points_offset",
+]
+
+
+def _empty_counts() -> pd.DataFrame:
+    counts = pd.DataFrame({column: [] for column in ["judge_id", *COUNT_COLUMNS]})
+    return counts.astype(np.int64).astype(
+        {"points_offset_sum": np.float64, "points_offset_count": np.int64}
+    )
+
+
+@dataclass
+class JudgeStatsState:
+    """Additive per-judge counts and the debates they were counted from."""
+
+    counts: pd.DataFrame = field(default_factory=_empty_counts)
+    debate_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+
+def debate_points_offsets(
+    store: DebateStore, debate_ids: np.ndarray | None = None
+) -> pd.Series:
+    """Mean speaker points of each debate minus its tournament's mean.
+
+    Debates without speaker points or without a tournament are left out.
+
+    Args:
+        store: Debate history
+        debate_ids: Only the offsets of these debates (default: all); the
+            tournament means still cover every debate of their tournaments
+
+    Returns:
+        Series of point offsets indexed by debate_id
+    """
+    debates = store.debates
+    tournament = pd.Series(
+        tournament_keys(debates).to_numpy(), index=debates["debate_id"]
+    ).dropna()
+    if debate_ids is not None:
+        selected = tournament[tournament.index.isin(debate_ids)]
+        tournament = tournament[tournament.isin(selected)]
+
+    points = store.performances[["debate_id", "points"]].dropna()
+    points = points[points["debate_id"].isin(tournament.index)]
+    points = points.assign(
+        points=points["points"].astype(np.float64),
+        tournament=points["debate_id"].map(tournament),
+    )
+
+    debate_means = points.groupby("debate_id")["points"].mean()
+    tournament_means = points.groupby("tournament")["points"].mean()
+    debate_tournaments = points.drop_duplicates("debate_id").set_index("debate_id")
+    offsets = debate_means - debate_tournaments["tournament"].map(tournament_means)
+    if debate_ids is not None:
+        offsets = offsets[offsets.index.isin(debate_ids)]
+    return offsets
+
+
+def count_judge_ballots(
+    store: DebateStore, debate_ids: np.ndarray | None = None
+) -> pd.DataFrame:
+    """Count the ballots of every judge.
+
+    Args:
+        store: Debate history
+        debate_ids: Only count ballots of these debates (default: all)
+
+    Returns:
+        DataFrame with judge_id and the COUNT_COLUMNS
+    """
+    offsets = debate_points_offsets(store, debate_ids)
+    if debate_ids is not None:
+        store = store.only_debates(debate_ids)
+    ballots = store.ballots
+    if ballots.empty:
+        return _empty_counts()
+
+    winners = store.outcomes().set_index("debate_id")["winner_side"]
+    winner = ballots["debate_id"].map(winners)
+    panel_size = ballots.groupby("debate_id")["judge_id"].transform("size")
+    voted = ballots["side"].isin(["aff", "neg"])
+    panel_vote = voted & (panel_size > 1) & winner.notna()
+
+    split = ballots["score"].astype("string").str.extract(SCORE_PATTERN)
+    scored = split[1].notna()
+
+    offsets = ballots["debate_id"].map(offsets)
+
+    counts = pd.DataFrame(
+        {
+            "judge_id": ballots["judge_id"],
+            "ballots": 1,
+            "aff_votes": (ballots["side"] == "aff").astype(np.int64),
+            "neg_votes": (ballots["side"] == "neg").astype(np.int64),
+            "panel_votes": panel_vote.astype(np.int64),
+            "dissents": (panel_vote & (ballots["side"] != winner)).astype(np.int64),
+            "scored_ballots": scored.astype(np.int64),
+            "clear_ballots": (scored & (split[1] == "0")).astype(np.int64),
+            "points_offset_sum": offsets.fillna(0.0).astype(np.float64),
+            "points_offset_count": offsets.notna().astype(np.int64),
+        }
+    )
+    return counts.groupby("judge_id", as_index=False).sum()
+
+
+def merge_counts(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Add two per-judge count tables."""
+    if old.empty:
+        return new.reset_index(drop=True)
+    merged = pd.concat([old, new], ignore_index=True)
+    return merged.groupby("judge_id", as_index=False).sum()
+
+
+def update_judge_stats(
+    store: DebateStore, state: JudgeStatsState | None = None
+) -> JudgeStatsState:
+    """Count the ballots of debates the state has not seen yet.
+
+    Debates are identified by id, so a debate refreshed after it was counted
+    is not counted again; start from an empty state to recount.
+
+    Args:
+        store: Debate history
+        state: Counts to continue from (default: empty)
+
+    Returns:
+        New JudgeStatsState
+    """
+    state = state or JudgeStatsState()
+    new_ids = np.setdiff1d(
+        store.debates["debate_id"].to_numpy(dtype=np.int64), state.debate_ids
+    )
+    if len(new_ids) == 0:
+        return state
+
+    return JudgeStatsState(
+        counts=merge_counts(state.counts, count_judge_ballots(store, new_ids)),
+        debate_ids=np.union1d(state.debate_ids, new_ids),
+    )
+
+
+def judge_stats(counts: pd.DataFrame, judges: pd.DataFrame) -> pd.DataFrame:
+    """Derive the per-judge rates from the counts.
+
+    Args:
+        counts: Per-judge counts
+        judges: Judge name dimension (judge_id, judge_name)
+
+    Returns:
+        DataFrame with the JUDGE_STATS_COLUMNS; rates are NaN when the judge
+        has no ballots they apply to
+    """
+
+    def ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+        return numerator / denominator.where(denominator > 0)
+
+    stats = pd.DataFrame(
+        {
+            "judge_id": counts["judge_id"],
+            "ballots": counts["ballots"],
+            "aff_share": ratio(
+                counts["aff_votes"], counts["aff_votes"] + counts["neg_votes"]
+            ),
+            "dissent_rate": ratio(counts["dissents"], counts["panel_votes"]),
+            "clear_share": ratio(counts["clear_ballots"], counts["scored_ballots"]),
+            "points_offset": ratio(
+                counts["points_offset_sum"], counts["points_offset_count"]
+            ),
+        }
+    )
+    stats = stats.merge(judges, on="judge_id", how="left")
+    return stats[JUDGE_STATS_COLUMNS].sort_values("judge_id", ignore_index=True)
+
+
+def save_judge_state(state: JudgeStatsState, output_path: Path) -> None:
+    """Save the judge counts as a NumPy archive."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        np.savez(
+            f,
+            debate_ids=state.debate_ids,
+            **{
+                column: state.counts[column].to_numpy()
+                for column in ["judge_id", *COUNT_COLUMNS]
+            },
+        )
+
+
+def load_judge_state(input_path: Path) -> JudgeStatsState:
+    """Load a state saved by save_judge_state."""
+    with np.load(input_path) as data:
+        return JudgeStatsState(
+            counts=pd.DataFrame(
+                {column: data[column] for column in ["judge_id", *COUNT_COLUMNS]}
+            ),
+            debate_ids=data["debate_ids"],
+        )
+
+
+def save_judge_stats(stats: pd.DataFrame, output_path: Path) -> None:
+    """Save the per-judge table to CSV."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    stats.round(4).to_csv(output_path, index=False, encoding="utf-8")
+
+    logger.info(f"Saved judge stats to: {output_path}")
+
+
+def cmd_update(args):
+    """Command to count new ballots and export the judge table."""
+    input_path = Path(args.input)
+    state_path = Path(args.state)
+    output_path = Path(args.output)
+
+    print(f"Loading debates from: {input_path}")
+    store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    state = None
+    if state_path.exists() and not args.full:
+        state = load_judge_state(state_path)
+    counted = len(state.debate_ids) if state else 0
+    state = update_judge_stats(store, state)
+    save_judge_state(state, state_path)
+    print(f"Counted ballots of {len(state.debate_ids) - counted} new debates")
+
+    stats = judge_stats(state.counts, store.judges)
+    save_judge_stats(stats, output_path)
+    print(f"Saved stats of {len(stats)} judges to: {output_path}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Per-judge ballot statistics",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # update command
+    update_parser = subparsers.add_parser(
+        "update", help="Count new ballots and export the judge table"
+    )
+    update_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    update_parser.add_argument(
+        "-s",
+        "--state",
+        type=str,
+        default=str(PATH_TO_JUDGE_STATE),
+        help=f"Judge state file path (default: {PATH_TO_JUDGE_STATE})",
+    )
+    update_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Discard the saved state and count every ballot again",
+    )
+    update_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=str(PATH_TO_JUDGE_STATS),
+        help=f"Output CSV file path (default: {PATH_TO_JUDGE_STATS})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "update":
+        cmd_update(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,57 @@
+"""Deferred imports of heavy dependencies.
+
+The preprocessing CLIs import pandas and NumPy at module level, but most of
+the time of a short command such as `--help` would go to importing them.
+`lazy_import` returns a module object that performs the actual import on
+first attribute access, so a module can keep writing `pd.DataFrame` while
+paying for pandas only once a subcommand uses it.
+
+Modules using it should start with `from __future__ import annotations`,
+so that annotations such as `pd.DataFrame` are not evaluated at import.
+
+Example usage:
+    from data.preprocessing.lazy_imports import lazy_import
+
+    np = lazy_import("numpy")
+    pd = lazy_import("pandas")
+"""
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Module that is imported on first attribute access.
+
+    Args:
+        name: Absolute module name (e.g. "pandas")
+
+    Returns:
+        The module if it is already imported, a lazy module otherwise
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load(module: ModuleType) -> ModuleType:
+    """Finish a lazy import now, e.g. before forking worker processes.
+
+    Args:
+        module: Module returned by lazy_import
+
+    Returns:
+        The same module, fully imported
+    """
+    # LazyLoader executes the module on its first attribute access
+    getattr(module, "__name__")
+    return module
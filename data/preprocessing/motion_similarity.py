@@ -0,0 +1,460 @@
+"""Near-duplicate clustering and similarity search over motions.
+
+The same motion is often entered with small wording differences ("vztahu"
+vs "vztahů", a trailing full stop). Motions are compared on their
+`normalize_motion` words in two ways:
+
+- MinHash signatures of character shingles, bucketed with LSH banding,
+  find near-duplicate candidates without comparing every pair; candidates
+  above a Jaccard threshold are merged into one canonical motion.
+- TF-IDF vectors in an inverted index answer "motions similar to X" by
+  scoring only the motions that share a word with the query.
+
+Example usage:
+    python -m data.preprocessing.motion_similarity cluster
+    python -m data.preprocessing.motion_similarity similar "Hotovost by měla být zrušena"
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import zlib
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from data.preprocessing.categorize_motions import (
+    PATH_TO_MOTION_CLUSTERS,
+    PATH_TO_MOTIONS_LIST,
+    load_motions,
+    normalize_motion,
+)
+from data.preprocessing.lazy_imports import lazy_import
+from data.preprocessing.results_cache import hash_file
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+SHINGLE_SIZE = 4
+DEFAULT_THRESHOLD = 0.7
+# Two motions become candidates with probability 1 - (1 - J**rows)**bands at
+# shingle Jaccard similarity J; the S-curve rises at (1 / bands)**(1 / rows),
+# about 0.68, so pairs far below DEFAULT_THRESHOLD are rarely compared
+LSH_BANDS = 10
+LSH_ROWS = 6
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+DEFAULT_TOP_K = 10
+
+_MERSENNE_PRIME = (1 << 31) - 1
+
+
+@functools.cache
+def _hash_coefficients() -> tuple[np.ndarray, np.ndarray]:
+    """(a, b) of the NUM_PERMUTATIONS hashes `(a * x + b) % _MERSENNE_PRIME`.
+
+    Built on first use, so importing the module does not load NumPy.
+    """
+    rng = np.random.default_rng(20240601)
+    hash_a = rng.integers(1, _MERSENNE_PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+    hash_b = rng.integers(0, _MERSENNE_PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+    return hash_a, hash_b
+
+
+def motion_words(motion_text: str) -> list[str]:
+    """Normalized words of a motion, as used by the categorizer."""
+    return normalize_motion(motion_text).normalized_words
+
+
+def shingles(words: list[str], size: int = SHINGLE_SIZE) -> frozenset[int]:
+    """Hashed character shingles of the space-joined words.
+
+    Args:
+        words: Normalized motion words
+        size: Shingle length in characters
+
+    Returns:
+        Set of distinct 31-bit shingle hashes
+    """
+    text = " ".join(words)
+    if len(text) <= size:
+        grams = [text] if text else []
+    else:
+        grams = [text[i : i + size] for i in range(len(text) - size + 1)]
+    return frozenset(
+        zlib.crc32(gram.encode("utf-8")) % _MERSENNE_PRIME for gram in grams
+    )
+
+
+def minhash_signature(shingle_hashes: frozenset[int]) -> np.ndarray:
+    """MinHash signature of a shingle set under NUM_PERMUTATIONS hashes."""
+    if not shingle_hashes:
+        return np.full(NUM_PERMUTATIONS, _MERSENNE_PRIME, dtype=np.uint64)
+    hash_a, hash_b = _hash_coefficients()
+    shingle_hashes = np.fromiter(
+        shingle_hashes, dtype=np.uint64, count=len(shingle_hashes)
+    )
+    permuted = (
+        hash_a[:, None] * shingle_hashes[None, :] + hash_b[:, None]
+    ) % _MERSENNE_PRIME
+    return permuted.min(axis=1)
+
+
+def jaccard(a: frozenset[int], b: frozenset[int]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def candidate_buckets(
+    signatures: np.ndarray, bands: int = LSH_BANDS
+) -> Iterator[list[int]]:
+    """Groups of rows whose signatures agree on one LSH band.
+
+    Every pair of rows agreeing on at least one band shares a bucket.
+
+    Args:
+        signatures: MinHash signatures, one row per motion
+        bands: Number of bands the signature is split into
+
+    Yields:
+        Rows of each bucket with more than one member, in ascending order
+    """
+    rows_per_band = signatures.shape[1] // bands
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_values = signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        for row, key in enumerate(map(bytes, band_values)):
+            buckets[key].append(row)
+        yield from (members for members in buckets.values() if len(members) > 1)
+
+
+def candidate_pairs(signatures: np.ndarray, bands: int = LSH_BANDS) -> set:
+    """Pairs of rows whose signatures agree on at least one LSH band.
+
+    Args:
+        signatures: MinHash signatures, one row per motion
+        bands: Number of bands the signature is split into
+
+    Returns:
+        Set of (i, j) row pairs with i < j
+    """
+    return {
+        (first, second)
+        for members in candidate_buckets(signatures, bands)
+        for i, first in enumerate(members)
+        for second in members[i + 1 :]
+    }
+
+
+@dataclass
+class MotionIndex:
+    """Similarity index over a motion list.
+
+    `canonical[i]` is the row of the canonical motion of `motions[i]`. The
+    TF-IDF postings of term `t` are `term_motions[term_offsets[t]:term_offsets[t + 1]]`
+    with matching L2-normalized `term_weights`. Lookups cost time in the
+    size of the query's postings, not of the index, so a batch of queries
+    against one index stays linear.
+    """
+
+    motions: list[str]
+    canonical: np.ndarray
+    vocabulary: dict[str, int]
+    idf: np.ndarray
+    term_offsets: np.ndarray
+    term_motions: np.ndarray
+    term_weights: np.ndarray
+    rows: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.rows = {motion: row for row, motion in enumerate(self.motions)}
+
+    def canonical_motion(self, motion_text: str) -> str:
+        """Canonical form of an indexed motion (the motion itself otherwise)."""
+        row = self.rows.get(motion_text)
+        if row is None:
+            return motion_text
+        return self.motions[self.canonical[row]]
+
+    def clusters(self) -> dict[str, list[str]]:
+        """Variants of every canonical motion, canonical form first."""
+        clusters = defaultdict(list)
+        is_variant = self.canonical != np.arange(len(self.motions))
+        for row in np.argsort(is_variant, kind="stable"):
+            clusters[self.motions[self.canonical[row]]].append(self.motions[row])
+        return dict(clusters)
+
+    def similar(self, motion_text: str, k: int = DEFAULT_TOP_K) -> list[tuple]:
+        """Indexed motions most similar to a text by TF-IDF cosine.
+
+        Args:
+            motion_text: Query motion (need not be indexed)
+            k: Number of results
+
+        Returns:
+            List of (motion, similarity) pairs, most similar first
+        """
+        words = [w for w in motion_words(motion_text) if w in self.vocabulary]
+        if not words:
+            return []
+        terms, tf = np.unique([self.vocabulary[w] for w in words], return_counts=True)
+        query = tf * self.idf[terms]
+        query /= np.linalg.norm(query)
+
+        # Score only the motions in the query terms' postings
+        starts, ends = self.term_offsets[terms], self.term_offsets[terms + 1]
+        positions = np.concatenate(
+            [np.arange(start, end) for start, end in zip(starts, ends)]
+        )
+        rows, inverse = np.unique(self.term_motions[positions], return_inverse=True)
+        scores = np.bincount(
+            inverse,
+            weights=self.term_weights[positions] * np.repeat(query, ends - starts),
+            minlength=len(rows),
+        )
+
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = sorted(top, key=lambda i: (-scores[i], self.motions[rows[i]]))
+        return [(self.motions[rows[i]], round(float(scores[i]), 4)) for i in top]
+
+
+def _tfidf_postings(word_lists: list[list[str]]):
+    vocabulary: dict[str, int] = {}
+    term_ids, motion_rows = [], []
+    for row, words in enumerate(word_lists):
+        for word in words:
+            term_ids.append(vocabulary.setdefault(word, len(vocabulary)))
+            motion_rows.append(row)
+    term_ids = np.array(term_ids, dtype=np.int64)
+    motion_rows = np.array(motion_rows, dtype=np.int64)
+
+    # Term frequencies as (term, motion) pair counts, grouped by term
+    pair_keys, tf = np.unique(
+        term_ids * len(word_lists) + motion_rows, return_counts=True
+    )
+    terms, motions = np.divmod(pair_keys, max(len(word_lists), 1))
+    df = np.bincount(terms, minlength=len(vocabulary))
+    idf = np.log((1 + len(word_lists)) / (1 + df)) + 1.0
+
+    weights = tf * idf[terms]
+    norms = np.sqrt(np.bincount(motions, weights=weights**2, minlength=len(word_lists)))
+    weights = weights / norms[motions]
+
+    offsets = np.r_[0, np.cumsum(df)].astype(np.int64)
+    return vocabulary, idf, offsets, motions, weights
+
+
+def build_motion_index(
+    motions, counts: dict[str, int] | None = None, threshold: float = DEFAULT_THRESHOLD
+) -> MotionIndex:
+    """Cluster near-duplicate motions and index them for similarity search.
+
+    Args:
+        motions: Motion texts
+        counts: Optional number of debates per motion; the most debated
+            variant becomes the canonical motion of its cluster
+        threshold: Minimum shingle Jaccard similarity of two variants
+
+    Returns:
+        MotionIndex over the motions in sorted order
+    """
+    motions = sorted(set(motions))
+    word_lists = [motion_words(m) for m in motions]
+    shingle_sets = [shingles(words) for words in word_lists]
+    signatures = np.array(
+        [minhash_signature(s) for s in shingle_sets], dtype=np.uint64
+    ).reshape(len(motions), NUM_PERMUTATIONS)
+
+    parent = list(range(len(motions)))
+
+    def find(row):
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    # Buckets are compared as they come rather than collected into candidate
+    # pairs first; pairs already in one cluster need no comparison, so a
+    # bucket of k variants costs about k Jaccard comparisons, not k**2
+    for members in candidate_buckets(signatures):
+        for i, first in enumerate(members):
+            for second in members[i + 1 :]:
+                first_root, second_root = find(first), find(second)
+                if first_root == second_root:
+                    continue
+                if jaccard(shingle_sets[first], shingle_sets[second]) >= threshold:
+                    parent[first_root] = second_root
+
+    counts = counts or {}
+    roots = np.array([find(row) for row in range(len(motions))], dtype=np.int64)
+    # Most debated variant first, then the shortest, then alphabetical
+    order = np.lexsort(
+        (
+            np.arange(len(motions)),
+            np.array([len(m) for m in motions], dtype=np.int64),
+            -np.array([counts.get(m, 0) for m in motions], dtype=np.int64),
+            roots,
+        )
+    )
+    sorted_roots = roots[order]
+    is_best = np.ones(len(motions), dtype=bool)
+    is_best[1:] = sorted_roots[1:] != sorted_roots[:-1]
+    best = np.empty(len(motions), dtype=np.int64)
+    best[sorted_roots[is_best]] = order[is_best]
+    canonical = best[roots]
+
+    vocabulary, idf, offsets, term_motions, term_weights = _tfidf_postings(word_lists)
+    return MotionIndex(
+        motions=motions,
+        canonical=canonical,
+        vocabulary=vocabulary,
+        idf=idf,
+        term_offsets=offsets,
+        term_motions=term_motions,
+        term_weights=term_weights,
+    )
+
+
+def load_motion_index(
+    motions_path: Path, threshold: float = DEFAULT_THRESHOLD
+) -> MotionIndex:
+    """Motion index of a motions file, built once per file contents.
+
+    Args:
+        motions_path: Path to motions text file
+        threshold: Minimum shingle Jaccard similarity of two variants
+
+    Returns:
+        MotionIndex shared by every call with the same file contents
+    """
+    return _cached_motion_index(hash_file(motions_path), motions_path, threshold)
+
+
+@functools.cache
+def _cached_motion_index(
+    digest: str, motions_path: Path, threshold: float
+) -> MotionIndex:
+    return build_motion_index(load_motions(motions_path), threshold=threshold)
+
+
+def save_motion_clusters(index: MotionIndex, output_path: Path) -> None:
+    """Save the motion -> canonical motion mapping to CSV.
+
+    Args:
+        index: Motion index
+        output_path: Path to output CSV file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df = pd.DataFrame(
+        {
+            "motion": index.motions,
+            "canonical_motion": [index.motions[row] for row in index.canonical],
+        }
+    )
+    df.to_csv(output_path, index=False, encoding="utf-8")
+
+    logger.info(f"Saved motion clusters to: {output_path}")
+
+
+def cmd_cluster(args):
+    """Command to cluster motion variants into canonical motions."""
+    motions_path = Path(args.motions_file)
+    output_path = Path(args.output)
+
+    motions = load_motions(motions_path)
+    print(f"Loaded {len(motions)} motions")
+
+    index = build_motion_index(motions, threshold=args.threshold)
+    save_motion_clusters(index, output_path)
+
+    clusters = index.clusters()
+    print(f"Found {len(clusters)} canonical motions")
+    for canonical, variants in clusters.items():
+        if len(variants) > 1:
+            print(f"\n  {canonical}")
+            for variant in variants[1:]:
+                print(f"    ~ {variant}")
+    print(f"\nMotion clusters saved to: {output_path}")
+
+
+def cmd_similar(args):
+    """Command to list the motions most similar to each query text."""
+    index = load_motion_index(Path(args.motions_file))
+    for query in args.motion:
+        if len(args.motion) > 1:
+            print(f"\n{query}")
+        for motion, score in index.similar(query, k=args.top):
+            print(f"{score:.3f}  {motion}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Near-duplicate clustering and similarity search for motions",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # cluster command
+    cluster_parser = subparsers.add_parser(
+        "cluster", help="Cluster motion variants into canonical motions"
+    )
+    cluster_parser.add_argument(
+        "-m",
+        "--motions-file",
+        default=str(PATH_TO_MOTIONS_LIST),
+        help="Path to motions text file",
+    )
+    cluster_parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimum similarity of two variants (default: {DEFAULT_THRESHOLD})",
+    )
+    cluster_parser.add_argument(
+        "-o",
+        "--output",
+        default=str(PATH_TO_MOTION_CLUSTERS),
+        help="Path to output CSV file",
+    )
+    cluster_parser.set_defaults(func=cmd_cluster)
+
+    # similar command
+    similar_parser = subparsers.add_parser(
+        "similar", help="List the motions most similar to each text"
+    )
+    similar_parser.add_argument("motion", nargs="+", help="Motion texts to search for")
+    similar_parser.add_argument(
+        "-m",
+        "--motions-file",
+        default=str(PATH_TO_MOTIONS_LIST),
+        help="Path to motions text file",
+    )
+    similar_parser.add_argument(
+        "-k",
+        "--top",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help=f"Number of results (default: {DEFAULT_TOP_K})",
+    )
+    similar_parser.set_defaults(func=cmd_similar)
+
+    args = parser.parse_args()
+
+    if args.command is None:
+        parser.print_help()
+    else:
+        args.func(args)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
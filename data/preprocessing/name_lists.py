@@ -0,0 +1,207 @@
+"""Compiled first name lists with memory-mapped binary search lookups.
+
+The text name lists (one name per line) are compiled into a binary file of
+sorted, deduplicated, normalized names:
+
+    magic      8 bytes, MAGIC
+    count      uint32, number of names
+    offsets    count + 1 uint32, start of every name in the data section
+               followed by its end
+    data       UTF-8 names, concatenated in sorted (byte) order
+
+All integers are little-endian. A NameList memory-maps the file and answers
+membership by binary search directly on the mapped bytes, so opening a list
+parses nothing however long it is, and worker processes share its pages
+through the OS page cache instead of each building its own set.
+
+Example usage:
+    python -m data.preprocessing.name_lists compile
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import unicodedata
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from logger.logger import logger, setup_logging
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_MALE_NAMES = PROJECT_ROOT / "data" / "resources" / "male_names.txt"
+PATH_TO_FEMALE_NAMES = PROJECT_ROOT / "data" / "resources" / "female_names.txt"
+PATH_TO_COMPILED_NAMES = PROJECT_ROOT / "data" / "processed"
+
+MAGIC = b"NAMELST1"
+COUNT = struct.Struct("<I")
+OFFSET = struct.Struct("<I")
+HEADER_SIZE = len(MAGIC) + COUNT.size
+COMPILED_SUFFIX = ".bin"
+
+
+def normalize_name(name: str) -> str:
+    """Normalized form of a first name, as stored in name lists and looked up."""
+    return unicodedata.normalize("NFC", name.strip().lower())
+
+
+def normalized_names(names: Iterable[str]) -> set[str]:
+    """Distinct normalized names of a name list, skipping blank ones.
+
+    Shared by the compiler and the text list loader, so both kinds of list
+    hold the same names.
+    """
+    return {normalize_name(name) for name in names if name.strip()}
+
+
+def compiled_path(input_path: Path, output_dir: Path = PATH_TO_COMPILED_NAMES) -> Path:
+    """Path of the compiled list of a text name list."""
+    return output_dir / input_path.with_suffix(COMPILED_SUFFIX).name
+
+
+def compile_name_list(names: Iterable[str], output_path: Path) -> int:
+    """Write names as a compiled name list.
+
+    Args:
+        names: Names in any order; blank names are skipped
+        output_path: Path to output binary file
+
+    Returns:
+        Number of distinct names written
+    """
+    encoded = sorted(name.encode("utf-8") for name in normalized_names(names))
+    offsets = [0]
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(COUNT.pack(len(encoded)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(b"".join(encoded))
+    os.replace(tmp_path, output_path)
+    return len(encoded)
+
+
+def compile_name_file(input_path: Path, output_path: Path) -> int:
+    """Compile a text name list (one name per line).
+
+    Args:
+        input_path: Path to the text name list
+        output_path: Path to output binary file
+
+    Returns:
+        Number of distinct names written
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
+        count = compile_name_list(f, output_path)
+    logger.info(f"Compiled {count} names from {input_path} to: {output_path}")
+    return count
+
+
+class NameList:
+    """Read-only, memory-mapped compiled name list.
+
+    Supports `in`, `len` and iteration (in sorted order). Lookups normalize
+    the name first, like the compiler.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._data[: len(MAGIC)] != MAGIC:
+            self._data.close()
+            raise ValueError(f"Not a compiled name list: {path}")
+        (self._count,) = COUNT.unpack_from(self._data, len(MAGIC))
+        self._names_start = HEADER_SIZE + (self._count + 1) * OFFSET.size
+
+    def _name(self, index: int) -> bytes:
+        start, end = struct.unpack_from(
+            "<2I", self._data, HEADER_SIZE + index * OFFSET.size
+        )
+        return self._data[self._names_start + start : self._names_start + end]
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        key = normalize_name(name).encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            mid = (low + high) // 2
+            if self._name(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low < self._count and self._name(low) == key
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._name(index).decode("utf-8")
+
+    def close(self) -> None:
+        self._data.close()
+
+    def __enter__(self) -> "NameList":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.close()
+
+
+def cmd_compile(args):
+    """Command to compile text name lists."""
+    output_dir = Path(args.output_dir)
+    for input_path in map(Path, args.input):
+        output_path = compiled_path(input_path, output_dir)
+        count = compile_name_file(input_path, output_path)
+        print(f"Compiled {count} names to: {output_path}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compile first name lists for memory-mapped lookups",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # compile command
+    compile_parser = subparsers.add_parser(
+        "compile", help="Compile text name lists into binary name lists"
+    )
+    compile_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        nargs="+",
+        default=[str(PATH_TO_MALE_NAMES), str(PATH_TO_FEMALE_NAMES)],
+        help="Text name lists, one name per line (default: the male and "
+        "female name lists)",
+    )
+    compile_parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default=str(PATH_TO_COMPILED_NAMES),
+        help="Directory of the compiled lists, named after the inputs with a "
+        f"{COMPILED_SUFFIX} suffix (default: {PATH_TO_COMPILED_NAMES})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        cmd_compile(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,114 @@
+"""Parallel processing of the scraped debate CSV in byte-range chunks.
+
+The data rows of the CSV are split into contiguous byte ranges that start
+and end on record boundaries, and a function is mapped over the ranges in a
+process pool. Each worker reads only its own range (with the header
+prepended) and returns a partial result; the caller merges the partial
+results in range order, so the merged result does not depend on the number
+of workers.
+
+Record boundaries are the newlines outside quoted fields. Quoted fields may
+contain newlines, so they are found with one vectorized pass over the file:
+a newline ends a record when an even number of quote characters precede it
+(escaped quotes come in pairs and keep the parity). The header is expected
+on a single line.
+
+Example usage:
+    parts = map_chunks(extract_chunk, csv_path, workers=4)
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import io
+from collections.abc import Callable
+from pathlib import Path
+
+from data.preprocessing.lazy_imports import lazy_import, load
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+QUOTE = ord('"')
+NEWLINE = ord("\n")
+# Several ranges per worker even out rows that are slower to parse
+CHUNKS_PER_WORKER = 4
+
+
+def record_ends(csv_path: Path) -> np.ndarray:
+    """Byte offsets just past the end of every record (header included)."""
+    if csv_path.stat().st_size == 0:
+        return np.empty(0, dtype=np.int64)
+    data = np.memmap(csv_path, dtype=np.uint8, mode="r")
+    quotes = np.flatnonzero(data == QUOTE)
+    newlines = np.flatnonzero(data == NEWLINE)
+    outside_quotes = np.searchsorted(quotes, newlines) % 2 == 0
+    ends = newlines[outside_quotes] + 1
+    if len(data) and (len(ends) == 0 or ends[-1] != len(data)):
+        # Last record without a trailing newline
+        ends = np.r_[ends, len(data)]
+    return ends.astype(np.int64)
+
+
+def chunk_ranges(csv_path: Path, chunks: int) -> list[tuple[int, int]]:
+    """Split the data rows of a CSV into byte ranges of similar size.
+
+    Args:
+        csv_path: Path to the CSV file
+        chunks: Number of ranges wanted
+
+    Returns:
+        List of (start, end) byte offsets aligned to record boundaries, in
+        file order; fewer than `chunks` ranges for files with fewer rows
+    """
+    ends = record_ends(csv_path)
+    if len(ends) < 2:
+        return []
+    header_end, size = int(ends[0]), int(ends[-1])
+    targets = np.linspace(header_end, size, chunks + 1)[1:-1]
+    cuts = ends[np.searchsorted(ends, targets)]
+    bounds = np.unique(np.r_[header_end, cuts, size])
+    return [(int(start), int(end)) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def read_csv_range(
+    csv_path: Path, start: int, end: int, columns: list[str] | None = None
+) -> pd.DataFrame:
+    """Read the records in a byte range of a CSV file.
+
+    Args:
+        csv_path: Path to the CSV file
+        start: Offset of the first record (as returned by chunk_ranges)
+        end: Offset just past the last record
+        columns: Only read these columns
+
+    Returns:
+        DataFrame of the records, with the columns of the file's header (or
+        `columns`)
+    """
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        f.seek(start)
+        body = f.read(end - start)
+    return pd.read_csv(io.BytesIO(header + body), encoding="utf-8", usecols=columns)
+
+
+def map_chunks(func: Callable, csv_path: Path, workers: int) -> list:
+    """Apply `func(csv_path, start, end)` to byte ranges of a CSV in parallel.
+
+    Args:
+        func: Module-level function (it is pickled to the workers)
+        csv_path: Path to the CSV file
+        workers: Number of worker processes
+
+    Returns:
+        Results of `func` in file order, one per range
+    """
+    ranges = chunk_ranges(csv_path, workers * CHUNKS_PER_WORKER)
+    starts = [start for start, _ in ranges]
+    ends = [end for _, end in ranges]
+    # Import pandas before the pool starts, so forked workers inherit it
+    load(pd)
+    # Accessing ProcessPoolExecutor imports multiprocessing only when needed
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(func, [csv_path] * len(ranges), starts, ends))
@@ -0,0 +1,371 @@
+"""Elo ratings of speakers and teams over the debate history.
+
+Debates are rated in date order in daily rating periods: all debates held on
+one day are rated against the ratings from the start of that day, which lets
+each period be processed with a handful of array operations. The outcome of
+a debate is its ballot split, so a 3:0 win moves ratings more than a 2:1.
+
+A speaker's strength in a debate is the mean rating of the speakers of their
+team; teams are also rated on their own. The rating state is kept in compact
+arrays indexed by id and can be updated incrementally with new debates.
+
+Example usage:
+    python -m data.preprocessing.ratings update
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from data.preprocessing.debate_store import (
+    DebateStore,
+    load_debate_store,
+    team_keys,
+)
+from data.preprocessing.lazy_imports import lazy_import
+from logger.logger import setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_RATING_STATE = PROJECT_ROOT / "data" / "processed" / "rating_state.npz"
+PATH_TO_SPEAKER_RATINGS = PROJECT_ROOT / "data" / "processed" / "speaker_ratings.csv"
+PATH_TO_TEAM_RATINGS = PROJECT_ROOT / "data" / "processed" / "team_ratings.csv"
+
+INITIAL_RATING = 1500.0
+ELO_SCALE = 400.0
+K_FACTOR = 24.0
+# New entities move faster until their rating has settled
+PROVISIONAL_K_FACTOR = 48.0
+PROVISIONAL_GAMES = 10
+
+# Smallest int64 (np.iinfo(np.int64).min), spelled out to keep NumPy unloaded
+NO_DATE = -(2**63)
+
+
+@dataclass
+class RatingTable:
+    """Ratings of one kind of entity in parallel arrays, one slot per id."""
+
+    ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    ratings: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    games: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int32))
+
+    def slots(self, ids: np.ndarray) -> np.ndarray:
+        """Map ids to array slots, adding slots for ids not seen before.
+
+        Args:
+            ids: Entity ids
+
+        Returns:
+            Slot index of every id
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        slots = pd.Index(self.ids).get_indexer(ids)
+        unseen = slots < 0
+        if unseen.any():
+            new_ids = pd.unique(ids[unseen])
+            self.ids = np.concatenate([self.ids, new_ids])
+            self.ratings = np.concatenate(
+                [self.ratings, np.full(len(new_ids), INITIAL_RATING)]
+            )
+            self.games = np.concatenate(
+                [self.games, np.zeros(len(new_ids), dtype=np.int32)]
+            )
+            slots[unseen] = pd.Index(self.ids).get_indexer(ids[unseen])
+        return slots
+
+    def k_factors(self, slots: np.ndarray) -> np.ndarray:
+        return np.where(
+            self.games[slots] < PROVISIONAL_GAMES, PROVISIONAL_K_FACTOR, K_FACTOR
+        )
+
+    def apply(self, slots: np.ndarray, scores: np.ndarray, expected: np.ndarray):
+        """Apply the Elo update of one rating period.
+
+        Args:
+            slots: Slot of the rated entity, once per game
+            scores: Actual score of every game (share of ballots won)
+            expected: Expected score of every game
+        """
+        np.add.at(self.ratings, slots, self.k_factors(slots) * (scores - expected))
+        np.add.at(self.games, slots, 1)
+
+    def to_frame(self, id_column: str) -> pd.DataFrame:
+        return pd.DataFrame(
+            {id_column: self.ids, "rating": self.ratings, "games": self.games}
+        )
+
+
+@dataclass
+class RatingState:
+    """Speaker and team ratings after the last rated debate.
+
+    Debates are ordered by (day, debate_id); `last_day` is the day in
+    nanoseconds since the epoch.
+    """
+
+    speakers: RatingTable = field(default_factory=RatingTable)
+    teams: RatingTable = field(default_factory=RatingTable)
+    last_day: int = NO_DATE
+    last_debate_id: int = -1
+
+
+def expected_score(rating: np.ndarray, opponent_rating: np.ndarray) -> np.ndarray:
+    """Elo win expectancy of `rating` against `opponent_rating`."""
+    return 1.0 / (1.0 + 10.0 ** ((opponent_rating - rating) / ELO_SCALE))
+
+
+def _rating_inputs(store: DebateStore, state: RatingState):
+    """Decided debates after the state's last debate, in rating order."""
+    debates = store.debates[["debate_id", "start_time"]].merge(
+        store.outcomes(), on="debate_id"
+    )
+    # Local midnight of the debate day, in nanoseconds since the epoch
+    days = debates["start_time"].dt.tz_localize(None).dt.normalize()
+    debates["day"] = days.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    debates = debates[days.notna().to_numpy()]
+    debates = debates[
+        (debates["day"] > state.last_day)
+        | (
+            (debates["day"] == state.last_day)
+            & (debates["debate_id"] > state.last_debate_id)
+        )
+    ]
+    debates = debates.sort_values(["day", "debate_id"], ignore_index=True)
+
+    performances = store.performances
+    rows = pd.Index(debates["debate_id"]).get_indexer(performances["debate_id"])
+    keep = (rows >= 0) & performances["side"].isin(["aff", "neg"]).to_numpy()
+    performances = performances[keep].assign(row=rows[keep])
+    performances = performances.sort_values("row", kind="stable", ignore_index=True)
+    return debates, performances
+
+
+def update_ratings(store: DebateStore, state: RatingState | None = None):
+    """Rate the debates of a store that the state has not seen yet.
+
+    Debates without a date or a judge majority are skipped. Debates dated
+    before the state's last rated debate are ignored; rate from a fresh state
+    to take such late additions into account.
+
+    Args:
+        store: Debate history
+        state: Ratings to continue from (default: everyone at the initial
+            rating); updated in place
+
+    Returns:
+        Updated RatingState
+    """
+    state = state or RatingState()
+    debates, performances = _rating_inputs(store, state)
+    if debates.empty:
+        return state
+
+    total_ballots = (debates["aff_ballots"] + debates["neg_ballots"]).to_numpy()
+    aff_score = debates["aff_ballots"].to_numpy() / np.maximum(total_ballots, 1)
+
+    rows = performances["row"].to_numpy(dtype=np.int64)
+    is_neg = (performances["side"] == "neg").to_numpy()
+    speaker_slots = state.speakers.slots(performances["debater_id"].to_numpy())
+    team_slots_by_perf = state.teams.slots(team_keys(performances))
+
+    # One team per debate side; -1 when a side has no speakers on record
+    team_slots = np.full((len(debates), 2), -1, dtype=np.int64)
+    team_slots[rows, is_neg.astype(np.int64)] = team_slots_by_perf
+
+    days = debates["day"].to_numpy()
+    period_starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    period_ends = np.r_[period_starts[1:], len(debates)]
+    perf_bounds = np.searchsorted(rows, np.r_[period_starts, len(debates)])
+
+    for period, (start, end) in enumerate(zip(period_starts, period_ends)):
+        p_start, p_end = perf_bounds[period], perf_bounds[period + 1]
+        if p_end > p_start:
+            _rate_speakers(
+                state.speakers,
+                speaker_slots[p_start:p_end],
+                (rows[p_start:p_end] - start) * 2 + is_neg[p_start:p_end],
+                aff_score[start:end],
+            )
+        _rate_teams(state.teams, team_slots[start:end], aff_score[start:end])
+
+    state.last_day = int(days[-1])
+    state.last_debate_id = int(debates["debate_id"].iloc[-1])
+    return state
+
+
+def _rate_speakers(table, slots, sides, aff_score):
+    """Rate one period of speakers against the mean rating of each side."""
+    n_sides = 2 * len(aff_score)
+    ratings = table.ratings[slots]
+    counts = np.bincount(sides, minlength=n_sides)
+    totals = np.bincount(sides, weights=ratings, minlength=n_sides)
+    strength = np.divide(
+        totals, counts, out=np.full(n_sides, INITIAL_RATING), where=counts > 0
+    ).reshape(-1, 2)
+
+    expected_aff = expected_score(strength[:, 0], strength[:, 1])
+    debates = sides // 2
+    aff = sides % 2 == 0
+    scores = np.where(aff, aff_score[debates], 1.0 - aff_score[debates])
+    expected = np.where(aff, expected_aff[debates], 1.0 - expected_aff[debates])
+    table.apply(slots, scores, expected)
+
+
+def _rate_teams(table, team_slots, aff_score):
+    """Rate one period of team pairings; one-sided debates are skipped."""
+    paired = (team_slots >= 0).all(axis=1)
+    if not paired.any():
+        return
+    aff_slots, neg_slots = team_slots[paired, 0], team_slots[paired, 1]
+    aff_score = aff_score[paired]
+    expected_aff = expected_score(table.ratings[aff_slots], table.ratings[neg_slots])
+    table.apply(
+        np.concatenate([aff_slots, neg_slots]),
+        np.concatenate([aff_score, 1.0 - aff_score]),
+        np.concatenate([expected_aff, 1.0 - expected_aff]),
+    )
+
+
+def speaker_ratings(state: RatingState) -> pd.DataFrame:
+    """Speaker ratings as a DataFrame with debater_id, rating and games."""
+    return state.speakers.to_frame("debater_id")
+
+
+def team_ratings(state: RatingState) -> pd.DataFrame:
+    """Team ratings as a DataFrame with team_id, rating and games."""
+    return state.teams.to_frame("team_id")
+
+
+def save_rating_state(state: RatingState, output_path: Path) -> None:
+    """Save the rating state as a NumPy archive."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        np.savez(
+            f,
+            speaker_ids=state.speakers.ids,
+            speaker_ratings=state.speakers.ratings,
+            speaker_games=state.speakers.games,
+            team_ids=state.teams.ids,
+            team_ratings=state.teams.ratings,
+            team_games=state.teams.games,
+            last=np.array([state.last_day, state.last_debate_id], dtype=np.int64),
+        )
+
+
+def load_rating_state(input_path: Path) -> RatingState:
+    """Load a rating state saved by save_rating_state."""
+    with np.load(input_path) as data:
+        last_day, last_debate_id = data["last"]
+        return RatingState(
+            speakers=RatingTable(
+                data["speaker_ids"], data["speaker_ratings"], data["speaker_games"]
+            ),
+            teams=RatingTable(
+                data["team_ids"], data["team_ratings"], data["team_games"]
+            ),
+            last_day=int(last_day),
+            last_debate_id=int(last_debate_id),
+        )
+
+
+def update_rating_state_file(store: DebateStore, state_path: Path) -> RatingState:
+    """Continue the rating state saved at `state_path` and save it back.
+
+    Args:
+        store: Debate history
+        state_path: Rating state file; created when it does not exist yet
+
+    Returns:
+        Updated RatingState
+    """
+    state = load_rating_state(state_path) if state_path.exists() else None
+    state = update_ratings(store, state)
+    save_rating_state(state, state_path)
+    return state
+
+
+def cmd_update(args):
+    """Command to rate new debates and export the ratings."""
+    input_path = Path(args.input)
+    state_path = Path(args.state)
+
+    print(f"Loading debates from: {input_path}")
+    store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    if args.full and state_path.exists():
+        state_path.unlink()
+    state = update_rating_state_file(store, state_path)
+    print(f"Rating state saved to: {state_path}")
+
+    speakers = speaker_ratings(state).sort_values("rating", ascending=False)
+    speakers.to_csv(args.speakers_output, index=False)
+    print(f"Rated {len(speakers)} speakers: {args.speakers_output}")
+
+    teams = team_ratings(state).sort_values("rating", ascending=False)
+    teams.to_csv(args.teams_output, index=False)
+    print(f"Rated {len(teams)} teams: {args.teams_output}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Elo ratings of speakers and teams",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # update command
+    update_parser = subparsers.add_parser(
+        "update", help="Rate debates not yet in the rating state"
+    )
+    update_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    update_parser.add_argument(
+        "-s",
+        "--state",
+        type=str,
+        default=str(PATH_TO_RATING_STATE),
+        help=f"Rating state file path (default: {PATH_TO_RATING_STATE})",
+    )
+    update_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Discard the saved state and rate the whole history again",
+    )
+    update_parser.add_argument(
+        "--speakers-output",
+        type=str,
+        default=str(PATH_TO_SPEAKER_RATINGS),
+        help=f"Speaker ratings CSV path (default: {PATH_TO_SPEAKER_RATINGS})",
+    )
+    update_parser.add_argument(
+        "--teams-output",
+        type=str,
+        default=str(PATH_TO_TEAM_RATINGS),
+        help=f"Team ratings CSV path (default: {PATH_TO_TEAM_RATINGS})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "update":
+        cmd_update(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
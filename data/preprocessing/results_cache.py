@@ -0,0 +1,130 @@
+"""Content-addressed cache of per-item preprocessing results.
+
+A cache entry is keyed by a hash of everything a result depends on besides
+the item itself: the algorithm name and version and the contents of the
+resource files (category keywords, name lists, ...). Within an entry,
+results are stored per item (a motion, a debater name), so a run whose
+resources are unchanged computes only the items that are new since the
+last run; when nothing is new it computes nothing.
+
+Entries are JSON files in the cache directory. Reading an entry refreshes
+its modification time, and storing one evicts the least recently used
+entries beyond the configured maximum.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from logger.logger import logger
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_RESULTS_CACHE = PROJECT_ROOT / "data" / "processed" / "cache"
+
+DEFAULT_MAX_ENTRIES = 8
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents ("missing" if it does not exist)."""
+    if not path.exists():
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_key(
+    algorithm: str, version: int, resources: list[Path], options: list = ()
+) -> str:
+    """Key of the cache entry for one algorithm, version and set of resources.
+
+    Args:
+        algorithm: Name of the computation (e.g. "categorize")
+        version: Algorithm version; bump it whenever results change
+        resources: Files the results depend on; their contents are hashed
+        options: Further JSON-serializable settings the results depend on
+
+    Returns:
+        Hex digest identifying the cache entry
+    """
+    parts = [algorithm, version, [hash_file(path) for path in resources], options]
+    payload = json.dumps(parts, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+@dataclass
+class ResultsCache:
+    """Directory of cache entries with LRU eviction."""
+
+    directory: Path = PATH_TO_RESULTS_CACHE
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def lookup(self, key: str) -> dict[str, Any]:
+        """Results stored under a key (empty if there are none)."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return {}
+        # Mark as recently used
+        os.utime(path)
+        return entries
+
+    def store(self, key: str, entries: dict[str, Any]) -> None:
+        """Store results under a key and evict the least recently used entries."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove all but the `max_entries` most recently used entries."""
+        entries = sorted(
+            self.directory.glob("*.json"),
+            key=lambda path: path.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for path in entries[self.max_entries :]:
+            path.unlink(missing_ok=True)
+            logger.info(f"Evicted cache entry: {path.name}")
+
+
+def cached_map(
+    cache: ResultsCache,
+    key: str,
+    items: list[str],
+    compute: Callable[[list[str]], list[Any]],
+) -> tuple[dict[str, Any], int]:
+    """Results for every item, computing only those not cached under the key.
+
+    Args:
+        cache: Results cache
+        key: Cache entry key, see cache_key
+        items: Items to get results for
+        compute: Computes the JSON-serializable results of a list of items,
+            in order
+
+    Returns:
+        Tuple of (item -> result for every item, number of items computed)
+    """
+    entries = cache.lookup(key)
+    missing = [item for item in dict.fromkeys(items) if item not in entries]
+    if missing:
+        entries.update(zip(missing, compute(missing)))
+        cache.store(key, entries)
+    return {item: entries[item] for item in items}, len(missing)
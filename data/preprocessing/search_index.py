@@ -0,0 +1,262 @@
+"""Typeahead search index over debater names for the dashboard.
+
+The debater selector should not have to load every debater's stats just to
+filter names, nor scan all names on each keystroke. This module builds a
+small JSON index the selector loads instead:
+
+    names, ids   debaters, in stats order
+    keys         sorted search keys; one per rotation of a debater's name
+                 tokens, so "novak jakub" and "jakub novak" both exist
+    entries      debater (position in names) of each key
+    trigrams     trigram -> sorted debaters whose name contains it
+
+Names are normalized with normalize_text (lowercase, no diacritics), so
+"Novák" matches "novak". A prefix query is two binary searches over keys
+and matches the tokens in either order; queries without a prefix match
+(typos, infixes) fall back to trigram overlap.
+
+The index is written by `debater_stats generate` next to the stats, where
+the dashboard fetches it (`docs/debater_index.json` beside
+`docs/example_stats.json`); `build` rebuilds it from a stats file.
+
+Example usage:
+    python -m data.preprocessing.search_index build -s docs/example_stats.json
+    python -m data.preprocessing.search_index search "jakub nov"
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from data.preprocessing.categorize_motions import normalize_text
+from logger.logger import logger, setup_logging
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+# The dashboard fetches the index from beside the stats JSON
+SEARCH_INDEX_FILENAME = "debater_index.json"
+PATH_TO_SEARCH_INDEX = PROJECT_ROOT / "data" / "processed" / SEARCH_INDEX_FILENAME
+
+INDEX_VERSION = 1
+DEFAULT_LIMIT = 5
+# Minimum share of the query's trigrams a fuzzy match must contain
+MIN_TRIGRAM_OVERLAP = 0.5
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(name: str) -> list[str]:
+    """Normalized tokens of a name ("Novák-Malá Eva" -> novak, mala, eva)."""
+    return _TOKEN_PATTERN.findall(normalize_text(name))
+
+
+def name_keys(name: str) -> list[str]:
+    """Search keys of a name: every rotation of its tokens.
+
+    Rotations make a prefix of the tokens in any cyclic order a prefix of
+    some key, which covers both "surname first" and "first name first".
+    """
+    tokens = name_tokens(name)
+    keys = {" ".join(tokens[i:] + tokens[:i]) for i in range(len(tokens))}
+    return sorted(keys)
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of the normalized tokens, padded so word starts count more."""
+    grams = set()
+    for token in name_tokens(text):
+        padded = f"  {token} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def build_search_index(debaters: list[dict]) -> dict:
+    """Build the search index of debaters.
+
+    Args:
+        debaters: Dicts with at least "id" and "name" (e.g. DebaterStats)
+
+    Returns:
+        JSON-serializable index, see the module docstring
+    """
+    pairs = []
+    postings = defaultdict(list)
+    for position, debater in enumerate(debaters):
+        pairs.extend((key, position) for key in name_keys(debater["name"]))
+        for gram in trigrams(debater["name"]):
+            postings[gram].append(position)
+    pairs.sort()
+
+    return {
+        "version": INDEX_VERSION,
+        "names": [debater["name"] for debater in debaters],
+        "ids": [debater["id"] for debater in debaters],
+        "keys": [key for key, _ in pairs],
+        "entries": [position for _, position in pairs],
+        "trigrams": dict(sorted(postings.items())),
+    }
+
+
+def prefix_search(index: dict, query: str, limit: int = DEFAULT_LIMIT) -> list[int]:
+    """Positions of debaters whose name starts with the query's tokens.
+
+    Args:
+        index: Search index
+        query: Typed text
+        limit: Maximum number of results
+
+    Returns:
+        Debater positions in key order, without duplicates
+    """
+    prefix = " ".join(name_tokens(query))
+    if not prefix:
+        return []
+    keys = index["keys"]
+    start = bisect.bisect_left(keys, prefix)
+    # U+FFFF sorts after every character that can follow the prefix
+    end = bisect.bisect_right(keys, prefix + "\uffff", lo=start)
+
+    results = []
+    for position in index["entries"][start:end]:
+        if position not in results:
+            results.append(position)
+            if len(results) == limit:
+                break
+    return results
+
+
+def trigram_search(index: dict, query: str, limit: int = DEFAULT_LIMIT) -> list[int]:
+    """Positions of debaters sharing the most trigrams with the query.
+
+    Args:
+        index: Search index
+        query: Typed text
+        limit: Maximum number of results
+
+    Returns:
+        Debater positions by decreasing overlap, then by position
+    """
+    grams = trigrams(query)
+    if not grams:
+        return []
+    hits = Counter()
+    for gram in grams:
+        hits.update(index["trigrams"].get(gram, ()))
+    min_hits = max(1, MIN_TRIGRAM_OVERLAP * len(grams))
+    ranked = sorted(
+        (position for position, count in hits.items() if count >= min_hits),
+        key=lambda position: (-hits[position], position),
+    )
+    return ranked[:limit]
+
+
+def search(index: dict, query: str, limit: int = DEFAULT_LIMIT) -> list[int]:
+    """Prefix matches, falling back to trigram matches when there are none."""
+    return prefix_search(index, query, limit) or trigram_search(index, query, limit)
+
+
+def save_search_index(index: dict, output_path: Path) -> None:
+    """Save the search index as compact JSON, replacing the file atomically.
+
+    Args:
+        index: Search index
+        output_path: Path to output JSON file
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Saved search index to: {output_path}")
+
+
+def load_search_index(path: Path) -> dict:
+    """Load a search index saved by save_search_index."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def search_index_path(stats_path: Path) -> Path:
+    """Path of the search index published beside a stats file."""
+    return stats_path.with_name(SEARCH_INDEX_FILENAME)
+
+
+def cmd_build(args):
+    """Command to build the search index of a debater stats file."""
+    stats_path = Path(args.stats)
+    output_path = Path(args.output) if args.output else search_index_path(stats_path)
+
+    with open(stats_path, "r", encoding="utf-8") as f:
+        stats = json.load(f)
+    save_search_index(build_search_index(stats), output_path)
+    print(f"Saved search index of {len(stats)} debaters to: {output_path}")
+
+
+def cmd_search(args):
+    """Command to look up debaters in the search index."""
+    index = load_search_index(Path(args.index))
+    for position in search(index, args.query, args.limit):
+        print(f"{index['ids'][position]:>8}  {index['names'][position]}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Typeahead search index over debater names",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # build command
+    build_parser = subparsers.add_parser(
+        "build", help="Build the search index of a debater stats file"
+    )
+    build_parser.add_argument(
+        "-s", "--stats", type=str, required=True, help="Debater stats JSON path"
+    )
+    build_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help=f"Search index path (default: {SEARCH_INDEX_FILENAME} beside the stats)",
+    )
+
+    # search command
+    search_parser = subparsers.add_parser(
+        "search", help="Look up debaters in the search index"
+    )
+    search_parser.add_argument("query", type=str, help="Search text")
+    search_parser.add_argument(
+        "-i",
+        "--index",
+        type=str,
+        default=str(PATH_TO_SEARCH_INDEX),
+        help=f"Search index path (default: {PATH_TO_SEARCH_INDEX})",
+    )
+    search_parser.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=DEFAULT_LIMIT,
+        help=f"Maximum number of results (default: {DEFAULT_LIMIT})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        cmd_build(args)
+    elif args.command == "search":
+        cmd_search(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
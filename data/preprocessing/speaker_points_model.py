@@ -0,0 +1,348 @@
+"""Fixed-effects model of speaker points.
+
+Fits points = intercept + speaker + tournament + judge + position by least
+squares, so a speaker's adjusted score is not inflated by generous
+tournaments or judges. The judge effect is only estimated from debates with
+a single judge, where the points on record are that judge's.
+
+The design matrix is never built: the normal equations are solved by
+conjugate gradients with a diagonal preconditioner, and each product with
+the design (or its transpose) is a gather (or np.bincount) per factor, so
+memory stays at a few arrays of the length of the data. A small ridge
+penalty shrinks the effects of levels with few performances towards zero.
+A previous fit can seed the next one, so refitting after new debates arrive
+takes only a few iterations.
+
+Example usage:
+    python -m data.preprocessing.speaker_points_model fit
+"""
+
+from __future__ import annotations
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+
+from data.preprocessing.debate_store import (
+    DebateStore,
+    load_debate_store,
+    tournament_keys,
+)
+from data.preprocessing.lazy_imports import lazy_import
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_MODEL = PROJECT_ROOT / "data" / "processed" / "speaker_points_model.npz"
+PATH_TO_ADJUSTED_POINTS = (
+    PROJECT_ROOT / "data" / "processed" / "adjusted_speaker_points.csv"
+)
+
+FACTORS = ["speaker", "tournament", "judge", "position"]
+DEFAULT_RIDGE = 2.0
+DEFAULT_TOLERANCE = 1e-8
+DEFAULT_MAX_ITERATIONS = 500
+
+
+@dataclass
+class SpeakerPointsModel:
+    """Fitted intercept and effect of every level of every factor."""
+
+    intercept: float
+    effects: dict[str, pd.Series]
+    iterations: int = 0
+    converged: bool = False
+
+    def adjusted_points(self) -> pd.Series:
+        """Expected points of each speaker at an average tournament, judge
+        and position, indexed by debater_id."""
+        return self.intercept + self.effects["speaker"]
+
+
+def model_frame(store: DebateStore) -> pd.DataFrame:
+    """Performances with points and the level of every factor.
+
+    Returns:
+        DataFrame with points and one column per factor; judge is NA for
+        debates without exactly one judge
+    """
+    performances = store.performances.dropna(subset=["points"])
+    tournaments = pd.Series(
+        tournament_keys(store.debates).to_numpy(), index=store.debates["debate_id"]
+    )
+
+    judge_counts = store.ballots.groupby("debate_id")["judge_id"].agg(["size", "first"])
+    single_judges = judge_counts.loc[judge_counts["size"] == 1, "first"]
+
+    return pd.DataFrame(
+        {
+            "points": performances["points"].to_numpy(dtype=np.float64),
+            "speaker": performances["debater_id"].to_numpy(),
+            "tournament": performances["debate_id"].map(tournaments).to_numpy(),
+            "judge": performances["debate_id"]
+            .map(single_judges)
+            .astype("Int64")
+            .to_numpy(),
+            "position": performances["position"].to_numpy(),
+        }
+    )
+
+
+def fit_speaker_points(
+    store: DebateStore,
+    previous: SpeakerPointsModel | None = None,
+    ridge: float = DEFAULT_RIDGE,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_iterations: int = DEFAULT_MAX_ITERATIONS,
+) -> SpeakerPointsModel:
+    """Fit the fixed-effects model to all speaker performances.
+
+    Args:
+        store: Debate history
+        previous: Earlier fit to start from; levels it does not know start
+            at zero
+        ridge: Pseudo-observations at zero added to every level
+        tolerance: Relative residual norm of the normal equations to stop at
+        max_iterations: Maximum number of conjugate gradient iterations
+
+    Returns:
+        Fitted SpeakerPointsModel
+    """
+    frame = model_frame(store)
+    y = frame["points"].to_numpy()
+    if len(y) == 0:
+        return SpeakerPointsModel(
+            0.0, {f: pd.Series(dtype=np.float64) for f in FACTORS}, 0, True
+        )
+
+    levels, codes, sizes, start = {}, {}, {}, {}
+    x0_parts = [np.array([previous.intercept if previous else y.mean()])]
+    offset = 1
+    for factor in FACTORS:
+        factor_codes, factor_levels = pd.factorize(frame[factor])
+        observed = factor_codes >= 0
+        levels[factor] = factor_levels
+        # Codes into the parameter vector; rows without a level are dropped
+        codes[factor] = (np.flatnonzero(observed), factor_codes[observed] + offset)
+        sizes[factor] = len(factor_levels)
+        start[factor] = offset
+        offset += len(factor_levels)
+        x0_parts.append(
+            previous.effects[factor].reindex(factor_levels).fillna(0.0).to_numpy()
+            if previous is not None
+            else np.zeros(len(factor_levels))
+        )
+    n_params = offset
+
+    def predict(x: np.ndarray) -> np.ndarray:
+        fitted = np.full(len(y), x[0])
+        for rows, params in codes.values():
+            fitted[rows] += x[params]
+        return fitted
+
+    def transpose_product(r: np.ndarray) -> np.ndarray:
+        result = np.zeros(n_params)
+        result[0] = r.sum()
+        for rows, params in codes.values():
+            result += np.bincount(params, weights=r[rows], minlength=n_params)
+        return result
+
+    penalty = np.full(n_params, ridge)
+    penalty[0] = 0.0
+
+    def normal_product(x: np.ndarray) -> np.ndarray:
+        return transpose_product(predict(x)) + penalty * x
+
+    # Jacobi preconditioner: the diagonal of the normal equations
+    diagonal = transpose_product(np.ones(len(y))) + penalty
+
+    b = transpose_product(y)
+    x = np.concatenate(x0_parts).astype(np.float64)
+    residual = b - normal_product(x)
+    z = residual / diagonal
+    direction = z.copy()
+    rz = residual @ z
+    threshold = tolerance * np.linalg.norm(b)
+
+    converged = False
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        if np.linalg.norm(residual) <= threshold:
+            converged = True
+            iteration -= 1
+            break
+        product = normal_product(direction)
+        step = rz / (direction @ product)
+        x += step * direction
+        residual -= step * product
+        z = residual / diagonal
+        rz_next = residual @ z
+        direction = z + (rz_next / rz) * direction
+        rz = rz_next
+    else:
+        converged = np.linalg.norm(residual) <= threshold
+
+    if not converged:
+        logger.warning(
+            f"Speaker points model did not converge in {iteration} iterations"
+        )
+
+    return SpeakerPointsModel(
+        intercept=float(x[0]),
+        effects={
+            factor: pd.Series(
+                x[start[factor] : start[factor] + sizes[factor]],
+                index=levels[factor],
+                name=factor,
+            )
+            for factor in FACTORS
+        },
+        iterations=iteration,
+        converged=converged,
+    )
+
+
+def adjusted_speaker_points(
+    model: SpeakerPointsModel, store: DebateStore
+) -> pd.DataFrame:
+    """Raw and adjusted average points of every speaker.
+
+    Args:
+        model: Fitted model
+        store: Debate history the model was fitted on
+
+    Returns:
+        DataFrame with debater_id, debater_name, performances, raw_points and
+        adjusted_points, best adjusted score first
+    """
+    frame = model_frame(store)
+    raw = frame.groupby("speaker")["points"].agg(["size", "mean"])
+    adjusted = pd.DataFrame(
+        {
+            "debater_id": raw.index.to_numpy(dtype=np.int64),
+            "performances": raw["size"].to_numpy(),
+            "raw_points": raw["mean"].to_numpy(),
+            "adjusted_points": model.adjusted_points().reindex(raw.index).to_numpy(),
+        }
+    )
+    adjusted = adjusted.merge(store.debaters, on="debater_id", how="left")
+    return adjusted[
+        ["debater_id", "debater_name", "performances", "raw_points", "adjusted_points"]
+    ].sort_values("adjusted_points", ascending=False, ignore_index=True)
+
+
+def save_model(model: SpeakerPointsModel, output_path: Path) -> None:
+    """Save a fitted model as a NumPy archive."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {"intercept": np.array([model.intercept])}
+    for factor, effects in model.effects.items():
+        levels = effects.index.to_numpy()
+        # Tournament keys are strings; everything else is an integer id
+        dtype = str if factor == "tournament" else np.int64
+        arrays[f"{factor}_levels"] = levels.astype(dtype)
+        arrays[f"{factor}_effects"] = effects.to_numpy(dtype=np.float64)
+    with open(output_path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def load_model(input_path: Path) -> SpeakerPointsModel:
+    """Load a model saved by save_model."""
+    with np.load(input_path) as data:
+        return SpeakerPointsModel(
+            intercept=float(data["intercept"][0]),
+            effects={
+                factor: pd.Series(
+                    data[f"{factor}_effects"],
+                    index=data[f"{factor}_levels"],
+                    name=factor,
+                )
+                for factor in FACTORS
+            },
+            converged=True,
+        )
+
+
+def cmd_fit(args):
+    """Command to fit the model and export adjusted speaker points."""
+    input_path = Path(args.input)
+    model_path = Path(args.model)
+    output_path = Path(args.output)
+
+    print(f"Loading debates from: {input_path}")
+    store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    previous = None
+    if model_path.exists() and not args.cold:
+        previous = load_model(model_path)
+        print(f"Warm start from: {model_path}")
+
+    model = fit_speaker_points(store, previous, ridge=args.ridge)
+    print(f"Fitted in {model.iterations} iterations (converged: {model.converged})")
+    save_model(model, model_path)
+    print(f"Model saved to: {model_path}")
+
+    adjusted = adjusted_speaker_points(model, store)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    adjusted.round(2).to_csv(output_path, index=False, encoding="utf-8")
+    print(f"Adjusted points of {len(adjusted)} speakers saved to: {output_path}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Speaker points adjusted for tournament, judge and position",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # fit command
+    fit_parser = subparsers.add_parser(
+        "fit", help="Fit the model and export adjusted speaker points"
+    )
+    fit_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    fit_parser.add_argument(
+        "-m",
+        "--model",
+        type=str,
+        default=str(PATH_TO_MODEL),
+        help=f"Model file path, used for warm starts (default: {PATH_TO_MODEL})",
+    )
+    fit_parser.add_argument(
+        "--cold", action="store_true", help="Ignore the saved model and fit afresh"
+    )
+    fit_parser.add_argument(
+        "--ridge",
+        type=float,
+        default=DEFAULT_RIDGE,
+        help=f"Ridge penalty in pseudo-observations (default: {DEFAULT_RIDGE})",
+    )
+    fit_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=str(PATH_TO_ADJUSTED_POINTS),
+        help=f"Output CSV file path (default: {PATH_TO_ADJUSTED_POINTS})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        cmd_fit(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,457 @@
+"""Per-season and time-windowed debater statistics.
+
+Speaker performances are pre-aggregated into additive monthly partials, one
+row per debater, month and league: decided debates and wins per side and
+speaker points sums per position. The statistics of any window (a season,
+the last N months, a single league) are the sums of the partials of its
+months, so windows are answered without rescanning debates.
+
+Like the judge stats, the partials are kept in a state together with the
+ids of the debates already counted, so new debates are folded in without
+recounting history.
+
+Example usage:
+    python -m data.preprocessing.stats_rollups update
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from data.preprocessing.debate_store import (
+    SEASON_START_MONTH,
+    DebateStore,
+    load_debate_store,
+)
+from data.preprocessing.debater_stats import debate_results
+from data.preprocessing.lazy_imports import lazy_import
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_ROLLUP_STATE = PROJECT_ROOT / "data" / "processed" / "rollup_state.npz"
+PATH_TO_ROLLUPS_OUTPUT = PROJECT_ROOT / "data" / "processed" / "debater_rollups.json"
+
+RECENT_MONTHS = [3, 6, 12]
+# League key of debates outside any league
+NO_LEAGUE = -1
+
+PARTIAL_KEYS = ["debater_id", "month", "league_id"]
+POSITIONS = [1, 2, 3]
+PARTIAL_COLUMNS = [
+    "debates",
+    "aff_decided",
+    "aff_wins",
+    "neg_decided",
+    "neg_wins",
+    *[f"points_sum_{p}" for p in POSITIONS],
+    *[f"points_count_{p}" for p in POSITIONS],
+]
+
+
+def _empty_partials() -> pd.DataFrame:
+    partials = pd.DataFrame(
+        {column: [] for column in [*PARTIAL_KEYS, *PARTIAL_COLUMNS]}
+    ).astype(np.int64)
+    return partials.astype({f"points_sum_{p}": np.float64 for p in POSITIONS})
+
+
+@dataclass
+class RollupState:
+    """Monthly partials and the debates they were counted from."""
+
+    partials: pd.DataFrame = field(default_factory=_empty_partials)
+    debate_ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+
+def season_of(month: int) -> str:
+    """Season ("2024/2025") a yyyymm month belongs to."""
+    year, month_of_year = divmod(month, 100)
+    start = year if month_of_year >= SEASON_START_MONTH else year - 1
+    return f"{start}/{start + 1}"
+
+
+def shift_month(month: int, months: int) -> int:
+    """The yyyymm month `months` months after (or before) `month`."""
+    year, month_of_year = divmod(month, 100)
+    index = year * 12 + month_of_year - 1 + months
+    return (index // 12) * 100 + index % 12 + 1
+
+
+def season_months(season: str) -> tuple[int, int]:
+    """First and last yyyymm month of a season."""
+    first = int(season.split("/")[0]) * 100 + SEASON_START_MONTH
+    return first, shift_month(first, 11)
+
+
+def format_month(month: int) -> str:
+    return f"{month // 100:04d}-{month % 100:02d}"
+
+
+def compute_partials(
+    store: DebateStore, debate_ids: np.ndarray | None = None
+) -> pd.DataFrame:
+    """Aggregate speaker performances into monthly partials.
+
+    Performances in debates without a parseable date are left out.
+
+    Args:
+        store: Debate history
+        debate_ids: Only aggregate these debates (default: all)
+
+    Returns:
+        DataFrame with the PARTIAL_KEYS and PARTIAL_COLUMNS
+    """
+    if debate_ids is not None:
+        store = store.only_debates(debate_ids)
+    results = debate_results(store)
+
+    debates = store.debates.set_index("debate_id")
+    months = debates["month"].dropna()
+    leagues = debates["league_id"].astype("Int64").fillna(NO_LEAGUE)
+
+    results = results[results["debate_id"].isin(months.index)]
+    if results.empty:
+        return _empty_partials()
+
+    decided = results["won"].notna()
+    won = results["won"] == 1
+    is_aff = results["side"] == "aff"
+    is_neg = results["side"] == "neg"
+    has_points = results["points"].notna()
+
+    partials = pd.DataFrame(
+        {
+            "debater_id": results["debater_id"].to_numpy(dtype=np.int64),
+            "month": results["debate_id"].map(months).to_numpy(dtype=np.int64),
+            "league_id": results["debate_id"].map(leagues).to_numpy(dtype=np.int64),
+            "debates": 1,
+            "aff_decided": (decided & is_aff).to_numpy(dtype=np.int64),
+            "aff_wins": (won & is_aff).to_numpy(dtype=np.int64),
+            "neg_decided": (decided & is_neg).to_numpy(dtype=np.int64),
+            "neg_wins": (won & is_neg).to_numpy(dtype=np.int64),
+        }
+    )
+    points = results["points"].astype(np.float64).fillna(0.0)
+    for position in POSITIONS:
+        at_position = (results["position"] == position) & has_points
+        partials[f"points_sum_{position}"] = points.where(at_position, 0.0).to_numpy()
+        partials[f"points_count_{position}"] = at_position.to_numpy(dtype=np.int64)
+
+    return partials.groupby(PARTIAL_KEYS, as_index=False).sum()
+
+
+def merge_partials(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+    """Add two partial tables."""
+    if old.empty:
+        return new.reset_index(drop=True)
+    merged = pd.concat([old, new], ignore_index=True)
+    return merged.groupby(PARTIAL_KEYS, as_index=False).sum()
+
+
+def update_rollup_state(
+    store: DebateStore, state: RollupState | None = None
+) -> RollupState:
+    """Aggregate the debates the state has not seen yet.
+
+    Args:
+        store: Debate history
+        state: Partials to continue from (default: empty)
+
+    Returns:
+        New RollupState
+    """
+    state = state or RollupState()
+    new_ids = np.setdiff1d(
+        store.debates["debate_id"].to_numpy(dtype=np.int64), state.debate_ids
+    )
+    if len(new_ids) == 0:
+        return state
+
+    return RollupState(
+        partials=merge_partials(state.partials, compute_partials(store, new_ids)),
+        debate_ids=np.union1d(state.debate_ids, new_ids),
+    )
+
+
+def rollup(
+    partials: pd.DataFrame,
+    first_month: int | None = None,
+    last_month: int | None = None,
+    league_id: int | None = None,
+) -> pd.DataFrame:
+    """Sum the partials of a window per debater.
+
+    Args:
+        partials: Monthly partials
+        first_month: First yyyymm month of the window (default: unbounded)
+        last_month: Last yyyymm month of the window (default: unbounded)
+        league_id: Only count debates of this league (default: all)
+
+    Returns:
+        DataFrame indexed by debater_id with the PARTIAL_COLUMNS
+    """
+    selected = np.ones(len(partials), dtype=bool)
+    if first_month is not None:
+        selected &= partials["month"].to_numpy() >= first_month
+    if last_month is not None:
+        selected &= partials["month"].to_numpy() <= last_month
+    if league_id is not None:
+        selected &= partials["league_id"].to_numpy() == league_id
+    return partials.loc[selected].groupby("debater_id")[PARTIAL_COLUMNS].sum()
+
+
+def window_stats(totals: pd.DataFrame) -> list[dict]:
+    """Dashboard statistics of every debater in a window.
+
+    Args:
+        totals: Per-debater sums from rollup
+
+    Returns:
+        List of dicts with id, debates, side_win_rates and
+        positions_speaker_points in the DebaterStats format
+    """
+
+    def rate(numerator, denominator, digits):
+        return round(numerator / denominator, digits) if denominator else None
+
+    stats = []
+    for debater_id, row in totals.to_dict("index").items():
+        stats.append(
+            {
+                "id": int(debater_id),
+                "debates": int(row["debates"]),
+                "side_win_rates": {
+                    "total": rate(
+                        row["aff_wins"] + row["neg_wins"],
+                        row["aff_decided"] + row["neg_decided"],
+                        4,
+                    ),
+                    "aff": rate(row["aff_wins"], row["aff_decided"], 4),
+                    "neg": rate(row["neg_wins"], row["neg_decided"], 4),
+                },
+                "positions_speaker_points": {
+                    str(p): rate(row[f"points_sum_{p}"], row[f"points_count_{p}"], 2)
+                    for p in POSITIONS
+                },
+            }
+        )
+    return stats
+
+
+def standard_windows(
+    partials: pd.DataFrame, recent_months: list[int] = RECENT_MONTHS
+) -> list[dict]:
+    """Windows published for the dashboard.
+
+    These are all time, every season (overall and per league) and the last
+    N months before the latest month with debates.
+
+    Returns:
+        List of window dicts with key, first_month, last_month and league_id
+    """
+    windows = [
+        {"key": "all", "first_month": None, "last_month": None, "league_id": None}
+    ]
+    if partials.empty:
+        return windows
+
+    months = partials["month"].to_numpy()
+    seasons = sorted({season_of(int(month)) for month in np.unique(months)})
+    for season in seasons:
+        first, last = season_months(season)
+        in_season = (months >= first) & (months <= last)
+        leagues = np.unique(partials.loc[in_season, "league_id"])
+        windows.append(
+            {
+                "key": f"season:{season}",
+                "first_month": first,
+                "last_month": last,
+                "league_id": None,
+            }
+        )
+        windows.extend(
+            {
+                "key": f"season:{season}:league:{league}",
+                "first_month": first,
+                "last_month": last,
+                "league_id": int(league),
+            }
+            for league in leagues
+            if league != NO_LEAGUE
+        )
+
+    latest = int(months.max())
+    windows.extend(
+        {
+            "key": f"last_{count}_months",
+            "first_month": shift_month(latest, 1 - count),
+            "last_month": latest,
+            "league_id": None,
+        }
+        for count in recent_months
+    )
+    return windows
+
+
+def compute_rollups(
+    partials: pd.DataFrame, recent_months: list[int] = RECENT_MONTHS
+) -> dict:
+    """Statistics of every standard window.
+
+    Args:
+        partials: Monthly partials
+        recent_months: Lengths of the trailing windows
+
+    Returns:
+        Dict with latest_month and a list of windows, each with its bounds
+        and the stats of every debater who spoke in it
+    """
+    latest = int(partials["month"].max()) if not partials.empty else None
+    windows = []
+    for window in standard_windows(partials, recent_months):
+        totals = rollup(
+            partials, window["first_month"], window["last_month"], window["league_id"]
+        )
+        windows.append(
+            {
+                "key": window["key"],
+                "first_month": (
+                    format_month(window["first_month"])
+                    if window["first_month"]
+                    else None
+                ),
+                "last_month": (
+                    format_month(window["last_month"]) if window["last_month"] else None
+                ),
+                "league_id": window["league_id"],
+                "stats": window_stats(totals),
+            }
+        )
+    return {
+        "latest_month": format_month(latest) if latest else None,
+        "windows": windows,
+    }
+
+
+def save_rollup_state(state: RollupState, output_path: Path) -> None:
+    """Save the monthly partials as a NumPy archive."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        np.savez(
+            f,
+            debate_ids=state.debate_ids,
+            **{
+                column: state.partials[column].to_numpy()
+                for column in [*PARTIAL_KEYS, *PARTIAL_COLUMNS]
+            },
+        )
+
+
+def load_rollup_state(input_path: Path) -> RollupState:
+    """Load a state saved by save_rollup_state."""
+    with np.load(input_path) as data:
+        return RollupState(
+            partials=pd.DataFrame(
+                {column: data[column] for column in [*PARTIAL_KEYS, *PARTIAL_COLUMNS]}
+            ),
+            debate_ids=data["debate_ids"],
+        )
+
+
+def save_rollups(rollups: dict, output_path: Path) -> None:
+    """Save the window statistics as JSON."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(rollups, f, ensure_ascii=False)
+
+    logger.info(f"Saved debater rollups to: {output_path}")
+
+
+def cmd_update(args):
+    """Command to aggregate new debates and export the window statistics."""
+    input_path = Path(args.input)
+    state_path = Path(args.state)
+    output_path = Path(args.output)
+
+    print(f"Loading debates from: {input_path}")
+    store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    state = None
+    if state_path.exists() and not args.full:
+        state = load_rollup_state(state_path)
+    counted = len(state.debate_ids) if state else 0
+    state = update_rollup_state(store, state)
+    save_rollup_state(state, state_path)
+    print(f"Aggregated {len(state.debate_ids) - counted} new debates")
+
+    rollups = compute_rollups(state.partials, args.recent_months)
+    save_rollups(rollups, output_path)
+    print(f"Saved {len(rollups['windows'])} windows to: {output_path}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Per-season and time-windowed debater statistics",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # update command
+    update_parser = subparsers.add_parser(
+        "update", help="Aggregate new debates and export the window statistics"
+    )
+    update_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    update_parser.add_argument(
+        "-s",
+        "--state",
+        type=str,
+        default=str(PATH_TO_ROLLUP_STATE),
+        help=f"Rollup state file path (default: {PATH_TO_ROLLUP_STATE})",
+    )
+    update_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Discard the saved state and aggregate every debate again",
+    )
+    update_parser.add_argument(
+        "--recent-months",
+        type=int,
+        nargs="+",
+        default=RECENT_MONTHS,
+        help=f"Lengths of the trailing windows in months (default: {RECENT_MONTHS})",
+    )
+    update_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=str(PATH_TO_ROLLUPS_OUTPUT),
+        help=f"Output JSON file path (default: {PATH_TO_ROLLUPS_OUTPUT})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "update":
+        cmd_update(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
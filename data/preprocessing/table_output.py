@@ -0,0 +1,204 @@
+"""Streaming, atomic output of result tables.
+
+Results are written to CSV chunk by chunk with `csv.writer` on a buffered
+file, so a save never holds more than one chunk of rows beyond the results
+themselves (no per-column lists, no DataFrame copy). The same chunks can
+also go to a Parquet file when pyarrow is installed. Its column types are
+either declared or inferred from the first non-null values; chunks are held
+back until every inferred column has one.
+
+Files are written under a temporary name and renamed into place once
+complete, so readers never see a partial file and a failed save leaves the
+previous output intact.
+
+Example usage:
+    rows = ((r.id, r.name) for r in results)
+    write_table(Path("out.csv"), ["id", "name"], rows, parquet=True)
+"""
+
+import csv
+import itertools
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+DEFAULT_CHUNK_ROWS = 10_000
+# Output buffer of the CSV file
+BUFFER_SIZE = 1 << 20
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".tmp")
+
+
+def parquet_path(output_path: Path) -> Path:
+    """Path of the Parquet file written next to a CSV output."""
+    return output_path.with_suffix(".parquet")
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(
+            "Parquet output requires pyarrow (pip install pyarrow)"
+        ) from e
+    return pa, pq
+
+
+def chunked(rows: Iterable[tuple], chunk_rows: int) -> Iterator[list[tuple]]:
+    """Split rows into lists of at most `chunk_rows` rows."""
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, chunk_rows)):
+        yield chunk
+
+
+class TableWriter:
+    """Writes row chunks to a CSV file and optionally a Parquet file.
+
+    Use as a context manager: the files are renamed into place when the
+    block exits normally and removed when it raises.
+
+    Args:
+        output_path: Path to output CSV file
+        header: Column names
+        parquet: Also write `output_path` with a .parquet suffix
+        column_types: Parquet types (pyarrow aliases such as "string") of
+            columns that may have no values in a whole chunk; other types are
+            inferred from the first non-null values
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        header: list[str],
+        parquet: bool = False,
+        column_types: dict[str, str] | None = None,
+    ):
+        self.output_path = output_path
+        self.header = header
+        self.parquet = parquet
+        self.column_types = column_types or {}
+        self.rows_written = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self._parquet_writer = None
+        self._parquet_schema = None
+        # Rows held back until the types of all columns are known
+        self._pending_rows = []
+        self._untyped_columns = {
+            i for i, name in enumerate(header) if name not in self.column_types
+        }
+
+    def __enter__(self) -> "TableWriter":
+        if self.parquet:
+            # Fail before writing anything if pyarrow is missing
+            _import_pyarrow()
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._csv_file = open(
+            _tmp_path(self.output_path),
+            "w",
+            encoding="utf-8",
+            newline="",
+            buffering=BUFFER_SIZE,
+        )
+        self._csv_writer = csv.writer(self._csv_file, lineterminator="\n")
+        self._csv_writer.writerow(self.header)
+        return self
+
+    def write_rows(self, rows: list[tuple]) -> None:
+        """Append a chunk of rows (tuples in header order)."""
+        self._csv_writer.writerows(rows)
+        if self.parquet:
+            self._write_parquet(rows)
+        self.rows_written += len(rows)
+
+    def _write_parquet(self, rows: list[tuple]) -> None:
+        if self._parquet_writer is None:
+            self._pending_rows.extend(rows)
+            self._untyped_columns = {
+                i for i in self._untyped_columns if all(row[i] is None for row in rows)
+            }
+            if self._untyped_columns:
+                return
+            self._open_parquet()
+        else:
+            self._parquet_writer.write_table(self._parquet_table(rows))
+
+    def _open_parquet(self) -> None:
+        """Fix the schema from the pending rows and write them."""
+        pa, pq = _import_pyarrow()
+        rows, self._pending_rows = self._pending_rows, []
+        columns = list(zip(*rows)) if rows else [()] * len(self.header)
+        fields = []
+        for name, values in zip(self.header, columns):
+            if name in self.column_types:
+                column_type = pa.type_for_alias(self.column_types[name])
+            else:
+                # Null-typed only when the column has no values at all
+                column_type = pa.array(values).type
+            fields.append(pa.field(name, column_type))
+        self._parquet_schema = pa.schema(fields)
+        self._parquet_writer = pq.ParquetWriter(
+            _tmp_path(parquet_path(self.output_path)), self._parquet_schema
+        )
+        self._parquet_writer.write_table(self._parquet_table(rows))
+
+    def _parquet_table(self, rows: list[tuple]):
+        pa, _ = _import_pyarrow()
+        columns = list(zip(*rows)) if rows else [()] * len(self.header)
+        return pa.table(
+            [
+                pa.array(values, type=field.type)
+                for values, field in zip(columns, self._parquet_schema)
+            ],
+            schema=self._parquet_schema,
+        )
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self.parquet and self._parquet_writer is None and exc_type is None:
+            # Columns without values (or no rows at all): write what is pending
+            self._open_parquet()
+
+        self._csv_file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+        paths = [self.output_path] + (
+            [parquet_path(self.output_path)] if self.parquet else []
+        )
+        for path in paths:
+            if exc_type is None:
+                os.replace(_tmp_path(path), path)
+            else:
+                _tmp_path(path).unlink(missing_ok=True)
+
+
+def write_table(
+    output_path: Path,
+    header: list[str],
+    rows: Iterable[tuple],
+    parquet: bool = False,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    column_types: dict[str, str] | None = None,
+) -> int:
+    """Stream rows to a CSV file (and a Parquet file next to it).
+
+    Args:
+        output_path: Path to output CSV file
+        header: Column names
+        rows: Rows as tuples in header order; consumed once, chunk by chunk
+        parquet: Also write `output_path` with a .parquet suffix (needs
+            pyarrow)
+        chunk_rows: Number of rows buffered per write
+        column_types: Parquet types of columns that may be null in a whole
+            chunk, see TableWriter
+
+    Returns:
+        Number of rows written
+    """
+    with TableWriter(output_path, header, parquet, column_types) as writer:
+        for chunk in chunked(rows, chunk_rows):
+            writer.write_rows(chunk)
+    return writer.rows_written
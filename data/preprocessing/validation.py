@@ -0,0 +1,284 @@
+"""Data-quality validation of the normalized debate tables.
+
+Runs vectorized checks over the DebateStore tables (one boolean mask per
+check, no per-row Python) and reports every failing row as an issue:
+
+    table      debates, performances, ballots, or raw for CSV rows that
+               never made it into the store
+    row        row position in that table (data row of the CSV for raw)
+    debate_id  debate the row belongs to
+    reason     reason code, see REASONS
+    value      offending value
+
+Issues are written to a quarantine CSV and summarized as counters per
+reason. quarantine_store removes the debates with any issue, so they are
+left out of aggregation (`debater_stats generate --quarantine`); a debate id
+repeated in the CSV keeps its last row and quarantines the earlier ones.
+
+Example usage:
+    python -m data.preprocessing.validation check
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from data.preprocessing.debate_store import (
+    SCORE_PATTERN,
+    DebateStore,
+    build_debate_store,
+    read_debate_records,
+)
+from data.preprocessing.lazy_imports import lazy_import
+from data.preprocessing.table_output import write_table
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_QUARANTINE = PROJECT_ROOT / "data" / "processed" / "quarantine.csv"
+
+QUARANTINE_COLUMNS = ["table", "row", "debate_id", "reason", "value"]
+
+SIDES = ["aff", "neg"]
+SPEAKERS_PER_TEAM = 3
+# Sanity bounds of speaker points; missing points are allowed
+POINTS_RANGE = (0, 100)
+# A single judge's decision, e.g. "3:0"; missing scores are allowed
+BALLOT_SCORE_PATTERN = r"^\s*\d+\s*:\s*\d+\s*$"
+
+# Issues of raw rows that were left out of the store while their debate
+# stays in it (from its last row), so quarantine_store keeps the debate
+KEPT_DEBATE_REASONS = ["duplicate_debate_id"]
+
+REASONS = {
+    "missing_teams": "CSV row without a teams column",
+    "unparseable_teams": "teams column is not a valid list",
+    "unparseable_judges": "judges_scoring column is not a valid list",
+    "duplicate_debate_id": "CSV row repeats the debate id of a later row",
+    "invalid_date": "date is missing or not a 'YYYY-MM-DD HH:MM:SS' date",
+    "invalid_score": "debate score has no 'W:L' ballot split",
+    "team_count": "debate does not have exactly one aff and one neg team",
+    "invalid_side": "speaker side is not aff or neg",
+    "invalid_position": f"speaker position is not 1..{SPEAKERS_PER_TEAM}",
+    "points_out_of_range": f"speaker points outside {POINTS_RANGE}",
+    "invalid_ballot_side": "judge vote is not aff or neg",
+    "invalid_ballot_score": "judge score is not 'W:L'",
+}
+
+
+def _issues(
+    table: str, df: pd.DataFrame, mask, reason: str, column: str
+) -> pd.DataFrame:
+    """Issue rows for the rows of `df` selected by `mask`."""
+    mask = np.asarray(mask, dtype=bool)
+    flagged = df[mask]
+    return pd.DataFrame(
+        {
+            "table": table,
+            "row": np.flatnonzero(mask),
+            "debate_id": flagged["debate_id"].to_numpy(dtype=np.int64),
+            "reason": reason,
+            "value": flagged[column].astype(object).to_numpy(),
+        }
+    )
+
+
+def _teams_per_side(performances: pd.DataFrame) -> pd.DataFrame:
+    """Number of distinct teams per side of each debate (debate_id index)."""
+    teams = (
+        performances["team_id"]
+        .astype("string")
+        .fillna(performances["team_name"].astype("string"))
+    )
+    return (
+        performances.assign(team=teams)
+        .groupby(["debate_id", "side"], dropna=False)["team"]
+        .nunique(dropna=False)
+        .unstack(fill_value=0)
+        .reindex(columns=SIDES, fill_value=0)
+    )
+
+
+def validate_store(store: DebateStore) -> pd.DataFrame:
+    """Run every check over the tables of a store.
+
+    Args:
+        store: Debate store
+
+    Returns:
+        DataFrame with QUARANTINE_COLUMNS, one row per failing check and row
+    """
+    debates = store.debates
+    performances = store.performances
+    ballots = store.ballots
+
+    scores = debates["score"].astype("string")
+
+    teams = _teams_per_side(performances).reindex(debates["debate_id"], fill_value=0)
+    one_team_per_side = (teams[SIDES] == 1).all(axis=1).to_numpy()
+
+    points = performances["points"].astype("Float64")
+    ballot_scores = ballots["score"].astype("string")
+
+    issues = [
+        _issues(
+            "debates", debates, debates["start_time"].isna(), "invalid_date", "date"
+        ),
+        _issues(
+            "debates",
+            debates,
+            scores.notna() & scores.str.extract(SCORE_PATTERN)[0].isna(),
+            "invalid_score",
+            "score",
+        ),
+        _issues("debates", debates, ~one_team_per_side, "team_count", "debate_id"),
+        _issues(
+            "performances",
+            performances,
+            ~performances["side"].isin(SIDES),
+            "invalid_side",
+            "side",
+        ),
+        _issues(
+            "performances",
+            performances,
+            ~performances["position"].between(1, SPEAKERS_PER_TEAM),
+            "invalid_position",
+            "position",
+        ),
+        _issues(
+            "performances",
+            performances,
+            points.notna() & ~points.between(*POINTS_RANGE).fillna(True).astype(bool),
+            "points_out_of_range",
+            "points",
+        ),
+        _issues(
+            "ballots",
+            ballots,
+            ~ballots["side"].isin(SIDES),
+            "invalid_ballot_side",
+            "side",
+        ),
+        _issues(
+            "ballots",
+            ballots,
+            ballot_scores.notna()
+            & ~ballot_scores.str.match(BALLOT_SCORE_PATTERN).fillna(False),
+            "invalid_ballot_score",
+            "score",
+        ),
+    ]
+    return pd.concat(issues, ignore_index=True)
+
+
+def load_validated_store(csv_path: Path) -> tuple[DebateStore, pd.DataFrame]:
+    """Load the scraped debate CSV and validate it.
+
+    Args:
+        csv_path: Path to the input CSV file
+
+    Returns:
+        Tuple of (DebateStore of all parseable rows, issues including the
+        rows that could not be parsed)
+    """
+    rejected = []
+    store = build_debate_store(read_debate_records(csv_path, rejected))
+    raw_issues = pd.DataFrame(rejected, columns=["row", "debate_id", "reason", "value"])
+    raw_issues.insert(0, "table", "raw")
+    issues = pd.concat([raw_issues, validate_store(store)], ignore_index=True)
+    return store, issues[QUARANTINE_COLUMNS]
+
+
+def issue_counts(issues: pd.DataFrame) -> dict[str, int]:
+    """Number of issues per reason, in REASONS order (zeros included)."""
+    counts = issues["reason"].value_counts()
+    return {reason: int(counts.get(reason, 0)) for reason in REASONS}
+
+
+def quarantine_store(store: DebateStore, issues: pd.DataFrame) -> DebateStore:
+    """Store without the debates that have any issue but KEPT_DEBATE_REASONS."""
+    failing = issues[~issues["reason"].isin(KEPT_DEBATE_REASONS)]
+    return store.without_debates(failing["debate_id"].dropna().astype(np.int64))
+
+
+def save_quarantine(issues: pd.DataFrame, output_path: Path) -> None:
+    """Save issues as the quarantine CSV.
+
+    Args:
+        issues: Issues as returned by validate_store
+        output_path: Path to output CSV file
+    """
+    write_table(
+        output_path,
+        QUARANTINE_COLUMNS,
+        issues[QUARANTINE_COLUMNS].itertuples(index=False, name=None),
+    )
+    logger.info(
+        f"Saved {len(issues)} quarantined rows to: {output_path}",
+        extra={"data": issue_counts(issues)},
+    )
+
+
+def cmd_check(args):
+    """Command to validate the debate CSV and write the quarantine file."""
+    input_path = Path(args.input)
+    output_path = Path(args.output)
+
+    print(f"Validating debates from: {input_path}")
+    store, issues = load_validated_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    save_quarantine(issues, output_path)
+    print(f"Quarantine saved to: {output_path}")
+
+    affected = issues["debate_id"].nunique()
+    print(f"\nIssues: {len(issues)} in {affected} debates")
+    for reason, count in issue_counts(issues).items():
+        if count:
+            print(f"  {reason:<22} {count:>7}  {REASONS[reason]}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Data-quality validation of the debate data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # check command
+    check_parser = subparsers.add_parser(
+        "check", help="Validate the debate CSV and write the quarantine file"
+    )
+    check_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    check_parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=str(PATH_TO_QUARANTINE),
+        help=f"Quarantine CSV path (default: {PATH_TO_QUARANTINE})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "check":
+        cmd_check(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -0,0 +1,498 @@
+"""Embedded SQLite warehouse of the debate data.
+
+Holds the normalized debate store (debates, speaker performances, ballots
+and the debater and judge names) next to the derived tables the stats
+need: decided outcomes, guessed genders and motion categories. Everything
+is indexed by speaker, team, judge and date, so tools query one file
+instead of re-reading and re-parsing the CSVs.
+
+Loading is incremental: debates are upserted by id, their performances and
+ballots replaced, and every load runs in a single transaction using
+`executemany`. The database runs in WAL mode, so readers are not blocked
+while a load is running.
+
+Example usage:
+    python -m data.preprocessing.warehouse load
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+from pathlib import Path
+
+from data.preprocessing.categorize_motions import PATH_TO_CATEGORIZATION_OUTPUT
+from data.preprocessing.debate_store import (
+    BALLOT_COLUMNS,
+    DEBATE_COLUMNS,
+    DEBATER_COLUMNS,
+    JUDGE_COLUMNS,
+    PERFORMANCE_COLUMNS,
+    DebateStore,
+    add_date_keys,
+    legacy_person_id,
+    load_debate_store,
+)
+from data.preprocessing.estimate_gender import PATH_TO_GENDER_OUTPUT
+from data.preprocessing.lazy_imports import lazy_import
+from logger.logger import logger, setup_logging
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+PATH_TO_INPUT_CSV = PROJECT_ROOT / "data" / "raw" / "debate_data.csv"
+PATH_TO_WAREHOUSE = PROJECT_ROOT / "data" / "processed" / "warehouse.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    debate_id INTEGER PRIMARY KEY,
+    date TEXT,
+    comp TEXT,
+    comp_id INTEGER,
+    league_name TEXT,
+    league_id INTEGER,
+    tournament_name TEXT,
+    tournament_id INTEGER,
+    motion TEXT,
+    score TEXT
+);
+CREATE TABLE IF NOT EXISTS performances (
+    debate_id INTEGER NOT NULL REFERENCES debates(debate_id) ON DELETE CASCADE,
+    team_id INTEGER,
+    team_name TEXT,
+    side TEXT,
+    position INTEGER NOT NULL,
+    debater_id INTEGER NOT NULL,
+    points INTEGER
+);
+CREATE TABLE IF NOT EXISTS ballots (
+    debate_id INTEGER NOT NULL REFERENCES debates(debate_id) ON DELETE CASCADE,
+    judge_id INTEGER NOT NULL,
+    side TEXT,
+    score TEXT
+);
+CREATE TABLE IF NOT EXISTS outcomes (
+    debate_id INTEGER PRIMARY KEY REFERENCES debates(debate_id) ON DELETE CASCADE,
+    winner_side TEXT NOT NULL,
+    aff_ballots INTEGER NOT NULL,
+    neg_ballots INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS debaters (
+    debater_id INTEGER PRIMARY KEY,
+    debater_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS judges (
+    judge_id INTEGER PRIMARY KEY,
+    judge_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS genders (
+    debater_id INTEGER PRIMARY KEY,
+    is_male INTEGER NOT NULL,
+    inconclusive INTEGER NOT NULL,
+    method_used TEXT
+);
+CREATE TABLE IF NOT EXISTS motion_categories (
+    motion TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (motion, rank)
+);
+CREATE INDEX IF NOT EXISTS debates_date ON debates(date);
+CREATE INDEX IF NOT EXISTS debates_motion ON debates(motion);
+CREATE INDEX IF NOT EXISTS performances_debate ON performances(debate_id);
+CREATE INDEX IF NOT EXISTS performances_debater ON performances(debater_id);
+CREATE INDEX IF NOT EXISTS performances_team ON performances(team_id);
+CREATE INDEX IF NOT EXISTS ballots_debate ON ballots(debate_id);
+CREATE INDEX IF NOT EXISTS ballots_judge ON ballots(judge_id);
+"""
+
+# Win/loss record and average points of every speaker per side
+SPEAKER_RECORDS_QUERY = """
+SELECT p.debater_id,
+       p.side,
+       COUNT(*) AS debates,
+       COUNT(o.debate_id) AS decided,
+       SUM(o.winner_side = p.side) AS wins,
+       AVG(p.points) AS average_points
+FROM performances p
+LEFT JOIN outcomes o ON o.debate_id = p.debate_id
+WHERE (:debater_id IS NULL OR p.debater_id = :debater_id)
+GROUP BY p.debater_id, p.side
+ORDER BY p.debater_id, p.side
+"""
+
+# Average points of every speaker per position
+POSITION_POINTS_QUERY = """
+SELECT debater_id, position, AVG(points) AS average_points, COUNT(points) AS scored
+FROM performances
+WHERE (:debater_id IS NULL OR debater_id = :debater_id)
+GROUP BY debater_id, position
+ORDER BY debater_id, position
+"""
+
+# Debate history of one speaker with the opponent and the ballots gained
+SPEAKER_DEBATES_QUERY = """
+SELECT d.debate_id,
+       d.date,
+       d.motion,
+       p.side,
+       p.points,
+       opponent.team_name AS opponent,
+       o.winner_side,
+       CASE p.side WHEN 'aff' THEN o.aff_ballots ELSE o.neg_ballots END
+           AS ballots_gained
+FROM performances p
+JOIN debates d ON d.debate_id = p.debate_id
+LEFT JOIN outcomes o ON o.debate_id = p.debate_id
+LEFT JOIN (
+    SELECT DISTINCT debate_id, side, team_name FROM performances
+) opponent ON opponent.debate_id = p.debate_id AND opponent.side != p.side
+WHERE p.debater_id = :debater_id
+  AND (:since IS NULL OR d.date >= :since)
+ORDER BY d.date, d.debate_id
+"""
+
+# Win rate of every speaker per motion category
+CATEGORY_RECORDS_QUERY = """
+SELECT p.debater_id,
+       c.category,
+       COUNT(*) AS decided,
+       SUM(o.winner_side = p.side) AS wins
+FROM performances p
+JOIN debates d ON d.debate_id = p.debate_id
+JOIN outcomes o ON o.debate_id = p.debate_id
+JOIN motion_categories c ON c.motion = TRIM(d.motion)
+WHERE (:debater_id IS NULL OR p.debater_id = :debater_id)
+GROUP BY p.debater_id, c.category
+ORDER BY p.debater_id, c.category
+"""
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open the warehouse, creating the schema if needed.
+
+    Args:
+        path: Database file path (":memory:" for a temporary database)
+
+    Returns:
+        Connection in WAL mode with foreign keys enforced
+    """
+    if str(path) != ":memory:":
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _rows(df: pd.DataFrame, columns: list[str]):
+    """Rows of a DataFrame as tuples of Python values with None for NA."""
+    values = df[columns].astype(object)
+    return values.where(df[columns].notna(), None).itertuples(index=False, name=None)
+
+
+def _insert(
+    conn: sqlite3.Connection,
+    table: str,
+    df: pd.DataFrame,
+    columns: list[str],
+    conflict: str = "",
+) -> None:
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"{conflict}",
+        _rows(df, columns),
+    )
+
+
+def _upsert_clause(key: str, columns: list[str]) -> str:
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+    return f"ON CONFLICT({key}) DO UPDATE SET {updates}"
+
+
+def load_store(conn: sqlite3.Connection, store: DebateStore) -> None:
+    """Upsert the debates of a store into the warehouse.
+
+    Debates are matched by id; the performances, ballots and outcome of a
+    debate already in the warehouse are replaced. Names from the store
+    take precedence over the stored ones. Runs as a single transaction.
+
+    Args:
+        conn: Warehouse connection
+        store: Debates to load
+    """
+    debate_ids = [(int(i),) for i in store.debates["debate_id"]]
+    with conn:
+        # Facts of reloaded debates are replaced, not merged
+        for table in ("performances", "ballots", "outcomes"):
+            conn.executemany(f"DELETE FROM {table} WHERE debate_id = ?", debate_ids)
+
+        _insert(
+            conn,
+            "debates",
+            store.debates,
+            DEBATE_COLUMNS,
+            _upsert_clause("debate_id", DEBATE_COLUMNS),
+        )
+        _insert(conn, "performances", store.performances, PERFORMANCE_COLUMNS)
+        _insert(conn, "ballots", store.ballots, BALLOT_COLUMNS)
+        outcomes = store.outcomes()
+        _insert(conn, "outcomes", outcomes, list(outcomes.columns))
+        _insert(
+            conn,
+            "debaters",
+            store.debaters,
+            DEBATER_COLUMNS,
+            _upsert_clause("debater_id", DEBATER_COLUMNS),
+        )
+        _insert(
+            conn,
+            "judges",
+            store.judges,
+            JUDGE_COLUMNS,
+            _upsert_clause("judge_id", JUDGE_COLUMNS),
+        )
+
+    logger.info(f"Loaded {len(debate_ids)} debates into the warehouse")
+
+
+def load_genders(conn: sqlite3.Connection, genders: pd.DataFrame) -> None:
+    """Replace the guessed genders with the results of estimate_gender.
+
+    Results without a debater_id column (older exports) get the surrogate
+    ids of speakers scraped without ids.
+
+    Args:
+        conn: Warehouse connection
+        genders: DataFrame as saved by save_gender_results
+    """
+    if "debater_id" not in genders:
+        genders = genders.assign(
+            debater_id=genders["debater_name"].map(legacy_person_id)
+        )
+    genders = genders.drop_duplicates("debater_id", keep="last")
+    columns = ["debater_id", "is_male", "inconclusive", "method_used"]
+    with conn:
+        conn.execute("DELETE FROM genders")
+        _insert(conn, "genders", genders, columns)
+
+
+def load_motion_categories(conn: sqlite3.Connection, categories: pd.DataFrame) -> None:
+    """Replace the motion categories with the results of categorize_motions.
+
+    Args:
+        conn: Warehouse connection
+        categories: DataFrame as saved by save_categorization_results
+    """
+    ranked = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "motion": categories["motion"],
+                    "rank": rank,
+                    "category": categories[f"category_{rank}"],
+                    "score": categories[f"category_{rank}_score"],
+                }
+            )
+            for rank in (1, 2, 3)
+        ],
+        ignore_index=True,
+    )
+    ranked = ranked[ranked["category"].fillna("").astype(str).str.strip() != ""]
+    with conn:
+        conn.execute("DELETE FROM motion_categories")
+        _insert(
+            conn,
+            "motion_categories",
+            ranked,
+            ["motion", "rank", "category", "score"],
+            "ON CONFLICT(motion, rank) DO NOTHING",
+        )
+
+
+def read_store(conn: sqlite3.Connection) -> DebateStore:
+    """Read the warehouse back into a DebateStore.
+
+    Returns:
+        DebateStore with the same column types as load_debate_store
+    """
+
+    def table(name: str, columns: list[str], key: str) -> pd.DataFrame:
+        return pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM {name} ORDER BY {key}", conn
+        )
+
+    debates = table("debates", DEBATE_COLUMNS, "debate_id")
+    performances = table("performances", PERFORMANCE_COLUMNS, "rowid")
+    ballots = table("ballots", BALLOT_COLUMNS, "rowid")
+
+    for column in ("comp_id", "league_id", "tournament_id"):
+        debates[column] = debates[column].astype("Int64")
+    debates["debate_id"] = debates["debate_id"].astype(np.int64)
+    debates = add_date_keys(debates)
+    performances = performances.astype(
+        {
+            "debate_id": np.int64,
+            "team_id": "Int64",
+            "position": np.int8,
+            "debater_id": np.int64,
+            "points": "Int64",
+        }
+    )
+    ballots = ballots.astype({"debate_id": np.int64, "judge_id": np.int64})
+
+    return DebateStore(
+        debates=debates,
+        performances=performances,
+        ballots=ballots,
+        debaters=table("debaters", DEBATER_COLUMNS, "debater_id"),
+        judges=table("judges", JUDGE_COLUMNS, "judge_id"),
+    )
+
+
+def speaker_records(
+    conn: sqlite3.Connection, debater_id: int | None = None
+) -> pd.DataFrame:
+    """Debates, decided debates, wins and average points per speaker and side.
+
+    Args:
+        conn: Warehouse connection
+        debater_id: Only this speaker (default: all)
+    """
+    return pd.read_sql_query(
+        SPEAKER_RECORDS_QUERY, conn, params={"debater_id": debater_id}
+    )
+
+
+def position_points(
+    conn: sqlite3.Connection, debater_id: int | None = None
+) -> pd.DataFrame:
+    """Average speaker points per speaker and position.
+
+    Args:
+        conn: Warehouse connection
+        debater_id: Only this speaker (default: all)
+    """
+    return pd.read_sql_query(
+        POSITION_POINTS_QUERY, conn, params={"debater_id": debater_id}
+    )
+
+
+def speaker_debates(
+    conn: sqlite3.Connection, debater_id: int, since: str | None = None
+) -> pd.DataFrame:
+    """Debate history of a speaker, oldest first.
+
+    Args:
+        conn: Warehouse connection
+        debater_id: Speaker id
+        since: Only debates on or after this date ("YYYY-MM-DD")
+    """
+    return pd.read_sql_query(
+        SPEAKER_DEBATES_QUERY, conn, params={"debater_id": debater_id, "since": since}
+    )
+
+
+def category_records(
+    conn: sqlite3.Connection, debater_id: int | None = None
+) -> pd.DataFrame:
+    """Decided debates and wins per speaker and motion category.
+
+    Args:
+        conn: Warehouse connection
+        debater_id: Only this speaker (default: all)
+    """
+    return pd.read_sql_query(
+        CATEGORY_RECORDS_QUERY, conn, params={"debater_id": debater_id}
+    )
+
+
+def cmd_load(args):
+    """Command to load the debate data and derived tables into the warehouse."""
+    input_path = Path(args.input)
+    genders_path = Path(args.genders)
+    categories_path = Path(args.categories)
+    database_path = Path(args.database)
+
+    print(f"Loading debates from: {input_path}")
+    store = load_debate_store(input_path)
+    print(f"Loaded {len(store.debates)} debates")
+
+    conn = connect(database_path)
+    try:
+        load_store(conn, store)
+        if genders_path.exists():
+            load_genders(conn, pd.read_csv(genders_path, encoding="utf-8"))
+        else:
+            print(f"Genders not found, skipping: {genders_path}")
+        if categories_path.exists():
+            load_motion_categories(conn, pd.read_csv(categories_path, encoding="utf-8"))
+        else:
+            print(f"Motion categories not found, skipping: {categories_path}")
+
+        for name in ("debates", "performances", "ballots", "genders"):
+            count = conn.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]
+            print(f"  {name}: {count}")
+    finally:
+        conn.close()
+    print(f"Warehouse saved to: {database_path}")
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="SQLite warehouse of the debate data",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    # load command
+    load_parser = subparsers.add_parser(
+        "load", help="Upsert the debate data and derived tables into the warehouse"
+    )
+    load_parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        default=str(PATH_TO_INPUT_CSV),
+        help=f"Input CSV file path (default: {PATH_TO_INPUT_CSV})",
+    )
+    load_parser.add_argument(
+        "-g",
+        "--genders",
+        type=str,
+        default=str(PATH_TO_GENDER_OUTPUT),
+        help=f"Debater genders CSV path (default: {PATH_TO_GENDER_OUTPUT})",
+    )
+    load_parser.add_argument(
+        "-c",
+        "--categories",
+        type=str,
+        default=str(PATH_TO_CATEGORIZATION_OUTPUT),
+        help=f"Motion categories CSV path (default: {PATH_TO_CATEGORIZATION_OUTPUT})",
+    )
+    load_parser.add_argument(
+        "-d",
+        "--database",
+        type=str,
+        default=str(PATH_TO_WAREHOUSE),
+        help=f"Warehouse database path (default: {PATH_TO_WAREHOUSE})",
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "load":
+        cmd_load(args)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    setup_logging()
+    main()
@@ -1,5 +1,5 @@
 export class DebaterSelector {
-    constructor(containerId, allDebaters, currentDebater, onSelect) {
+    constructor(containerId, allDebaters, currentDebater, onSelect, search = null) {
         this.inputElement = null;
         this.dropdownElement = null;
         const container = document.getElementById(containerId);
@@ -10,7 +10,12 @@ export class DebaterSelector {
         this.allDebaters = allDebaters;
         this.currentDebater = currentDebater;
         this.onSelectCallback = onSelect;
-        this.initializeFuse();
+        this.search = search;
+        this.debatersById = new Map(allDebaters.map(debater => [debater.id, debater]));
+        // Fall back to fuzzy search when there is no prebuilt search index
+        if (!this.search) {
+            this.initializeFuse();
+        }
         this.render();
     }
     async initializeFuse() {
@@ -80,12 +85,23 @@ export class DebaterSelector {
         });
         this.dropdownElement.classList.add('active');
     }
+    findDebaters(query, limit) {
+        if (this.search) {
+            return this.search
+                .search(query, limit)
+                .map(id => this.debatersById.get(id))
+                .filter((debater) => debater !== undefined);
+        }
+        if (!this.fuse)
+            return [];
+        const results = this.fuse.search(query);
+        return results.slice(0, limit).map(result => result.item);
+    }
     showFilteredDebaters(query) {
-        if (!this.dropdownElement || !this.fuse)
+        if (!this.dropdownElement)
             return;
-        const results = this.fuse.search(query);
+        const topResults = this.findDebaters(query, 5);
         this.dropdownElement.innerHTML = '';
-        const topResults = results.slice(0, 5);
         if (topResults.length === 0) {
             const noResults = document.createElement('div');
             noResults.className = 'selector-option';
@@ -95,8 +111,8 @@ export class DebaterSelector {
             this.dropdownElement.appendChild(noResults);
         }
         else {
-            topResults.forEach(result => {
-                this.addOptionToDropdown(result.item);
+            topResults.forEach(debater => {
+                this.addOptionToDropdown(debater);
             });
         }
         this.dropdownElement.classList.add('active');
@@ -1,3 +1,4 @@
+import { formatNumber } from './numberFormatter.js';
 export class DebatesTable {
     constructor(containerId, debater) {
         this.tableElement = null;
@@ -98,7 +99,7 @@ export class DebatesTable {
             this.addCellToRow(row, debate.ballots_gained.toString());
             this.addCellToRow(row, debate.opponent);
             this.addCellToRow(row, debate.was_aff ? 'A' : 'N');
-            this.addCellToRow(row, debate.speaker_points.toFixed(1));
+            this.addCellToRow(row, formatNumber(debate.speaker_points));
             this.addCellToRow(row, debate.date);
             const linkCell = document.createElement('td');
             const linkIcon = document.createElement('a');
@@ -1,3 +1,4 @@
+import { formatNumber } from './numberFormatter.js';
 export class PositionStats {
     constructor(containerId, debater) {
         const container = document.getElementById(containerId);
@@ -27,7 +28,7 @@ export class PositionStats {
             positionLabel.textContent = `Position ${position}`;
             const value = document.createElement('span');
             value.className = 'stats-value';
-            value.textContent = points.toFixed(1);
+            value.textContent = formatNumber(points);
             item.appendChild(positionLabel);
             item.appendChild(value);
             list.appendChild(item);
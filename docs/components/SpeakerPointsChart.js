@@ -33,9 +33,7 @@ export class SpeakerPointsChart {
         const ctx = this.canvasElement.getContext('2d');
         if (!ctx)
             return;
-        const sortedDebates = [...this.currentDebater.debates].sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime());
-        const dates = sortedDebates.map(d => d.date);
-        const points = sortedDebates.map(d => d.speaker_points);
+        const { dates, points } = this.series(this.currentDebater);
         this.chart = new Chart(ctx, {
             type: 'line',
             data: {
@@ -115,14 +113,22 @@ export class SpeakerPointsChart {
             }
         });
     }
+    series(debater) {
+        // Debates without recorded points are left out of the line
+        const sortedDebates = debater.debates
+            .filter(d => d.speaker_points !== null)
+            .sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime());
+        return {
+            dates: sortedDebates.map(d => d.date),
+            points: sortedDebates.map(d => d.speaker_points)
+        };
+    }
     update(debater) {
         this.currentDebater = debater;
         if (!this.chart) {
             this.render();
         }
-        const sortedDebates = [...debater.debates].sort((a, b) => new Date(a.date).getTime() - new Date(b.date).getTime());
-        const dates = sortedDebates.map(d => d.date);
-        const points = sortedDebates.map(d => d.speaker_points);
+        const { dates, points } = this.series(debater);
         this.chart.data.labels = dates;
         this.chart.data.datasets[0].data = points;
         this.chart.update();
@@ -1,3 +1,4 @@
+import { formatPercent } from './numberFormatter.js';
 export class WinRateChart {
     constructor(containerId, debater) {
         this.chart = null; // Chart.js instance
@@ -20,12 +21,7 @@ export class WinRateChart {
         this.canvasElement.className = 'chart-canvas';
         const details = document.createElement('div');
         details.className = 'win-rate-details';
-        details.innerHTML = `
-      <h2>Win Rate</h2>
-      <p><strong>Overall:</strong> ${(this.currentDebater.side_win_rates.total * 100).toFixed(1)}%</p>
-      <p><strong>Affirmative:</strong> ${(this.currentDebater.side_win_rates.aff * 100).toFixed(1)}%</p>
-      <p><strong>Negative:</strong> ${(this.currentDebater.side_win_rates.neg * 100).toFixed(1)}%</p>
-    `;
+        details.innerHTML = this.detailsHtml(this.currentDebater);
         this.container.appendChild(this.canvasElement);
         this.container.appendChild(details);
         this.initializeChart();
@@ -42,14 +38,12 @@ export class WinRateChart {
         const ctx = this.canvasElement.getContext('2d');
         if (!ctx)
             return;
-        const winRate = this.currentDebater.side_win_rates.total;
-        const lossRate = 1 - winRate;
         this.chart = new Chart(ctx, {
             type: 'pie',
             data: {
                 labels: ['Wins', 'Losses'],
                 datasets: [{
-                        data: [winRate * 100, lossRate * 100],
+                        data: this.chartData(this.currentDebater),
                         backgroundColor: [
                             'rgba(34, 197, 94, 0.8)', // Green for wins
                             'rgba(239, 68, 68, 0.8)' // Red for losses
@@ -87,21 +81,30 @@ export class WinRateChart {
             }
         });
     }
+    chartData(debater) {
+        const winRate = debater.side_win_rates.total;
+        // An empty pie for debaters without decided debates
+        if (winRate === null)
+            return [0, 0];
+        return [winRate * 100, (1 - winRate) * 100];
+    }
+    detailsHtml(debater) {
+        const rates = debater.side_win_rates;
+        return `
+      <h2>Win Rate</h2>
+      <p><strong>Overall:</strong> ${formatPercent(rates.total)}</p>
+      <p><strong>Affirmative:</strong> ${formatPercent(rates.aff)}</p>
+      <p><strong>Negative:</strong> ${formatPercent(rates.neg)}</p>
+    `;
+    }
     update(debater) {
         this.currentDebater = debater;
         if (this.chart) {
-            const winRate = debater.side_win_rates.total;
-            const lossRate = 1 - winRate;
-            this.chart.data.datasets[0].data = [winRate * 100, lossRate * 100];
+            this.chart.data.datasets[0].data = this.chartData(debater);
             this.chart.update();
             const details = this.container.querySelector('.win-rate-details');
             if (details) {
-                details.innerHTML = `
-          <h2>Win Rate</h2>
-          <p><strong>Overall:</strong> ${(debater.side_win_rates.total * 100).toFixed(1)}%</p>
-          <p><strong>Affirmative:</strong> ${(debater.side_win_rates.aff * 100).toFixed(1)}%</p>
-          <p><strong>Negative:</strong> ${(debater.side_win_rates.neg * 100).toFixed(1)}%</p>
-        `;
+                details.innerHTML = this.detailsHtml(debater);
             }
         }
         else {
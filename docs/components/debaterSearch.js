@@ -0,0 +1,79 @@
+// Mirrors data/preprocessing/search_index.py; keep both in sync.
+const MIN_TRIGRAM_OVERLAP = 0.5;
+export function nameTokens(text) {
+    const normalized = text
+        .normalize('NFD')
+        .replace(/\p{Mn}/gu, '')
+        .toLowerCase();
+    return normalized.match(/[a-z0-9]+/g) ?? [];
+}
+function trigrams(text) {
+    const grams = new Set();
+    for (const token of nameTokens(text)) {
+        const padded = `  ${token} `;
+        for (let i = 0; i + 3 <= padded.length; i++) {
+            grams.add(padded.slice(i, i + 3));
+        }
+    }
+    return grams;
+}
+function lowerBound(keys, value, start = 0) {
+    let low = start;
+    let high = keys.length;
+    while (low < high) {
+        const mid = (low + high) >>> 1;
+        if (keys[mid] < value) {
+            low = mid + 1;
+        }
+        else {
+            high = mid;
+        }
+    }
+    return low;
+}
+export class DebaterSearch {
+    constructor(index) {
+        this.index = index;
+    }
+    // Debater ids, prefix matches first and trigram matches if there are none
+    search(query, limit) {
+        let positions = this.prefixSearch(query, limit);
+        if (positions.length === 0) {
+            positions = this.trigramSearch(query, limit);
+        }
+        return positions.map(position => this.index.ids[position]);
+    }
+    prefixSearch(query, limit) {
+        const prefix = nameTokens(query).join(' ');
+        if (prefix === '')
+            return [];
+        const { keys, entries } = this.index;
+        const start = lowerBound(keys, prefix);
+        // Keys are ASCII, so U+FFFF sorts after anything following the prefix
+        const end = lowerBound(keys, prefix + '\uffff', start);
+        const results = [];
+        for (let i = start; i < end && results.length < limit; i++) {
+            if (!results.includes(entries[i])) {
+                results.push(entries[i]);
+            }
+        }
+        return results;
+    }
+    trigramSearch(query, limit) {
+        const grams = trigrams(query);
+        if (grams.size === 0)
+            return [];
+        const hits = new Map();
+        grams.forEach(gram => {
+            for (const position of this.index.trigrams[gram] ?? []) {
+                hits.set(position, (hits.get(position) ?? 0) + 1);
+            }
+        });
+        const minHits = Math.max(1, MIN_TRIGRAM_OVERLAP * grams.size);
+        return Array.from(hits.entries())
+            .filter(([, count]) => count >= minHits)
+            .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+            .slice(0, limit)
+            .map(([position]) => position);
+    }
+}
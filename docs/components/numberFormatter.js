@@ -0,0 +1,8 @@
+// Shown instead of a statistic the debater has no data for
+export const MISSING_VALUE = '–';
+export function formatNumber(value, digits = 1) {
+    return value === null ? MISSING_VALUE : value.toFixed(digits);
+}
+export function formatPercent(rate, digits = 1) {
+    return rate === null ? MISSING_VALUE : `${(rate * 100).toFixed(digits)}%`;
+}
@@ -1,3 +1,4 @@
+import { DebaterSearch } from './components/debaterSearch.js';
 import { DebaterSelector } from './components/DebaterSelector.js';
 import { DebatesTable } from './components/DebatesTable.js';
 import { MotionStats } from './components/MotionStats.js';
@@ -9,6 +10,7 @@ const state = {
     allDebaters: [],
     currentDebater: null
 };
+let debaterSearch = null;
 let debaterSelector = null;
 let winRateChart = null;
 let speakerPointsChart = null;
@@ -27,18 +29,34 @@ async function loadData() {
         console.log('Data loaded successfully');
         console.log(`Loaded ${state.allDebaters.length} debaters`);
         console.log('Current debater:', state.currentDebater?.name);
+        debaterSearch = await loadSearchIndex();
         initializeComponents();
     }
     catch (error) {
         console.error('Failed to load data:', error);
     }
 }
+// The selector falls back to fuzzy search when the index is not published
+async function loadSearchIndex() {
+    try {
+        const response = await fetch('./debater_index.json');
+        if (!response.ok) {
+            return null;
+        }
+        const index = await response.json();
+        return new DebaterSearch(index);
+    }
+    catch (error) {
+        console.warn('Debater search index not available:', error);
+        return null;
+    }
+}
 function initializeComponents() {
     if (!state.currentDebater) {
         console.error('No debater selected');
         return;
     }
-    debaterSelector = new DebaterSelector('debater-selector', state.allDebaters, state.currentDebater, onDebaterSelected);
+    debaterSelector = new DebaterSelector('debater-selector', state.allDebaters, state.currentDebater, onDebaterSelected, debaterSearch);
     winRateChart = new WinRateChart('win-rate-chart', state.currentDebater);
     speakerPointsChart = new SpeakerPointsChart('speaker-points-chart', state.currentDebater);
     motionStats = new MotionStats('motion-stats', state.currentDebater);
@@ -22,6 +22,9 @@ The log file will contain entries like:
 "my_script.py", "lineno": 10, "message": "This is an info message", "logger":
 "myapp"}
 
+Structured data passed as `extra={"data": {...}}` is added to the entry under
+the "data" key.
+
 """
 
 import atexit
@@ -68,31 +71,23 @@ class JSONLinesFormatter(logging.Formatter):
             "message": record.getMessage(),
             "logger": record.name,
         }
+        # Structured payload passed as logger.info(..., extra={"data": {...}})
+        if hasattr(record, "data"):
+            log_record["data"] = record.data
         return json.dumps(log_record, default=str)
 
 
-def setup_logging(
-    log_file_path: str = "logger/logs/log.jsonl", log_level=logging.DEBUG
-) -> logging.Logger:
-    """
-    Set up logging with both console and file output using QueueHandler/QueueListener.
+def _start_logging(log_file_path: str) -> logging.Handler:
+    """Create the log file handlers and start the listener thread.
 
-    Args:
-        log_file_path: Path to the log file
-        log_level: Minimum log level (default: DEBUG)
+    Returns:
+        QueueHandler feeding the listener
     """
     # Ensure log directory exists
     os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
 
-    logger_instance = logging.getLogger("myapp")
-    logger_instance.setLevel(log_level)
-
-    logger_instance.handlers.clear()
-
     log_queue = queue.Queue(maxsize=-1)
     queue_handler = logging.handlers.QueueHandler(log_queue)
-    logger_instance.addHandler(queue_handler)
-    logger_instance.propagate = False
 
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.DEBUG)
@@ -112,6 +107,48 @@ def setup_logging(
 
     atexit.register(listener.stop)
 
+    return queue_handler
+
+
+class DeferredHandler(logging.Handler):
+    """Handler that sets up the real handlers on the first record it gets.
+
+    Importing the logger and calling setup_logging stay cheap: the log
+    directory, the log file and the listener thread are only created once
+    something is actually logged.
+    """
+
+    def __init__(self, log_file_path: str):
+        super().__init__()
+        self.log_file_path = log_file_path
+        self.queue_handler: logging.Handler | None = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Runs under the handler lock, so the listener is started only once
+        if self.queue_handler is None:
+            self.queue_handler = _start_logging(self.log_file_path)
+        self.queue_handler.handle(record)
+
+
+def setup_logging(
+    log_file_path: str = "logger/logs/log.jsonl", log_level=logging.DEBUG
+) -> logging.Logger:
+    """
+    Set up logging with both console and file output using QueueHandler/QueueListener.
+
+    The handlers are created lazily, on the first logged record.
+
+    Args:
+        log_file_path: Path to the log file
+        log_level: Minimum log level (default: DEBUG)
+    """
+    logger_instance = logging.getLogger("myapp")
+    logger_instance.setLevel(log_level)
+
+    logger_instance.handlers.clear()
+    logger_instance.addHandler(DeferredHandler(log_file_path))
+    logger_instance.propagate = False
+
     is_production: bool = (
         os.getenv("ENVIRONMENT", "development").lower() == "production"
     )
@@ -0,0 +1,161 @@
+"""Content-addressed archive of raw responses.
+
+Every archived body is stored gzip-compressed under its SHA-256 digest, so a
+page fetched twice with identical content is stored once. An append-only
+``index.jsonl`` records which spider fetched which URL, the callback that
+parsed it and the callback kwargs, which is everything needed to run the
+extraction again offline (see ``scrapy reparse``).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+INDEX_FILENAME = "index.jsonl"
+OBJECTS_DIRNAME = "objects"
+
+
+class RawArchive:
+    """Raw response store rooted at a directory."""
+
+    def __init__(self, root: Path | str):
+        self.root = Path(root)
+        self.objects_dir = self.root / OBJECTS_DIRNAME
+        self.index_path = self.root / INDEX_FILENAME
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.gz"
+
+    def put(self, body: bytes) -> str:
+        """Store a response body and return its digest.
+
+        Args:
+            body: Raw response body
+
+        Returns:
+            Hex SHA-256 digest of the body
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest)
+        if path.exists():
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(gzip.compress(body, mtime=0))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Load a response body by its digest."""
+        with open(self.object_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def record(
+        self,
+        spider: str,
+        url: str,
+        digest: str,
+        callback: str,
+        cb_kwargs: dict,
+        status: int = 200,
+        encoding: str = "utf-8",
+    ) -> None:
+        """Append an index entry linking a fetched URL to its stored body."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "spider": spider,
+            "url": url,
+            "digest": digest,
+            "callback": callback,
+            "cb_kwargs": cb_kwargs,
+            "status": status,
+            "encoding": encoding,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def entries(self, spider: str) -> list[dict]:
+        """Return the latest index entry for every URL fetched by a spider.
+
+        Entries keep the order in which their URL was first archived.
+        """
+        if not self.index_path.exists():
+            return []
+
+        latest: dict[str, dict] = {}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if entry["spider"] == spider:
+                    latest[entry["url"]] = entry
+        return list(latest.values())
+
+
+def _reparse_chunk(spider_cls, archive_root: str, entries: list[dict]) -> list:
+    """Run spider callbacks over a chunk of archived responses.
+
+    Follow-up requests yielded by the callbacks are dropped; offline, the
+    pages they point to are covered by their own archive entries.
+    """
+    archive = RawArchive(archive_root)
+    spider = spider_cls()
+
+    items = []
+    for entry in entries:
+        request = Request(entry["url"], cb_kwargs=entry["cb_kwargs"])
+        response = HtmlResponse(
+            url=entry["url"],
+            status=entry["status"],
+            body=archive.get(entry["digest"]),
+            encoding=entry["encoding"],
+            request=request,
+        )
+        callback = getattr(spider, entry["callback"])
+        for result in callback(response, **entry["cb_kwargs"]) or ():
+            if not isinstance(result, Request):
+                items.append(result)
+    return items
+
+
+def reparse_archive(
+    spider_cls, archive_root: Path | str, workers: int | None = None
+) -> list:
+    """Re-run a spider's extraction callbacks over its archived responses.
+
+    Args:
+        spider_cls: Spider class whose callbacks should be used
+        archive_root: Root directory of the raw archive
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        Extracted items, in archive order
+    """
+    entries = RawArchive(archive_root).entries(spider_cls.name)
+    if not entries:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(entries)))
+    chunk_size = -(-len(entries) // workers)
+    chunks = [entries[i : i + chunk_size] for i in range(0, len(entries), chunk_size)]
+
+    items = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_reparse_chunk, spider_cls, str(archive_root), chunk)
+            for chunk in chunks
+        ]
+        for future in futures:
+            items.extend(future.result())
+    return items
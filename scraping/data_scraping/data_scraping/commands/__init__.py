@@ -0,0 +1,4 @@
+# Custom scrapy commands for the data_scraping project
+#
+# See documentation in:
+# https://docs.scrapy.org/en/latest/topics/commands.html#custom-project-commands
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from scrapy.commands import ScrapyCommand
+from scrapy.exceptions import UsageError
+
+from data_scraping.archive import reparse_archive
+from data_scraping.utils import EXPORTERS, export_items
+
+
+class Command(ScrapyCommand):
+    requires_project = True
+    default_settings = {"LOG_ENABLED": False}
+
+    def syntax(self):
+        return "[options] <spider>"
+
+    def short_desc(self):
+        return "Rebuild spider output from the raw response archive"
+
+    def long_desc(self):
+        return (
+            "Run the spider's extraction callbacks over the pages stored in "
+            "RAW_ARCHIVE_DIR, in parallel, without sending any requests"
+        )
+
+    def add_options(self, parser):
+        super().add_options(parser)
+        parser.add_argument(
+            "-o",
+            "--output",
+            required=True,
+            metavar="FILE",
+            help="output file (.csv, .jl or .jsonl)",
+        )
+        parser.add_argument(
+            "-w",
+            "--workers",
+            type=int,
+            default=None,
+            help="number of worker processes (default: CPU count)",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=None,
+            help="raw archive directory (default: RAW_ARCHIVE_DIR setting)",
+        )
+
+    def run(self, args, opts):
+        if len(args) != 1:
+            raise UsageError()
+
+        output_path = Path(opts.output)
+        if output_path.suffix not in EXPORTERS:
+            raise UsageError(f"Unsupported output format: {output_path.suffix}")
+
+        spider_cls = self.crawler_process.spider_loader.load(args[0])
+        archive_dir = opts.archive_dir or self.settings.get("RAW_ARCHIVE_DIR")
+
+        items = reparse_archive(spider_cls, archive_dir, workers=opts.workers)
+
+        export_items(items, output_path)
+
+        print(f"Re-parsed {len(items)} items from {archive_dir} into {output_path}")
@@ -0,0 +1,277 @@
+"""Lightweight asyncio fetcher for ad-hoc refreshes of individual debates.
+
+Fetches debate detail pages for a bounded list of ids over a small pool of
+keep-alive connections and runs them through the same extraction callback
+as the `greybox` spider, without starting a Scrapy crawler.
+
+Example usage (from scraping/data_scraping):
+    python -m data_scraping.fetch 10700-10720 11012 -o output/refresh.jl
+"""
+
+import argparse
+import asyncio
+import logging
+import ssl
+from urllib.parse import urlsplit
+
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from data_scraping.spiders.greybox import DebatySpider
+from data_scraping.utils import export_items
+
+BASE_URL = "https://statistiky.debatovani.cz/"
+DEBATE_PATH = "?page=debata&debata_id={debate_id}"
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP/1.1 connections to a single host.
+
+    At most `limit` requests are in flight at once; idle connections are
+    reused by the next request instead of being closed.
+    """
+
+    def __init__(self, base_url: str, limit: int = 8, timeout: float = 30.0):
+        parts = urlsplit(base_url)
+        self.base_url = base_url
+        self.host = parts.hostname
+        self.use_ssl = parts.scheme == "https"
+        self.port = parts.port or (443 if self.use_ssl else 80)
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _connect(self):
+        self.connections_opened += 1
+        return await asyncio.open_connection(
+            self.host,
+            self.port,
+            ssl=ssl.create_default_context() if self.use_ssl else None,
+        )
+
+    async def get(self, target: str) -> tuple[int, dict[str, str], bytes]:
+        """Send a GET request for a path relative to the base URL.
+
+        Args:
+            target: Path and query, e.g. "?page=debata&debata_id=10700"
+
+        Returns:
+            Tuple of (status, lower-cased headers, body)
+        """
+        async with self._semaphore:
+            reused = bool(self._idle)
+            reader, writer = self._idle.pop() if reused else await self._connect()
+            try:
+                status, headers, body, keep_alive = await self._send(
+                    reader, writer, target
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once
+                reader, writer = await self._connect()
+                status, headers, body, keep_alive = await self._send(
+                    reader, writer, target
+                )
+
+            if keep_alive:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, headers, body
+
+    async def _send(self, reader, writer, target):
+        try:
+            return await asyncio.wait_for(
+                self._request(reader, writer, target), self.timeout
+            )
+        except BaseException:
+            writer.close()
+            raise
+
+    async def _request(self, reader, writer, target):
+        path = urlsplit(self.base_url).path or "/"
+        if target.startswith("?"):
+            target = path + target
+        writer.write(
+            (
+                f"GET {target} HTTP/1.1\r\n"
+                f"Host: {self.host}\r\n"
+                "Connection: keep-alive\r\n"
+                "Accept-Encoding: identity\r\n"
+                "\r\n"
+            ).encode("latin-1")
+        )
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+        version, status = status_line.split(None, 2)[:2]
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = (
+            version == b"HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        )
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        return int(status), headers, body, keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader) -> bytes:
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";")[0].strip(), 16)
+            if size == 0:
+                # Skip optional trailers up to the terminating blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+async def fetch_debates(
+    debate_ids, base_url: str = BASE_URL, concurrency: int = 8, timeout: float = 30.0
+) -> list[dict]:
+    """Fetch and parse debate detail pages.
+
+    Args:
+        debate_ids: Ids of the debates to fetch
+        base_url: Site root the debate pages are served from
+        concurrency: Maximum number of requests in flight
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        Debate items in the order of `debate_ids`; debates that failed to
+        download or parse are logged and left out
+    """
+    spider = DebatySpider()
+
+    async with ConnectionPool(base_url, limit=concurrency, timeout=timeout) as pool:
+
+        async def fetch_one(debate_id):
+            target = DEBATE_PATH.format(debate_id=debate_id)
+            url = base_url + target
+            try:
+                status, headers, body = await pool.get(target)
+            except (
+                OSError,
+                ValueError,  # Malformed status line, header or chunk size
+                asyncio.TimeoutError,
+                asyncio.IncompleteReadError,
+            ) as e:
+                logger.warning(f"Failed to fetch debate {debate_id}: {e!r}")
+                return []
+            if status != 200:
+                logger.warning(f"Failed to fetch debate {debate_id}: HTTP {status}")
+                return []
+
+            response = HtmlResponse(
+                url=url,
+                status=status,
+                headers={"Content-Type": headers.get("content-type", "text/html")},
+                body=body,
+                request=Request(url, cb_kwargs={"debate_id": debate_id}),
+            )
+            # One unexpected page must not discard the rest of the batch
+            try:
+                return list(spider.parseDebateDetail(response, debate_id=debate_id))
+            except Exception as e:
+                logger.warning(f"Failed to parse debate {debate_id}: {e!r}")
+                return []
+
+        results = await asyncio.gather(*(fetch_one(i) for i in debate_ids))
+
+    return [item for items in results for item in items]
+
+
+def refresh_debate_store(store, debate_ids, **kwargs):
+    """Fetch debates and upsert them into a debate store.
+
+    Args:
+        store: DebateStore to update (see data.preprocessing.debate_store)
+        debate_ids: Ids of the debates to refresh
+        **kwargs: Passed on to fetch_debates
+
+    Returns:
+        Updated DebateStore
+    """
+    return store.upsert(asyncio.run(fetch_debates(debate_ids, **kwargs)))
+
+
+def parse_debate_ids(values: list[str]) -> list[int]:
+    """Expand CLI id arguments such as "10700-10720" and "11012"."""
+    debate_ids = []
+    for value in values:
+        start, _, end = value.partition("-")
+        if end:
+            debate_ids.extend(range(int(start), int(end) + 1))
+        else:
+            debate_ids.append(int(start))
+    return list(dict.fromkeys(debate_ids))
+
+
+def main():
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Fetch individual debates without running the crawler"
+    )
+    parser.add_argument(
+        "debate_ids", nargs="+", help="Debate ids or inclusive ranges (10700-10720)"
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="Output file (.csv, .jl or .jsonl)"
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of requests in flight (default: 4)",
+    )
+    parser.add_argument(
+        "--base-url", default=BASE_URL, help=f"Site root (default: {BASE_URL})"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    debate_ids = parse_debate_ids(args.debate_ids)
+    items = asyncio.run(
+        fetch_debates(debate_ids, base_url=args.base_url, concurrency=args.concurrency)
+    )
+    export_items(items, args.output)
+    print(f"Fetched {len(items)} of {len(debate_ids)} debates into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Per-spider crawl metrics collected by the project middlewares.
+
+One CrawlMetrics instance is shared by the spider and downloader middleware
+of a crawler. It is exported as a single JSON record when the spider closes.
+"""
+
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Item fields whose extraction is tracked by default
+DEFAULT_TRACKED_FIELDS = ["motion", "score", "judges_scoring"]
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of response latencies."""
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = list(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, latency_ms):
+        index = len(self.bounds_ms)
+        for i, bound in enumerate(self.bounds_ms):
+            if latency_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in self.bounds_ms]
+        labels.append(f">{self.bounds_ms[-1]}")
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "max_ms": round(self.max_ms, 1),
+        }
+
+
+class CrawlMetrics:
+    """Throughput, error and extraction-coverage counters of one crawl."""
+
+    def __init__(self, tracked_fields=DEFAULT_TRACKED_FIELDS):
+        self.tracked_fields = list(tracked_fields)
+        self.started = time.monotonic()
+        self.started_at = datetime.now(timezone.utc)
+        self.latency = LatencyHistogram()
+        self.status_codes = Counter()
+        self.exceptions = Counter()
+        self.retries = 0
+        self.pages = 0
+        self.items = 0
+        self.items_per_page = Counter()
+        self.field_seen = Counter()
+        self.field_missing = Counter()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Return the metrics shared by all middlewares of a crawler."""
+        metrics = getattr(crawler, "crawl_metrics", None)
+        if metrics is None:
+            metrics = cls(
+                crawler.settings.getlist(
+                    "CRAWL_METRICS_TRACKED_FIELDS", DEFAULT_TRACKED_FIELDS
+                )
+            )
+            crawler.crawl_metrics = metrics
+        return metrics
+
+    def start(self):
+        """Restart the throughput clock, e.g. when the spider opens."""
+        self.started = time.monotonic()
+        self.started_at = datetime.now(timezone.utc)
+
+    def record_response(self, status, latency_seconds=None):
+        self.status_codes[status] += 1
+        if latency_seconds is not None:
+            self.latency.add(latency_seconds * 1000)
+
+    def record_exception(self, exception):
+        self.exceptions[type(exception).__name__] += 1
+
+    def record_retry(self):
+        self.retries += 1
+
+    def record_page(self, items):
+        """Record the items extracted from one response."""
+        self.pages += 1
+        self.items += len(items)
+        self.items_per_page[len(items)] += 1
+
+        for item in items:
+            for field in self.tracked_fields:
+                if field in item:
+                    self.field_seen[field] += 1
+                    if not item[field]:
+                        self.field_missing[field] += 1
+
+    def to_record(self, spider_name):
+        """Summarize the metrics as a JSON-serializable dict."""
+        elapsed = time.monotonic() - self.started
+        requests = sum(self.status_codes.values()) + sum(self.exceptions.values())
+        errors = sum(
+            count for status, count in self.status_codes.items() if status >= 400
+        ) + sum(self.exceptions.values())
+
+        return {
+            "spider": spider_name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "elapsed_seconds": round(elapsed, 3),
+            "pages": self.pages,
+            "items": self.items,
+            "pages_per_second": round(self.pages / elapsed, 3) if elapsed else None,
+            "items_per_second": round(self.items / elapsed, 3) if elapsed else None,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+            "error_rate": round(errors / requests, 4) if requests else None,
+            "exceptions": dict(self.exceptions),
+            "retries": self.retries,
+            "latency": self.latency.to_dict(),
+            "items_per_page": {
+                str(k): v for k, v in sorted(self.items_per_page.items())
+            },
+            "extraction_missing": {
+                field: {
+                    "missing": self.field_missing[field],
+                    "seen": self.field_seen[field],
+                    "rate": round(
+                        self.field_missing[field] / self.field_seen[field], 4
+                    ),
+                }
+                for field in self.tracked_fields
+                if self.field_seen[field]
+            },
+        }
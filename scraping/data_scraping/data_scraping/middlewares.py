@@ -3,98 +3,116 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
-from scrapy import signals
+from scrapy import Request, signals
+from scrapy.exceptions import NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
 
+from data_scraping.archive import RawArchive
+from data_scraping.metrics import CrawlMetrics
+from logger.logger import logger as metrics_logger
+
 
 class DataScrapingSpiderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the spider middleware does not modify the
-    # passed objects.
+    """Count items per page and how often tracked fields fail to extract.
+
+    The crawl metrics (shared with DataScrapingDownloaderMiddleware) are
+    written as one JSON record through the project logger when the spider
+    closes.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
 
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
-        s = cls()
+        s = cls(CrawlMetrics.from_crawler(crawler))
         crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(s.spider_closed, signal=signals.spider_closed)
         return s
 
-    def process_spider_input(self, response, spider):
-        # Called for each response that goes through the spider
-        # middleware and into the spider.
-
-        # Should return None or raise an exception.
-        return None
-
     def process_spider_output(self, response, result, spider):
-        # Called with the results returned from the Spider, after
-        # it has processed the response.
-
-        # Must return an iterable of Request, or item objects.
+        items = []
         for i in result:
+            if not isinstance(i, Request):
+                items.append(ItemAdapter(i))
             yield i
-
-    def process_spider_exception(self, response, exception, spider):
-        # Called when a spider or process_spider_input() method
-        # (from other spider middleware) raises an exception.
-
-        # Should return either None or an iterable of Request or item objects.
-        pass
-
-    async def process_start(self, start):
-        # Called with an async iterator over the spider start() method or the
-        # maching method of an earlier spider middleware.
-        async for item_or_request in start:
-            yield item_or_request
+        self.metrics.record_page(items)
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+        self.metrics.start()
+
+    def spider_closed(self, spider, reason):
+        record = self.metrics.to_record(spider.name)
+        record["finish_reason"] = reason
+        metrics_logger.info(
+            f"Crawl metrics for {spider.name}", extra={"data": record}
+        )
 
 
 class DataScrapingDownloaderMiddleware:
-    # Not all methods need to be defined. If a method is not defined,
-    # scrapy acts as if the downloader middleware does not modify the
-    # passed objects.
+    """Record status codes, download latency, retries and download errors."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
 
     @classmethod
     def from_crawler(cls, crawler):
         # This method is used by Scrapy to create your spiders.
-        s = cls()
-        crawler.signals.connect(s.spider_opened, signal=signals.spider_opened)
-        return s
+        return cls(CrawlMetrics.from_crawler(crawler))
 
     def process_request(self, request, spider):
-        # Called for each request that goes through the downloader
-        # middleware.
-
-        # Must either:
-        # - return None: continue processing this request
-        # - or return a Response object
-        # - or return a Request object
-        # - or raise IgnoreRequest: process_exception() methods of
-        #   installed downloader middleware will be called
+        # RetryMiddleware marks the requests it reschedules with retry_times.
+        # Redirects copy the meta, so only count retry_times that went up.
+        retry_times = request.meta.get("retry_times", 0)
+        if retry_times > request.meta.get("metrics_retry_times", 0):
+            self.metrics.record_retry()
+            request.meta["metrics_retry_times"] = retry_times
         return None
 
     def process_response(self, request, response, spider):
-        # Called with the response returned from the downloader.
-
-        # Must either;
-        # - return a Response object
-        # - return a Request object
-        # - or raise IgnoreRequest
+        self.metrics.record_response(
+            response.status, request.meta.get("download_latency")
+        )
         return response
 
     def process_exception(self, request, exception, spider):
-        # Called when a download handler or a process_request()
-        # (from other downloader middleware) raises an exception.
+        self.metrics.record_exception(exception)
+        return None
 
-        # Must either:
-        # - return None: continue processing this exception
-        # - return a Response object: stops process_exception() chain
-        # - return a Request object: stops process_exception() chain
-        pass
 
-    def spider_opened(self, spider):
-        spider.logger.info("Spider opened: %s" % spider.name)
+class RawArchiveMiddleware:
+    """Store every successful response body in the raw archive.
+
+    Enabled with the RAW_ARCHIVE_ENABLED setting; the archive is written
+    to RAW_ARCHIVE_DIR. Archived pages can be re-parsed offline with
+    `scrapy reparse <spider>`.
+    """
+
+    def __init__(self, archive_dir):
+        self.archive = RawArchive(archive_dir)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if not crawler.settings.getbool("RAW_ARCHIVE_ENABLED"):
+            raise NotConfigured
+        return cls(crawler.settings.get("RAW_ARCHIVE_DIR", "archive"))
+
+    def process_response(self, request, response, spider):
+        if response.status != 200:
+            return response
+
+        digest = self.archive.put(response.body)
+        self.archive.record(
+            spider=spider.name,
+            url=response.url,
+            digest=digest,
+            callback=request.callback.__name__ if request.callback else "parse",
+            cb_kwargs=request.cb_kwargs,
+            status=response.status,
+            encoding=getattr(response, "encoding", "utf-8"),
+        )
+        return response
@@ -7,10 +7,20 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import sys
+from pathlib import Path
+
+# Make project-level packages (e.g. `logger`) importable when scrapy runs
+# from scraping/data_scraping
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
 BOT_NAME = "data_scraping"
 
 SPIDER_MODULES = ["data_scraping.spiders"]
 NEWSPIDER_MODULE = "data_scraping.spiders"
+COMMANDS_MODULE = "data_scraping.commands"
 
 LOG_LEVEL = "INFO"
 
@@ -45,15 +55,28 @@ DOWNLOAD_DELAY = 1
 
 # Enable or disable spider middlewares
 # See https://docs.scrapy.org/en/latest/topics/spider-middleware.html
-#SPIDER_MIDDLEWARES = {
-#    "data_scraping.middlewares.DataScrapingSpiderMiddleware": 543,
-#}
+SPIDER_MIDDLEWARES = {
+    "data_scraping.middlewares.DataScrapingSpiderMiddleware": 543,
+}
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
-#    "data_scraping.middlewares.DataScrapingDownloaderMiddleware": 543,
-#}
+# The metrics middleware sits above every built-in one (the highest is 900), so
+# it sees each raw response and exception before RetryMiddleware retries them
+# or RedirectMiddleware follows them.
+DOWNLOADER_MIDDLEWARES = {
+    "data_scraping.middlewares.DataScrapingDownloaderMiddleware": 950,
+    "data_scraping.middlewares.RawArchiveMiddleware": 100,
+}
+
+# Item fields whose extraction failures are reported in the crawl metrics
+# logged when a spider closes
+CRAWL_METRICS_TRACKED_FIELDS = ["motion", "score", "judges_scoring"]
+
+# Keep a compressed, content-addressed copy of every fetched page so the
+# extraction can be re-run offline with `scrapy reparse <spider>`
+RAW_ARCHIVE_ENABLED = True
+RAW_ARCHIVE_DIR = "archive"
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -91,22 +114,6 @@ DOWNLOAD_DELAY = 1
 # Set settings whose default value is deprecated to a future-proof value
 #FEED_EXPORT_ENCODING = "utf-8"
 
-#TURN OFF FOR DEBATES
-#FEED_EXPORT_FIELDS = [
- #   "Type",
-  #  "Team_ID",
-   # "Team",
-#    "Klub",
- #   "Členové",
-  #  "Debaty",
-#]
-
-
-
-FEEDS = {
-    'output/debate_data.csv': {
-        'format': 'csv',
-        'encoding': 'utf8',
-        'overwrite': True,
-    },
-}
+# Feeds are configured per spider (see `custom_settings` in each spider), so
+# the debate facts and the team/competition dimension tables end up in
+# separate files under output/ and can be joined on their ids
@@ -1,11 +1,21 @@
 from scrapy import Spider, Request
 import re
-from urllib.parse import urlparse, parse_qs
 import scrapy
 
+from data_scraping.utils import extract_id
+
 
 class DebatySpider(scrapy.Spider):
     name = "greybox"
+    custom_settings = {
+        "FEEDS": {
+            "output/debate_data.csv": {
+                "format": "csv",
+                "encoding": "utf8",
+                "overwrite": True,
+            },
+        },
+    }
 
     def start_requests(self):
         #for debate_id in range(11012, 11380):
@@ -19,11 +29,6 @@ class DebatySpider(scrapy.Spider):
 
     def parseDebateDetail(self, response, debate_id):
 
-        def extract_id(url, key):
-            if not url:
-                return None
-            return parse_qs(urlparse(url).query).get(key, [None])[0]
-
         # ---------- COMPETITION / LEAGUE / TOURNAMENT ----------
         base_p = response.xpath("//p[starts-with(normalize-space(.),'soutěž:')]")
 
@@ -53,7 +58,7 @@ class DebatySpider(scrapy.Spider):
         motion = response.xpath("//div[@id='mainbody']//a[contains(@href, 'teze_id')]/text()").get()
 
         # ---------- TEAMS ----------
-        team_names = response.xpath("//tr[th[text()='tým']]/td/a/text()").getall()
+        team_links = response.xpath("//tr[th[text()='tým']]/td/a")
 
         # ---------- SCORE ----------
         score = response.xpath(
@@ -68,25 +73,21 @@ class DebatySpider(scrapy.Spider):
         for row in speaker_rows:
             cells = row.xpath("./td")
 
-            left_name = cells[0].xpath(".//a/text()").get()
-            left_points = cells[1].xpath("text()").get()
-            left_win = "sieg" in (cells[0].attrib.get("class", "") + cells[1].attrib.get("class", ""))
-
-            right_name = cells[2].xpath(".//a/text()").get()
-            right_points = cells[3].xpath("text()").get()
-            right_win = "sieg" in (cells[2].attrib.get("class", "") + cells[3].attrib.get("class", ""))
-
-            if left_name:
-                speakers_by_side["aff" if left_win else "neg"].append({
-                    "name": left_name.strip(),
-                    "points": int(left_points) if left_points else None
-                })
-
-            if right_name:
-                speakers_by_side["aff" if right_win else "neg"].append({
-                    "name": right_name.strip(),
-                    "points": int(right_points) if right_points else None
-                })
+            # Left columns belong to the aff team, right columns to the neg
+            # team; the "sieg" class only marks the winning side
+            for side, name_cell, points_cell in (
+                ("aff", cells[0], cells[1]),
+                ("neg", cells[2], cells[3]),
+            ):
+                name = name_cell.xpath(".//a/text()").get()
+                points = points_cell.xpath("text()").get()
+
+                if name:
+                    speakers_by_side[side].append({
+                        "name": name.strip(),
+                        "speaker_id": extract_id(name_cell.xpath(".//a/@href").get(), "clovek_id"),
+                        "points": int(points) if points else None
+                    })
             # ---------- JUDGES (ROZHODČÍ) ----------
         # ---------- JUDGES (ROZHODČÍ) ----------
         judges = []
@@ -100,6 +101,7 @@ class DebatySpider(scrapy.Spider):
 
             if len(cells) >= 2:
                 judge_name = cells[0].xpath(".//a/text()").get()
+                judge_id = extract_id(cells[0].xpath(".//a/@href").get(), "clovek_id")
                 decision_side = cells[1].xpath("normalize-space(text())").get()
 
                 # score is optional (3rd column may not exist)
@@ -111,6 +113,7 @@ class DebatySpider(scrapy.Spider):
 
                 judges.append({
                     "name": judge_name.strip() if judge_name else None,
+                    "judge_id": judge_id,
                     "side": decision_side,
                     "score": decision_score
                 })
@@ -118,10 +121,11 @@ class DebatySpider(scrapy.Spider):
         # ---------- BUILD TEAM STRUCTURE ----------
         teams = []
 
-        for i, name in enumerate(team_names):
+        for i, team_a in enumerate(team_links):
             side = "aff" if i == 0 else "neg"
             teams.append({
-                "team_name": name.strip(),
+                "team_name": team_a.xpath("text()").get("").strip(),
+                "team_id": extract_id(team_a.xpath("@href").get(), "tym_id"),
                 "side": side,
                 "speakers": speakers_by_side[side]
             })
@@ -133,6 +137,7 @@ class DebatySpider(scrapy.Spider):
          #   "url": response.url,
             "date": date,
             "comp": competition_name,
+            "comp_id": extract_id(competition_link, "soutez_id"),
 
             "league_name": league_name,
             "league_id": extract_id(league_link, "liga_id"),
@@ -143,11 +148,5 @@ class DebatySpider(scrapy.Spider):
             "score": score2,
 
 
-        #    "competition": {
-         #       "name": competition_name,
-          #      "id": extract_id(competition_link, "soutez_id")
-           # },
-
-
             "teams": teams
         }
\ No newline at end of file
@@ -1,9 +1,20 @@
 import scrapy
 
+from data_scraping.utils import extract_id
+
 
 class GreyboxCompetitionsSpider(scrapy.Spider):
     name = "greybox_competitions"
     start_urls = ["https://statistiky.debatovani.cz/?page=souteze"]
+    custom_settings = {
+        "FEEDS": {
+            "output/competitions.csv": {
+                "format": "csv",
+                "encoding": "utf8",
+                "overwrite": True,
+            },
+        },
+    }
 
     def parse(self, response):
         rows = response.xpath(
@@ -15,6 +26,9 @@ class GreyboxCompetitionsSpider(scrapy.Spider):
         for row in rows:
             yield {
                 "Type": "Competition",
+                "Competition_ID": extract_id(
+                    row.xpath("./td[2]//a/@href").get(), "soutez_id"
+                ),
                 "Sezóna": row.xpath("./td[1]/text()").get("").strip(),
                 "Soutěž": row.xpath("./td[2]//text()").get("").strip(),
                 "Druh": row.xpath("./td[3]/text()").get("").strip(),
@@ -1,5 +1,6 @@
 import scrapy
-import re
+
+from data_scraping.utils import extract_id
 
 
 class GreyboxTeamsSpider(scrapy.Spider):
@@ -8,6 +9,15 @@ class GreyboxTeamsSpider(scrapy.Spider):
     start_urls = [
         "https://statistiky.debatovani.cz/?page=tymy"
     ]
+    custom_settings = {
+        "FEEDS": {
+            "output/teams.csv": {
+                "format": "csv",
+                "encoding": "utf8",
+                "overwrite": True,
+            },
+        },
+    }
 
     def parse(self, response):
         self.logger.info("PAGE LOADED OK")
@@ -20,18 +30,11 @@ class GreyboxTeamsSpider(scrapy.Spider):
             tym_a = row.xpath("./td[1]/a")
             klub_a = row.xpath("./td[2]/a")
 
-            href = tym_a.xpath("@href").get()
-            team_id = None
-
-            if href:
-                match = re.search(r"tym_id=(\d+)", href)
-                if match:
-                    team_id = int(match.group(1))
-
             yield {
                 "Type": "Teams",
-                "Team_ID": team_id,
+                "Team_ID": extract_id(tym_a.xpath("@href").get(), "tym_id"),
                 "Team": tym_a.xpath("normalize-space(.)").get(),
+                "Club_ID": extract_id(klub_a.xpath("@href").get(), "klub_id"),
                 "Klub": klub_a.xpath("normalize-space(.)").get(),
                 "Členové": row.xpath("normalize-space(./td[3])").get(),
                 "Debaty": row.xpath("normalize-space(./td[4])").get(),
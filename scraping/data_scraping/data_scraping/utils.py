@@ -0,0 +1,36 @@
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from scrapy.exporters import CsvItemExporter, JsonLinesItemExporter
+
+EXPORTERS = {
+    ".csv": CsvItemExporter,
+    ".jl": JsonLinesItemExporter,
+    ".jsonl": JsonLinesItemExporter,
+}
+
+
+def extract_id(url, key):
+    """Return the integer value of an id query parameter (e.g. `tym_id`) in a
+    statistiky.debatovani.cz link, or None if the link does not carry it."""
+    if not url:
+        return None
+    value = parse_qs(urlparse(url).query).get(key, [None])[0]
+    return int(value) if value and value.isdigit() else None
+
+
+def export_items(items, output_path):
+    """Write items with the same exporters the feeds use, picked by the file
+    extension (.csv, .jl or .jsonl)."""
+    output_path = Path(output_path)
+    exporter_cls = EXPORTERS.get(output_path.suffix)
+    if exporter_cls is None:
+        raise ValueError(f"Unsupported output format: {output_path.suffix}")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as f:
+        exporter = exporter_cls(f, encoding="utf-8")
+        exporter.start_exporting()
+        for item in items:
+            exporter.export_item(item)
+        exporter.finish_exporting()
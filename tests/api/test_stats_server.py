@@ -0,0 +1,193 @@
+import asyncio
+import gzip
+import json
+import os
+from http import HTTPStatus
+
+import pytest
+
+from api.stats_server import (
+    GZIP_MIN_BYTES,
+    ResponseCache,
+    StatsApp,
+    handle_connection,
+)
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.debater_stats import compute_debater_stats, save_debater_stats
+
+OPPONENTS = [(2, 70, "Nováková Eva"), (3, 70, "Černý Petr")]
+
+
+def write_stats(path, debates):
+    stats = compute_debater_stats(build_debate_store(debates))
+    save_debater_stats(stats, path)
+
+
+@pytest.fixture
+def stats_path(tmp_path, make_debate):
+    path = tmp_path / "debater_stats.json"
+    write_stats(
+        path,
+        [
+            make_debate(
+                i + 1,
+                [(1, 70, "Novák Jakub")],
+                (f"Team {i}", 100 + i, [OPPONENTS[i % 2]]),
+            )
+            for i in range(45)
+        ],
+    )
+    return path
+
+
+def get_json(app, target, headers=None):
+    response = app.handle("GET", target, headers or {})
+    return response, json.loads(response.body) if response.body else None
+
+
+class TestRoutes:
+    def test_version(self, stats_path):
+        app = StatsApp(stats_path)
+        response, body = get_json(app, "/api/version")
+        assert response.status == HTTPStatus.OK
+        assert body == {"version": app.snapshot.version, "debaters": 3}
+
+    def test_search_is_diacritic_insensitive(self, stats_path):
+        app = StatsApp(stats_path)
+        _, body = get_json(app, "/api/debaters?q=NOVAK")
+        assert [d["name"] for d in body["items"]] == ["Novák Jakub", "Nováková Eva"]
+        assert body["total"] == 2
+
+    def test_search_pagination(self, stats_path):
+        app = StatsApp(stats_path)
+        _, body = get_json(app, "/api/debaters?page=2&per_page=2")
+        assert body["total"] == 3
+        assert [d["id"] for d in body["items"]] == [3]
+
+    def test_debater_without_history(self, stats_path):
+        app = StatsApp(stats_path)
+        _, body = get_json(app, "/api/debaters/1")
+        assert body["name"] == "Novák Jakub"
+        assert body["debates_count"] == 45
+        assert "debates" not in body
+
+    def test_debates_pagination(self, stats_path):
+        app = StatsApp(stats_path)
+        _, body = get_json(app, "/api/debaters/1/debates?page=3")
+        assert body["total"] == 45
+        assert [d["opponent"] for d in body["items"]] == [
+            f"Team {i}" for i in range(40, 45)
+        ]
+
+    @pytest.mark.parametrize(
+        "target, status",
+        [
+            ("/api/debaters/99", HTTPStatus.NOT_FOUND),
+            ("/api/debaters/abc", HTTPStatus.NOT_FOUND),
+            ("/api/debaters/1/ratings", HTTPStatus.NOT_FOUND),
+            ("/other", HTTPStatus.NOT_FOUND),
+            ("/api/debaters?page=0", HTTPStatus.BAD_REQUEST),
+            ("/api/debaters?per_page=x", HTTPStatus.BAD_REQUEST),
+        ],
+    )
+    def test_errors(self, stats_path, target, status):
+        response, body = get_json(StatsApp(stats_path), target)
+        assert response.status == status
+        assert "error" in body
+
+    def test_only_get(self, stats_path):
+        response = StatsApp(stats_path).handle("POST", "/api/version", {})
+        assert response.status == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+class TestCaching:
+    def test_etag_not_modified(self, stats_path):
+        app = StatsApp(stats_path)
+        response, _ = get_json(app, "/api/debaters/1")
+        etag = response.headers["ETag"]
+
+        response = app.handle("GET", "/api/debaters/1", {"if-none-match": etag})
+        assert response.status == HTTPStatus.NOT_MODIFIED
+        assert response.body == b""
+
+    def test_gzip(self, stats_path):
+        app = StatsApp(stats_path)
+        plain = app.handle("GET", "/api/debaters/1/debates?per_page=45", {})
+        zipped = app.handle(
+            "GET", "/api/debaters/1/debates?per_page=45", {"accept-encoding": "gzip"}
+        )
+        assert len(plain.body) >= GZIP_MIN_BYTES
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(zipped.body) == plain.body
+        assert zipped.headers["ETag"] != plain.headers["ETag"]
+
+    def test_small_bodies_are_not_compressed(self, stats_path):
+        app = StatsApp(stats_path)
+        response = app.handle("GET", "/api/version", {"accept-encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_responses_are_cached(self, stats_path):
+        app = StatsApp(stats_path)
+        first = app.handle("GET", "/api/debaters/1", {})
+        second = app.handle("GET", "/api/debaters/1", {})
+        assert second.body is first.body
+        assert len(app.cache) == 1
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+
+class TestReload:
+    def test_new_version_is_swapped_in(self, stats_path, make_debate):
+        app = StatsApp(stats_path)
+        old_version = app.snapshot.version
+        assert not app.reload_if_changed()
+
+        write_stats(stats_path, [make_debate(1, [(4, 70, "Malá Eva")])])
+        stat = stats_path.stat()
+        os.utime(stats_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert app.reload_if_changed()
+
+        response, body = get_json(app, "/api/version")
+        assert body["debaters"] == 1
+        assert body["version"] != old_version
+        assert response.headers["X-Stats-Version"] == body["version"]
+
+    def test_broken_file_keeps_old_version(self, stats_path):
+        app = StatsApp(stats_path)
+        version = app.snapshot.version
+        stats_path.write_text("[{", encoding="utf-8")
+        assert not app.reload_if_changed()
+        assert app.snapshot.version == version
+
+
+class TestConnection:
+    def test_keep_alive_requests(self, stats_path):
+        app = StatsApp(stats_path)
+
+        async def exchange():
+            server = await asyncio.start_server(
+                lambda r, w: handle_connection(app, r, w), "127.0.0.1", 0
+            )
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(
+                    b"GET /api/version HTTP/1.1\r\nHost: x\r\n\r\n"
+                    b"HEAD /api/debaters/1 HTTP/1.1\r\nConnection: close\r\n\r\n"
+                )
+                await writer.drain()
+                data = await reader.read()
+                writer.close()
+                return data
+
+        data = asyncio.run(exchange())
+        assert data.count(b"HTTP/1.1 200 OK") == 2
+        assert b"Connection: keep-alive" in data
+        assert data.endswith(b"Connection: close\r\n\r\n")
@@ -0,0 +1,113 @@
+import json
+import time
+
+from benchmarks import synthetic_data
+from benchmarks.bench_preprocessing import (
+    BENCHMARKS,
+    BenchmarkCase,
+    compare_results,
+    load_results,
+    measure,
+    parse_importtime,
+    run_benchmarks,
+    run_startup_benchmarks,
+    save_results,
+)
+
+
+def result(benchmark, n_debates, seconds):
+    return {
+        "type": "result",
+        "benchmark": benchmark,
+        "n_debates": n_debates,
+        "seconds": seconds,
+    }
+
+
+class TestMeasure:
+    def test_reports_throughput_and_memory(self):
+        case = BenchmarkCase(n_ops=1000, run=lambda: [i * 2 for i in range(1000)])
+
+        measured = measure(case, repeat=2)
+
+        assert measured["n_ops"] == 1000
+        assert measured["seconds"] > 0
+        assert measured["ops_per_second"] > 0
+        assert measured["peak_memory_mb"] > 0
+
+    def test_first_run_is_not_timed(self):
+        calls = []
+
+        def run():
+            # Only the first call pays a one-off cost, like a lazy import
+            if not calls:
+                time.sleep(0.2)
+            calls.append(1)
+
+        measured = measure(BenchmarkCase(n_ops=1, run=run), memory=False)
+
+        assert len(calls) == 2
+        assert measured["seconds"] < 0.1
+
+    def test_without_memory(self):
+        case = BenchmarkCase(n_ops=1, run=lambda: None)
+        assert measure(case, memory=False)["peak_memory_mb"] is None
+
+
+class TestRunBenchmarks:
+    def test_all_benchmarks_on_small_dataset(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(synthetic_data, "PATH_TO_SYNTHETIC_DATA", tmp_path)
+
+        results = run_benchmarks([50], memory=False)
+
+        assert [r["benchmark"] for r in results] == list(BENCHMARKS)
+        assert all(r["n_debates"] == 50 for r in results)
+        assert all(r["n_ops"] > 0 for r in results)
+
+
+class TestSaveAndCompareResults:
+    def test_roundtrip(self, tmp_path):
+        output_path = tmp_path / "bench_output.txt"
+        results = [result("normalize_text", 100, 0.5)]
+
+        save_results(results, output_path)
+
+        lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert lines[0]["type"] == "run"
+        assert load_results(output_path) == results
+
+    def test_regressions_above_threshold(self):
+        baseline = [result("a", 100, 1.0), result("b", 100, 1.0)]
+        current = [result("a", 100, 1.1), result("b", 100, 2.0), result("c", 1, 1)]
+
+        regressions = compare_results(baseline, current, threshold=1.2)
+
+        assert regressions == [{"benchmark": "b", "n_debates": 100, "ratio": 2.0}]
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   encodings
+import time:       200 |       2000 | site
+import time:       300 |        300 |     json.decoder
+import time:       400 |        700 |   json
+import time:       500 |       1200 | data.preprocessing.search_index
+import time:        50 |         50 | argparse
+"""
+
+
+class TestStartup:
+    def test_parse_importtime(self):
+        assert parse_importtime(IMPORTTIME_OUTPUT) == {
+            "data.preprocessing.search_index": 1200,
+            "argparse": 50,
+        }
+
+    def test_run_startup_benchmarks(self):
+        results = run_startup_benchmarks(["data.preprocessing.search_index"])
+
+        assert len(results) == 1
+        assert results[0]["benchmark"] == "startup:search_index"
+        assert results[0]["n_debates"] == 0
+        assert results[0]["seconds"] > 0
+        assert results[0]["slowest_import"] is not None
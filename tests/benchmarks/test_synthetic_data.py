@@ -0,0 +1,55 @@
+from benchmarks import synthetic_data
+from benchmarks.synthetic_data import (
+    feminine_surname,
+    generate_debate_rows,
+    synthetic_debate_csv,
+    write_debate_csv,
+)
+from data.preprocessing.debate_store import load_debate_store
+
+
+class TestFeminineSurname:
+    def test_ak(self):
+        assert feminine_surname("Novák") == "Nováková"
+
+    def test_y(self):
+        assert feminine_surname("Černý") == "Černá"
+
+    def test_a(self):
+        assert feminine_surname("Svoboda") == "Svobodová"
+
+    def test_ek(self):
+        assert feminine_surname("Hájek") == "Hájková"
+
+
+class TestGenerateDebateRows:
+    def test_deterministic(self):
+        assert list(generate_debate_rows(20, seed=1)) == list(
+            generate_debate_rows(20, seed=1)
+        )
+
+    def test_row_count_and_ids(self):
+        rows = list(generate_debate_rows(50))
+        assert len(rows) == 50
+        assert len({row["id"] for row in rows}) == 50
+
+
+class TestWriteDebateCsv:
+    def test_loads_into_debate_store(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 100)
+
+        store = load_debate_store(csv_path)
+
+        assert len(store.debates) == 100
+        assert len(store.performances) == 100 * 2 * 3
+        assert (store.performances["debater_id"] > 0).all()
+        assert not store.ballots.empty
+
+    def test_cached_file_is_reused(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(synthetic_data, "PATH_TO_SYNTHETIC_DATA", tmp_path)
+
+        first = synthetic_debate_csv(30)
+        mtime = first.stat().st_mtime_ns
+
+        assert synthetic_debate_csv(30) == first
+        assert first.stat().st_mtime_ns == mtime
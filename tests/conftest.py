@@ -0,0 +1,86 @@
+import pytest
+
+
+def _padded(entry, defaults: tuple) -> tuple:
+    entry = entry if isinstance(entry, tuple) else (entry,)
+    return entry + defaults[len(entry) :]
+
+
+def _team(side: str, team) -> dict:
+    team_name, team_id, speakers = None, None, team
+    if isinstance(team, tuple):
+        *header, speakers = team
+        team_name, team_id = ([None] + header)[-2:]
+    speaker_entries = []
+    for entry in speakers:
+        speaker_id, points, name = _padded(entry, (None, 70, None))
+        speaker_entries.append(
+            {
+                "name": name or f"Speaker {speaker_id}",
+                "speaker_id": speaker_id,
+                "points": points,
+            }
+        )
+    return {
+        "team_name": team_name or f"Team {side if team_id is None else team_id}",
+        "team_id": team_id,
+        "side": side,
+        "speakers": speaker_entries,
+    }
+
+
+def _judge(number: int, entry) -> dict:
+    if isinstance(entry, str):
+        entry = (900 + number, entry)
+    judge_id, side, score, name = _padded(entry, (None, "aff", None, None))
+    return {
+        "name": name or f"Judge {judge_id}",
+        "judge_id": judge_id,
+        "side": side,
+        "score": score,
+    }
+
+
+@pytest.fixture
+def make_debate():
+    """Build debate records in the format accepted by build_debate_store.
+
+    Teams are a list of speakers, a (team_id, speakers) pair or a
+    (team_name, team_id, speakers) triple. Speakers are a speaker id or a
+    (speaker_id, points[, name]) tuple; points default to 70. Judges are a
+    side (judge ids 900, 901, ...), a judge id voting aff or a
+    (judge_id, side[, score[, name]]) tuple. Without judges, `ballots` ("2:1") gives one judge per ballot
+    and the "vyhráli 2:1" score; otherwise a single judge votes for
+    `winner`. Other keyword arguments are copied into the record.
+    """
+
+    def build(
+        debate_id,
+        aff=None,
+        neg=None,
+        *,
+        winner="aff",
+        ballots=None,
+        judges=None,
+        date="2024-01-01",
+        **fields,
+    ):
+        if judges is None and winner is None:
+            judges = []
+        elif judges is None:
+            loser = "neg" if winner == "aff" else "aff"
+            winner_ballots, loser_ballots = (
+                (int(b) for b in ballots.split(":")) if ballots else (1, 0)
+            )
+            judges = [winner] * winner_ballots + [loser] * loser_ballots
+        record = {
+            "id": debate_id,
+            "date": f"{date} 10:00:00 " if date else None,
+            "score": f"vyhráli {ballots}" if ballots else None,
+            "teams": [_team("aff", aff or []), _team("neg", neg or [])],
+            "judges_scoring": [_judge(i, entry) for i, entry in enumerate(judges)],
+        }
+        record.update(fields)
+        return record
+
+    return build
@@ -1,11 +1,24 @@
+import pytest
+
 from data.preprocessing.categorize_motions import (
+    CategorizationResults,
     Category,
     Motion,
     calculate_category_score,
     categorize_motion,
+    categorize_motions,
+    categorize_motions_cached,
+    compile_category_index,
+    load_canonical_motions,
+    load_category_index,
+    load_motion_categories,
+    load_or_compile_category_index,
     normalize_motion,
     normalize_text,
+    save_categorization_results,
+    save_category_index,
 )
+from data.preprocessing.results_cache import ResultsCache
 
 
 class TestNormalizeText:
@@ -276,3 +289,207 @@ class TestCategorizeMotion:
         assert result.top_category_1 is None
         assert result.top_category_2 is None
         assert result.top_category_3 is None
+
+
+class TestLoadMotionCategories:
+    def test_skips_empty_categories(self, tmp_path):
+        path = tmp_path / "motion_categories.csv"
+        path.write_text(
+            "motion,category_1,category_1_score,category_2,category_2_score,"
+            "category_3,category_3_score\n"
+            "Teze A,Economics,3,Education,1,,0\n"
+            "Teze B,,0,,0,,0\n",
+            encoding="utf-8",
+        )
+        pairs = load_motion_categories(path)
+        assert sorted(pairs["category"]) == ["Economics", "Education"]
+
+
+class TestCategorizeMotions:
+    CATEGORIES = [
+        Category(name="Economics", keywords={"taxes", "economy"}),
+        Category(name="Law", keywords={"courts"}),
+    ]
+
+    def test_without_clusters(self):
+        results = categorize_motions(["Raise taxes", "Reform courts"], self.CATEGORIES)
+        assert [r.top_category_1.category.name for r in results] == [
+            "Economics",
+            "Law",
+        ]
+
+    def test_variants_share_canonical_categories(self):
+        canonical = {"Raise taxes.": "Raise taxes", "Raise taxes": "Raise taxes"}
+        results = categorize_motions(
+            ["Raise taxes", "Raise taxes."], self.CATEGORIES, canonical
+        )
+        assert [r.motion_text for r in results] == ["Raise taxes", "Raise taxes."]
+        assert results[0].top_category_1 == results[1].top_category_1
+
+    def test_cached_results_match(self, tmp_path):
+        motions = ["Raise taxes", "Reform courts", "Ban cars"]
+        cache = ResultsCache(tmp_path)
+        expected = categorize_motions(motions, self.CATEGORIES)
+
+        results, computed = categorize_motions_cached(
+            motions[:2], self.CATEGORIES, cache, "key"
+        )
+        assert computed == 2
+        results, computed = categorize_motions_cached(
+            motions, self.CATEGORIES, cache, "key"
+        )
+        assert computed == 1
+        assert list(results) == list(expected)
+
+    def test_load_canonical_motions(self, tmp_path):
+        path = tmp_path / "motion_clusters.csv"
+        path.write_text(
+            "motion,canonical_motion\nTeze A,Teze A\nTeze A.,Teze A\n",
+            encoding="utf-8",
+        )
+        assert load_canonical_motions(path) == {"Teze A": "Teze A", "Teze A.": "Teze A"}
+
+
+class TestCategoryIndex:
+    CATEGORIES = [
+        Category(name="Economics", keywords={"taxes", "should"}),
+        Category(name="Law", keywords={"courts", "should"}),
+    ]
+    CORPUS = {
+        "We should raise taxes",
+        "We should reform courts",
+        "We should ban cars",
+        "Courts should be elected",
+    }
+
+    def test_unweighted_index_counts_keywords(self):
+        index = compile_category_index(self.CATEGORIES)
+        result = categorize_motion("We should raise taxes", index)
+        assert result.top_category_1.category.name == "Economics"
+        assert result.top_category_1.score == 2
+        assert result.top_category_2.category.name == "Law"
+        assert result.top_category_2.score == 1
+
+    def test_generic_keywords_weigh_less(self):
+        index = compile_category_index(self.CATEGORIES, self.CORPUS)
+        weights = dict(zip(index.keyword_ids, index.weights))
+        assert weights["should"] < weights["courts"] < weights["taxes"]
+
+    def test_ties_broken_by_name(self):
+        index = compile_category_index(list(reversed(self.CATEGORIES)))
+        result = categorize_motion("We should", index)
+        assert result.top_category_1.category.name == "Economics"
+        assert result.top_category_2.category.name == "Law"
+
+    def test_thresholds(self):
+        index = compile_category_index(
+            self.CATEGORIES, self.CORPUS, thresholds={"Law": 2.0}
+        )
+        result = categorize_motion("We should raise taxes", index)
+        assert result.top_category_1.category.name == "Economics"
+        assert result.top_category_2 is None
+
+    def test_save_and_load(self, tmp_path):
+        index = compile_category_index(
+            self.CATEGORIES, self.CORPUS, thresholds={"Law": 1.5}
+        )
+        path = tmp_path / "category_index.json"
+        save_category_index(index, path)
+        loaded = load_category_index(path)
+
+        assert loaded.categories == index.categories
+        assert loaded.thresholds == index.thresholds
+        for motion in self.CORPUS:
+            assert categorize_motion(motion, loaded) == categorize_motion(motion, index)
+
+
+class TestLoadOrCompileCategoryIndex:
+    @pytest.fixture
+    def paths(self, tmp_path):
+        categories_path = tmp_path / "category_keywords.json"
+        categories_path.write_text(
+            '{"Economics": ["taxes"], "Law": ["courts"]}', encoding="utf-8"
+        )
+        motions_path = tmp_path / "motions.txt"
+        motions_path.write_text(
+            "We should raise taxes\nWe should reform courts\n", encoding="utf-8"
+        )
+        return tmp_path / "category_index.json", categories_path, motions_path
+
+    def test_reuses_up_to_date_index(self, paths):
+        index_path = paths[0]
+        load_or_compile_category_index(*paths)
+        compiled = index_path.stat().st_mtime_ns
+        index = load_or_compile_category_index(*paths)
+
+        assert index_path.stat().st_mtime_ns == compiled
+        assert [c.name for c in index.categories] == ["Economics", "Law"]
+
+    def test_recompiles_when_categories_change(self, paths):
+        index_path, categories_path, _ = paths
+        load_or_compile_category_index(*paths)
+        categories_path.write_text(
+            '{"Economics": ["taxes"], "Transport": ["cars"]}', encoding="utf-8"
+        )
+        index = load_or_compile_category_index(*paths)
+
+        assert [c.name for c in index.categories] == ["Economics", "Transport"]
+        result = categorize_motion("Ban cars", load_category_index(index_path))
+        assert result.top_category_1.category.name == "Transport"
+
+    def test_recompiles_when_motions_change(self, paths):
+        _, _, motions_path = paths
+        before = load_or_compile_category_index(*paths)
+        motions_path.write_text(
+            "We should raise taxes\nTaxes are theft\nBan cars\n", encoding="utf-8"
+        )
+        after = load_or_compile_category_index(*paths)
+        assert after.weights != before.weights
+
+    def test_keeps_thresholds_of_remaining_categories(self, paths):
+        index_path, categories_path, motions_path = paths
+        index = load_or_compile_category_index(*paths)
+        index.thresholds = [2.0, 3.0]
+        save_category_index(index, index_path)
+        categories_path.write_text('{"Law": ["courts"]}', encoding="utf-8")
+
+        index = load_or_compile_category_index(*paths)
+        assert index.thresholds == [3.0]
+
+
+class TestCategorizationResults:
+    CATEGORIES = [
+        Category(name="Economics", keywords={"taxes", "economy"}),
+        Category(name="Law", keywords={"courts", "taxes"}),
+        Category(name="Transport", keywords={"cars"}),
+    ]
+    MOTIONS = ["Raise taxes on the economy", "Ban cars", "Plant trees"]
+
+    def test_rows_match_categorize_motion(self):
+        results = categorize_motions(self.MOTIONS, self.CATEGORIES)
+        assert len(results) == 3
+        assert list(results) == [
+            categorize_motion(m, self.CATEGORIES) for m in self.MOTIONS
+        ]
+        assert results.category_counts().tolist() == [2, 1, 0]
+        assert results.scores.dtype.kind == "i"
+
+    def test_from_categorizations(self):
+        categorizations = [categorize_motion(m, self.CATEGORIES) for m in self.MOTIONS]
+        results = CategorizationResults.from_categorizations(categorizations)
+        assert list(results) == categorizations
+
+    def test_save_accepts_list_and_container(self, tmp_path):
+        results = categorize_motions(self.MOTIONS, self.CATEGORIES)
+        save_categorization_results(results, tmp_path / "a.csv")
+        save_categorization_results(list(results), tmp_path / "b.csv")
+
+        content = (tmp_path / "a.csv").read_text(encoding="utf-8")
+        assert content == (tmp_path / "b.csv").read_text(encoding="utf-8")
+        assert content.splitlines()[3] == "Plant trees,,0,,0,,0"
+
+    def test_records_are_slotted_and_frozen(self):
+        result = categorize_motion(self.MOTIONS[0], self.CATEGORIES)
+        assert not hasattr(result, "__dict__")
+        with pytest.raises(AttributeError):
+            result.motion_text = "changed"
@@ -0,0 +1,142 @@
+from argparse import Namespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.preprocessing.debate_index import (
+    Postings,
+    build_debate_index,
+    cmd_build,
+    load_debate_index,
+    save_debate_index,
+)
+from data.preprocessing.debate_store import build_debate_store
+
+MOTION_CATEGORIES = pd.DataFrame(
+    {
+        "motion": ["Teze A", "Teze A", "Teze B"],
+        "category": ["Economics", "Education", "Economics"],
+    }
+)
+
+
+@pytest.fixture
+def index(make_debate):
+    store = build_debate_store(
+        [
+            make_debate(
+                3, (10, [1, 2]), (20, [3, 4]), judges=("aff", "neg"), motion="Teze A"
+            ),
+            make_debate(1, (20, [3, 4]), (10, [1, 2]), winner="neg", motion="Teze B"),
+            make_debate(2, (30, [1, 5]), (10, [2, 6]), motion="Teze C"),
+        ]
+    )
+    return build_debate_index(store, MOTION_CATEGORIES)
+
+
+class TestPostings:
+    def test_build_groups_sorts_and_dedupes(self):
+        postings = Postings.build([5, 2, 5, 5], [30, 10, 10, 30])
+        assert list(postings.keys) == [2, 5]
+        assert list(postings.get(5)) == [10, 30]
+        assert list(postings.get(2)) == [10]
+
+    def test_unknown_key(self):
+        postings = Postings.build([5], [1])
+        assert len(postings.get(4)) == 0
+        assert len(postings.get(6)) == 0
+
+    def test_sides_follow_postings(self):
+        postings = Postings.build([1, 1], [20, 10], sides=[1, 0])
+        assert list(postings.get_sides(1)) == [0, 1]
+
+    def test_empty(self):
+        postings = Postings.build([], [], sides=[])
+        assert len(postings.keys) == 0
+        assert list(postings.offsets) == [0]
+        assert len(postings.get(1)) == 0
+        assert len(postings.get_sides(1)) == 0
+
+
+class TestDebateIndex:
+    def test_speaker_debates(self, index):
+        assert list(index.speaker_debates(1)) == [1, 2, 3]
+        assert list(index.speaker_debates(1, "Economics")) == [1, 3]
+        assert list(index.speaker_debates(1, "Education")) == [3]
+
+    def test_unknown_category(self, index):
+        with pytest.raises(KeyError):
+            index.speaker_debates(1, "Sport")
+
+    def test_speaker_vs_team(self, index):
+        assert list(index.speaker_vs_team(1, 20)) == [1, 3]
+        # Speaker 1 switched to team 30 and faced their old team
+        assert list(index.speaker_vs_team(1, 10)) == [2]
+
+    def test_team_vs_team(self, index):
+        assert list(index.team_vs_team(10, 20)) == [1, 3]
+        assert list(index.team_vs_team(20, 30)) == []
+
+    def test_judge_side_votes(self, index):
+        assert index.judge_side_votes(900) == {"aff": 2, "neg": 1, "aff_share": 2 / 3}
+        assert index.judge_side_votes(999)["aff_share"] is None
+
+    def test_motions_in_category(self, index):
+        assert index.motions_in_category("Economics") == ["Teze A", "Teze B"]
+        assert list(index.category_debates("Education")) == [3]
+
+
+class TestEmptyTables:
+    def test_without_motion_categories(self, make_debate):
+        store = build_debate_store(
+            [make_debate(1, (10, [1]), (20, [2]), motion="Teze A")]
+        )
+        index = build_debate_index(store)
+        assert index.category_names == []
+        assert len(index.categories.keys) == 0
+        assert list(index.speaker_debates(1)) == [1]
+
+    def test_without_ballots(self, make_debate):
+        store = build_debate_store(
+            [make_debate(1, (10, [1]), (20, [2]), judges=(), motion="Teze A")]
+        )
+        index = build_debate_index(store, MOTION_CATEGORIES)
+        assert len(index.judges.keys) == 0
+        assert list(index.category_debates("Economics")) == [1]
+
+    def test_build_command_skips_missing_categories(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        pd.DataFrame(
+            {
+                "id": [1],
+                "date": ["2024-01-01 10:00:00 "],
+                "motion": ["Teze A"],
+                "teams": [
+                    "[{'team_name': 'Fretky', 'team_id': 10, 'side': 'aff', "
+                    "'speakers': [{'name': 'Novák Jakub', 'speaker_id': 1}]}]"
+                ],
+                "judges_scoring": [None],
+            }
+        ).to_csv(csv_path, index=False)
+        args = Namespace(
+            input=str(csv_path),
+            categories=str(tmp_path / "missing.csv"),
+            output=str(tmp_path / "index"),
+        )
+        cmd_build(args)
+        loaded = load_debate_index(tmp_path / "index")
+        assert loaded.category_names == []
+        assert list(loaded.speaker_debates(1)) == [1]
+
+
+class TestSaveLoad:
+    def test_round_trip_is_memory_mapped(self, index, tmp_path):
+        save_debate_index(index, tmp_path / "index")
+        loaded = load_debate_index(tmp_path / "index")
+
+        assert isinstance(loaded.speakers.values, np.memmap)
+        assert list(loaded.speaker_debates(1, "Economics")) == [1, 3]
+        assert list(loaded.speaker_vs_team(1, 20)) == [1, 3]
+        assert loaded.category_names == index.category_names
+        assert loaded.motions == index.motions
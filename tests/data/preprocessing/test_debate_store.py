@@ -0,0 +1,311 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic_data import write_debate_csv
+from data.preprocessing.debate_store import (
+    build_debate_store,
+    legacy_person_id,
+    load_debate_store,
+    parse_debate_dates,
+    parse_judges_string,
+    parse_teams_string,
+)
+from data.preprocessing.ratings import speaker_ratings, update_ratings
+
+CSV_HEADER = (
+    "type,id,date,comp,league_name,league_id,motion,tournament_name,"
+    "tournament_id,judges_scoring,score,teams\n"
+)
+
+
+@pytest.fixture
+def make_record(make_debate):
+    """Debate of Fretky against Máme pravdu won 3:0."""
+
+    def build(debate_id, aff_speakers, neg_speakers, judges=()):
+        return make_debate(
+            debate_id,
+            ("Fretky", 1530, aff_speakers),
+            ("Máme pravdu", 1087, neg_speakers),
+            ballots="3:0",
+            judges=judges,
+            date="2025-01-26",
+            comp="Debatní pohár XXIX.",
+            comp_id=12,
+            motion="Teze",
+        )
+
+    return build
+
+
+class TestParseTeamsString:
+    def test_nickname_with_quotes(self):
+        teams_str = (
+            "[{'team_name': 'Fretky', 'side': 'aff', "
+            "'speakers': [{'name': 'Novák \"Speedy\" Jakub', 'points': 80}]}]"
+        )
+        result = parse_teams_string(teams_str)
+        assert result[0]["speakers"][0]["name"] == 'Novák "Speedy" Jakub'
+
+    def test_team_name_with_quotes(self):
+        teams_str = "[{'team_name': '\"All Stars\"', 'side': 'aff', 'speakers': []}]"
+        assert parse_teams_string(teams_str)[0]["team_name"] == '"All Stars"'
+
+    def test_none_values(self):
+        teams_str = "[{'team_name': 'Fretky', 'side': 'aff', 'speakers': [{'name': 'Novák Jakub', 'points': None}]}]"
+        assert parse_teams_string(teams_str)[0]["speakers"][0]["points"] is None
+
+    def test_invalid_string(self):
+        assert parse_teams_string("[{'name': ") is None
+
+
+class TestParseJudgesString:
+    def test_judges(self):
+        judges_str = "[{'name': 'Kalouda Dominik', 'side': 'neg', 'score': '3:0'}]"
+        assert parse_judges_string(judges_str) == [
+            {"name": "Kalouda Dominik", "side": "neg", "score": "3:0"}
+        ]
+
+
+class TestLegacyPersonId:
+    def test_stable_and_negative(self):
+        assert legacy_person_id("Novák Jakub") == legacy_person_id("Novák Jakub")
+        assert legacy_person_id("Novák Jakub") < 0
+
+    def test_distinct_names(self):
+        assert legacy_person_id("Novák Jakub") != legacy_person_id("Novák Jan")
+
+
+class TestParseDebateDates:
+    def test_prague_time(self):
+        dates = parse_debate_dates(
+            pd.Series(["2025-01-26 09:31:00 ", "2024-06-01 09:31:00"])
+        )
+        assert list(dates) == [
+            pd.Timestamp("2025-01-26 09:31:00+01:00"),
+            pd.Timestamp("2024-06-01 09:31:00+02:00"),
+        ]
+
+    def test_dst_transitions(self):
+        dates = parse_debate_dates(
+            pd.Series(["2024-10-27 02:30:00", "2024-03-31 02:30:00"])
+        )
+        assert list(dates) == [
+            pd.Timestamp("2024-10-27 02:30:00+01:00"),
+            pd.Timestamp("2024-03-31 03:00:00+02:00"),
+        ]
+
+    def test_date_only_missing_and_invalid(self):
+        dates = parse_debate_dates(pd.Series(["2024-09-01", None, "včera"]))
+        assert dates[0] == pd.Timestamp("2024-09-01 00:00:00+02:00")
+        assert dates[1:].isna().all()
+
+
+class TestBuildDebateStore:
+    def test_same_name_different_ids_stay_distinct(self, make_record):
+        store = build_debate_store(
+            [make_record(1, [(501, 70, "Novák Jakub")], [(502, 70, "Novák Jakub")])]
+        )
+        assert list(store.debaters["debater_id"]) == [501, 502]
+        assert list(store.debaters["debater_name"]) == ["Novák Jakub", "Novák Jakub"]
+
+    def test_renamed_debater_keeps_one_id_with_latest_name(self, make_record):
+        store = build_debate_store(
+            [
+                make_record(2, [(501, 70, "Nováková Anna")], []),
+                make_record(1, [(501, 70, "Malá Anna")], []),
+            ]
+        )
+        assert list(store.debaters["debater_id"]) == [501]
+        assert list(store.debaters["debater_name"]) == ["Nováková Anna"]
+
+    def test_missing_ids_fall_back_to_legacy_ids(self, make_record):
+        store = build_debate_store([make_record(1, [(None, 70, "Novák Jakub")], [])])
+        assert list(store.debater_ids()) == [legacy_person_id("Novák Jakub")]
+
+    def test_performances(self, make_record):
+        store = build_debate_store(
+            [
+                make_record(
+                    1,
+                    [(1, 80, "A"), (2, 75, "B")],
+                    [(3, 70, "C")],
+                )
+            ]
+        )
+        performances = store.performances
+        assert list(performances["debater_id"]) == [1, 2, 3]
+        assert list(performances["position"]) == [1, 2, 1]
+        assert list(performances["side"]) == ["aff", "aff", "neg"]
+        assert list(performances["team_id"]) == [1530, 1530, 1087]
+        assert list(performances["points"]) == [80, 75, 70]
+
+    def test_ballots_and_judges(self, make_record):
+        judges = [(901, "aff", "3:0", "Kalouda Dominik")]
+        store = build_debate_store([make_record(1, [], [], judges)])
+        assert list(store.ballots["judge_id"]) == [901]
+        assert list(store.judges["judge_name"]) == ["Kalouda Dominik"]
+
+    def test_date_keys(self, make_record):
+        records = [
+            make_record(1, [], []),
+            make_record(2, [], []),
+            make_record(3, [], []),
+        ]
+        records[1]["date"] = "2024-09-01 10:00:00 "
+        records[2]["date"] = None
+        debates = build_debate_store(records).debates
+        assert str(debates["start_time"].dt.tz) == "Europe/Prague"
+        assert debates["month"].tolist() == [202501, 202409, pd.NA]
+        assert debates["season"].tolist() == [2024, 2024, pd.NA]
+
+    def test_repeated_debate_id_keeps_last_record(self, make_record):
+        store = build_debate_store(
+            [
+                make_record(1, [(501, 70, "Malá Anna")], [(9, 70, "Old")]),
+                make_record(2, [(502, 70, "Novák Jakub")], []),
+                make_record(1, [(501, 70, "Nováková Anna")], []),
+            ]
+        )
+        assert list(store.debates["debate_id"]) == [2, 1]
+        assert list(store.performances["debater_id"]) == [502, 501]
+        assert list(store.debaters["debater_name"]) == ["Nováková Anna", "Novák Jakub"]
+
+    def test_skips_empty_speaker_names(self, make_record):
+        store = build_debate_store([make_record(1, [(1, 70, "  ")], [])])
+        assert store.performances.empty
+        assert store.debaters.empty
+
+
+class TestLoadDebateStore:
+    def test_load_csv(self, tmp_path):
+        csv_path = tmp_path / "debate_data.csv"
+        csv_path.write_text(
+            CSV_HEADER
+            + "debate,10700,2025-01-26 09:31:00 ,Debatní pohár,Debatní liga,44,Teze,"
+            "Turnaj,307,\"[{'name': 'Kalouda Dominik', 'side': 'neg', 'score': '3:0'}]\","
+            "vyhráli 3:0,\"[{'team_name': 'Fretky', 'side': 'aff', 'speakers': "
+            "[{'name': 'Novák Jakub', 'points': 84}]}]\"\n"
+            "debate,10701,,,,,,,,,,\n"
+            "debate,10702,2025-01-26 09:31:00 ,Debatní pohár,Debatní liga,44,Teze,"
+            "Turnaj,307,[],vyhráli 3:0,\"[{'name': \"\n",
+            encoding="utf-8",
+        )
+
+        store = load_debate_store(csv_path)
+
+        assert list(store.debates["debate_id"]) == [10700]
+        assert list(store.debates["league_id"]) == [44]
+        assert list(store.debaters["debater_name"]) == ["Novák Jakub"]
+        assert list(store.ballots["judge_id"]) == [legacy_person_id("Kalouda Dominik")]
+
+    def test_concatenated_csv(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 50)
+        lines = csv_path.read_text(encoding="utf-8").splitlines(keepends=True)
+        repeated_path = tmp_path / "repeated.csv"
+        repeated_path.write_text("".join(lines + lines[1:]), encoding="utf-8")
+
+        store = load_debate_store(csv_path)
+        repeated = load_debate_store(repeated_path)
+
+        assert repeated.debates["debate_id"].is_unique
+        pd.testing.assert_frame_equal(repeated.outcomes(), store.outcomes())
+        pd.testing.assert_frame_equal(
+            speaker_ratings(update_ratings(repeated)),
+            speaker_ratings(update_ratings(store)),
+        )
+
+
+class TestUpsert:
+    def test_replaces_and_appends_debates(self, make_record):
+        store = build_debate_store(
+            [
+                make_record(1, [(501, 70, "Malá Anna")], [(9, 70, "Old")]),
+                make_record(2, [(502, 70, "Novák Jakub")], []),
+            ]
+        )
+
+        updated = store.upsert(
+            [
+                make_record(1, [(501, 70, "Nováková Anna")], []),
+                make_record(3, [(503, 70, "Petr Jan")], []),
+            ]
+        )
+
+        assert sorted(updated.debates["debate_id"]) == [1, 2, 3]
+        assert sorted(updated.performances["debater_id"]) == [501, 502, 503]
+        assert list(updated.debaters["debater_name"]) == [
+            "Nováková Anna",
+            "Novák Jakub",
+            "Petr Jan",
+        ]
+
+    def test_original_store_unchanged(self, make_record):
+        store = build_debate_store([make_record(1, [(1, 70, "A")], [])])
+        store.upsert([make_record(1, [(2, 70, "B")], [])])
+        assert list(store.debaters["debater_name"]) == ["A"]
+
+
+class TestSelectDebates:
+    @pytest.fixture
+    def store(self, make_record):
+        return build_debate_store(
+            [
+                make_record(
+                    1, [(501, 70, "Malá Anna")], [], [(601, "aff", None, "Soudce")]
+                ),
+                make_record(2, [(502, 70, "Novák Jakub")], []),
+                make_record(3, [(503, 70, "Petr Jan")], [(501, 70, "Malá Anna")]),
+            ]
+        )
+
+    def test_only_debates(self, store):
+        selected = store.only_debates(np.array([2, 3]))
+
+        assert list(selected.debates["debate_id"]) == [2, 3]
+        assert sorted(selected.performances["debater_id"]) == [501, 502, 503]
+        assert list(selected.debaters["debater_id"]) == [501, 502, 503]
+        assert selected.ballots.empty
+        assert selected.judges.empty
+
+    def test_without_debates_is_the_complement(self, store):
+        kept = store.without_debates([2, 3])
+
+        assert list(kept.debates["debate_id"]) == [1]
+        assert list(kept.debaters["debater_id"]) == [501]
+        assert list(kept.judges["judge_id"]) == [601]
+
+
+class TestOutcomes:
+    def test_winner_from_judge_majority_and_split_from_score(self, make_record):
+        record = make_record(
+            1,
+            [(1, 70, "A")],
+            [(2, 70, "B")],
+            [(9, "neg", None, "J1"), (8, "aff", None, "J2"), (7, "neg", None, "J3")],
+        )
+        record["score"] = "vyhráli 2:1"
+        outcomes = build_debate_store([record]).outcomes()
+        assert outcomes.to_dict("records") == [
+            {"debate_id": 1, "winner_side": "neg", "aff_ballots": 1, "neg_ballots": 2}
+        ]
+
+    def test_missing_score_falls_back_to_votes(self, make_record):
+        record = make_record(
+            1, [(1, 70, "A")], [(2, 70, "B")], [(9, "aff", None, "J1")]
+        )
+        record["score"] = None
+        outcome = build_debate_store([record]).outcomes().iloc[0]
+        assert (outcome["winner_side"], outcome["aff_ballots"]) == ("aff", 1)
+        assert outcome["neg_ballots"] == 0
+
+    def test_undecided_debates_left_out(self, make_record):
+        tied = make_record(
+            1,
+            [(1, 70, "A")],
+            [(2, 70, "B")],
+            [(9, "aff", None, "J1"), (8, "neg", None, "J2")],
+        )
+        no_judges = make_record(2, [(1, 70, "A")], [(2, 70, "B")])
+        assert build_debate_store([tied, no_judges]).outcomes().empty
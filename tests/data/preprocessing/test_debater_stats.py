@@ -0,0 +1,100 @@
+import json
+
+import pandas as pd
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.debater_stats import (
+    compute_debater_stats,
+    save_debater_stats,
+)
+
+FRETKY = ("Fretky", 10, [(1, 75, "Novák Jakub"), (2, 70, "Malá Eva")])
+JAMBO = ("Jambo", 20, [(3, 72, "Černý Petr")])
+
+
+@pytest.fixture
+def store(make_debate):
+    return build_debate_store(
+        [
+            make_debate(1, FRETKY, JAMBO, motion="Teze A", ballots="2:1"),
+            make_debate(
+                2, JAMBO, FRETKY, date="2024-02-01", motion="Teze B", ballots="3:0"
+            ),
+        ]
+    )
+
+
+def stats_by_id(stats):
+    return {s["id"]: s for s in stats}
+
+
+class TestComputeDebaterStats:
+    def test_win_rates_and_points(self, store):
+        novak = stats_by_id(compute_debater_stats(store))[1]
+        assert novak["name"] == "Novák Jakub"
+        assert novak["side_win_rates"] == {"total": 0.5, "aff": 1.0, "neg": 0.0}
+        assert novak["positions_speaker_points"] == {"1": 75.0, "2": None, "3": None}
+
+    def test_debate_history(self, store):
+        novak = stats_by_id(compute_debater_stats(store))[1]
+        assert novak["debates"] == [
+            {
+                "ballots_gained": 2,
+                "opponent": "Jambo",
+                "was_aff": True,
+                "link": "https://statistiky.debatovani.cz/?page=debata&debata_id=1",
+                "speaker_points": 75.0,
+                "date": "2024-01-01",
+            },
+            {
+                "ballots_gained": 0,
+                "opponent": "Jambo",
+                "was_aff": False,
+                "link": "https://statistiky.debatovani.cz/?page=debata&debata_id=2",
+                "speaker_points": 75.0,
+                "date": "2024-02-01",
+            },
+        ]
+
+    def test_motion_categories(self, store):
+        categories = pd.DataFrame(
+            {
+                "motion": ["Teze A", "Teze A", "Teze B"],
+                "category": ["Economics", "Education", "Health"],
+            }
+        )
+        stats = stats_by_id(compute_debater_stats(store, categories))
+        assert stats[1]["motion_category_stats"] == {
+            "top_3": [
+                {"category": "Economics", "win_rate": 1.0},
+                {"category": "Education", "win_rate": 1.0},
+                {"category": "Health", "win_rate": 0.0},
+            ],
+            "bottom_3": [],
+        }
+
+    def test_ratings(self, store):
+        ratings = pd.DataFrame({"debater_id": [1], "rating": [1523.456]})
+        stats = stats_by_id(compute_debater_stats(store, ratings=ratings))
+        assert stats[1]["rating"] == 1523.5
+        assert stats[3]["rating"] is None
+
+    def test_sorted_by_name(self, store):
+        names = [s["name"] for s in compute_debater_stats(store)]
+        assert names == sorted(names)
+
+    def test_empty_store(self):
+        assert compute_debater_stats(build_debate_store([])) == []
+
+    def test_debates_without_teams(self, make_debate):
+        debate = make_debate(1, FRETKY, JAMBO, motion="Teze A", ballots="2:1")
+        store = build_debate_store([{**debate, "teams": []}])
+        assert compute_debater_stats(store) == []
+
+
+def test_save_debater_stats(tmp_path, store):
+    output_path = tmp_path / "stats" / "debater_stats.json"
+    stats = compute_debater_stats(store)
+    save_debater_stats(stats, output_path)
+    assert json.loads(output_path.read_text(encoding="utf-8")) == stats
@@ -1,11 +1,39 @@
+import pandas as pd
+
+from benchmarks.synthetic_data import write_debate_csv
+from data.preprocessing.debate_store import load_debate_store
 from data.preprocessing.estimate_gender import (
     Gender,
     GenderGuessMethod,
+    extract_debater_names,
+    extract_debaters,
+    first_name_table,
     guess_gender,
+    guess_genders,
     guess_gender_from_firstname,
     guess_gender_from_lastname,
+    name_classes,
     parse_name,
+    save_first_name_table,
+    save_gender_results,
 )
+from data.preprocessing.results_cache import ResultsCache
+
+
+class TestExtractDebaters:
+    def test_matches_debate_store(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 300)
+        debaters = extract_debaters(csv_path)
+        pd.testing.assert_frame_equal(debaters, load_debate_store(csv_path).debaters)
+        assert extract_debater_names(csv_path) == set(debaters["debater_name"])
+
+    def test_skips_unparseable_teams(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 20)
+        expected = extract_debaters(csv_path)
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write('debate,999999,2024-01-01 10:00:00,,,,,Teze,,,,,"[{\'broken"\n')
+            f.write("debate,999998,2024-01-01 10:00:00,,,,,Teze,,,,,\n")
+        pd.testing.assert_frame_equal(extract_debaters(csv_path), expected)
 
 
 class TestParseName:
@@ -119,6 +147,10 @@ class TestGuessGender:
         assert result.debater_name.last_name == "Nováková"
         assert result.debater_name.first_name == "Anna"
 
+    def test_debater_id_is_kept(self):
+        result = guess_gender("Novák Jakub", {"jakub"}, set(), debater_id=501)
+        assert result.debater_name.debater_id == 501
+
     def test_male_by_firstname_match(self):
         male_names = {"jakub"}
         female_names = set()
@@ -160,3 +192,134 @@ class TestGuessGender:
         result = guess_gender("Nováková", male_names, female_names)
         assert result.gender == Gender.FEMALE
         assert result.method_used == GenderGuessMethod.LASTNAME_SUFFIX
+
+
+class TestFirstNameTable:
+    MALE_NAMES = {"jakub", "petr"}
+    FEMALE_NAMES = {"eva", "petr"}
+    DEBATERS = pd.DataFrame(
+        {
+            "debater_id": [1, 2, 3, 4, 5, 6, 7],
+            "debater_name": [
+                "Novák Jakub",
+                "Nováková Eva",
+                "Svoboda jakub",
+                "Malá Jana",
+                "Dvořák Petr",
+                "Single",
+                "  Černý   Tomáš  Karel ",
+            ],
+        }
+    )
+
+    def test_name_classes(self):
+        classes = name_classes(self.DEBATERS)
+        assert classes.to_dict("list") == {
+            "female_suffix": [False, True, False, True, False, False, False],
+            "first_name": ["jakub", "", "jakub", "", "petr", "", "tomáš"],
+        }
+
+    def test_each_class_is_resolved_once(self):
+        classes = name_classes(self.DEBATERS)
+        table, computed = first_name_table(classes, self.MALE_NAMES, self.FEMALE_NAMES)
+        assert computed == len(table) == 5
+        assert table.iloc[0].to_dict() == {
+            "female_suffix": False,
+            "first_name": "jakub",
+            "debaters": 2,
+            "gender": "male",
+            "method_used": "firstname_match",
+        }
+        assert table["debaters"].sum() == len(self.DEBATERS)
+
+    def test_matches_guess_gender(self):
+        classes = name_classes(self.DEBATERS)
+        table, _ = first_name_table(classes, self.MALE_NAMES, self.FEMALE_NAMES)
+        results = guess_genders(self.DEBATERS, classes, table)
+
+        expected = [
+            guess_gender(name, self.MALE_NAMES, self.FEMALE_NAMES, debater_id)
+            for debater_id, name in zip(
+                self.DEBATERS["debater_id"], self.DEBATERS["debater_name"]
+            )
+        ]
+        assert results["debater_id"].tolist() == [1, 2, 3, 4, 5, 6, 7]
+        assert results["gender"].tolist() == [g.gender.value for g in expected]
+        assert results["method_used"].tolist() == [
+            g.method_used.value for g in expected
+        ]
+
+    def test_cached_results_match(self, tmp_path):
+        classes = name_classes(self.DEBATERS)
+        cache = ResultsCache(tmp_path)
+        expected, _ = first_name_table(classes, self.MALE_NAMES, self.FEMALE_NAMES)
+
+        table, computed = first_name_table(
+            classes, self.MALE_NAMES, self.FEMALE_NAMES, cache, "key"
+        )
+        assert computed == 5
+        pd.testing.assert_frame_equal(table, expected)
+
+        table, computed = first_name_table(
+            classes, self.MALE_NAMES, self.FEMALE_NAMES, cache, "key"
+        )
+        assert computed == 0
+        pd.testing.assert_frame_equal(table, expected)
+
+    def test_save(self, tmp_path):
+        classes = name_classes(self.DEBATERS)
+        table, _ = first_name_table(classes, self.MALE_NAMES, self.FEMALE_NAMES)
+        path = tmp_path / "first_names.csv"
+
+        save_first_name_table(table, path)
+
+        saved = pd.read_csv(path, keep_default_na=False)
+        assert saved.columns.tolist() == list(table.columns)
+        assert saved["debaters"].tolist() == table["debaters"].tolist()
+
+
+class TestSaveGenderResults:
+    def test_list_and_frame_match(self, tmp_path):
+        male_names, female_names = {"jakub"}, {"eva"}
+        debaters = TestFirstNameTable.DEBATERS
+        classes = name_classes(debaters)
+        table, _ = first_name_table(classes, male_names, female_names)
+        guesses = [
+            guess_gender(name, male_names, female_names, debater_id)
+            for debater_id, name in zip(
+                debaters["debater_id"], debaters["debater_name"]
+            )
+        ]
+
+        save_gender_results(guesses, tmp_path / "a.csv")
+        save_gender_results(guess_genders(debaters, classes, table), tmp_path / "b.csv")
+
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    def test_columns(self, tmp_path):
+        male_names, female_names = {"jakub"}, {"eva"}
+        results = [
+            guess_gender("Novák Jakub", male_names, female_names, 1),
+            guess_gender("Novák Petr", male_names, female_names, 2),
+        ]
+        path = tmp_path / "genders.csv"
+
+        save_gender_results(results, path)
+
+        df = pd.read_csv(path)
+        assert df.to_dict("records") == [
+            {
+                "debater_id": 1,
+                "debater_name": "Novák Jakub",
+                "is_male": True,
+                "inconclusive": False,
+                "method_used": "firstname_match",
+            },
+            {
+                "debater_id": 2,
+                "debater_name": "Novák Petr",
+                "is_male": False,
+                "inconclusive": True,
+                "method_used": "inconclusive",
+            },
+        ]
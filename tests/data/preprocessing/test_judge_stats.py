@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.judge_stats import (
+    JudgeStatsState,
+    count_judge_ballots,
+    judge_stats,
+    load_judge_state,
+    save_judge_state,
+    update_judge_stats,
+)
+
+
+def stats_by_id(store, state=None):
+    state = state or update_judge_stats(store)
+    return judge_stats(state.counts, store.judges).set_index("judge_id")
+
+
+@pytest.fixture
+def store(make_debate):
+    return build_debate_store(
+        [
+            make_debate(
+                1, [(1, 80)], [(2, 80)], judges=[(7, "aff", "3:0")], tournament_id=307
+            ),
+            make_debate(
+                2, [(1, 60)], [(2, 60)], judges=[(7, "neg", "2:1")], tournament_id=307
+            ),
+            make_debate(
+                3,
+                [1],
+                [2],
+                judges=[(7, "aff", None), (8, "aff", None), (9, "neg", None)],
+                tournament_id=307,
+            ),
+        ]
+    )
+
+
+class TestJudgeStats:
+    def test_side_share(self, store):
+        stats = stats_by_id(store)
+        assert stats.loc[7, "ballots"] == 3
+        assert stats.loc[7, "aff_share"] == pytest.approx(2 / 3)
+        assert stats.loc[7, "judge_name"] == "Judge 7"
+
+    def test_dissent_only_counts_panels(self, store):
+        stats = stats_by_id(store)
+        assert stats.loc[7, "dissent_rate"] == 0.0
+        assert stats.loc[9, "dissent_rate"] == 1.0
+
+    def test_clear_share_of_scored_ballots(self, store):
+        stats = stats_by_id(store)
+        assert stats.loc[7, "clear_share"] == 0.5
+        assert np.isnan(stats.loc[8, "clear_share"])
+
+    def test_points_offset_against_tournament_mean(self, store, make_debate):
+        stats = stats_by_id(store)
+        # Tournament mean is 70; judge 7 saw 80, 60 and 70
+        assert stats.loc[7, "points_offset"] == pytest.approx(0.0)
+        assert stats.loc[8, "points_offset"] == pytest.approx(0.0)
+
+        generous = build_debate_store(
+            [
+                make_debate(
+                    1,
+                    [(1, 80)],
+                    [(2, 80)],
+                    judges=[(7, "aff", "3:0")],
+                    tournament_id=307,
+                ),
+                make_debate(
+                    2,
+                    [(1, 60)],
+                    [(2, 60)],
+                    judges=[(8, "aff", "3:0")],
+                    tournament_id=307,
+                ),
+            ]
+        )
+        stats = stats_by_id(generous)
+        assert stats.loc[7, "points_offset"] == pytest.approx(10.0)
+        assert stats.loc[8, "points_offset"] == pytest.approx(-10.0)
+
+
+class TestCountJudgeBallots:
+    def test_only_given_debates(self, store):
+        counts = count_judge_ballots(store, np.array([2, 3])).set_index("judge_id")
+        assert counts.loc[7, "ballots"] == 2
+        assert list(counts.index) == [7, 8, 9]
+
+    def test_offsets_use_the_whole_tournament(self, store):
+        # Debate 2 (60 points) is 10 below the mean of all three debates
+        counts = count_judge_ballots(store, np.array([2])).set_index("judge_id")
+        assert counts.loc[7, "points_offset_sum"] == pytest.approx(-10.0)
+        assert counts.loc[7, "points_offset_count"] == 1
+
+
+class TestUpdateJudgeStats:
+    def test_incremental_matches_full_count(self, store, make_debate):
+        first = build_debate_store(
+            [
+                make_debate(
+                    1,
+                    [(1, 80)],
+                    [(2, 80)],
+                    judges=[(7, "aff", "3:0")],
+                    tournament_id=307,
+                )
+            ]
+        )
+        state = update_judge_stats(first)
+        state = update_judge_stats(store, state)
+
+        full = count_judge_ballots(store)
+        assert list(state.debate_ids) == [1, 2, 3]
+        pd.testing.assert_frame_equal(
+            state.counts.drop(columns="points_offset_sum"),
+            full.drop(columns="points_offset_sum"),
+        )
+
+    def test_counted_debates_are_skipped(self, store):
+        state = update_judge_stats(store)
+        assert update_judge_stats(store, state) is state
+
+    def test_state_round_trip(self, store, tmp_path):
+        state = update_judge_stats(store)
+        save_judge_state(state, tmp_path / "judge_state.npz")
+        loaded = load_judge_state(tmp_path / "judge_state.npz")
+        pd.testing.assert_frame_equal(loaded.counts, state.counts)
+        assert list(loaded.debate_ids) == [1, 2, 3]
+
+    def test_empty_state(self, make_debate):
+        store = build_debate_store(
+            [make_debate(1, [1], [2], judges=[], tournament_id=307)]
+        )
+        state = update_judge_stats(store, JudgeStatsState())
+        assert state.counts.empty
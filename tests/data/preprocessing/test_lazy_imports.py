@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_preprocessing import PROJECT_ROOT, STARTUP_MODULES
+from data.preprocessing.lazy_imports import lazy_import
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+
+
+class TestLazyImport:
+    def test_already_imported_module_is_returned(self):
+        assert lazy_import("json") is sys.modules["json"]
+
+    def test_missing_module(self):
+        with pytest.raises(ModuleNotFoundError):
+            lazy_import("no_such_module_xyz")
+
+    def test_loads_on_attribute_access(self):
+        code = (
+            "import sys\n"
+            "from data.preprocessing.lazy_imports import lazy_import\n"
+            "m = lazy_import('colorsys')\n"
+            "print(type(sys.modules['colorsys']).__name__)\n"
+            "print(m.rgb_to_hsv(1, 0, 0)[0])\n"
+            "print(type(sys.modules['colorsys']).__name__)\n"
+        )
+        assert run_python(code) == ["_LazyModule", "0.0", "module"]
+
+    def test_load(self):
+        code = (
+            "import sys\n"
+            "from data.preprocessing.lazy_imports import lazy_import, load\n"
+            "m = lazy_import('colorsys')\n"
+            "print(load(m) is m)\n"
+            "print(type(sys.modules['colorsys']).__name__)\n"
+        )
+        assert run_python(code) == ["True", "module"]
+
+
+class TestPreprocessingModules:
+    @pytest.mark.parametrize("module", STARTUP_MODULES)
+    def test_import_does_not_load_pandas(self, module):
+        code = (
+            f"import sys, {module}\n"
+            "print(*(type(sys.modules.get(m)).__name__ for m in ('numpy', 'pandas')))\n"
+        )
+        # Either never imported or still lazy
+        assert set(run_python(code)) <= {"NoneType", "_LazyModule"}
@@ -0,0 +1,188 @@
+import random
+
+import numpy as np
+
+from data.preprocessing import motion_similarity
+from data.preprocessing.motion_similarity import (
+    DEFAULT_THRESHOLD,
+    LSH_BANDS,
+    LSH_ROWS,
+    build_motion_index,
+    candidate_pairs,
+    jaccard,
+    load_motion_index,
+    minhash_signature,
+    motion_words,
+    save_motion_clusters,
+    shingles,
+)
+
+MOTIONS = [
+    "EU by měla více spolupracovat s Čínou na úkor vztahu s USA",
+    "EU by měla více spolupracovat s Čínou na úkor vztahů s USA",
+    "Hotovost by měla být zrušena",
+    "Hotovost by měla být zrušena.",
+    "Tento dům lituje vzniku sociálních sítí",
+]
+
+
+class TestShingles:
+    def test_identical_texts(self):
+        a = shingles(motion_words("Hotovost by měla být zrušena"))
+        b = shingles(motion_words("HOTOVOST by mela byt zrusena"))
+        assert jaccard(a, b) == 1.0
+
+    def test_short_text_is_one_shingle(self):
+        assert len(shingles(["eu"])) == 1
+
+    def test_empty_text(self):
+        assert len(shingles([])) == 0
+        assert jaccard(shingles([]), shingles([])) == 1.0
+
+    def test_minhash_estimates_jaccard(self):
+        a = shingles(motion_words(MOTIONS[0]))
+        b = shingles(motion_words(MOTIONS[1]))
+        estimate = np.mean(minhash_signature(a) == minhash_signature(b))
+        assert abs(estimate - jaccard(a, b)) < 0.2
+
+
+def random_motions(n_motions: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6))
+            for _ in range(5)
+        )
+        for _ in range(n_motions)
+    ]
+
+
+class TestLsh:
+    def test_s_curve_near_default_threshold(self):
+        assert abs((1 / LSH_BANDS) ** (1 / LSH_ROWS) - DEFAULT_THRESHOLD) < 0.05
+
+    def test_candidates_are_near_duplicates(self):
+        signatures = np.array(
+            [minhash_signature(shingles(motion_words(m))) for m in MOTIONS]
+        )
+        assert candidate_pairs(signatures) == {(0, 1), (2, 3)}
+
+
+class TestClusterScaling:
+    def count_comparisons(self, monkeypatch, motions):
+        calls = []
+
+        def counting_jaccard(a, b):
+            calls.append(1)
+            return jaccard(a, b)
+
+        monkeypatch.setattr(motion_similarity, "jaccard", counting_jaccard)
+        build_motion_index(motions)
+        return len(calls)
+
+    def test_comparisons_grow_linearly(self, monkeypatch):
+        # Three variants per motion, identical after normalization
+        for n_motions in [50, 200]:
+            motions = [
+                variant
+                for motion in random_motions(n_motions)
+                for variant in (motion, motion + ".", motion.upper())
+            ]
+            comparisons = self.count_comparisons(monkeypatch, motions)
+            assert comparisons == 2 * n_motions
+
+    def test_unrelated_motions_are_not_compared(self, monkeypatch):
+        assert self.count_comparisons(monkeypatch, random_motions(500)) == 0
+
+
+class TestClustering:
+    def test_variants_share_canonical_motion(self):
+        index = build_motion_index(MOTIONS)
+        assert index.canonical_motion(MOTIONS[1]) == index.canonical_motion(MOTIONS[0])
+        assert index.canonical_motion(MOTIONS[3]) == MOTIONS[2]
+        assert index.canonical_motion(MOTIONS[4]) == MOTIONS[4]
+        assert len(index.clusters()) == 3
+
+    def test_most_debated_variant_is_canonical(self):
+        index = build_motion_index(MOTIONS, counts={MOTIONS[3]: 5})
+        assert index.canonical_motion(MOTIONS[2]) == MOTIONS[3]
+        assert index.clusters()[MOTIONS[3]] == [MOTIONS[3], MOTIONS[2]]
+
+    def test_high_threshold_keeps_variants_apart(self):
+        motions = [
+            "Hotovost by měla být zrušena",
+            "Hotovost by neměla být zrušena",
+        ]
+        assert len(build_motion_index(motions).clusters()) == 1
+        assert len(build_motion_index(motions, threshold=0.95).clusters()) == 2
+
+    def test_canonical_motion_matches_clusters(self):
+        index = build_motion_index(MOTIONS)
+        for canonical, variants in index.clusters().items():
+            assert [index.canonical_motion(v) for v in variants] == [canonical] * len(
+                variants
+            )
+
+    def test_unknown_motion_is_its_own_canonical(self):
+        index = build_motion_index(MOTIONS)
+        assert index.canonical_motion("Nová teze") == "Nová teze"
+
+    def test_save_motion_clusters(self, tmp_path):
+        index = build_motion_index(MOTIONS)
+        path = tmp_path / "clusters.csv"
+        save_motion_clusters(index, path)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "motion,canonical_motion"
+        assert len(lines) == len(MOTIONS) + 1
+
+
+class TestSimilar:
+    def test_exact_motion_ranks_first(self):
+        index = build_motion_index(MOTIONS)
+        results = index.similar("Tento dům lituje vzniku sociálních sítí", k=2)
+        assert results[0] == (MOTIONS[4], 1.0)
+
+    def test_only_motions_sharing_words(self):
+        index = build_motion_index(MOTIONS)
+        results = index.similar("zrušena", k=10)
+        assert sorted(motion for motion, _ in results) == MOTIONS[2:4]
+
+    def test_unknown_words(self):
+        index = build_motion_index(MOTIONS)
+        assert index.similar("xyz qwerty") == []
+
+    def test_scores_match_dense_cosine(self):
+        index = build_motion_index(MOTIONS)
+        dense = np.zeros((len(index.motions), len(index.vocabulary)))
+        for term in range(len(index.vocabulary)):
+            postings = slice(index.term_offsets[term], index.term_offsets[term + 1])
+            dense[index.term_motions[postings], term] = index.term_weights[postings]
+        query = "Hotovost by měla spolupracovat s USA"
+        terms, tf = np.unique(
+            [index.vocabulary[w] for w in motion_words(query) if w in index.vocabulary],
+            return_counts=True,
+        )
+        vector = np.zeros(len(index.vocabulary))
+        vector[terms] = tf * index.idf[terms]
+        expected = dense @ (vector / np.linalg.norm(vector))
+
+        results = dict(index.similar(query, k=len(MOTIONS)))
+
+        assert results == {
+            motion: round(float(score), 4)
+            for motion, score in zip(index.motions, expected)
+            if score > 0
+        }
+
+
+class TestLoadMotionIndex:
+    def test_built_once_per_file_contents(self, tmp_path):
+        path = tmp_path / "motions.txt"
+        path.write_text("\n".join(MOTIONS[:3]) + "\n", encoding="utf-8")
+        index = load_motion_index(path)
+        assert load_motion_index(path) is index
+
+        path.write_text("\n".join(MOTIONS) + "\n", encoding="utf-8")
+        updated = load_motion_index(path)
+        assert updated is not index
+        assert updated.motions == sorted(MOTIONS)
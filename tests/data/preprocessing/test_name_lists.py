@@ -0,0 +1,104 @@
+import unicodedata
+
+import pytest
+
+from data.preprocessing.estimate_gender import (
+    Gender,
+    guess_gender_from_firstname,
+    load_name_list,
+)
+from data.preprocessing.name_lists import (
+    NameList,
+    compile_name_file,
+    compile_name_list,
+    compiled_path,
+)
+
+
+@pytest.fixture
+def name_list(tmp_path):
+    path = tmp_path / "names.bin"
+    compile_name_list(["Tomáš", "jakub", " Jan ", "", "Jakub", "Ondřej"], path)
+    with NameList(path) as names:
+        yield names
+
+
+class TestCompileNameList:
+    def test_sorted_deduplicated_normalized(self, name_list):
+        assert len(name_list) == 4
+        assert list(name_list) == ["jakub", "jan", "ondřej", "tomáš"]
+
+    def test_compile_text_file(self, tmp_path):
+        input_path = tmp_path / "male_names.txt"
+        input_path.write_text("Jakub\nJan\n\nJakub\n", encoding="utf-8")
+        output_path = compiled_path(input_path, tmp_path / "compiled")
+        assert output_path.name == "male_names.bin"
+        assert compile_name_file(input_path, output_path) == 2
+        with NameList(output_path) as names:
+            assert list(names) == ["jakub", "jan"]
+
+
+class TestNameList:
+    def test_membership(self, name_list):
+        for name in ["jakub", "Jan", " TOMÁŠ ", "ondřej"]:
+            assert name in name_list
+        for name in ["jana", "a", "zuzana", "", None]:
+            assert name not in name_list
+
+    def test_decomposed_input(self, name_list):
+        assert unicodedata.normalize("NFD", "Tomáš") in name_list
+
+    def test_empty_list(self, tmp_path):
+        path = tmp_path / "empty.bin"
+        compile_name_list([], path)
+        with NameList(path) as names:
+            assert len(names) == 0
+            assert "jakub" not in names
+
+    def test_not_a_name_list(self, tmp_path):
+        path = tmp_path / "names.bin"
+        path.write_bytes(b"Jakub\nJan\n")
+        with pytest.raises(ValueError):
+            NameList(path)
+
+
+class TestLoadNameList:
+    def test_compiled_list_is_memory_mapped(self, tmp_path):
+        path = tmp_path / "female_names.bin"
+        compile_name_list(["Anna"], path)
+        names = load_name_list(path)
+        assert isinstance(names, NameList)
+        assert guess_gender_from_firstname("Anna", set(), names) == Gender.FEMALE
+        names.close()
+
+    def test_text_list(self, tmp_path):
+        path = tmp_path / "female_names.txt"
+        path.write_text("Anna\n\n Eva \n", encoding="utf-8")
+        assert load_name_list(path) == {"anna", "eva"}
+
+    def test_missing_file(self, tmp_path):
+        assert load_name_list(tmp_path / "missing.bin") == set()
+
+    def test_text_and_compiled_lists_agree(self, tmp_path):
+        lines = ["Tomáš", unicodedata.normalize("NFD", "Zdeněk"), " JAN ", "", "jan"]
+        text_path = tmp_path / "male_names.txt"
+        text_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        compiled = compiled_path(text_path, tmp_path)
+        compile_name_file(text_path, compiled)
+
+        text_names = load_name_list(text_path)
+        with load_name_list(compiled) as compiled_names:
+            assert set(compiled_names) == text_names
+            for query in [
+                "zdeněk",
+                unicodedata.normalize("NFD", "Tomáš"),
+                " Jan",
+                "ZDENĚK ",
+                "Jana",
+            ]:
+                assert guess_gender_from_firstname(
+                    query, text_names, set()
+                ) == guess_gender_from_firstname(query, compiled_names, set())
+                assert (query in compiled_names) == (
+                    guess_gender_from_firstname(query, text_names, set()) == Gender.MALE
+                )
@@ -0,0 +1,108 @@
+import pandas as pd
+
+from benchmarks.synthetic_data import write_debate_csv
+from data.preprocessing.categorize_motions import extract_motions
+from data.preprocessing.estimate_gender import extract_debaters
+from data.preprocessing.parallel_csv import (
+    chunk_ranges,
+    map_chunks,
+    read_csv_range,
+    record_ends,
+)
+
+CSV_HEADER = (
+    "type,id,date,comp,league_name,league_id,motion,tournament_name,"
+    "tournament_id,judges_scoring,score,teams\n"
+)
+
+
+def debate_row(debate_id, motion, speaker_name, speaker_id=501, judge_name="Kalouda"):
+    teams = (
+        f"[{{'team_name': 'Fretky', 'side': 'aff', 'speakers': "
+        f"[{{'name': '{speaker_name}', 'speaker_id': {speaker_id}, 'points': 70}}]}}]"
+    )
+    judges = f"[{{'name': '{judge_name}', 'judge_id': 901, 'side': 'aff'}}]"
+    return (
+        f'debate,{debate_id},2024-01-01 10:00:00 ,Pohár,,,"{motion}",,,'
+        f'"{judges}",vyhráli 3:0,"{teams}"\n'
+    )
+
+
+def count_rows(csv_path, ranges):
+    return sum(len(read_csv_range(csv_path, start, end)) for start, end in ranges)
+
+
+def motions_in_range(csv_path, start, end):
+    return list(read_csv_range(csv_path, start, end)["motion"])
+
+
+class TestRecordEnds:
+    def test_newlines_and_quotes_inside_fields(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        csv_path.write_text('a,b\n1,"x\ny"\n2,"say ""hi""\nthere"\n3,z', "utf-8")
+        data = csv_path.read_bytes()
+        ends = record_ends(csv_path)
+        assert [data[:end].count(b"\n") for end in ends] == [1, 3, 5, 5]
+        assert ends[-1] == len(data)
+
+    def test_empty_file(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        csv_path.write_text("", "utf-8")
+        assert len(record_ends(csv_path)) == 0
+        assert chunk_ranges(csv_path, 4) == []
+
+
+class TestChunkRanges:
+    def test_ranges_cover_all_rows(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 200)
+        ranges = chunk_ranges(csv_path, 7)
+        assert len(ranges) == 7
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        assert ranges[-1][1] == csv_path.stat().st_size
+        assert count_rows(csv_path, ranges) == 200
+
+    def test_more_chunks_than_rows(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        csv_path.write_text(CSV_HEADER + debate_row(1, "Teze", "Novák Jakub"), "utf-8")
+        ranges = chunk_ranges(csv_path, 4)
+        assert len(ranges) == 1
+        assert count_rows(csv_path, ranges) == 1
+
+
+class TestMapChunks:
+    def test_results_in_file_order(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 100)
+        parts = map_chunks(motions_in_range, csv_path, workers=2)
+        motions = pd.read_csv(csv_path)["motion"].tolist()
+        assert [motion for part in parts for motion in part] == motions
+
+
+class TestParallelExtraction:
+    def test_motions_match_serial(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 300)
+        assert extract_motions(csv_path, workers=2) == extract_motions(csv_path)
+
+    def test_debaters_match_serial(self, tmp_path):
+        csv_path = write_debate_csv(tmp_path / "debates.csv", 300)
+        pd.testing.assert_frame_equal(
+            extract_debaters(csv_path, workers=2), extract_debaters(csv_path)
+        )
+
+    def test_latest_name_across_chunks(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        csv_path.write_text(
+            CSV_HEADER
+            + debate_row(5, "Teze A", "Nováková Anna")
+            + debate_row(2, "Teze B", "Malá Anna")
+            + debate_row(3, "Teze C", "Novák Jakub", speaker_id=502)
+            + debate_row(4, "Teze D", "Novák Jakub", speaker_id=503),
+            "utf-8",
+        )
+        assert len(chunk_ranges(csv_path, 8)) == 4
+        debaters = extract_debaters(csv_path, workers=2)
+        assert debaters.values.tolist() == [
+            [501, "Nováková Anna"],
+            [502, "Novák Jakub"],
+            [503, "Novák Jakub"],
+        ]
+        pd.testing.assert_frame_equal(debaters, extract_debaters(csv_path))
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.ratings import (
+    INITIAL_RATING,
+    RatingState,
+    expected_score,
+    load_rating_state,
+    save_rating_state,
+    speaker_ratings,
+    team_ratings,
+    update_ratings,
+)
+
+
+def rating_of(state, debater_id):
+    ratings = speaker_ratings(state).set_index("debater_id")["rating"]
+    return ratings[debater_id]
+
+
+class TestExpectedScore:
+    def test_equal_ratings(self):
+        assert expected_score(np.array([1500.0]), np.array([1500.0]))[0] == 0.5
+
+    def test_symmetric(self):
+        a, b = np.array([1600.0]), np.array([1400.0])
+        assert expected_score(a, b)[0] + expected_score(b, a)[0] == pytest.approx(1)
+
+
+class TestUpdateRatings:
+    def test_winners_gain_and_losers_lose(self, make_debate):
+        store = build_debate_store([make_debate(1, (10, [1, 2]), (20, [3, 4]))])
+        state = update_ratings(store)
+        assert rating_of(state, 1) > INITIAL_RATING
+        assert rating_of(state, 3) < INITIAL_RATING
+        assert rating_of(state, 1) + rating_of(state, 3) == pytest.approx(
+            2 * INITIAL_RATING
+        )
+        teams = team_ratings(state).set_index("team_id")["rating"]
+        assert teams[10] > INITIAL_RATING > teams[20]
+
+    def test_split_decision_moves_ratings_less(self, make_debate):
+        clear = update_ratings(
+            build_debate_store([make_debate(1, (10, [1]), (20, [2]))])
+        )
+        split = update_ratings(
+            build_debate_store([make_debate(1, (10, [1]), (20, [2]), ballots="2:1")])
+        )
+        assert INITIAL_RATING < rating_of(split, 1) < rating_of(clear, 1)
+
+    def test_debates_rated_in_date_order(self, make_debate):
+        later = make_debate(1, (10, [1]), (20, [2]), date="2024-02-01", winner="neg")
+        earlier = make_debate(2, (10, [1]), (30, [3]))
+        store = build_debate_store([later, earlier])
+        state = update_ratings(store)
+        assert state.last_debate_id == 1
+        assert list(speaker_ratings(state)["games"]) == [2, 1, 1]
+
+    def test_incremental_update_matches_full_run(self, make_debate):
+        debates = [
+            make_debate(1, (10, [1, 2]), (20, [3, 4])),
+            make_debate(2, (20, [3, 4]), (30, [5, 6]), date="2024-01-08", winner="neg"),
+            make_debate(3, (30, [5, 6]), (10, [1, 2]), date="2024-01-15"),
+        ]
+        full = update_ratings(build_debate_store(debates))
+
+        state = update_ratings(build_debate_store(debates[:2]))
+        state = update_ratings(build_debate_store(debates), state)
+
+        for debater_id in range(1, 7):
+            assert rating_of(state, debater_id) == pytest.approx(
+                rating_of(full, debater_id)
+            )
+
+    def test_already_rated_debates_are_skipped(self, make_debate):
+        store = build_debate_store([make_debate(1, (10, [1]), (20, [2]))])
+        state = update_ratings(store)
+        rating = rating_of(state, 1)
+        update_ratings(store, state)
+        assert rating_of(state, 1) == rating
+
+    def test_debates_without_date_are_skipped(self, make_debate):
+        debate = make_debate(1, (10, [1]), (20, [2]), date=None)
+        state = update_ratings(build_debate_store([debate]))
+        assert len(state.speakers.ids) == 0
+
+
+class TestRatingStateFile:
+    def test_round_trip(self, tmp_path, make_debate):
+        store = build_debate_store([make_debate(1, (10, [1]), (20, [2]))])
+        state = update_ratings(store)
+        save_rating_state(state, tmp_path / "state.npz")
+        loaded = load_rating_state(tmp_path / "state.npz")
+
+        assert np.array_equal(loaded.speakers.ids, state.speakers.ids)
+        assert np.array_equal(loaded.teams.ratings, state.teams.ratings)
+        assert (loaded.last_day, loaded.last_debate_id) == (
+            state.last_day,
+            state.last_debate_id,
+        )
+
+    def test_empty_state(self, tmp_path):
+        save_rating_state(RatingState(), tmp_path / "state.npz")
+        loaded = load_rating_state(tmp_path / "state.npz")
+        assert len(loaded.speakers.ids) == 0
+        assert loaded.last_debate_id == -1
@@ -0,0 +1,85 @@
+import os
+
+from data.preprocessing.results_cache import (
+    ResultsCache,
+    cache_key,
+    cached_map,
+    hash_file,
+)
+
+
+def upper(items):
+    return [item.upper() for item in items]
+
+
+class TestCacheKey:
+    def test_depends_on_resource_contents(self, tmp_path):
+        resource = tmp_path / "keywords.json"
+        resource.write_text("a", encoding="utf-8")
+        first = cache_key("categorize", 1, [resource])
+        assert cache_key("categorize", 1, [resource]) == first
+
+        resource.write_text("b", encoding="utf-8")
+        assert cache_key("categorize", 1, [resource]) != first
+
+    def test_depends_on_version_and_options(self, tmp_path):
+        resource = tmp_path / "keywords.json"
+        resource.write_text("a", encoding="utf-8")
+        key = cache_key("categorize", 1, [resource])
+        assert cache_key("categorize", 2, [resource]) != key
+        assert cache_key("categorize", 1, [resource], options=[True]) != key
+
+    def test_missing_file(self, tmp_path):
+        assert hash_file(tmp_path / "missing.txt") == "missing"
+
+
+class TestCachedMap:
+    def test_miss_then_hit(self, tmp_path):
+        cache = ResultsCache(tmp_path)
+        results, computed = cached_map(cache, "k", ["a", "b"], upper)
+        assert results == {"a": "A", "b": "B"}
+        assert computed == 2
+
+        calls = []
+        results, computed = cached_map(
+            cache, "k", ["a", "b"], lambda items: calls.append(items) or []
+        )
+        assert results == {"a": "A", "b": "B"}
+        assert computed == 0
+        assert calls == []
+
+    def test_partial_hit_computes_new_items_only(self, tmp_path):
+        cache = ResultsCache(tmp_path)
+        cached_map(cache, "k", ["a"], upper)
+
+        calls = []
+
+        def compute(items):
+            calls.append(items)
+            return upper(items)
+
+        results, computed = cached_map(cache, "k", ["a", "b", "b"], compute)
+        assert results == {"a": "A", "b": "B"}
+        assert computed == 1
+        assert calls == [["b"]]
+
+    def test_corrupt_entry_is_recomputed(self, tmp_path):
+        cache = ResultsCache(tmp_path)
+        (tmp_path / "k.json").write_text("{", encoding="utf-8")
+        results, computed = cached_map(cache, "k", ["a"], upper)
+        assert results == {"a": "A"}
+        assert computed == 1
+
+
+class TestEviction:
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = ResultsCache(tmp_path, max_entries=3)
+        for age, key in enumerate(["old", "used", "new"]):
+            cache.store(key, {})
+            mtime = 1_000_000 + age
+            os.utime(tmp_path / f"{key}.json", (mtime, mtime))
+        cache.lookup("old")  # refreshed, so "used" is now the oldest
+        cache.max_entries = 2
+        cache.evict()
+
+        assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["new", "old"]
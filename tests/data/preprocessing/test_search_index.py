@@ -0,0 +1,101 @@
+import json
+from argparse import Namespace
+
+import pytest
+
+from data.preprocessing.search_index import (
+    build_search_index,
+    cmd_build,
+    load_search_index,
+    name_keys,
+    name_tokens,
+    prefix_search,
+    save_search_index,
+    search,
+    trigram_search,
+)
+
+DEBATERS = [
+    {"id": 10, "name": "Černý Petr"},
+    {"id": 11, "name": "Novák Jakub"},
+    {"id": 12, "name": "Nováková Eva"},
+    {"id": 13, "name": "Malá-Nováková Jana"},
+]
+
+
+@pytest.fixture
+def index():
+    return build_search_index(DEBATERS)
+
+
+def ids(index, positions):
+    return [index["ids"][position] for position in positions]
+
+
+class TestNameKeys:
+    def test_tokens_are_normalized(self):
+        assert name_tokens("Malá-Nováková  Jana") == ["mala", "novakova", "jana"]
+
+    def test_rotations(self):
+        assert name_keys("Novák Jakub") == ["jakub novak", "novak jakub"]
+        assert name_keys("Malá-Nováková Jana") == [
+            "jana mala novakova",
+            "mala novakova jana",
+            "novakova jana mala",
+        ]
+
+
+class TestBuildSearchIndex:
+    def test_keys_are_sorted(self, index):
+        assert index["keys"] == sorted(index["keys"])
+        assert len(index["keys"]) == len(index["entries"]) == 9
+
+    def test_trigram_postings(self, index):
+        assert index["trigrams"]["  m"] == [3]
+        assert index["trigrams"]["nov"] == [1, 2, 3]
+
+    def test_save_load(self, index, tmp_path):
+        path = tmp_path / "debater_index.json"
+        save_search_index(index, path)
+        assert load_search_index(path) == index
+        assert not path.with_suffix(".json.tmp").exists()
+
+    def test_built_beside_the_stats(self, index, tmp_path):
+        stats_path = tmp_path / "example_stats.json"
+        stats_path.write_text(json.dumps(DEBATERS), encoding="utf-8")
+
+        cmd_build(Namespace(stats=str(stats_path), output=None))
+
+        assert load_search_index(tmp_path / "debater_index.json") == index
+
+
+class TestSearch:
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("nov", [11, 12, 13]),
+            ("NOVÁK", [11, 12, 13]),
+            ("novak jakub", [11]),
+            ("Jakub Novák", [11]),
+            ("jakub nov", [11]),
+            ("cerny", [10]),
+            ("petr", [10]),
+            ("ja", [11, 13]),
+        ],
+    )
+    def test_prefix(self, index, query, expected):
+        assert sorted(ids(index, prefix_search(index, query))) == expected
+
+    def test_limit(self, index):
+        assert len(prefix_search(index, "nov", limit=2)) == 2
+
+    def test_empty_query(self, index):
+        assert prefix_search(index, " - ") == []
+        assert search(index, "") == []
+
+    def test_trigram_fallback(self, index):
+        assert prefix_search(index, "nvak jakub") == []
+        assert ids(index, search(index, "nvak jakub"))[0] == 11
+
+    def test_trigram_requires_overlap(self, index):
+        assert trigram_search(index, "xyz") == []
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.speaker_points_model import (
+    FACTORS,
+    adjusted_speaker_points,
+    fit_speaker_points,
+    load_model,
+    model_frame,
+    save_model,
+)
+
+
+@pytest.fixture
+def store(make_debate):
+    rng = np.random.default_rng(1)
+    debates = []
+    for debate_id in range(60):
+        speakers = rng.choice(12, size=4, replace=False)
+        points = rng.integers(60, 85, size=4)
+        judges = [int(rng.integers(900, 905))]
+        if debate_id % 5 == 0:
+            judges.append(905)
+        debates.append(
+            make_debate(
+                debate_id,
+                [
+                    (int(speakers[0]), int(points[0])),
+                    (int(speakers[1]), int(points[1])),
+                ],
+                [
+                    (int(speakers[2]), int(points[2])),
+                    (int(speakers[3]), int(points[3])),
+                ],
+                judges=judges,
+                tournament_id=int(debate_id % 4),
+            )
+        )
+    return build_debate_store(debates)
+
+
+def dense_ridge_solution(frame, ridge):
+    columns = [np.ones(len(frame))]
+    penalties = [0.0]
+    for factor in FACTORS:
+        for level in np.unique(frame[factor].dropna()):
+            columns.append((frame[factor] == level).fillna(False).to_numpy(float))
+            penalties.append(ridge)
+    design = np.column_stack(columns)
+    lhs = design.T @ design + np.diag(penalties)
+    return np.linalg.solve(lhs, design.T @ frame["points"].to_numpy())
+
+
+class TestFitSpeakerPoints:
+    def test_matches_dense_least_squares(self, store):
+        model = fit_speaker_points(store, ridge=1.0)
+        assert model.converged
+
+        frame = model_frame(store)
+        solution = dense_ridge_solution(frame, ridge=1.0)
+        fitted = [model.intercept]
+        for factor in FACTORS:
+            effects = model.effects[factor]
+            fitted.extend(effects.sort_index().to_numpy())
+        assert np.allclose(fitted, solution, atol=1e-5)
+
+    def test_generous_tournament_does_not_inflate_speakers(self, make_debate):
+        # Speakers 1 and 2 are equally good; speaker 1 only debated at the
+        # generous tournament
+        debates = [
+            make_debate(1, [(1, 80)], [(3, 76)], judges=[900], tournament_id=1),
+            make_debate(2, [(2, 70)], [(3, 66)], judges=[900], tournament_id=2),
+            make_debate(3, [(4, 78)], [(3, 76)], judges=[900], tournament_id=1),
+            make_debate(4, [(4, 68)], [(3, 66)], judges=[900], tournament_id=2),
+        ]
+        model = fit_speaker_points(build_debate_store(debates), ridge=0.01)
+        adjusted = model.adjusted_points()
+        assert adjusted[1] == pytest.approx(adjusted[2], abs=0.1)
+
+    def test_panel_debates_have_no_judge_effect(self, store):
+        frame = model_frame(store)
+        assert frame["judge"].isna().sum() == 12 * 4
+        assert 905 not in set(fit_speaker_points(store).effects["judge"].index)
+
+    def test_warm_start_converges_immediately(self, store):
+        model = fit_speaker_points(store)
+        refit = fit_speaker_points(store, model)
+        assert refit.iterations <= 1
+        assert np.allclose(
+            refit.effects["speaker"].sort_index(), model.effects["speaker"].sort_index()
+        )
+
+    def test_empty_store(self):
+        model = fit_speaker_points(build_debate_store([]))
+        assert model.converged
+        assert model.effects["speaker"].empty
+
+
+class TestModelFile:
+    def test_round_trip(self, store, tmp_path):
+        model = fit_speaker_points(store)
+        save_model(model, tmp_path / "model.npz")
+        loaded = load_model(tmp_path / "model.npz")
+
+        assert loaded.intercept == model.intercept
+        for factor in FACTORS:
+            assert np.allclose(loaded.effects[factor], model.effects[factor])
+        assert fit_speaker_points(store, loaded).iterations <= 1
+
+
+def test_adjusted_speaker_points(store):
+    model = fit_speaker_points(store)
+    adjusted = adjusted_speaker_points(model, store)
+    assert list(adjusted.columns) == [
+        "debater_id",
+        "debater_name",
+        "performances",
+        "raw_points",
+        "adjusted_points",
+    ]
+    assert adjusted["performances"].sum() == 240
+    assert adjusted["adjusted_points"].is_monotonic_decreasing
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.debater_stats import compute_debater_stats
+from data.preprocessing.stats_rollups import (
+    compute_partials,
+    compute_rollups,
+    load_rollup_state,
+    rollup,
+    save_rollup_state,
+    season_months,
+    season_of,
+    shift_month,
+    update_rollup_state,
+    window_stats,
+)
+
+
+@pytest.fixture
+def debates(make_debate):
+    return [
+        make_debate(1, [(1, 80)], [(2, 70)], date="2024-06-10", league_id=44),
+        make_debate(
+            2, [(1, 70)], [(2, 72)], date="2024-10-05", league_id=45, winner="neg"
+        ),
+        make_debate(3, [(1, 76)], [(2, 74)], date="2024-11-20", league_id=45),
+        make_debate(4, [(1, 75)], [(2, 70)], date=None, league_id=45),
+    ]
+
+
+@pytest.fixture
+def store(debates):
+    return build_debate_store(debates)
+
+
+def window(rollups, key):
+    windows = {w["key"]: w for w in rollups["windows"]}
+    return {s["id"]: s for s in windows[key]["stats"]}
+
+
+class TestMonths:
+    def test_season_of(self):
+        assert season_of(202408) == "2023/2024"
+        assert season_of(202409) == "2024/2025"
+
+    def test_season_months(self):
+        assert season_months("2024/2025") == (202409, 202508)
+
+    def test_shift_month(self):
+        assert shift_month(202501, -1) == 202412
+        assert shift_month(202412, 1) == 202501
+        assert shift_month(202412, -11) == 202401
+
+
+class TestPartials:
+    def test_undated_debates_are_left_out(self, store):
+        partials = compute_partials(store)
+        assert sorted(partials["month"].unique()) == [202406, 202410, 202411]
+        assert partials["debates"].sum() == 6
+
+    def test_all_time_window_matches_debater_stats(self, store, debates):
+        dated = build_debate_store(debates[:3])
+        stats = {s["id"]: s for s in compute_debater_stats(dated)}
+        rolled = {s["id"]: s for s in window_stats(rollup(compute_partials(store)))}
+        for debater_id, debater in stats.items():
+            assert rolled[debater_id]["side_win_rates"] == debater["side_win_rates"]
+            assert (
+                rolled[debater_id]["positions_speaker_points"]
+                == debater["positions_speaker_points"]
+            )
+
+    def test_debates_without_performances(self, debates):
+        store = build_debate_store([{**debates[0], "teams": []}])
+        assert compute_partials(store).empty
+
+    def test_window_and_league_filters(self, store):
+        partials = compute_partials(store)
+        totals = rollup(partials, first_month=202409, league_id=45)
+        assert totals.loc[1, "debates"] == 2
+        assert totals.loc[1, "aff_wins"] == 1
+        assert totals.loc[1, "points_sum_1"] == 146.0
+
+
+class TestRollups:
+    def test_standard_windows(self, store):
+        rollups = compute_rollups(compute_partials(store))
+        assert rollups["latest_month"] == "2024-11"
+        keys = [w["key"] for w in rollups["windows"]]
+        assert keys == [
+            "all",
+            "season:2023/2024",
+            "season:2023/2024:league:44",
+            "season:2024/2025",
+            "season:2024/2025:league:45",
+            "last_3_months",
+            "last_6_months",
+            "last_12_months",
+        ]
+
+        season = window(rollups, "season:2024/2025")
+        assert season[1]["side_win_rates"] == {"total": 0.5, "aff": 0.5, "neg": None}
+        assert season[1]["positions_speaker_points"]["1"] == 73.0
+        assert window(rollups, "last_3_months")[2]["debates"] == 2
+
+    def test_empty(self):
+        rollups = compute_rollups(compute_partials(build_debate_store([])))
+        assert rollups == {
+            "latest_month": None,
+            "windows": [
+                {
+                    "key": "all",
+                    "first_month": None,
+                    "last_month": None,
+                    "league_id": None,
+                    "stats": [],
+                }
+            ],
+        }
+
+
+class TestRollupState:
+    def test_incremental_matches_full(self, store, debates):
+        partial_store = build_debate_store(debates[:2])
+        state = update_rollup_state(partial_store)
+        state = update_rollup_state(store, state)
+        full = update_rollup_state(store)
+
+        assert np.array_equal(state.debate_ids, full.debate_ids)
+        assert compute_rollups(state.partials) == compute_rollups(full.partials)
+
+    def test_save_and_load(self, store, tmp_path):
+        state = update_rollup_state(store)
+        path = tmp_path / "rollup_state.npz"
+        save_rollup_state(state, path)
+        loaded = load_rollup_state(path)
+
+        assert np.array_equal(loaded.debate_ids, state.debate_ids)
+        assert compute_rollups(loaded.partials) == compute_rollups(state.partials)
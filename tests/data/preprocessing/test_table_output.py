@@ -0,0 +1,118 @@
+import csv
+import importlib.util
+
+import pytest
+
+from data.preprocessing.table_output import (
+    TableWriter,
+    chunked,
+    parquet_path,
+    write_table,
+)
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+HEADER = ["id", "name", "score"]
+ROWS = [(1, "Novák, Jakub", 1.5), (2, 'Eva "E" Malá', None), (3, "", 0.0)]
+
+
+def read_rows(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+class TestChunked:
+    def test_chunks(self):
+        assert list(chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+    def test_empty(self):
+        assert list(chunked([], 2)) == []
+
+
+class TestWriteTable:
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / "out" / "table.csv"
+
+        assert write_table(path, HEADER, iter(ROWS), chunk_rows=2) == 3
+
+        assert read_rows(path) == [
+            HEADER,
+            ["1", "Novák, Jakub", "1.5"],
+            ["2", 'Eva "E" Malá', ""],
+            ["3", "", "0.0"],
+        ]
+        assert path.read_bytes().count(b"\r") == 0
+
+    def test_empty_table_has_header(self, tmp_path):
+        path = tmp_path / "table.csv"
+        assert write_table(path, HEADER, []) == 0
+        assert read_rows(path) == [HEADER]
+
+    def test_failure_keeps_previous_file(self, tmp_path):
+        path = tmp_path / "table.csv"
+        write_table(path, HEADER, ROWS)
+        before = path.read_text(encoding="utf-8")
+
+        def failing_rows():
+            yield ROWS[0]
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(RuntimeError):
+            write_table(path, HEADER, failing_rows(), chunk_rows=1)
+
+        assert path.read_text(encoding="utf-8") == before
+        assert [p.name for p in tmp_path.iterdir()] == ["table.csv"]
+
+    def test_file_appears_only_on_success(self, tmp_path):
+        path = tmp_path / "table.csv"
+        with TableWriter(path, HEADER) as writer:
+            writer.write_rows(ROWS)
+            assert not path.exists()
+        assert len(read_rows(path)) == 4
+
+
+class TestParquet:
+    @pytest.mark.skipif(HAS_PYARROW, reason="pyarrow is installed")
+    def test_requires_pyarrow(self, tmp_path):
+        path = tmp_path / "table.csv"
+        with pytest.raises(ImportError, match="pyarrow"):
+            write_table(path, HEADER, ROWS, parquet=True)
+        assert list(tmp_path.iterdir()) == []
+
+    @pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is not installed")
+    def test_roundtrip(self, tmp_path):
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "table.csv"
+        write_table(path, HEADER, ROWS, parquet=True, chunk_rows=2)
+
+        table = pq.read_table(parquet_path(path))
+        assert table.column_names == HEADER
+        assert table.to_pylist() == [dict(zip(HEADER, row)) for row in ROWS]
+
+    @pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is not installed")
+    def test_types_from_first_non_null_values(self, tmp_path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "table.csv"
+        rows = [(1, None, None), (2, None, None), (3, "Malá Eva", 2.5)]
+        write_table(path, HEADER, rows, parquet=True, chunk_rows=1)
+
+        table = pq.read_table(parquet_path(path))
+        assert table.schema.field("name").type == pa.string()
+        assert table.schema.field("score").type == pa.float64()
+        assert table.to_pylist() == [dict(zip(HEADER, row)) for row in rows]
+
+    @pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is not installed")
+    def test_declared_types(self, tmp_path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "table.csv"
+        rows = [(1, None, 1.0), (2, None, 2.0)]
+        write_table(path, HEADER, rows, parquet=True, column_types={"name": "string"})
+
+        schema = pq.read_schema(parquet_path(path))
+        assert schema.field("name").type == pa.string()
+        assert schema.field("score").type == pa.float64()
@@ -0,0 +1,188 @@
+import csv
+
+import pandas as pd
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data.preprocessing.validation import (
+    QUARANTINE_COLUMNS,
+    issue_counts,
+    load_validated_store,
+    quarantine_store,
+    save_quarantine,
+    validate_store,
+)
+
+CSV_HEADER = (
+    "type,id,date,comp,league_name,league_id,motion,tournament_name,"
+    "tournament_id,judges_scoring,score,teams\n"
+)
+TEAMS = (
+    "\"[{'team_name': 'Fretky', 'team_id': 1, 'side': 'aff', 'speakers': "
+    "[{'name': 'Novák Jakub', 'speaker_id': 10, 'points': 80}]}, "
+    "{'team_name': 'Máme pravdu', 'team_id': 2, 'side': 'neg', 'speakers': "
+    "[{'name': 'Prokeš Patrik', 'speaker_id': 11, 'points': 70}]}]\""
+)
+JUDGES = "\"[{'name': 'Kalouda Dominik', 'side': 'neg', 'score': '3:0'}]\""
+
+
+FRETKY = ("Fretky", 1, [(10, 80, "Novák Jakub")])
+MAME_PRAVDU = ("Máme pravdu", 2, [(11, 70, "Prokeš Patrik")])
+
+
+@pytest.fixture
+def make_record(make_debate):
+    """Valid debate record; keyword arguments replace its raw fields."""
+
+    def build(debate_id, **fields):
+        record = make_debate(
+            debate_id,
+            FRETKY,
+            MAME_PRAVDU,
+            ballots="3:0",
+            judges=[(5, "neg", "3:0", "Kalouda Dominik")],
+            date="2025-01-26",
+            comp="Debatní pohár XXIX.",
+            motion="Teze",
+        )
+        return {**record, **fields}
+
+    return build
+
+
+def reasons(issues):
+    return sorted(zip(issues["debate_id"], issues["reason"]))
+
+
+class TestValidateStore:
+    def test_clean_store(self, make_record):
+        store = build_debate_store([make_record(1), make_record(2, score=None)])
+        issues = validate_store(store)
+        assert list(issues.columns) == QUARANTINE_COLUMNS
+        assert issues.empty
+
+    def test_debate_checks(self, make_record):
+        store = build_debate_store(
+            [
+                make_record(1, date="včera"),
+                make_record(2, score="kontumace"),
+                make_record(3),
+            ]
+        )
+        issues = validate_store(store)
+        assert reasons(issues) == [(1, "invalid_date"), (2, "invalid_score")]
+        assert issues["value"].tolist() == ["včera", "kontumace"]
+
+    def test_team_count(self, make_record):
+        one_sided = make_record(1)
+        one_sided["teams"] = one_sided["teams"][:1]
+        both_aff = make_record(2)
+        both_aff["teams"][1]["side"] = "aff"
+        issues = validate_store(build_debate_store([one_sided, both_aff]))
+        assert (1, "team_count") in reasons(issues)
+        assert (2, "team_count") in reasons(issues)
+
+    def test_performance_checks(self, make_record):
+        record = make_record(1)
+        record["teams"][0]["speakers"] = [
+            {"name": f"Řečník {i}", "speaker_id": 20 + i, "points": 70}
+            for i in range(4)
+        ]
+        record["teams"][1]["speakers"][0]["points"] = 180
+        issues = validate_store(build_debate_store([record]))
+        assert issues[["table", "reason", "value"]].values.tolist() == [
+            ["performances", "invalid_position", 4],
+            ["performances", "points_out_of_range", 180],
+        ]
+
+    def test_ballot_checks(self, make_record):
+        record = make_record(1)
+        record["judges_scoring"] = [
+            {"name": "Kalouda Dominik", "judge_id": 5, "side": "?", "score": "3:0"},
+            {"name": "Navrátilová Anežka", "judge_id": 6, "side": "aff", "score": "3"},
+            {"name": "Fryčová Lucie", "judge_id": 7, "side": "aff", "score": None},
+        ]
+        issues = validate_store(build_debate_store([record]))
+        assert issues["reason"].tolist() == [
+            "invalid_ballot_side",
+            "invalid_ballot_score",
+        ]
+        assert issues["row"].tolist() == [0, 1]
+
+
+class TestLoadValidatedStore:
+    def test_rejected_rows(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        csv_path.write_text(
+            CSV_HEADER
+            + f"debate,1,2025-01-26,Pohár,,,Teze,,,{JUDGES},vyhráli 3:0,{TEAMS}\n"
+            + "debate,2,2025-01-26,Pohár,,,Teze,,,,vyhráli 3:0,\n"
+            + f"debate,3,2025-01-26,Pohár,,,Teze,,,{JUDGES},vyhráli 3:0,\"[{{'x': \"\n"
+            + f"debate,4,2025-01-26,Pohár,,,Teze,,,\"[{{'x': \",vyhráli 3:0,{TEAMS}\n",
+            encoding="utf-8",
+        )
+        store, issues = load_validated_store(csv_path)
+        assert store.debates["debate_id"].tolist() == [1, 4]
+        assert issues[["table", "row", "debate_id", "reason"]].values.tolist() == [
+            ["raw", 1, 2, "missing_teams"],
+            ["raw", 2, 3, "unparseable_teams"],
+            ["raw", 3, 4, "unparseable_judges"],
+        ]
+
+    def test_duplicate_debate_ids(self, tmp_path):
+        csv_path = tmp_path / "debates.csv"
+        row = "debate,{},2025-01-26,Pohár,,,{},,,{},vyhráli 3:0,{}\n"
+        csv_path.write_text(
+            CSV_HEADER
+            + row.format(1, "Stará teze", JUDGES, TEAMS)
+            + row.format(2, "Teze", JUDGES, TEAMS)
+            + row.format(1, "Opravená teze", JUDGES, TEAMS)
+            + row.format(1, "Nová teze", JUDGES, TEAMS),
+            encoding="utf-8",
+        )
+        store, issues = load_validated_store(csv_path)
+        assert store.debates[["debate_id", "motion"]].values.tolist() == [
+            [2, "Teze"],
+            [1, "Nová teze"],
+        ]
+        assert issues[["table", "row", "debate_id", "reason"]].values.tolist() == [
+            ["raw", 0, 1, "duplicate_debate_id"],
+            ["raw", 2, 1, "duplicate_debate_id"],
+        ]
+
+        kept = quarantine_store(store, issues)
+        assert sorted(kept.debates["debate_id"]) == [1, 2]
+        assert kept.outcomes()["debate_id"].is_unique
+
+
+class TestQuarantine:
+    def test_quarantine_store(self, make_record):
+        record = make_record(1, date="včera")
+        record["teams"][0]["speakers"][0]["speaker_id"] = 30
+        store = build_debate_store([record, make_record(2)])
+
+        kept = quarantine_store(store, validate_store(store))
+        assert kept.debates["debate_id"].tolist() == [2]
+        assert set(kept.performances["debate_id"]) == {2}
+        assert set(kept.ballots["debate_id"]) == {2}
+        assert 30 not in set(kept.debaters["debater_id"])
+        assert 10 in set(kept.debaters["debater_id"])
+
+    def test_issue_counts(self):
+        issues = pd.DataFrame({"reason": ["team_count", "team_count", "invalid_date"]})
+        counts = issue_counts(issues)
+        assert counts["team_count"] == 2
+        assert counts["invalid_date"] == 1
+        assert counts["missing_teams"] == 0
+
+    def test_save_quarantine(self, tmp_path, make_record):
+        store = build_debate_store([make_record(1, score="kontumace")])
+        output_path = tmp_path / "quarantine.csv"
+        save_quarantine(validate_store(store), output_path)
+
+        with open(output_path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows == [
+            QUARANTINE_COLUMNS,
+            ["debates", "0", "1", "invalid_score", "kontumace"],
+        ]
@@ -0,0 +1,156 @@
+import pandas as pd
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store, legacy_person_id
+from data.preprocessing.warehouse import (
+    category_records,
+    connect,
+    load_genders,
+    load_motion_categories,
+    load_store,
+    position_points,
+    read_store,
+    speaker_debates,
+    speaker_records,
+)
+
+
+def fretky(speaker_name="Novák Jakub", points=75):
+    return ("Fretky", 10, [(1, points, speaker_name), (2, None, "Malá Eva")])
+
+
+JAMBO = ("Jambo", 20, [(3, 70, "Černý Petr")])
+
+
+@pytest.fixture
+def conn():
+    conn = connect(":memory:")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def store(make_debate):
+    return build_debate_store(
+        [
+            make_debate(1, fretky(), JAMBO, league_id=44, motion="Teze A "),
+            make_debate(
+                2,
+                fretky(points=65),
+                JAMBO,
+                date="2024-02-01",
+                winner="neg",
+                league_id=44,
+                motion="Teze A ",
+            ),
+        ]
+    )
+
+
+class TestLoadStore:
+    def test_round_trip(self, conn, store):
+        load_store(conn, store)
+        loaded = read_store(conn)
+        for name in ("debates", "performances", "ballots", "debaters", "judges"):
+            pd.testing.assert_frame_equal(getattr(loaded, name), getattr(store, name))
+
+    def test_reload_replaces_debates(self, conn, store, make_debate):
+        load_store(conn, store)
+        load_store(
+            conn,
+            build_debate_store(
+                [
+                    make_debate(
+                        2,
+                        fretky("Novák J."),
+                        JAMBO,
+                        date="2024-02-01",
+                        league_id=44,
+                        motion="Teze A ",
+                    )
+                ]
+            ),
+        )
+        loaded = read_store(conn)
+
+        assert len(loaded.debates) == 2
+        assert len(loaded.performances) == len(store.performances)
+        assert loaded.outcomes()["winner_side"].tolist() == ["aff", "aff"]
+        names = dict(
+            zip(loaded.debaters["debater_id"], loaded.debaters["debater_name"])
+        )
+        assert names[1] == "Novák J."
+
+    def test_wal_mode(self, tmp_path):
+        conn = connect(tmp_path / "warehouse.sqlite")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+
+class TestQueries:
+    def test_speaker_records(self, conn, store):
+        load_store(conn, store)
+        records = speaker_records(conn, debater_id=1)
+        assert records.to_dict("records") == [
+            {
+                "debater_id": 1,
+                "side": "aff",
+                "debates": 2,
+                "decided": 2,
+                "wins": 1,
+                "average_points": 70.0,
+            }
+        ]
+        assert set(speaker_records(conn)["debater_id"]) == {1, 2, 3}
+
+    def test_position_points(self, conn, store):
+        load_store(conn, store)
+        points = position_points(conn, debater_id=2)
+        assert points["scored"].tolist() == [0]
+        assert points["average_points"].isna().all()
+
+    def test_speaker_debates(self, conn, store):
+        load_store(conn, store)
+        debates = speaker_debates(conn, 3)
+        assert debates["debate_id"].tolist() == [1, 2]
+        assert debates["opponent"].tolist() == ["Fretky", "Fretky"]
+        assert debates["ballots_gained"].tolist() == [0, 1]
+        assert speaker_debates(conn, 3, since="2024-01-15")["debate_id"].tolist() == [2]
+
+    def test_category_records(self, conn, store):
+        load_store(conn, store)
+        load_motion_categories(
+            conn,
+            pd.DataFrame(
+                {
+                    "motion": ["Teze A"],
+                    "category_1": ["Economics"],
+                    "category_1_score": [2],
+                    "category_2": [None],
+                    "category_2_score": [0],
+                    "category_3": [None],
+                    "category_3_score": [0],
+                }
+            ),
+        )
+        records = category_records(conn, debater_id=3)
+        assert records[["category", "decided", "wins"]].values.tolist() == [
+            ["Economics", 2, 1]
+        ]
+
+
+class TestLoadGenders:
+    def test_legacy_export_without_ids(self, conn):
+        load_genders(
+            conn,
+            pd.DataFrame(
+                {
+                    "debater_name": ["Malá Eva"],
+                    "is_male": [False],
+                    "inconclusive": [False],
+                    "method_used": ["lastname_suffix"],
+                }
+            ),
+        )
+        rows = conn.execute("SELECT debater_id, is_male FROM genders").fetchall()
+        assert rows == [(legacy_person_id("Malá Eva"), 0)]
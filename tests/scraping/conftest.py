@@ -0,0 +1,44 @@
+import pytest
+
+DEBATE_PAGE_TEMPLATE = """
+<html><body><div id="mainbody">
+<h1>debata</h1>
+<p>soutěž: <a href="?page=soutez&amp;soutez_id=12">Debatní pohár XXIX.</a>,
+liga: <a href="?page=liga&amp;liga_id=44">Debatní liga XXX.</a>,
+turnaj: <a href="?page=turnaj&amp;turnaj_id=307">Druhý turnaj</a></p>
+<p>datum: 2025-01-26 09:31:00 </p>
+<p>teze: <a href="?page=teze&amp;teze_id=99">{motion}</a></p>
+<table>
+<tr><th>tým</th>
+<td><a href="?page=tym&amp;tym_id=1530">Fretky Alfredky</a></td>
+<td><a href="?page=tym&amp;tym_id=1087">Máme pravdu</a></td></tr>
+<tr><th>výsledek</th><td colspan="4">vyhráli 2:1</td></tr>
+<tr><th>1. řečník</th>
+<td class="sieg"><a href="?page=clovek&amp;clovek_id=501">Prokeš Patrik</a></td>
+<td class="sieg">84</td>
+<td><a href="?page=clovek&amp;clovek_id=601">Ondráčková Zuzana</a></td><td>69</td></tr>
+<tr><th>2. řečník</th>
+<td class="sieg"><a href="?page=clovek&amp;clovek_id=502">Novák Jakub</a></td>
+<td class="sieg">81</td>
+<td><a href="?page=clovek&amp;clovek_id=602">Petrencová Nikol</a></td><td>68</td></tr>
+</table>
+<h2>rozhodčí</h2>
+<table>
+<tr><th>jméno</th><th>strana</th><th>body</th></tr>
+<tr><td><a href="?page=clovek&amp;clovek_id=901">Kalouda Dominik</a></td>
+<td>aff</td><td>3:0</td></tr>
+<tr><td><a href="?page=clovek&amp;clovek_id=902">Navrátilová Anežka</a></td>
+<td>neg</td><td>2:1</td></tr>
+</table>
+</div></body></html>
+"""
+
+
+@pytest.fixture
+def debate_page():
+    """Render a debate detail page shaped like statistiky.debatovani.cz."""
+
+    def render(motion="Rozvinuté země by měly kompenzovat škody"):
+        return DEBATE_PAGE_TEMPLATE.format(motion=motion).encode("utf-8")
+
+    return render
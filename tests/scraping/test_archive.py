@@ -0,0 +1,103 @@
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from data_scraping.archive import RawArchive, reparse_archive
+from data_scraping.middlewares import RawArchiveMiddleware
+from data_scraping.spiders.greybox import DebatySpider
+
+
+def debate_url(debate_id):
+    return f"https://statistiky.debatovani.cz/?page=debata&debata_id={debate_id}"
+
+
+def archive_debate(archive, body, debate_id):
+    digest = archive.put(body)
+    archive.record(
+        spider="greybox",
+        url=debate_url(debate_id),
+        digest=digest,
+        callback="parseDebateDetail",
+        cb_kwargs={"debate_id": debate_id},
+    )
+
+
+class TestRawArchive:
+    def test_roundtrip(self, tmp_path):
+        archive = RawArchive(tmp_path)
+        digest = archive.put(b"<html>debata</html>")
+        assert archive.get(digest) == b"<html>debata</html>"
+
+    def test_identical_bodies_stored_once(self, tmp_path):
+        archive = RawArchive(tmp_path)
+        first = archive.put(b"same page")
+        second = archive.put(b"same page")
+        assert first == second
+        assert len(list((tmp_path / "objects").rglob("*.gz"))) == 1
+
+    def test_entries_keep_latest_per_url(self, tmp_path):
+        archive = RawArchive(tmp_path)
+        archive_debate(archive, b"old", 1)
+        archive_debate(archive, b"other", 2)
+        archive_debate(archive, b"new", 1)
+
+        entries = archive.entries("greybox")
+
+        assert [e["url"] for e in entries] == [debate_url(1), debate_url(2)]
+        assert archive.get(entries[0]["digest"]) == b"new"
+
+    def test_entries_filtered_by_spider(self, tmp_path):
+        archive = RawArchive(tmp_path)
+        archive_debate(archive, b"page", 1)
+        assert archive.entries("greybox_teams") == []
+
+    def test_missing_index(self, tmp_path):
+        assert RawArchive(tmp_path / "missing").entries("greybox") == []
+
+
+class TestReparseArchive:
+    def test_reparse_runs_spider_callbacks(self, tmp_path, debate_page):
+        archive = RawArchive(tmp_path)
+        for debate_id in range(1, 6):
+            archive_debate(archive, debate_page(f"Teze {debate_id}"), debate_id)
+
+        items = reparse_archive(DebatySpider, tmp_path, workers=2)
+
+        assert [item["id"] for item in items] == [1, 2, 3, 4, 5]
+        assert [item["motion"] for item in items] == [
+            f"Teze {debate_id}" for debate_id in range(1, 6)
+        ]
+        assert items[0]["tournament_name"] == "Druhý turnaj"
+
+    def test_empty_archive(self, tmp_path):
+        assert reparse_archive(DebatySpider, tmp_path) == []
+
+
+class TestRawArchiveMiddleware:
+    def test_archives_successful_responses(self, tmp_path, debate_page):
+        spider = DebatySpider()
+        middleware = RawArchiveMiddleware(tmp_path)
+        request = Request(
+            debate_url(7),
+            callback=spider.parseDebateDetail,
+            cb_kwargs={"debate_id": 7},
+        )
+        response = HtmlResponse(
+            url=debate_url(7), body=debate_page(), encoding="utf-8", request=request
+        )
+
+        assert middleware.process_response(request, response, spider) is response
+
+        (entry,) = RawArchive(tmp_path).entries("greybox")
+        assert entry["callback"] == "parseDebateDetail"
+        assert entry["cb_kwargs"] == {"debate_id": 7}
+        assert RawArchive(tmp_path).get(entry["digest"]) == debate_page()
+
+    def test_skips_error_responses(self, tmp_path):
+        spider = DebatySpider()
+        middleware = RawArchiveMiddleware(tmp_path)
+        request = Request(debate_url(8))
+        response = HtmlResponse(url=debate_url(8), status=404, body=b"")
+
+        middleware.process_response(request, response, spider)
+
+        assert RawArchive(tmp_path).entries("greybox") == []
@@ -0,0 +1,199 @@
+import asyncio
+
+import pytest
+
+from data.preprocessing.debate_store import build_debate_store
+from data_scraping.fetch import (
+    ConnectionPool,
+    fetch_debates,
+    parse_debate_ids,
+    refresh_debate_store,
+)
+from data_scraping.spiders.greybox import DebatySpider
+
+
+class StubServer:
+    """Minimal keep-alive HTTP server serving debate pages by id.
+
+    Ids in `raw` get their bytes written as the whole response instead, and
+    the connection is closed after them.
+    """
+
+    def __init__(self, pages, chunked=False, raw=None):
+        self.pages = pages
+        self.chunked = chunked
+        self.raw = raw or {}
+        self.connections = 0
+        self.requests = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            self.requests += 1
+
+            target = request_line.split()[1].decode()
+            debate_id = int(target.rsplit("=", 1)[1])
+            if debate_id in self.raw:
+                writer.write(self.raw[debate_id])
+                await writer.drain()
+                break
+            body = self.pages.get(debate_id)
+            status = "200 OK" if body is not None else "404 Not Found"
+            body = body or b"not found"
+
+            head = f"HTTP/1.1 {status}\r\nContent-Type: text/html; charset=utf-8\r\n"
+            if self.chunked:
+                half = len(body) // 2
+                payload = b"".join(
+                    f"{len(part):x}\r\n".encode() + part + b"\r\n"
+                    for part in (body[:half], body[half:])
+                )
+                writer.write(
+                    (head + "Transfer-Encoding: chunked\r\n\r\n").encode()
+                    + payload
+                    + b"0\r\n\r\n"
+                )
+            else:
+                writer.write(
+                    (head + f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+                )
+            await writer.drain()
+        writer.close()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.base_url = f"http://127.0.0.1:{port}/"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+
+
+def run_with_server(pages, coroutine_factory, chunked=False, raw=None):
+    async def run():
+        async with StubServer(pages, chunked=chunked, raw=raw) as server:
+            return server, await coroutine_factory(server)
+
+    return asyncio.run(run())
+
+
+class TestParseDebateIds:
+    def test_ranges_and_single_ids(self):
+        assert parse_debate_ids(["10700-10702", "11012"]) == [
+            10700,
+            10701,
+            10702,
+            11012,
+        ]
+
+    def test_duplicates_removed(self):
+        assert parse_debate_ids(["5", "4-6"]) == [5, 4, 6]
+
+
+class TestConnectionPool:
+    @pytest.mark.parametrize("chunked", [False, True])
+    def test_reuses_connections(self, chunked):
+        pages = {1: b"first", 2: b"second", 3: b"third"}
+
+        async def fetch(server):
+            async with ConnectionPool(server.base_url, limit=1) as pool:
+                return [
+                    await pool.get(f"?page=debata&debata_id={i}") for i in (1, 2, 3)
+                ]
+
+        server, responses = run_with_server(pages, fetch, chunked=chunked)
+
+        assert [body for _, _, body in responses] == [b"first", b"second", b"third"]
+        assert server.connections == 1
+        assert server.requests == 3
+
+
+class TestFetchDebates:
+    def test_parses_pages_in_id_order(self, debate_page):
+        pages = {i: debate_page(f"Teze {i}") for i in range(1, 9)}
+
+        server, items = run_with_server(
+            pages,
+            lambda server: fetch_debates(
+                range(1, 9), base_url=server.base_url, concurrency=3
+            ),
+        )
+
+        assert [item["id"] for item in items] == list(range(1, 9))
+        assert [item["motion"] for item in items] == [f"Teze {i}" for i in range(1, 9)]
+        assert server.connections <= 3
+
+    def test_skips_missing_debates(self, debate_page):
+        server, items = run_with_server(
+            {1: debate_page()},
+            lambda server: fetch_debates([1, 2], base_url=server.base_url),
+        )
+
+        assert [item["id"] for item in items] == [1]
+
+    @pytest.mark.parametrize(
+        "response",
+        [
+            b"garbage\r\n",
+            b"HTTP/1.1 OK\r\n\r\n",
+            b"HTTP/1.1 200 OK\r\nContent-Length: many\r\n\r\n",
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nzz\r\n",
+        ],
+    )
+    def test_skips_malformed_response(self, debate_page, response):
+        pages = {i: debate_page(f"Teze {i}") for i in (1, 2, 4)}
+
+        _, items = run_with_server(
+            pages,
+            lambda server: fetch_debates(
+                [1, 2, 3, 4], base_url=server.base_url, concurrency=2
+            ),
+            raw={3: response},
+        )
+
+        assert [item["id"] for item in items] == [1, 2, 4]
+
+    def test_skips_page_that_fails_to_parse(self, debate_page, monkeypatch):
+        parse = DebatySpider.parseDebateDetail
+
+        def parse_or_fail(spider, response, debate_id):
+            if debate_id == 2:
+                raise IndexError("unexpected page layout")
+            return parse(spider, response, debate_id)
+
+        monkeypatch.setattr(DebatySpider, "parseDebateDetail", parse_or_fail)
+        pages = {i: debate_page(f"Teze {i}") for i in (1, 2, 3)}
+
+        _, items = run_with_server(
+            pages,
+            lambda server: fetch_debates([1, 2, 3], base_url=server.base_url),
+        )
+
+        assert [item["id"] for item in items] == [1, 3]
+
+
+class TestRefreshDebateStore:
+    def test_upserts_into_store(self, debate_page):
+        store = build_debate_store(
+            [{"id": 1, "motion": "Stará teze", "teams": []}, {"id": 3, "teams": []}]
+        )
+
+        async def refresh(server):
+            return await asyncio.to_thread(
+                refresh_debate_store, store, [1, 2], base_url=server.base_url
+            )
+
+        _, updated = run_with_server(
+            {1: debate_page("Nová teze"), 2: debate_page("Teze 2")}, refresh
+        )
+
+        debates = updated.debates.sort_values("debate_id")
+        assert list(debates["debate_id"]) == [1, 2, 3]
+        assert list(debates["motion"])[:2] == ["Nová teze", "Teze 2"]
+        assert set(updated.debaters["debater_id"]) == {501, 502, 601, 602}
@@ -0,0 +1,167 @@
+from scrapy import Request
+from scrapy.http import HtmlResponse
+
+from data_scraping import middlewares
+from data_scraping.metrics import CrawlMetrics, LatencyHistogram
+from data_scraping.middlewares import (
+    DataScrapingDownloaderMiddleware,
+    DataScrapingSpiderMiddleware,
+)
+from data_scraping.spiders.greybox import DebatySpider
+
+URL = "https://statistiky.debatovani.cz/?page=debata&debata_id=1"
+
+
+class TestLatencyHistogram:
+    def test_buckets(self):
+        histogram = LatencyHistogram([100, 1000])
+        for latency_ms in (20, 100, 500, 5000):
+            histogram.add(latency_ms)
+
+        result = histogram.to_dict()
+
+        assert result["buckets"] == {"<=100": 2, "<=1000": 1, ">1000": 1}
+        assert result["count"] == 4
+        assert result["mean_ms"] == 1405.0
+        assert result["max_ms"] == 5000
+
+    def test_empty(self):
+        assert LatencyHistogram().to_dict()["mean_ms"] is None
+
+
+class TestCrawlMetrics:
+    def test_extraction_missing_rates(self):
+        metrics = CrawlMetrics(["motion", "score"])
+        metrics.record_page([{"motion": "Teze", "score": None}])
+        metrics.record_page([{"motion": None, "score": None}])
+        metrics.record_page([{"Team": "Fretky"}])
+
+        record = metrics.to_record("greybox")
+
+        assert record["extraction_missing"] == {
+            "motion": {"missing": 1, "seen": 2, "rate": 0.5},
+            "score": {"missing": 2, "seen": 2, "rate": 1.0},
+        }
+        assert record["items_per_page"] == {"1": 3}
+
+    def test_status_codes_and_error_rate(self):
+        metrics = CrawlMetrics()
+        metrics.record_response(200, 0.2)
+        metrics.record_response(200, 0.3)
+        metrics.record_response(500, 1.5)
+        metrics.record_exception(TimeoutError())
+
+        record = metrics.to_record("greybox")
+
+        assert record["status_codes"] == {"200": 2, "500": 1}
+        assert record["exceptions"] == {"TimeoutError": 1}
+        assert record["error_rate"] == 0.5
+        assert record["latency"]["count"] == 3
+
+
+class TestDownloaderMiddleware:
+    def test_records_latency_status_and_retries(self):
+        metrics = CrawlMetrics()
+        middleware = DataScrapingDownloaderMiddleware(metrics)
+        spider = DebatySpider()
+        request = Request(URL, meta={"retry_times": 1, "download_latency": 0.42})
+        response = HtmlResponse(url=URL, status=200, body=b"", request=request)
+
+        middleware.process_request(request, spider)
+        assert middleware.process_response(request, response, spider) is response
+
+        assert metrics.retries == 1
+        assert metrics.status_codes == {200: 1}
+        assert metrics.latency.to_dict()["buckets"]["<=500"] == 1
+
+
+class TestSpiderMiddleware:
+    def test_counts_items_and_passes_output_through(self, debate_page):
+        metrics = CrawlMetrics()
+        middleware = DataScrapingSpiderMiddleware(metrics)
+        spider = DebatySpider()
+        response = HtmlResponse(url=URL, body=debate_page(), encoding="utf-8")
+        result = list(spider.parseDebateDetail(response, debate_id=1)) + [Request(URL)]
+
+        output = list(middleware.process_spider_output(response, result, spider))
+
+        assert output == result
+        assert metrics.pages == 1
+        assert metrics.items == 1
+        assert metrics.field_missing["motion"] == 0
+
+    def test_exports_metrics_on_close(self, monkeypatch):
+        logged = []
+        monkeypatch.setattr(
+            middlewares.metrics_logger,
+            "info",
+            lambda message, extra: logged.append(extra["data"]),
+        )
+        middleware = DataScrapingSpiderMiddleware(CrawlMetrics())
+
+        middleware.spider_closed(DebatySpider(), "finished")
+
+        (record,) = logged
+        assert record["spider"] == "greybox"
+        assert record["finish_reason"] == "finished"
+
+
+def project_settings(**overrides):
+    from data_scraping import settings
+
+    values = {name: getattr(settings, name) for name in dir(settings) if name.isupper()}
+    values.update(RAW_ARCHIVE_ENABLED=False, **overrides)
+    return values
+
+
+class TestDownloaderMiddlewareOrder:
+    def download_through_chain(self, responses):
+        """Pass requests through the project's ordered downloader middlewares.
+
+        `responses` maps a URL to the status of its response; the requests
+        returned by the chain (retries and redirects) are downloaded in turn.
+        """
+        from scrapy import signals
+        from scrapy.core.downloader.middleware import DownloaderMiddlewareManager
+        from scrapy.crawler import Crawler
+        from scrapy.http import Response
+        from scrapy.settings import Settings
+        from twisted.internet.defer import succeed
+
+        # No reactor is needed: every download returns an already fired Deferred
+        crawler = Crawler(
+            DebatySpider, Settings(project_settings(TWISTED_REACTOR=None))
+        )
+        crawler._apply_settings()
+        crawler.spider = crawler._create_spider()
+        manager = DownloaderMiddlewareManager.from_crawler(crawler)
+        crawler.signals.send_catch_log(signals.spider_opened, spider=crawler.spider)
+        attempts = {}
+
+        def download(request, spider):
+            statuses = responses[request.url]
+            status = statuses[min(attempts.get(request.url, 0), len(statuses) - 1)]
+            attempts[request.url] = attempts.get(request.url, 0) + 1
+            request.meta["download_latency"] = 0.1
+            headers = {"Location": f"{URL}&moved=1"} if status == 301 else {}
+            return succeed(
+                Response(request.url, status=status, headers=headers, request=request)
+            )
+
+        results = []
+        request = Request(URL)
+        while isinstance(request, Request):
+            manager.download(download, request, crawler.spider).addBoth(results.append)
+            request = results[-1]
+        return crawler.crawl_metrics, results[-1]
+
+    def test_retried_and_redirected_responses_are_counted(self):
+        metrics, response = self.download_through_chain(
+            {URL: [503, 301], f"{URL}&moved=1": [200]}
+        )
+
+        assert response.status == 200
+        assert metrics.status_codes == {503: 1, 301: 1, 200: 1}
+        assert metrics.retries == 1
+        assert metrics.latency.to_dict()["count"] == 3
+        assert metrics.to_record("greybox")["error_rate"] == round(1 / 3, 4)
@@ -0,0 +1,114 @@
+from scrapy.http import HtmlResponse
+
+from data_scraping.spiders.greybox import DebatySpider
+from data_scraping.spiders.greybox2 import GreyboxCompetitionsSpider
+from data_scraping.spiders.greybox3 import GreyboxTeamsSpider
+from data_scraping.utils import extract_id
+
+BASE_URL = "https://statistiky.debatovani.cz/"
+
+TEAMS_PAGE = """
+<html><body><div id="mainbody"><table>
+<tr><th>tým</th><th>klub</th><th>členové</th><th>debaty</th></tr>
+<tr><td><a href="?page=tym&amp;tym_id=1530">¿PORG qué?</a></td>
+<td><a href="?page=klub&amp;klub_id=77">Gymnázium PORG Ostrava</a></td>
+<td>5 (5)</td><td>12 (12)</td></tr>
+</table></div></body></html>
+"""
+
+COMPETITIONS_PAGE = """
+<html><body><div id="mainbody"><table>
+<tr><th>sezóna</th><th>soutěž</th><th>druh</th><th>jazyk</th><th>aktivní</th>
+<th>debaty</th></tr>
+<tr><td>2025/2026</td>
+<td><a href="?page=soutez&amp;soutez_id=12">Debatní pohár XXIX.</a></td>
+<td>pohár</td><td>cz</td><td>ano</td><td>191</td></tr>
+</table></div></body></html>
+"""
+
+
+def html_response(body, url=BASE_URL):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return HtmlResponse(url=url, body=body, encoding="utf-8")
+
+
+class TestExtractId:
+    def test_relative_link(self):
+        assert extract_id("?page=tym&tym_id=1530", "tym_id") == 1530
+
+    def test_absolute_link(self):
+        assert extract_id(f"{BASE_URL}?page=liga&liga_id=44", "liga_id") == 44
+
+    def test_missing_key(self):
+        assert extract_id("?page=tym&tym_id=1530", "klub_id") is None
+
+    def test_missing_url(self):
+        assert extract_id(None, "tym_id") is None
+
+    def test_non_numeric_value(self):
+        assert extract_id("?page=tym&tym_id=abc", "tym_id") is None
+
+
+class TestDebatySpider:
+    def test_debate_ids(self, debate_page):
+        (item,) = DebatySpider().parseDebateDetail(
+            html_response(debate_page()), debate_id=10700
+        )
+
+        assert item["id"] == 10700
+        assert item["comp_id"] == 12
+        assert item["league_id"] == 44
+        assert item["tournament_id"] == 307
+        assert [team["team_id"] for team in item["teams"]] == [1530, 1087]
+        assert [team["team_name"] for team in item["teams"]] == [
+            "Fretky Alfredky",
+            "Máme pravdu",
+        ]
+
+    def test_speaker_ids(self, debate_page):
+        (item,) = DebatySpider().parseDebateDetail(
+            html_response(debate_page()), debate_id=10700
+        )
+
+        aff, neg = item["teams"]
+        assert [(s["speaker_id"], s["name"], s["points"]) for s in aff["speakers"]] == [
+            (501, "Prokeš Patrik", 84),
+            (502, "Novák Jakub", 81),
+        ]
+        assert [s["speaker_id"] for s in neg["speakers"]] == [601, 602]
+
+    def test_speakers_follow_columns_not_winner(self, debate_page):
+        body = debate_page().replace(b'class="sieg"', b"")
+        (item,) = DebatySpider().parseDebateDetail(html_response(body), debate_id=10700)
+
+        aff, neg = item["teams"]
+        assert [s["speaker_id"] for s in aff["speakers"]] == [501, 502]
+        assert [s["speaker_id"] for s in neg["speakers"]] == [601, 602]
+
+    def test_judge_ids(self, debate_page):
+        (item,) = DebatySpider().parseDebateDetail(
+            html_response(debate_page()), debate_id=10700
+        )
+
+        assert [j["judge_id"] for j in item["judges_scoring"]] == [901, 902]
+        assert [j["side"] for j in item["judges_scoring"]] == ["aff", "neg"]
+
+
+class TestGreyboxTeamsSpider:
+    def test_team_and_club_ids(self):
+        (item,) = GreyboxTeamsSpider().parse(html_response(TEAMS_PAGE))
+
+        assert item["Team_ID"] == 1530
+        assert item["Team"] == "¿PORG qué?"
+        assert item["Club_ID"] == 77
+        assert item["Klub"] == "Gymnázium PORG Ostrava"
+
+
+class TestGreyboxCompetitionsSpider:
+    def test_competition_id(self):
+        (item,) = GreyboxCompetitionsSpider().parse(html_response(COMPETITIONS_PAGE))
+
+        assert item["Competition_ID"] == 12
+        assert item["Soutěž"] == "Debatní pohár XXIX."
+        assert item["Sezóna"] == "2025/2026"
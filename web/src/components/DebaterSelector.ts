@@ -1,4 +1,5 @@
 import { DebaterStats } from '../types.js';
+import { DebaterSearch } from './debaterSearch.js';
 
 export class DebaterSelector {
   private container: HTMLElement;
@@ -6,6 +7,8 @@ export class DebaterSelector {
   private currentDebater: DebaterStats | null;
   private onSelectCallback: (debater: DebaterStats) => void;
   private fuse: any; // Fuse.js instance
+  private search: DebaterSearch | null;
+  private debatersById: Map<number, DebaterStats>;
   
   private inputElement: HTMLInputElement | null = null;
   private dropdownElement: HTMLElement | null = null;
@@ -14,7 +17,8 @@ export class DebaterSelector {
     containerId: string,
     allDebaters: DebaterStats[],
     currentDebater: DebaterStats | null,
-    onSelect: (debater: DebaterStats) => void
+    onSelect: (debater: DebaterStats) => void,
+    search: DebaterSearch | null = null
   ) {
     const container = document.getElementById(containerId);
     if (!container) {
@@ -25,8 +29,13 @@ export class DebaterSelector {
     this.allDebaters = allDebaters;
     this.currentDebater = currentDebater;
     this.onSelectCallback = onSelect;
+    this.search = search;
+    this.debatersById = new Map(allDebaters.map(debater => [debater.id, debater]));
     
-    this.initializeFuse();
+    // Fall back to fuzzy search when there is no prebuilt search index
+    if (!this.search) {
+      this.initializeFuse();
+    }
     this.render();
   }
 
@@ -113,15 +122,25 @@ export class DebaterSelector {
     this.dropdownElement.classList.add('active');
   }
 
+  private findDebaters(query: string, limit: number): DebaterStats[] {
+    if (this.search) {
+      return this.search
+        .search(query, limit)
+        .map(id => this.debatersById.get(id))
+        .filter((debater): debater is DebaterStats => debater !== undefined);
+    }
+    if (!this.fuse) return [];
+    const results = this.fuse.search(query) as Array<{ item: DebaterStats }>;
+    return results.slice(0, limit).map(result => result.item);
+  }
+
   private showFilteredDebaters(query: string): void {
-    if (!this.dropdownElement || !this.fuse) return;
+    if (!this.dropdownElement) return;
     
-    const results = this.fuse.search(query) as Array<{ item: DebaterStats }>;
+    const topResults = this.findDebaters(query, 5);
     
     this.dropdownElement.innerHTML = '';
     
-    const topResults = results.slice(0, 5);
-    
     if (topResults.length === 0) {
       const noResults = document.createElement('div');
       noResults.className = 'selector-option';
@@ -130,8 +149,8 @@ export class DebaterSelector {
       noResults.style.color = 'var(--color-text-muted)';
       this.dropdownElement.appendChild(noResults);
     } else {
-      topResults.forEach(result => {
-        this.addOptionToDropdown(result.item);
+      topResults.forEach(debater => {
+        this.addOptionToDropdown(debater);
       });
     }
     
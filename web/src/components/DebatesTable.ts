@@ -1,4 +1,5 @@
 import { DebaterStats } from '../types.js';
+import { formatNumber } from './numberFormatter.js';
 
 export class DebatesTable {
   private container: HTMLElement;
@@ -118,7 +119,7 @@ export class DebatesTable {
       this.addCellToRow(row, debate.ballots_gained.toString());
       this.addCellToRow(row, debate.opponent);
       this.addCellToRow(row, debate.was_aff ? 'A' : 'N');
-      this.addCellToRow(row, debate.speaker_points.toFixed(1));
+      this.addCellToRow(row, formatNumber(debate.speaker_points));
       this.addCellToRow(row, debate.date);
 
       const linkCell = document.createElement('td');
@@ -1,4 +1,5 @@
 import { DebaterStats } from '../types.js';
+import { formatNumber } from './numberFormatter.js';
 
 export class PositionStats {
   private container: HTMLElement;
@@ -41,7 +42,7 @@ export class PositionStats {
       
       const value = document.createElement('span');
       value.className = 'stats-value';
-      value.textContent = points.toFixed(1);
+      value.textContent = formatNumber(points);
       
       item.appendChild(positionLabel);
       item.appendChild(value);
@@ -0,0 +1,10 @@
+// Shown instead of a statistic the debater has no data for
+export const MISSING_VALUE = '–';
+
+export function formatNumber(value: number | null, digits: number = 1): string {
+  return value === null ? MISSING_VALUE : value.toFixed(digits);
+}
+
+export function formatPercent(rate: number | null, digits: number = 1): string {
+  return rate === null ? MISSING_VALUE : `${(rate * 100).toFixed(digits)}%`;
+}
@@ -1,10 +1,11 @@
+import { DebaterSearch } from './components/debaterSearch.js';
 import { DebaterSelector } from './components/DebaterSelector.js';
 import { DebatesTable } from './components/DebatesTable.js';
 import { MotionStats } from './components/MotionStats.js';
 import { PositionStats } from './components/PositionStats.js';
 import { SpeakerPointsChart } from './components/SpeakerPointsChart.js';
 import { WinRateChart } from './components/WinRateChart.js';
-import { AppState, DebaterStats } from './types.js';
+import { AppState, DebaterSearchIndex, DebaterStats } from './types.js';
 
 console.log('Speaker Stats app initialized!');
 
@@ -13,6 +14,7 @@ const state: AppState = {
   currentDebater: null
 };
 
+let debaterSearch: DebaterSearch | null = null;
 let debaterSelector: DebaterSelector | null = null;
 let winRateChart: WinRateChart | null = null;
 let speakerPointsChart: SpeakerPointsChart | null = null;
@@ -34,6 +36,7 @@ async function loadData(): Promise<void> {
     console.log(`Loaded ${state.allDebaters.length} debaters`);
     console.log('Current debater:', state.currentDebater?.name);
     
+    debaterSearch = await loadSearchIndex();
     initializeComponents();
     
   } catch (error) {
@@ -41,6 +44,21 @@ async function loadData(): Promise<void> {
   }
 }
 
+// The selector falls back to fuzzy search when the index is not published
+async function loadSearchIndex(): Promise<DebaterSearch | null> {
+  try {
+    const response = await fetch('./debater_index.json');
+    if (!response.ok) {
+      return null;
+    }
+    const index: DebaterSearchIndex = await response.json();
+    return new DebaterSearch(index);
+  } catch (error) {
+    console.warn('Debater search index not available:', error);
+    return null;
+  }
+}
+
 function initializeComponents(): void {
   if (!state.currentDebater) {
     console.error('No debater selected');
@@ -51,7 +69,8 @@ function initializeComponents(): void {
     'debater-selector',
     state.allDebaters,
     state.currentDebater,
-    onDebaterSelected
+    onDebaterSelected,
+    debaterSearch
   );
 
   winRateChart = new WinRateChart(
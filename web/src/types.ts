@@ -1,14 +1,16 @@
 export interface DebaterStats {
+  id: number;
   name: string;
+  rating: number | null;
   side_win_rates: {
-    total: number;
-    aff: number;
-    neg: number;
+    total: number | null;
+    aff: number | null;
+    neg: number | null;
   };
   positions_speaker_points: {
-    "1": number;
-    "2": number;
-    "3": number;
+    "1": number | null;
+    "2": number | null;
+    "3": number | null;
   };
   motion_category_stats: {
     top_3: CategoryStat[];
@@ -27,10 +29,39 @@ export interface Debate {
   opponent: string;
   was_aff: boolean;
   link: string;
-  speaker_points: number;
+  speaker_points: number | null;
   date: string;
 }
 
+export interface WindowStats {
+  id: number;
+  debates: number;
+  side_win_rates: DebaterStats["side_win_rates"];
+  positions_speaker_points: DebaterStats["positions_speaker_points"];
+}
+
+export interface StatsWindow {
+  key: string;
+  first_month: string | null;
+  last_month: string | null;
+  league_id: number | null;
+  stats: WindowStats[];
+}
+
+export interface DebaterRollups {
+  latest_month: string | null;
+  windows: StatsWindow[];
+}
+
+export interface DebaterSearchIndex {
+  version: number;
+  names: string[];
+  ids: number[];
+  keys: string[];
+  entries: number[];
+  trigrams: Record<string, number[]>;
+}
+
 export interface AppState {
   allDebaters: DebaterStats[];
   currentDebater: DebaterStats | null;